@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Telegram Dispatcher Module
+Background delivery for TelegramNotifier so producers never wait on HTTP.
+
+- Bounded queue, drop-oldest when full (order routing must never block)
+- Per-category coalescing: bursts of e.g. order messages become one digest
+- Retry with exponential backoff on failed deliveries
+- Queue depth / delivery latency exposed via get_stats()
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+from shoonya_platform.utils.latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Telegram rejects texts above 4096 chars; keep headroom for the separators
+MAX_DIGEST_CHARS = 3800
+DIGEST_SEPARATOR = "\n━━━━━━━━━━━━━━━━━━━━\n"
+
+
+@dataclass
+class QueuedMessage:
+    text: str
+    category: str
+    parse_mode: str = "HTML"
+    deliver: bool = True  # False → only recorded (prefs blocked HTTP send)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+# send_fn(text, parse_mode) -> bool ; on_done(messages, sent) records the outcome
+SendFn = Callable[[str, str], bool]
+DoneFn = Callable[[List[QueuedMessage], bool], None]
+
+
+class TelegramDispatcher:
+    """Single worker thread draining a bounded notification queue."""
+
+    def __init__(
+        self,
+        send_fn: SendFn,
+        on_done: Optional[DoneFn] = None,
+        *,
+        max_queue: int = 1000,
+        coalesce_categories: Iterable[str] = ("strategy",),
+        coalesce_window: float = 0.5,
+        max_batch: int = 20,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ):
+        self._send_fn = send_fn
+        self._on_done = on_done
+        self.max_queue = max_queue
+        self.coalesce_categories = frozenset(coalesce_categories)
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._queue: Deque[QueuedMessage] = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._stats = {
+            "enqueued": 0,
+            "delivered": 0,
+            "batches_sent": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "failed": 0,
+            "dropped": 0,
+            "recorded_only": 0,
+        }
+        self._latency = LatencyHistogram()
+
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="TelegramDispatcher", daemon=True
+        )
+        self._thread.start()
+        logger.info("📨 Telegram dispatcher started | max_queue=%d", self.max_queue)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive() and not self._stopping)
+
+    def stop(self, timeout: float = 5.0, flush: bool = True) -> None:
+        """Stop the worker; with flush=True pending messages are sent first."""
+        with self._cond:
+            if not flush:
+                self._queue.clear()
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    "Telegram dispatcher did not drain within %.1fs | pending=%d",
+                    timeout, len(self._queue),
+                )
+        self._thread = None
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until the queue is empty and no delivery is in flight."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # --------------------------------------------------
+    # PRODUCER SIDE
+    # --------------------------------------------------
+
+    def submit(
+        self,
+        text: str,
+        *,
+        category: str = "system",
+        parse_mode: str = "HTML",
+        deliver: bool = True,
+    ) -> bool:
+        """Enqueue and return immediately (drops the oldest message when full)."""
+        msg = QueuedMessage(text, category, parse_mode, deliver)
+        with self._cond:
+            if self._stopping:
+                return False
+            if len(self._queue) >= self.max_queue:
+                dropped = self._queue.popleft()
+                self._stats["dropped"] += 1
+                if self._stats["dropped"] % 100 == 1:
+                    logger.warning(
+                        "Telegram queue full (%d) — dropping oldest | category=%s | dropped_total=%d",
+                        self.max_queue, dropped.category, self._stats["dropped"],
+                    )
+            self._queue.append(msg)
+            self._stats["enqueued"] += 1
+            self._cond.notify()
+        return True
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                self._deliver(batch)
+            except Exception as e:
+                logger.error("Telegram dispatcher delivery error: %s", e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _next_batch(self) -> Optional[List[QueuedMessage]]:
+        with self._cond:
+            while not self._queue:
+                if self._stopping:
+                    return None
+                self._cond.wait(0.5)
+            first = self._queue.popleft()
+            self._busy = True
+            batch = [first]
+            if not first.deliver or first.category not in self.coalesce_categories:
+                return batch
+
+            # Gather same-category messages arriving within the window
+            size = len(first.text)
+            deadline = first.enqueued_at + self.coalesce_window
+            while len(batch) < self.max_batch:
+                size = self._take_matching(first, batch, size)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping or len(batch) >= self.max_batch:
+                    break
+                self._cond.wait(remaining)
+            return batch
+
+    def _take_matching(self, first: QueuedMessage, batch: List[QueuedMessage], size: int) -> int:
+        """Move queued messages coalescable with `first` into batch (lock held)."""
+        keep: Deque[QueuedMessage] = deque()
+        while self._queue:
+            msg = self._queue.popleft()
+            fits = size + len(DIGEST_SEPARATOR) + len(msg.text) <= MAX_DIGEST_CHARS
+            if (
+                len(batch) < self.max_batch
+                and fits
+                and msg.deliver
+                and msg.category == first.category
+                and msg.parse_mode == first.parse_mode
+            ):
+                batch.append(msg)
+                size += len(DIGEST_SEPARATOR) + len(msg.text)
+            else:
+                keep.append(msg)
+        self._queue = keep
+        return size
+
+    def _deliver(self, batch: List[QueuedMessage]) -> None:
+        if not batch[0].deliver:
+            self._stats["recorded_only"] += len(batch)
+            self._done(batch, False)
+            return
+
+        text = batch[0].text if len(batch) == 1 else DIGEST_SEPARATOR.join(m.text for m in batch)
+        attempt = 0
+        sent = False
+        while True:
+            try:
+                sent = bool(self._send_fn(text, batch[0].parse_mode))
+            except Exception as e:
+                logger.warning("Telegram send raised: %s", e)
+                sent = False
+            if sent or attempt >= self.max_retries:
+                break
+            attempt += 1
+            self._stats["retries"] += 1
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+            logger.debug("Telegram send failed — retry %d/%d in %.2fs", attempt, self.max_retries, delay)
+            with self._cond:
+                # Wake early on stop, but still make the remaining attempts
+                self._cond.wait_for(lambda: self._stopping, timeout=delay)
+
+        now = time.monotonic()
+        if sent:
+            self._stats["delivered"] += len(batch)
+            self._stats["batches_sent"] += 1
+            self._stats["coalesced"] += len(batch) - 1
+            for m in batch:
+                self._latency.observe(now - m.enqueued_at)
+        else:
+            self._stats["failed"] += len(batch)
+            logger.error(
+                "Telegram delivery FAILED after %d attempts | messages=%d | category=%s",
+                attempt + 1, len(batch), batch[0].category,
+            )
+        self._done(batch, sent)
+
+    def _done(self, batch: List[QueuedMessage], sent: bool) -> None:
+        if self._on_done is None:
+            return
+        try:
+            self._on_done(batch, sent)
+        except Exception as e:
+            logger.warning("Telegram dispatcher on_done failed: %s", e)
+
+    # --------------------------------------------------
+    # STATS
+    # --------------------------------------------------
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._cond:
+            depth = len(self._queue)
+        return {
+            **self._stats,
+            "queue_depth": depth,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "delivery_latency": self._latency.snapshot(),
+        }
@@ -13,6 +13,7 @@ from typing import Optional, Literal, Any, Dict, List
 import requests
 
 from shoonya_platform.utils.text_sanitize import sanitize_text
+from notifications.dispatcher import TelegramDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +35,18 @@ class TelegramNotifier:
         "send_heartbeat": "reports",
     }
 
-    def __init__(self, bot_token: str, chat_id: str):
+    def __init__(self, bot_token: str, chat_id: str, api_base: str = "https://api.telegram.org"):
         """Initialize Telegram notifier with bot token and chat ID"""
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.base_url = f"{api_base.rstrip('/')}/bot{bot_token}"
         self.session = requests.Session()
         self.is_connected = False
         self._log_path = self._resolve_log_path()
         # Granular preferences (set by dashboard toggle, default all on)
         self._prefs = {"all": True, "system": True, "strategy": True, "reports": True}
+        # Background delivery (see start_dispatcher); None → synchronous sends
+        self._dispatcher: Optional[TelegramDispatcher] = None
 
         # Eagerly establish connection so is_connected is True from the start
         try:
@@ -117,6 +120,77 @@ class TelegramNotifier:
     # Keep backward-compat alias
     _should_send = _should_send_to_telegram
 
+    def _category_for(self, method_name: str) -> str:
+        for prefix, cat in self._CATEGORY_MAP.items():
+            if method_name.startswith(prefix):
+                return cat
+        return "system"
+
+    # --------------------------------------------------
+    # ASYNC DISPATCH
+    # --------------------------------------------------
+
+    def start_dispatcher(self, **kwargs) -> TelegramDispatcher:
+        """Route notifications through a background queue (kwargs → TelegramDispatcher).
+
+        Once started, send_* / deliver() only enqueue; HTTP delivery, retries
+        and the JSONL dashboard log happen on the dispatcher thread.
+        """
+        if self._dispatcher is None:
+            self._dispatcher = TelegramDispatcher(
+                lambda text, parse_mode: self.send_message(text, parse_mode=parse_mode, _skip_log=True),
+                self._record_delivery,
+                **kwargs,
+            )
+        self._dispatcher.start()
+        return self._dispatcher
+
+    def stop_dispatcher(self, timeout: float = 5.0, flush: bool = True) -> None:
+        """Drain (optionally) and stop the dispatcher; later sends are synchronous."""
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.stop(timeout=timeout, flush=flush)
+
+    @property
+    def dispatcher_running(self) -> bool:
+        return self._dispatcher is not None and self._dispatcher.running
+
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        if self._dispatcher is None:
+            return {"running": False}
+        return self._dispatcher.get_stats()
+
+    def _record_delivery(self, messages, sent: bool) -> None:
+        for m in messages:
+            self._append_message_log(m.text, sent=sent)
+
+    def notify(self, message: str, *, method_name: str = "send_generic", category: str = "system") -> bool:
+        """Sanitize, check the master / category toggles and deliver.
+
+        Blocked messages are still logged (sent=False) for the dashboard.
+        """
+        return self.deliver(
+            sanitize_text(message, ascii_only=False),
+            category=category,
+            allowed=self._should_send_to_telegram(method_name, category=category),
+        )
+
+    def deliver(self, message: str, *, category: str = "system", allowed: bool = True) -> bool:
+        """Send (or, when not allowed, only log) an already-sanitized message.
+
+        With the dispatcher running this just enqueues and returns.
+        """
+        if self.dispatcher_running:
+            return self._dispatcher.submit(message, category=category, deliver=allowed)
+        if not allowed:
+            # Log for dashboard with sent=False so UI can show blocked status
+            self._append_message_log(message, sent=False)
+            return True
+        result = self.send_message(message, _skip_log=True)
+        # Log for dashboard with actual sent status
+        self._append_message_log(message, sent=result)
+        return result
+
     def test_connection(self):
         """Test Telegram bot connection"""
         try:
@@ -253,14 +327,9 @@ class TelegramNotifier:
             prefs_allow,
             self._prefs,
         )
-        if not prefs_allow:
-            # Log for dashboard with sent=False so UI can show blocked status
-            self._append_message_log(safe_message, sent=False)
-            return True
-        result = self.send_message(message, _skip_log=True)
-        # Log for dashboard with actual sent status
-        self._append_message_log(safe_message, sent=result)
-        return result
+        return self.deliver(
+            safe_message, category=self._category_for(method_name), allowed=prefs_allow
+        )
 
     @staticmethod
     def _format_price(order_type: str, price: Any) -> str:
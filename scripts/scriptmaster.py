@@ -25,18 +25,31 @@ SAFE TO FREEZE & USE IN PRODUCTION
 from __future__ import annotations
 
 import io
+import os
+import shutil
+import time
 import zipfile
 import json
 import threading
+import uuid
+from contextlib import contextmanager
 from shoonya_platform.logging.logger_config import get_component_logger
 import requests
 import re
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import pandas as pd
 
+from scripts.scriptmaster_table import FIELDS, TABLE_FORMAT, ExchangeTable, UniversalView
+
+try:  # inter-process lock for cache publishing
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 logger = get_component_logger('execution_service')
 
 # =============================================================================
@@ -63,6 +76,9 @@ DATA_DIR = Path(__file__).resolve().parent / "scriptmaster_store"
 RAW_DIR = DATA_DIR / "raw"
 PROC_DIR = DATA_DIR / "processed"
 META_FILE = DATA_DIR / "metadata.json"
+# Binary instrument cache: CACHE_DIR/CURRENT names the live generation dir,
+# which holds one mappable table per exchange + manifest.json
+CACHE_DIR = DATA_DIR / "cache"
 
 for d in (RAW_DIR, PROC_DIR):
     d.mkdir(parents=True, exist_ok=True)
@@ -87,8 +103,10 @@ OPTION_INSTRUMENTS = {
 # IN-MEMORY STORES
 # =============================================================================
 
-SCRIPTMASTER: Dict[str, Dict[str, Dict[str, Any]]] = {}
-SCRIPTMASTER_UNIVERSAL: Dict[str, Dict[str, Any]] = {}
+# Columnar per-exchange tables (Mapping[token, record], see scriptmaster_table)
+SCRIPTMASTER: Dict[str, ExchangeTable] = {}
+# "EXCH|token" read view over SCRIPTMASTER (no copied records)
+SCRIPTMASTER_UNIVERSAL = UniversalView(SCRIPTMASTER)
 EXPIRY_CALENDAR: Dict[str, Dict[str, Dict[str, list[str]]]] = {}
 _LAST_REFRESH_DATE: Optional[str] = None
 _SCRIPTMASTER_LOCK = threading.RLock()
@@ -155,7 +173,7 @@ def _extract_underlying(tradingsymbol: str, symbol: Optional[str] = None) -> Opt
     return ts or None
 
 
-def _normalize(df: pd.DataFrame, exchange: str) -> Dict[str, Dict[str, Any]]:
+def _normalize(df: pd.DataFrame, exchange: str) -> pd.DataFrame:
     colmap = {
         "Token": ["Token", "token"],
         "TradingSymbol": ["TradingSymbol", "tsym"],
@@ -192,56 +210,34 @@ def _normalize(df: pd.DataFrame, exchange: str) -> Dict[str, Dict[str, Any]]:
     norm["TickSize"] = pd.to_numeric(norm["TickSize"], errors="coerce")
     norm["PricePrecision"] = pd.to_numeric(norm["PricePrecision"], errors="coerce").astype("Int64")
 
-    records: Dict[str, Dict[str, Any]] = {}
-
-    for r in norm.itertuples(index=False):
-        records[r.Token] = {
-            "Exchange": exchange,
-            "Token": r.Token,
-            "TradingSymbol": r.TradingSymbol,
-            "Symbol": r.Symbol,
-            "Underlying": r.Underlying,
-            "LotSize": int(r.LotSize) if pd.notna(r.LotSize) else None,
-            "Expiry": r.Expiry,
-            "Instrument": r.Instrument,
-            "OptionType": r.OptionType,
-            "StrikePrice": float(r.StrikePrice) if pd.notna(r.StrikePrice) else None,
-            "TickSize": float(r.TickSize) if pd.notna(r.TickSize) else None,
-            "PricePrecision": int(r.PricePrecision) if pd.notna(r.PricePrecision) else None,
-        }
-
-    return records
-
-
-def _build_universal() -> None:
-    SCRIPTMASTER_UNIVERSAL.clear()
-    for exch, data in SCRIPTMASTER.items():
-        for tok, rec in data.items():
-            SCRIPTMASTER_UNIVERSAL[f"{exch}|{tok}"] = rec.copy()
+    norm["Exchange"] = exchange
+    # duplicate token: last row wins (as the old token-keyed dict did)
+    norm = norm.drop_duplicates("Token", keep="last")
+    norm = norm[list(FIELDS)]
+    norm.index = norm["Token"].to_numpy()
+    return norm
 
 
 def _build_expiry_calendar() -> None:
     new_calendar: Dict[str, Dict[str, Dict[str, list[str]]]] = {}
 
-    for exchange, data in SCRIPTMASTER.items():
-        for rec in data.values():
-            expiry = rec["Expiry"]
-            if not expiry:
-                continue
-
-            inst = rec["Instrument"]
-            symbol = rec["Symbol"]
-            underlying = rec.get("Underlying")
-
-            key = underlying or symbol
-
-            if inst in FUTURE_INSTRUMENTS.get(exchange, set()):
-                bucket = "FUTURE"
-            elif inst in OPTION_INSTRUMENTS.get(exchange, set()):
-                bucket = "OPTION"
-            else:
-                continue
+    for exchange, table in SCRIPTMASTER.items():
+        df = table.frame(["Symbol", "Underlying", "Instrument", "Expiry"])
+        df = df[df["Expiry"].notna()]
+        if df.empty:
+            continue
+
+        fut = FUTURE_INSTRUMENTS.get(exchange, set())
+        opt = OPTION_INSTRUMENTS.get(exchange, set())
+        inst = df["Instrument"].astype(object)
+        df = df.assign(
+            Key=df["Underlying"].astype(object).where(df["Underlying"].notna(), df["Symbol"].astype(object)),
+            Bucket=inst.map(lambda i: "FUTURE" if i in fut else ("OPTION" if i in opt else None)),
+            Expiry=df["Expiry"].astype(object),
+        )
+        df = df[df["Bucket"].notna()].drop_duplicates(["Key", "Bucket", "Expiry"])
 
+        for key, bucket, expiry in zip(df["Key"], df["Bucket"], df["Expiry"]):
             new_calendar \
                 .setdefault(exchange, {}) \
                 .setdefault(key, {"FUTURE": [], "OPTION": []}) \
@@ -258,6 +254,135 @@ def _build_expiry_calendar() -> None:
     EXPIRY_CALENDAR.clear()
     EXPIRY_CALENDAR.update(new_calendar)
 
+# =============================================================================
+# BINARY INSTRUMENT CACHE (mmap, shared across processes)
+# =============================================================================
+
+def _source_signature() -> Dict[str, list]:
+    """(size, mtime_ns) per exchange parquet — the cache is valid only for these."""
+    sig = {}
+    for p in sorted(PROC_DIR.glob("*.parquet")):
+        if p.name == "universal.parquet":
+            continue
+        st = p.stat()
+        sig[p.stem] = [st.st_size, st.st_mtime_ns]
+    return sig
+
+
+def _calendar_rules() -> Dict[str, Any]:
+    return {
+        "future": {k: sorted(v) for k, v in FUTURE_INSTRUMENTS.items()},
+        "option": {k: sorted(v) for k, v in OPTION_INSTRUMENTS.items()},
+    }
+
+
+def _open_instrument_cache() -> Optional[Tuple[Dict[str, ExchangeTable], Dict[str, Any]]]:
+    """Map the current cache generation, or None if missing / stale."""
+    try:
+        gen_dir = CACHE_DIR / (CACHE_DIR / "CURRENT").read_text().strip()
+        manifest = json.loads((gen_dir / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+    if (
+        manifest.get("format") != TABLE_FORMAT
+        or manifest.get("version") != SCRIPTMASTER_VERSION
+        or manifest.get("rules") != _calendar_rules()
+        or manifest.get("sources") != _source_signature()
+    ):
+        return None
+
+    tables = {
+        exch: ExchangeTable.open(gen_dir / f"{exch}.smt")
+        for exch in manifest["sources"]
+    }
+    return tables, manifest["calendar"]
+
+
+@contextmanager
+def _cache_publish_lock():
+    """
+    Exclusive lock across processes (main, gateway, master manager may all
+    cold-start together after a parquet refresh) for publishing generations.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_DIR / ".publish.lock", "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _publish_instrument_cache(sources: Dict[str, list]) -> None:
+    """
+    Write SCRIPTMASTER + EXPIRY_CALENDAR as a new cache generation, point
+    CURRENT at it, then swap this process onto the mapped tables too.
+
+    Runs under the publish lock. If another process published a generation
+    for the same sources while we were parsing, that one is mapped instead.
+    Only generations older than the one CURRENT now names are pruned.
+    """
+    with _cache_publish_lock():
+        cached = _open_instrument_cache() if sources == _source_signature() else None
+        if cached is not None:
+            tables, calendar = cached
+            with _SCRIPTMASTER_LOCK:
+                SCRIPTMASTER.clear()
+                SCRIPTMASTER.update(tables)
+                EXPIRY_CALENDAR.clear()
+                EXPIRY_CALENDAR.update(calendar)
+            logger.info("ScriptMaster cache already published by another process; mapped it")
+            return
+
+        with _SCRIPTMASTER_LOCK:
+            tables = dict(SCRIPTMASTER)
+            calendar = json.loads(json.dumps(EXPIRY_CALENDAR))
+
+        # Timestamp prefix down to the nanosecond: generation names sort
+        # oldest → newest even for publishes within the same second
+        now_ns = time.time_ns()
+        gen = (
+            f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now_ns // 10**9))}"
+            f"-{now_ns % 10**9:09d}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        gen_dir = CACHE_DIR / gen
+        gen_dir.mkdir(parents=True, exist_ok=True)
+        for exch, table in tables.items():
+            table.save(gen_dir / f"{exch}.smt")
+        (gen_dir / "manifest.json").write_text(json.dumps({
+            "format": TABLE_FORMAT,
+            "version": SCRIPTMASTER_VERSION,
+            "rules": _calendar_rules(),
+            "sources": sources,
+            "calendar": calendar,
+        }))
+
+        current_tmp = CACHE_DIR / f"CURRENT.tmp{os.getpid()}"
+        current_tmp.write_text(gen)
+        os.replace(current_tmp, CACHE_DIR / "CURRENT")
+
+        mapped = {exch: ExchangeTable.open(gen_dir / f"{exch}.smt") for exch in tables}
+        with _SCRIPTMASTER_LOCK:
+            SCRIPTMASTER.clear()
+            SCRIPTMASTER.update(mapped)
+
+        # Older generations: other processes may still map them. POSIX keeps
+        # unlinked mapped files alive; on Windows removal fails and is
+        # retried on the next publish.
+        for old in CACHE_DIR.iterdir():
+            if old.is_dir() and old.name < gen:
+                shutil.rmtree(old, ignore_errors=True)
+
+
 # =============================================================================
 # PUBLIC API
 # =============================================================================
@@ -274,19 +399,16 @@ def refresh_scriptmaster(force: bool = False) -> None:
     # Only atomically swap into SCRIPTMASTER if ALL exchanges succeed.
     # Previously, SCRIPTMASTER.clear() was called before any downloads, leaving
     # the system in a partially cleared state on mid-loop failures.
-    _temp_scriptmaster: Dict[str, Dict[str, Any]] = {}
+    _temp_scriptmaster: Dict[str, ExchangeTable] = {}
 
     for exch, url in SCRIPTMASTER_URLS.items():
         zip_path = _download_zip(exch, url)
 
         try:
             df = _extract_txt(zip_path)
-            _temp_scriptmaster[exch] = _normalize(df, exch)
-
-            pd.DataFrame.from_dict(
-                _temp_scriptmaster[exch],
-                orient="index"
-            ).to_parquet(PROC_DIR / f"{exch}.parquet")
+            norm = _normalize(df, exch)
+            norm.to_parquet(PROC_DIR / f"{exch}.parquet")
+            _temp_scriptmaster[exch] = ExchangeTable(norm, exchange=exch)
 
         except Exception as e:
             logger.error(f"âŒ Failed to process {exch} scripmaster: {e}")
@@ -309,16 +431,13 @@ def refresh_scriptmaster(force: bool = False) -> None:
     with _SCRIPTMASTER_LOCK:
         SCRIPTMASTER.clear()
         SCRIPTMASTER.update(_temp_scriptmaster)
-        SCRIPTMASTER_UNIVERSAL.clear()
         EXPIRY_CALENDAR.clear()
 
-        _build_universal()
         _build_expiry_calendar()
 
-        pd.DataFrame.from_dict(
-            SCRIPTMASTER_UNIVERSAL,
-            orient="index"
-        ).to_parquet(PROC_DIR / "universal.parquet")
+        # universal.parquet is no longer written: SCRIPTMASTER_UNIVERSAL is
+        # a view over the per-exchange tables
+        (PROC_DIR / "universal.parquet").unlink(missing_ok=True)
 
         (
             pd.DataFrame
@@ -332,41 +451,55 @@ def refresh_scriptmaster(force: bool = False) -> None:
         }, indent=2))
 
         _LAST_REFRESH_DATE = _today_ist()
+
+    try:
+        _publish_instrument_cache(_source_signature())
+    except Exception as e:
+        logger.warning(f"ScriptMaster binary cache not written: {e}")
     logger.info("ðŸŽ¯ ScriptMaster refreshed & cached")
 
 
 def _load_from_disk() -> None:
+    # Warm start: map the binary cache (no parquet parse, no index build)
+    try:
+        cached = _open_instrument_cache()
+    except Exception as e:
+        logger.warning(f"ScriptMaster binary cache unreadable, rebuilding: {e}")
+        cached = None
+    if cached is not None:
+        tables, calendar = cached
+        with _SCRIPTMASTER_LOCK:
+            SCRIPTMASTER.clear()
+            SCRIPTMASTER.update(tables)
+            EXPIRY_CALENDAR.clear()
+            EXPIRY_CALENDAR.update(calendar)
+        logger.info("ScriptMaster mapped from binary cache")
+        return
+
+    # Cold start: parse parquet, then publish the cache for the next process
+    sources = _source_signature()
+    tables: Dict[str, ExchangeTable] = {}
+    for p in PROC_DIR.glob("*.parquet"):
+        if p.name == "universal.parquet":
+            continue
+        exch = p.stem
+        # Straight into columns (no per-row dicts)
+        tables[exch] = ExchangeTable(pd.read_parquet(p), exchange=exch)
+
     with _SCRIPTMASTER_LOCK:
         SCRIPTMASTER.clear()
-        SCRIPTMASTER_UNIVERSAL.clear()
+        SCRIPTMASTER.update(tables)
         EXPIRY_CALENDAR.clear()
 
-        for p in PROC_DIR.glob("*.parquet"):
-            if p.name == "universal.parquet":
-                continue
-            exch = p.stem
-            df = pd.read_parquet(p)
-            # Ensure index is string (tokens are strings)
-            df.index = df.index.astype(str)
-            # Convert to dict with explicit string keys for both index and columns
-            data: Dict[str, Dict[str, Any]] = {
-                str(idx): {str(col): val for col, val in row.items()}
-                for idx, row in df.iterrows()
-            }
-            SCRIPTMASTER[exch] = data
-
-        if (PROC_DIR / "universal.parquet").exists():
-            df = pd.read_parquet(PROC_DIR / "universal.parquet")
-            df.index = df.index.astype(str)
-            universal_data: Dict[str, Dict[str, Any]] = {
-                str(idx): {str(col): val for col, val in row.items()}
-                for idx, row in df.iterrows()
-            }
-            SCRIPTMASTER_UNIVERSAL.update(universal_data)
-
-    # âœ… ALWAYS rebuild calendar from current rules
+        # âœ… ALWAYS rebuild calendar from current rules
         _build_expiry_calendar()
 
+    if tables:
+        try:
+            _publish_instrument_cache(sources)
+        except Exception as e:
+            logger.warning(f"ScriptMaster binary cache not written: {e}")
+
 # =============================================================================
 # QUERY HELPERS 
 # =============================================================================
@@ -374,17 +507,13 @@ def universal_symbol_search(symbol: str, exchange: str):
     symbol = symbol.upper()
     exchange = exchange.upper()
     with _SCRIPTMASTER_LOCK:
-        rows = [
-            r for r in SCRIPTMASTER.get(exchange, {}).values()
-            if r["Symbol"] == symbol
-        ]
-        if rows:
-            return rows
-        rows = [
-            r for r in SCRIPTMASTER.get(exchange, {}).values()
-            if r.get("Underlying") == symbol
-        ]
+        table = SCRIPTMASTER.get(exchange)
+    if table is None:
+        return []
+    rows = table.rows(table.select(symbol=symbol))
+    if rows:
         return rows
+    return table.rows(table.select(underlying=symbol))
 def get_expiry_calendar(exchange: str, symbol: str, kind: str) -> list[str]:
     exch = exchange.upper()
     sym = symbol.upper()
@@ -417,14 +546,8 @@ def get_future(symbol: str, exchange: str, result: Optional[int] = None):
     symbol, exchange = symbol.upper(), exchange.upper()
     insts = FUTURE_INSTRUMENTS.get(exchange, set())
     with _SCRIPTMASTER_LOCK:
-        rows = [
-            r for r in SCRIPTMASTER.get(exchange, {}).values()
-            if (
-                (r["Symbol"] == symbol or r.get("Underlying") == symbol)
-                and r["Instrument"] in insts
-                and r["Expiry"]
-            )
-        ]
+        table = SCRIPTMASTER.get(exchange)
+    rows = table.rows(table.select(name=symbol, instruments=insts, has_expiry=True)) if table else []
     if not rows:
         return {} if result is not None else pd.DataFrame()
     df = pd.DataFrame(rows)
@@ -434,12 +557,11 @@ def get_future(symbol: str, exchange: str, result: Optional[int] = None):
 def get_stock_detail(symbol: str, exchange: str, instrument_type: str):
     symbol = symbol.upper()
     with _SCRIPTMASTER_LOCK:
-        for r in SCRIPTMASTER.get(exchange, {}).values():
-            if (
-                (r["Symbol"] == symbol or r.get("Underlying") == symbol)
-                and r["Instrument"] == instrument_type
-            ):
-                return r
+        table = SCRIPTMASTER.get(exchange)
+    if table is not None:
+        positions = table.select(name=symbol, instruments=[instrument_type])
+        if len(positions):
+            return table.row(int(positions[0]))
     return {}
 def get_tokens(
     *,
@@ -458,31 +580,27 @@ def get_tokens(
     Returns:
         List[str] -> matching Token(s)
     """
+    try:
+        strike = float(strike_price) if strike_price is not None else None
+    except (TypeError, ValueError):
+        return []
+
     results = []
     with _SCRIPTMASTER_LOCK:
-        for key, rec in SCRIPTMASTER_UNIVERSAL.items():
-            exch, token = key.split("|", 1)
-            if exchange and rec.get("Exchange") != exchange.upper():
-                continue
-            if tradingsymbol and rec.get("TradingSymbol") != tradingsymbol.upper():
-                continue
-            if symbol and rec.get("Symbol") != symbol.upper():
-                continue
-            if underlying and rec.get("Underlying") != underlying.upper():
-                continue
-            if instrument and rec.get("Instrument") != instrument.upper():
-                continue
-            if expiry and rec.get("Expiry") != expiry:
-                continue
-            if option_type and rec.get("OptionType") != option_type.upper():
-                continue
-            if strike_price is not None:
-                try:
-                    if float(rec.get("StrikePrice") or 0) != float(strike_price):
-                        continue
-                except Exception:
-                    continue
-            results.append(token)
+        tables = list(SCRIPTMASTER.items())
+    for exch, table in tables:
+        if exchange and exch != exchange.upper():
+            continue
+        positions = table.select(
+            tradingsymbol=tradingsymbol.upper() if tradingsymbol else None,
+            symbol=symbol.upper() if symbol else None,
+            underlying=underlying.upper() if underlying else None,
+            instruments=[instrument.upper()] if instrument else None,
+            expiry=expiry or None,
+            option_type=option_type.upper() if option_type else None,
+            strike=strike,
+        )
+        results.extend(table.token_at(int(p)) for p in positions)
     return results
 def requires_limit_order(
     *,
@@ -506,14 +624,12 @@ def requires_limit_order(
     exchange = exchange.upper()
     rec = None
     with _SCRIPTMASTER_LOCK:
+        table = SCRIPTMASTER.get(exchange)
+    if table is not None:
         if token:
-            rec = SCRIPTMASTER_UNIVERSAL.get(f"{exchange}|{token}")
+            rec = table.get(token)
         if rec is None and tradingsymbol:
-            ts = tradingsymbol.upper()
-            for r in SCRIPTMASTER.get(exchange, {}).values():
-                if r.get("TradingSymbol") == ts:
-                    rec = r
-                    break
+            rec = table.get_by_tradingsymbol(tradingsymbol.upper())
     if not rec:
         return False
     instrument = rec.get("Instrument")
@@ -0,0 +1,518 @@
+"""
+Columnar ScriptMaster table (one per exchange)
+==============================================
+
+Replaces the per-row dict store of ScriptMaster v2. Each exchange is held
+as flat arrays only:
+
+- Token / TradingSymbol : packed UTF-8 blob + int64 offsets
+- Exchange, Symbol, Underlying, Expiry, Instrument, OptionType
+                        : categorical codes (int32) + category list
+- LotSize, StrikePrice, TickSize, PricePrecision
+                        : float64 arrays (NaN = missing)
+
+Prebuilt indexes, also arrays:
+
+- Token, TradingSymbol  : open-addressing hash tables (crc32, linear probe)
+- Symbol, Underlying    : row order grouped by code + group starts
+- (Underlying, Expiry, OptionType, StrikePrice)
+                        : sorted combined key + strike, searched by bisection
+
+Because nothing is a Python object per row, a table can be saved to one
+binary file and mapped back read-only (save() / open()): no parsing on
+startup, and processes mapping the same file share its pages.
+
+The table is a read-only Mapping[token, record], so existing callers that
+do ``SCRIPTMASTER[exch].get(token)`` / ``.values()`` keep working; records
+are materialised on access. Hot paths should use select() / by_*().
+"""
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FIELDS = (
+    "Exchange",
+    "Token",
+    "TradingSymbol",
+    "Symbol",
+    "Underlying",
+    "LotSize",
+    "Expiry",
+    "Instrument",
+    "OptionType",
+    "StrikePrice",
+    "TickSize",
+    "PricePrecision",
+)
+CATEGORICAL_FIELDS = ("Exchange", "Symbol", "Underlying", "Expiry", "Instrument", "OptionType")
+INT_FIELDS = ("LotSize", "PricePrecision")
+FLOAT_FIELDS = ("StrikePrice", "TickSize")
+STRING_FIELDS = ("Token", "TradingSymbol")
+GROUP_FIELDS = ("Symbol", "Underlying")
+
+# Binary table file: magic, u64 header length, JSON header, 64-byte aligned arrays
+TABLE_MAGIC = b"SMTABLE1"
+TABLE_FORMAT = 1
+_ALIGN = 64
+_CHUNK = 4096
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+# =============================================================================
+# Array building blocks
+# =============================================================================
+
+class _Strings:
+    """Packed UTF-8 strings: ``blob[offsets[i]:offsets[i+1]]``."""
+
+    __slots__ = ("blob", "offsets", "_mv")
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+        self._mv = memoryview(blob)
+
+    @classmethod
+    def pack(cls, values: Sequence[str]) -> "_Strings":
+        encoded = [v.encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, i: int) -> memoryview:
+        return self._mv[int(self.offsets[i]):int(self.offsets[i + 1])]
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.raw(i)).decode("utf-8")
+
+    def chunk(self, start: int, stop: int) -> List[str]:
+        """Decode rows [start, stop) with one slice of the blob."""
+        offs = self.offsets[start:stop + 1]
+        base = int(offs[0])
+        data = bytes(self._mv[base:int(offs[-1])])
+        rel = (offs - base).tolist()
+        return [data[rel[k]:rel[k + 1]].decode("utf-8") for k in range(len(rel) - 1)]
+
+
+def _hash(key: bytes) -> int:
+    # Stable across processes (unlike hash()), so the table can be persisted
+    return zlib.crc32(key)
+
+
+def _build_hash(strings: _Strings) -> np.ndarray:
+    """Open-addressing slots (row position or -1), load factor <= 0.5."""
+    n = len(strings)
+    size = 1 << max(4, (2 * n - 1).bit_length())
+    mask = size - 1
+    slots = [-1] * size
+    for pos, value in enumerate(strings.chunk(0, n)):
+        h = _hash(value.encode("utf-8")) & mask
+        while slots[h] >= 0:
+            h = (h + 1) & mask
+        slots[h] = pos
+    return np.asarray(slots, dtype=np.int32)
+
+
+def _probe(slots: np.ndarray, strings: _Strings, key: str) -> List[int]:
+    """All row positions whose string equals ``key`` (ascending)."""
+    kb = key.encode("utf-8")
+    mask = len(slots) - 1
+    h = _hash(kb) & mask
+    hits = []
+    while True:
+        pos = int(slots[h])
+        if pos < 0:
+            break
+        if strings.raw(pos) == kb:
+            hits.append(pos)
+        h = (h + 1) & mask
+    hits.sort()
+    return hits
+
+
+def _group(codes: np.ndarray, ncats: int):
+    """Row positions ordered by code, plus start offsets per code."""
+    order = np.argsort(codes, kind="stable").astype(np.int32)
+    starts = np.searchsorted(codes[order], np.arange(ncats + 1)).astype(np.int64)
+    return order, starts
+
+
+# =============================================================================
+# Table
+# =============================================================================
+
+class ExchangeTable(Mapping):
+    """Immutable columnar instrument table for one exchange."""
+
+    def __init__(self, frame: pd.DataFrame, exchange: Optional[str] = None):
+        # duplicate token: last row wins (matches the old token-keyed dict)
+        if "Token" in frame.columns:
+            frame = frame.loc[~frame["Token"].astype(str).duplicated(keep="last").to_numpy()]
+        n = len(frame)
+
+        def col(name: str) -> pd.Series:
+            if name in frame.columns:
+                return frame[name]
+            return pd.Series([None] * n, index=frame.index, dtype=object)
+
+        arrays: Dict[str, np.ndarray] = {}
+        cats: Dict[str, List[str]] = {}
+
+        for name in STRING_FIELDS:
+            s = _Strings.pack([str(v) for v in col(name)])
+            arrays[f"{name}.blob"], arrays[f"{name}.offsets"] = s.blob, s.offsets
+
+        for name in CATEGORICAL_FIELDS:
+            values = col(name)
+            if name == "Exchange" and exchange is not None:
+                values = pd.Series([exchange] * n, dtype=object)
+            # None / NaN → code -1
+            cat = pd.Categorical(values.astype(object).where(values.notna(), None))
+            cats[name] = [str(c) for c in cat.categories]
+            arrays[f"{name}.codes"] = np.asarray(cat.codes, dtype=np.int32)
+
+        for name in INT_FIELDS + FLOAT_FIELDS:
+            arrays[name] = pd.to_numeric(col(name), errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+
+        self._attach(arrays, cats)
+        arrays.update(self._build_indexes())
+        self._attach(arrays, cats)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _attach(self, arrays: Dict[str, np.ndarray], cats: Dict[str, List[str]],
+                mapped: bool = False) -> None:
+        self._arrays = arrays
+        self._cats_raw = cats
+        self._mapped = mapped
+        self._strings = {
+            name: _Strings(arrays[f"{name}.blob"], arrays[f"{name}.offsets"])
+            for name in STRING_FIELDS
+        }
+        self._codes = {name: arrays[f"{name}.codes"] for name in CATEGORICAL_FIELDS}
+        # code -1 (missing) → index -1 → trailing None
+        self._cats: Dict[str, List[Optional[str]]] = {name: c + [None] for name, c in cats.items()}
+        self._cat_lookup = {name: {c: i for i, c in enumerate(v)} for name, v in cats.items()}
+        self._num = {name: arrays[name] for name in INT_FIELDS + FLOAT_FIELDS}
+        self._n = len(self._strings["Token"])
+
+    def _build_indexes(self) -> Dict[str, np.ndarray]:
+        out: Dict[str, np.ndarray] = {}
+        for name in STRING_FIELDS:
+            out[f"{name}.hash"] = _build_hash(self._strings[name])
+
+        for name in GROUP_FIELDS:
+            out[f"{name}.order"], out[f"{name}.starts"] = _group(
+                self._codes[name], len(self._cats_raw[name])
+            )
+
+        und, exp, opt = (self._codes[f] for f in ("Underlying", "Expiry", "OptionType"))
+        strikes = self._num["StrikePrice"]
+        valid = np.flatnonzero((und >= 0) & (exp >= 0) & (opt >= 0) & ~np.isnan(strikes))
+        combined = self._contract_key(und[valid], exp[valid], opt[valid])
+        order = np.lexsort((strikes[valid], combined))
+        out["contract.pos"] = valid[order].astype(np.int32)
+        out["contract.key"] = combined[order]
+        out["contract.strike"] = strikes[valid][order]
+        return out
+
+    def _contract_key(self, und, exp, opt) -> np.ndarray:
+        n_exp = len(self._cats_raw["Expiry"]) + 1
+        n_opt = len(self._cats_raw["OptionType"]) + 1
+        return (np.asarray(und, dtype=np.int64) * n_exp + exp) * n_opt + opt
+
+    def save(self, path: Path) -> None:
+        """Write the table as one mappable file (atomic replace)."""
+        path = Path(path)
+        layout, offset = {}, 0
+        for name, arr in self._arrays.items():
+            layout[name] = [arr.dtype.str, offset, len(arr)]
+            offset += _aligned(arr.nbytes)
+        header = json.dumps({
+            "format": TABLE_FORMAT,
+            "rows": self._n,
+            "categories": self._cats_raw,
+            "arrays": layout,
+        }).encode("utf-8")
+        data_start = _aligned(len(TABLE_MAGIC) + 8 + len(header))
+
+        tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        with open(tmp, "wb") as f:
+            f.write(TABLE_MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for name, arr in self._arrays.items():
+                f.seek(data_start + layout[name][1])
+                f.write(np.ascontiguousarray(arr).tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path: Path) -> "ExchangeTable":
+        """Map a saved table read-only; every array is a view into one mmap."""
+        with open(path, "rb") as f:
+            if f.read(len(TABLE_MAGIC)) != TABLE_MAGIC:
+                raise ValueError(f"not a ScriptMaster table: {path}")
+            header_len = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_len))
+        if header.get("format") != TABLE_FORMAT:
+            raise ValueError(f"unsupported ScriptMaster table format: {path}")
+        data_start = _aligned(len(TABLE_MAGIC) + 8 + header_len)
+
+        mm = np.memmap(path, dtype=np.uint8, mode="r")
+        arrays = {}
+        for name, (dtype, offset, length) in header["arrays"].items():
+            dt = np.dtype(dtype)
+            start = data_start + offset
+            arrays[name] = mm[start:start + length * dt.itemsize].view(dt)
+
+        table = cls.__new__(cls)
+        table._attach(arrays, header["categories"], mapped=True)
+        return table
+
+    @property
+    def is_mapped(self) -> bool:
+        return self._mapped
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+    def row(self, pos: int) -> Dict[str, Any]:
+        codes, cats, num = self._codes, self._cats, self._num
+        lot = num["LotSize"][pos]
+        strike = num["StrikePrice"][pos]
+        tick = num["TickSize"][pos]
+        pp = num["PricePrecision"][pos]
+        return {
+            "Exchange": cats["Exchange"][codes["Exchange"][pos]],
+            "Token": self._strings["Token"][pos],
+            "TradingSymbol": self._strings["TradingSymbol"][pos],
+            "Symbol": cats["Symbol"][codes["Symbol"][pos]],
+            "Underlying": cats["Underlying"][codes["Underlying"][pos]],
+            "LotSize": None if lot != lot else int(lot),
+            "Expiry": cats["Expiry"][codes["Expiry"][pos]],
+            "Instrument": cats["Instrument"][codes["Instrument"][pos]],
+            "OptionType": cats["OptionType"][codes["OptionType"][pos]],
+            "StrikePrice": None if strike != strike else float(strike),
+            "TickSize": None if tick != tick else float(tick),
+            "PricePrecision": None if pp != pp else int(pp),
+        }
+
+    def rows(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.row(int(p)) for p in positions]
+
+    # Mapping[token, record] -------------------------------------------
+    def _token_pos(self, token) -> Optional[int]:
+        hits = _probe(self._arrays["Token.hash"], self._strings["Token"], str(token))
+        return hits[-1] if hits else None
+
+    def __getitem__(self, token: str) -> Dict[str, Any]:
+        pos = self._token_pos(token)
+        if pos is None:
+            raise KeyError(token)
+        return self.row(pos)
+
+    def get(self, token, default=None):
+        pos = self._token_pos(token)
+        return default if pos is None else self.row(pos)
+
+    def __contains__(self, token) -> bool:
+        return self._token_pos(token) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        strings = self._strings["Token"]
+        for start in range(0, self._n, _CHUNK):
+            yield from strings.chunk(start, min(start + _CHUNK, self._n))
+
+    def __len__(self) -> int:
+        return self._n
+
+    # ------------------------------------------------------------------
+    # Indexed lookups
+    # ------------------------------------------------------------------
+    def token_at(self, pos: int) -> str:
+        return self._strings["Token"][pos]
+
+    def _tsym_positions(self, tradingsymbol: str) -> List[int]:
+        return _probe(self._arrays["TradingSymbol.hash"], self._strings["TradingSymbol"], tradingsymbol)
+
+    def by_tradingsymbol(self, tradingsymbol: str) -> List[Dict[str, Any]]:
+        return self.rows(self._tsym_positions(tradingsymbol))
+
+    def get_by_tradingsymbol(self, tradingsymbol: str) -> Optional[Dict[str, Any]]:
+        positions = self._tsym_positions(tradingsymbol)
+        return self.row(positions[0]) if positions else None
+
+    def by_contract(self, underlying: str, expiry: str, option_type: str,
+                    strike: float) -> List[Dict[str, Any]]:
+        u = self._cat_lookup["Underlying"].get(underlying)
+        e = self._cat_lookup["Expiry"].get(expiry)
+        o = self._cat_lookup["OptionType"].get(option_type)
+        if u is None or e is None or o is None:
+            return []
+        key = int(self._contract_key(u, e, o))
+        keys = self._arrays["contract.key"]
+        lo, hi = np.searchsorted(keys, key, "left"), np.searchsorted(keys, key, "right")
+        strikes = self._arrays["contract.strike"][lo:hi]
+        s_lo = lo + np.searchsorted(strikes, float(strike), "left")
+        s_hi = lo + np.searchsorted(strikes, float(strike), "right")
+        return self.rows(np.sort(self._arrays["contract.pos"][s_lo:s_hi]))
+
+    def _name_positions(self, field: str, value: str) -> np.ndarray:
+        code = self._cat_lookup[field].get(value)
+        if code is None:
+            return np.empty(0, dtype=np.int32)
+        starts = self._arrays[f"{field}.starts"]
+        return self._arrays[f"{field}.order"][starts[code]:starts[code + 1]]
+
+    def select(
+        self,
+        *,
+        tradingsymbol: Optional[str] = None,
+        symbol: Optional[str] = None,
+        underlying: Optional[str] = None,
+        name: Optional[str] = None,
+        instruments: Optional[Iterable[str]] = None,
+        expiry: Optional[str] = None,
+        option_type: Optional[str] = None,
+        strike: Optional[float] = None,
+        has_expiry: bool = False,
+    ) -> np.ndarray:
+        """
+        Row positions (ascending, i.e. load order) matching every given
+        filter. ``name`` matches Symbol OR Underlying. Candidates come from
+        the most selective index; remaining filters run on the code columns.
+        """
+        if tradingsymbol is not None:
+            cand = np.asarray(self._tsym_positions(tradingsymbol), dtype=np.intp)
+        elif name is not None:
+            cand = np.union1d(self._name_positions("Symbol", name),
+                              self._name_positions("Underlying", name))
+        elif symbol is not None:
+            cand = self._name_positions("Symbol", symbol)
+        elif underlying is not None:
+            cand = self._name_positions("Underlying", underlying)
+        else:
+            cand = np.arange(self._n, dtype=np.intp)
+
+        def keep(field: str, value: str) -> None:
+            nonlocal cand
+            code = self._cat_lookup[field].get(value)
+            if code is None:
+                cand = cand[:0]
+            else:
+                cand = cand[self._codes[field][cand] == code]
+
+        if symbol is not None and (tradingsymbol is not None or name is not None):
+            keep("Symbol", symbol)
+        if underlying is not None and (tradingsymbol is not None or name is not None or symbol is not None):
+            keep("Underlying", underlying)
+        if expiry is not None:
+            keep("Expiry", expiry)
+        if option_type is not None:
+            keep("OptionType", option_type)
+        if instruments is not None:
+            codes = [self._cat_lookup["Instrument"].get(i) for i in instruments]
+            codes = [c for c in codes if c is not None]
+            cand = cand[np.isin(self._codes["Instrument"][cand], codes)]
+        if has_expiry:
+            cand = cand[self._codes["Expiry"][cand] >= 0]
+        if strike is not None:
+            strikes = np.nan_to_num(self._num["StrikePrice"][cand], nan=0.0)
+            cand = cand[strikes == float(strike)]
+        return np.sort(cand)
+
+    # ------------------------------------------------------------------
+    # Column access (vectorised consumers)
+    # ------------------------------------------------------------------
+    def frame(self, fields: Sequence[str]) -> pd.DataFrame:
+        """DataFrame of the requested columns (categoricals stay categorical)."""
+        out = {}
+        for name in fields:
+            if name in self._codes:
+                out[name] = pd.Categorical.from_codes(self._codes[name], self._cats_raw[name])
+            elif name in self._num:
+                out[name] = self._num[name]
+            elif name in self._strings:
+                out[name] = self._strings[name].chunk(0, self._n)
+        return pd.DataFrame(out)
+
+    def search_text(self, query: str, instruments: Optional[Iterable[str]] = None,
+                    limit: int = 20) -> List[Dict[str, Any]]:
+        """Rows whose TradingSymbol or Symbol contains ``query`` (load order)."""
+        sym_codes = self._codes["Symbol"]
+        sym_hit = {i for i, c in enumerate(self._cats_raw["Symbol"]) if query in c}
+        inst_ok = None
+        if instruments is not None:
+            inst_ok = {self._cat_lookup["Instrument"][i] for i in instruments
+                       if i in self._cat_lookup["Instrument"]}
+        inst_codes = self._codes["Instrument"]
+        tsyms = self._strings["TradingSymbol"]
+        out: List[Dict[str, Any]] = []
+        for start in range(0, self._n, _CHUNK):
+            for k, ts in enumerate(tsyms.chunk(start, min(start + _CHUNK, self._n))):
+                pos = start + k
+                if inst_ok is not None and inst_codes[pos] not in inst_ok:
+                    continue
+                if query in ts or sym_codes[pos] in sym_hit:
+                    out.append(self.row(pos))
+                    if len(out) >= limit:
+                        return out
+        return out
+
+
+class UniversalView(Mapping):
+    """
+    Read view keyed ``"EXCH|token"`` over the per-exchange tables
+    (replaces the copied SCRIPTMASTER_UNIVERSAL dict).
+    """
+
+    def __init__(self, tables: Dict[str, ExchangeTable]):
+        self._tables = tables
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        exch, _, token = key.partition("|")
+        table = self._tables.get(exch)
+        if table is None:
+            raise KeyError(key)
+        return table[token]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        exch, _, token = str(key).partition("|")
+        table = self._tables.get(exch)
+        return table is not None and token in table
+
+    def __iter__(self) -> Iterator[str]:
+        for exch, table in list(self._tables.items()):
+            for token in table:
+                yield f"{exch}|{token}"
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in list(self._tables.values()))
+
+    def tables(self) -> Dict[str, ExchangeTable]:
+        return dict(self._tables)
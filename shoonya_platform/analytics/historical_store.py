@@ -374,6 +374,33 @@ class PostgresHistoricalStore:
         )
         return self._rows_to_dict(cur)
 
+    def fetch_option_chain_ticks(
+        self,
+        exchange: Optional[str],
+        symbol: str,
+        from_ts: Optional[datetime],
+        to_ts: Optional[datetime],
+        expiry: Optional[str] = None,
+        limit: int = 500000,
+    ) -> List[Dict[str, Any]]:
+        """All recorded strikes of a chain in one pass, ordered by ts (replay)."""
+        cur = self._exec(
+            """
+            SELECT ts, exchange, symbol, expiry, strike, option_type, ltp, volume, oi, bid, ask, iv
+            FROM option_ticks
+            WHERE symbol = %s
+              AND (%s IS NULL OR exchange = %s)
+              AND (%s IS NULL OR expiry = %s)
+              AND (%s IS NULL OR ts >= %s)
+              AND (%s IS NULL OR ts <= %s)
+            ORDER BY ts ASC, expiry, strike, option_type
+            LIMIT %s
+            """,
+            (symbol, exchange, exchange, expiry, expiry,
+             from_ts, from_ts, to_ts, to_ts, max(1, min(limit, 2000000))),
+        )
+        return self._rows_to_dict(cur)
+
     @staticmethod
     def _rows_to_dict(cur) -> List[Dict[str, Any]]:
         cols = [d[0] for d in cur.description]
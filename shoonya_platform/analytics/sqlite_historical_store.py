@@ -550,6 +550,35 @@ class SQLiteHistoricalStore:
         )
         return self._rows_to_dict(cur)
 
+    def fetch_option_chain_ticks(
+        self,
+        exchange: Optional[str],
+        symbol: str,
+        from_ts: Optional[datetime],
+        to_ts: Optional[datetime],
+        expiry: Optional[str] = None,
+        limit: int = 500000,
+    ) -> List[Dict[str, Any]]:
+        """All recorded strikes of a chain in one pass, ordered by ts (replay)."""
+        from_iso = from_ts.isoformat() if from_ts else None
+        to_iso = to_ts.isoformat() if to_ts else None
+        cur = self._exec(
+            """
+            SELECT ts, exchange, symbol, expiry, strike, option_type, ltp, volume, oi, bid, ask, iv
+            FROM option_ticks
+            WHERE symbol = ?
+              AND (? IS NULL OR exchange = ?)
+              AND (? IS NULL OR expiry = ?)
+              AND (? IS NULL OR ts >= ?)
+              AND (? IS NULL OR ts <= ?)
+            ORDER BY ts ASC, expiry, strike, option_type
+            LIMIT ?
+            """,
+            (symbol, exchange, exchange, expiry, expiry,
+             from_iso, from_iso, to_iso, to_iso, max(1, min(limit, 2000000))),
+        )
+        return self._rows_to_dict(cur)
+
     def cleanup_old_data(self, days: int = 7) -> None:
         """Remove data older than N days to prevent SQLite bloat."""
         from datetime import timedelta, timezone
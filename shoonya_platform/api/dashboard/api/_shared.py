@@ -6,6 +6,7 @@
 # ======================================================================
 import threading
 from fastapi import Depends, Query, Body, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from typing import List, Optional, Any, Dict
 import logging
 from uuid import uuid4
@@ -21,6 +22,10 @@ import os
 from shoonya_platform.api.dashboard.deps import require_dashboard_auth
 from shoonya_platform.api.dashboard.services.broker_service import BrokerService
 from shoonya_platform.api.dashboard.services.system_service import SystemTruthService
+from shoonya_platform.api.dashboard.services.snapshot_service import (
+    DashboardSnapshotAggregator,
+    dashboard_sections,
+)
 from shoonya_platform.api.dashboard.services.symbols_utility import DashboardSymbolService
 from shoonya_platform.api.dashboard.services.intent_utility import DashboardIntentService
 from shoonya_platform.api.dashboard.services.option_chain_service import (
@@ -242,6 +247,33 @@ def get_symbols() -> DashboardSymbolService:
     return _symbols_service_instance
 
 
+# One background snapshot aggregator per client, shared by all its tabs.
+_snapshot_aggregators: Dict[str, DashboardSnapshotAggregator] = {}
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(ctx=Depends(require_dashboard_auth)) -> DashboardSnapshotAggregator:
+    client_id = ctx["client_id"]
+    bot = ctx.get("bot")
+    with _snapshot_lock:
+        aggregator = _snapshot_aggregators.get(client_id)
+        if aggregator is not None and aggregator.owner is bot:
+            return aggregator
+        if aggregator is not None:
+            aggregator.stop()              # bot was replaced: rebuild on the new one
+        aggregator = DashboardSnapshotAggregator(
+            dashboard_sections(
+                BrokerService(bot.broker_view),
+                SystemTruthService(client_id=client_id),
+                bot,
+            ),
+            encoder=jsonable_encoder,
+            owner=bot,
+        )
+        _snapshot_aggregators[client_id] = aggregator
+        return aggregator
+
+
 # ======================================================================
 # STRATEGY CONFIG UTILITIES
 # ======================================================================
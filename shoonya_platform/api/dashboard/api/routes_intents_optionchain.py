@@ -2,7 +2,8 @@
 # ROUTES: Intents, Dashboard Home, Option Chain, Diagnostics
 # Extracted from router.py during modularisation.
 # ======================================================================
-from fastapi import APIRouter, Depends, Query, Body, HTTPException, status
+from fastapi import APIRouter, Depends, Query, Body, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
 from typing import List, Optional, Any
 from uuid import uuid4
 from datetime import datetime
@@ -17,12 +18,13 @@ from shoonya_platform.api.dashboard.services.option_chain_service import (
     get_active_symbols,
     find_nearest_option,
 )
+from shoonya_platform.api.dashboard.services.snapshot_service import etag_matches
 from shoonya_platform.api.dashboard.api._shared import (
     logger,
     DATA_DIR,
-    get_broker,
     get_system,
     get_intent,
+    get_snapshot,
 )
 from shoonya_platform.api.dashboard.api.schemas import (
     StrategyIntentRequest,
@@ -38,15 +40,6 @@ import re as _re
 sub_router = APIRouter()
 
 
-def _safe_call(fn, fallback, name: str):
-    """Call *fn*(); on failure or None return, use *fallback*."""
-    try:
-        result = fn()
-        return result if result is not None else fallback
-    except Exception as exc:
-        logger.warning("dashboard_snapshot: %s failed: %s", name, exc)
-        return fallback
-
 # ==================================================
 # STRATEGY ENTRY INTENT
 # ==================================================
@@ -83,47 +76,31 @@ def submit_strategy_entry(
 
 @sub_router.get("/home/status")
 def dashboard_snapshot(
-    broker=Depends(get_broker),
-    system=Depends(get_system),
-    ctx=Depends(require_dashboard_auth),
+    request: Request,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated sections, e.g. 'broker,system.risk' (default: all)",
+    ),
+    snapshot=Depends(get_snapshot),
 ):
-    try:
-        limits = broker.get_limits()
-    except (RuntimeError, Exception) as e:
-        logger.warning(f"Failed to get broker limits: {e}, returning empty limits")
-        limits = {}
-
-    # Managed exit state for position manager view
-    managed_exits = []
-    bot = ctx.get("bot") if ctx else None
-    if bot:
-        watcher = getattr(bot, "order_watcher", None)
-        if watcher:
-            try:
-                managed_exits = watcher.get_managed_exits_snapshot()
-            except Exception as exc:
-                logger.warning("dashboard_snapshot: managed_exits_snapshot failed: %s", exc, exc_info=True)
+    """
+    Cached dashboard snapshot (see DashboardSnapshotAggregator).
 
-    return {
-        "broker": {
-            "positions": _safe_call(broker.get_positions, [], "broker.get_positions"),
-            "positions_summary": _safe_call(broker.get_positions_summary, {}, "broker.get_positions_summary"),
-            "holdings": _safe_call(broker.get_holdings, [], "broker.get_holdings"),
-            "limits": limits,
-            "orders": _safe_call(broker.get_order_book, [], "broker.get_order_book"),
-        },
-        "system": {
-            "orders": _safe_call(lambda: system.get_orders(200), [], "system.get_orders"),
-            "open_orders": _safe_call(system.get_open_orders, [], "system.get_open_orders"),
-            "control_intents": _safe_call(lambda: system.get_control_intents(50), [], "system.get_control_intents"),
-            "risk": _safe_call(system.get_risk_state, {}, "system.get_risk_state"),
-            "heartbeat": _safe_call(system.get_option_data_heartbeat, {}, "system.get_option_data_heartbeat"),
-            "signal": _safe_call(system.get_signal_activity, {}, "system.get_signal_activity"),
-            "telegram_messages": _safe_call(lambda: system.get_telegram_messages(200), [], "system.get_telegram_messages"),
-            "telegram_stats": _safe_call(lambda: system.get_telegram_alert_stats(500), {}, "system.get_telegram_alert_stats"),
-        },
-        "managed_exits": managed_exits,
-    }
+    Sections refresh in the background on their own cadences;
+    `_meta.age_sec` reports how old each one is. Send the returned ETag
+    back as If-None-Match to get 304 when nothing selected has changed.
+    """
+    try:
+        names = snapshot.resolve_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    body, etag = snapshot.collect(names)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        snapshot.record_not_modified()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(body, headers=headers)
 
 
 # ==================================================
@@ -1,312 +1,358 @@
 # shoonya_platform/api/dashboard/services/broker_service.py
 """
-ENHANCED BROKER VIEW WITH INTELLIGENT CACHING
-==============================================
+BROKER VIEW — SINGLE-FLIGHT BROKER READ CACHE
+=============================================
 
-Prevents duplicate broker API calls across multiple consumers:
+The one broker-read path for every consumer:
 - Dashboard frontend (2s polling)
-- Strategy executor (2s polling + verification)
-- Order watcher (periodic checks)
+- Strategy executor (pending-order reconciliation)
+- Order watcher (order book / positions polling)
+- Risk manager (PnL), orphan position manager
 
 CRITICAL FEATURES:
-✅ Thread-safe caching with RLock
-✅ Configurable TTL (default 1.5s for 2s poll intervals)
-✅ Stale data fallback on API errors (availability > freshness)
-✅ Force refresh bypass for critical operations
-✅ Cache invalidation after order placement
-✅ Copy-trading ready (client isolation via api_proxy)
-
-PERFORMANCE:
-- Before: 4-6 API calls/sec
-- After: 1-2 API calls/sec (50-66% reduction)
+✅ Freshness contract: callers ask for data "no older than max_age" instead
+   of forcing a refresh (force_refresh=True == max_age=0)
+✅ Single-flight: concurrent misses share ONE in-flight REST call
+✅ Lock is never held during broker I/O
+✅ Stale data fallback on API errors (opt-out with allow_stale=False)
+✅ Invalidation on order placement / fills (data fetched before the
+   invalidation is never served, in-flight fetches included)
+✅ Per-consumer hit / miss / coalesce counters
 """
 
 import time
 import logging
+import threading
 from threading import RLock
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 logger = logging.getLogger(__name__)
 
+# cache name → api_proxy method
+_FETCHERS: Dict[str, str] = {
+    "positions": "get_positions",
+    "orders": "get_order_book",
+    "holdings": "get_holdings",
+    "limits": "get_limits",
+}
+
+
+class _Flight:
+    """One in-progress broker fetch that concurrent readers wait on."""
+
+    __slots__ = ("started_at", "done", "result", "error")
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Entry:
+    __slots__ = ("data", "fetched_at", "valid_after", "flight")
+
+    def __init__(self):
+        self.data: Any = None
+        self.fetched_at: float = 0.0   # monotonic start time of the fetch that produced data
+        self.valid_after: float = 0.0  # data / flights started before this are unusable
+        self.flight: Optional[_Flight] = None
+
 
 class BrokerView:
     """
-    Thread-safe broker data view with intelligent caching.
-    
+    Thread-safe, single-flight broker data view.
+
     Consolidates all broker API access to prevent rate limiting.
-    Multiple consumers (dashboard, strategy runner) share cached data.
+    Multiple consumers (dashboard, strategy runner, watcher, RMS) share
+    cached data under an explicit freshness contract.
     """
-    
+
     def __init__(self, api_proxy, cache_ttl: float = 1.5):
         """
         Args:
             api_proxy: ShoonyaApiProxy instance (from trading_bot.py)
-            cache_ttl: Cache time-to-live in seconds (default 1.5s)
+            cache_ttl: Default max_age in seconds (default 1.5s)
                       - 1.5s optimal for 2s polling (0.5s safety margin)
-                      - Adjust based on your polling frequency
         """
         self.api = api_proxy  # Keep 'api' name for backward compatibility
         self.cache_ttl = cache_ttl
-        self._lock = RLock()  # Thread-safe for concurrent dashboard + strategy runner
-        
-        # Cache storage with timestamps
-        self._positions_cache: Optional[List[Dict]] = None
-        self._positions_timestamp: float = 0.0
-        
-        self._orders_cache: Optional[List[Dict]] = None
-        self._orders_timestamp: float = 0.0
-        
-        self._holdings_cache: Optional[List[Dict]] = None
-        self._holdings_timestamp: float = 0.0
-        
-        self._limits_cache: Optional[Dict] = None
-        self._limits_timestamp: float = 0.0
-        
-        # Performance metrics (optional monitoring)
+        self._lock = RLock()  # Guards cache state only — never held during I/O
+
+        self._entries: Dict[str, _Entry] = {name: _Entry() for name in _FETCHERS}
+
+        # Performance metrics (global + per consumer)
         self._cache_hits = 0
         self._cache_misses = 0
+        self._coalesced = 0
         self._api_errors = 0
-    
-    def get_positions(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
-        """
-        Get broker positions with intelligent caching.
-        
-        Args:
-            force_refresh: If True, bypass cache and fetch fresh data
-                          Use for critical operations (e.g., order verification)
-        
-        Returns:
-            List of position dictionaries
-            
-        Thread-Safety:
-            Yes - RLock ensures atomic cache check + update
-        """
+        self._rest_calls: Dict[str, int] = {name: 0 for name in _FETCHERS}
+        self._consumers: Dict[str, Dict[str, int]] = {}
+
+    # --------------------------------------------------
+    # CORE READ PATH
+    # --------------------------------------------------
+
+    def _count(self, consumer: str, key: str) -> None:
+        stats = self._consumers.get(consumer)
+        if stats is None:
+            stats = self._consumers[consumer] = {
+                "hits": 0, "misses": 0, "coalesced": 0, "errors": 0,
+            }
+        stats[key] += 1
+
+    def _read(
+        self,
+        name: str,
+        max_age: Optional[float],
+        consumer: str,
+        allow_stale: bool,
+    ) -> Any:
+        if max_age is None:
+            max_age = self.cache_ttl
+        entry = self._entries[name]
+
         with self._lock:
-            now = time.time()
-            age = now - self._positions_timestamp
-            
-            # Return cached data if still valid
-            if (not force_refresh and 
-                self._positions_cache is not None and
-                age < self.cache_ttl):
+            now = time.monotonic()
+            oldest_ok = max(now - max_age, entry.valid_after)
+
+            if entry.data is not None and entry.fetched_at >= oldest_ok:
                 self._cache_hits += 1
-                logger.debug(f"📦 POSITIONS CACHE HIT (age={age:.2f}s)")
-                return self._positions_cache.copy()
-            
-            # Fetch fresh data from broker
-            try:
+                self._count(consumer, "hits")
+                logger.debug("📦 %s CACHE HIT (age=%.2fs, consumer=%s)",
+                             name.upper(), now - entry.fetched_at, consumer)
+                return entry.data
+
+            flight = entry.flight
+            if flight is not None and flight.started_at >= oldest_ok:
+                leader = False
+                self._coalesced += 1
+                self._count(consumer, "coalesced")
+            else:
+                leader = True
+                flight = entry.flight = _Flight(now)
                 self._cache_misses += 1
-                logger.debug(f"🔄 POSITIONS FETCH (cache_age={age:.2f}s, force={force_refresh})")
-                
-                positions = self.api.get_positions() or []
-                
-                # Update cache
-                self._positions_cache = positions
-                self._positions_timestamp = now
-                
-                logger.debug(f"✅ POSITIONS CACHED ({len(positions)} positions)")
-                return positions.copy()
-                
-            except Exception as e:
-                self._api_errors += 1
-                logger.error(f"❌ Broker API error (positions): {e}")
-                
-                # Stale data fallback (availability > freshness)
-                if self._positions_cache is not None:
-                    logger.warning(
-                        f"⚠️  Using stale positions cache (age={age:.1f}s) "
-                        f"due to API error"
-                    )
-                    return self._positions_cache.copy()
-                
-                # No cache available, re-raise
-                raise
-    
-    def get_order_book(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
-        """
-        Get broker order book with intelligent caching.
-        
-        Args:
-            force_refresh: If True, bypass cache and fetch fresh data
-        
-        Returns:
-            List of order dictionaries
-        """
+                self._count(consumer, "misses")
+                self._rest_calls[name] += 1
+
+        if leader:
+            self._fetch(name, entry, flight, consumer)
+        else:
+            flight.done.wait()
+
+        if flight.error is None:
+            return flight.result
+
         with self._lock:
-            now = time.time()
-            age = now - self._orders_timestamp
-            
-            if (not force_refresh and
-                self._orders_cache is not None and
-                age < self.cache_ttl):
-                self._cache_hits += 1
-                logger.debug(f"📦 ORDERS CACHE HIT (age={age:.2f}s)")
-                return self._orders_cache.copy()
-            
-            try:
-                self._cache_misses += 1
-                logger.debug(f"🔄 ORDERS FETCH (cache_age={age:.2f}s, force={force_refresh})")
-                
-                orders = self.api.get_order_book() or []
-                
-                self._orders_cache = orders
-                self._orders_timestamp = now
-                
-                logger.debug(f"✅ ORDERS CACHED ({len(orders)} orders)")
-                return orders.copy()
-                
-            except Exception as e:
+            self._count(consumer, "errors")
+            stale = entry.data
+        if allow_stale and stale is not None:
+            logger.warning(
+                "⚠️  Using stale %s cache (age=%.1fs) due to API error",
+                name, time.monotonic() - entry.fetched_at,
+            )
+            return stale
+        raise flight.error
+
+    def _fetch(self, name: str, entry: _Entry, flight: _Flight, consumer: str) -> None:
+        try:
+            logger.debug("🔄 %s FETCH (consumer=%s)", name.upper(), consumer)
+            data = getattr(self.api, _FETCHERS[name])()
+            data = data or ({} if name == "limits" else [])
+            with self._lock:
+                if flight.started_at >= entry.fetched_at:
+                    entry.data = data
+                    entry.fetched_at = flight.started_at
+            flight.result = data
+        except BaseException as e:  # waiters must always be released
+            with self._lock:
                 self._api_errors += 1
-                logger.error(f"❌ Broker API error (orders): {e}")
-                
-                if self._orders_cache is not None:
-                    logger.warning(
-                        f"⚠️  Using stale orders cache (age={age:.1f}s) "
-                        f"due to API error"
-                    )
-                    return self._orders_cache.copy()
-                
-                raise
-    
-    def get_holdings(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+            logger.error(f"❌ Broker API error ({name}): {e}")
+            flight.error = e
+        finally:
+            with self._lock:
+                if entry.flight is flight:
+                    entry.flight = None
+            flight.done.set()
+
+    @staticmethod
+    def _copy(data):
+        return data.copy() if data else data
+
+    # --------------------------------------------------
+    # PUBLIC READERS
+    # --------------------------------------------------
+
+    def read(
+        self,
+        target: str,
+        *,
+        max_age: Optional[float] = None,
+        consumer: str = "default",
+        allow_stale: bool = True,
+    ) -> Any:
         """
-        Get broker holdings with caching.
-        
+        Read one broker target no older than max_age seconds.
+
         Args:
-            force_refresh: If True, bypass cache and fetch fresh data
-        
-        Returns:
-            List of holding dictionaries
+            target: positions | orders | holdings | limits
+            max_age: Freshness contract in seconds (default: cache_ttl)
+            consumer: Name used for per-consumer stats
+            allow_stale: Return last good data if the broker call fails
         """
-        with self._lock:
-            now = time.time()
-            age = now - self._holdings_timestamp
-            
-            if (not force_refresh and
-                self._holdings_cache is not None and
-                age < self.cache_ttl):
-                self._cache_hits += 1
-                return self._holdings_cache.copy()
-            
-            try:
-                self._cache_misses += 1
-                holdings = self.api.get_holdings() or []
-                
-                self._holdings_cache = holdings
-                self._holdings_timestamp = now
-                
-                return holdings.copy()
-                
-            except Exception as e:
-                self._api_errors += 1
-                logger.error(f"❌ Broker API error (holdings): {e}")
-                
-                if self._holdings_cache is not None:
-                    logger.warning(f"⚠️  Using stale holdings cache (age={age:.1f}s)")
-                    return self._holdings_cache.copy()
-                
-                raise
-    
-    def get_limits(self, force_refresh: bool = False) -> Dict[str, Any]:
+        if target not in _FETCHERS:
+            raise ValueError(f"Unknown broker target: {target}")
+        return self._copy(self._read(target, max_age, consumer, allow_stale)) or (
+            {} if target == "limits" else []
+        )
+
+    def get_positions(
+        self,
+        force_refresh: bool = False,
+        *,
+        max_age: Optional[float] = None,
+        consumer: str = "default",
+        allow_stale: bool = True,
+    ) -> List[Dict[str, Any]]:
         """
-        Get account limits with caching.
-        
+        Get broker positions no older than max_age seconds.
+
         Args:
-            force_refresh: If True, bypass cache and fetch fresh data
-        
-        Returns:
-            Limits dictionary
+            force_refresh: Legacy spelling of max_age=0 (fetched after this call)
+            max_age: Freshness contract in seconds (default: cache_ttl)
+            consumer: Name used for per-consumer stats
+            allow_stale: Return last good data if the broker call fails
         """
-        with self._lock:
-            now = time.time()
-            age = now - self._limits_timestamp
-            
-            if (not force_refresh and
-                self._limits_cache is not None and
-                age < self.cache_ttl):
-                self._cache_hits += 1
-                return self._limits_cache.copy() if self._limits_cache else {}
-            
-            try:
-                self._cache_misses += 1
-                limits = self.api.get_limits() or {}
-                
-                self._limits_cache = limits
-                self._limits_timestamp = now
-                
-                return limits.copy() if limits else {}
-                
-            except Exception as e:
-                self._api_errors += 1
-                logger.error(f"❌ Broker API error (limits): {e}")
-                
-                if self._limits_cache is not None:
-                    logger.warning(f"⚠️  Using stale limits cache (age={age:.1f}s)")
-                    return self._limits_cache.copy()
-                
-                raise
-    
+        if force_refresh:
+            max_age = 0.0
+        return self.read("positions", max_age=max_age, consumer=consumer, allow_stale=allow_stale)
+
+    def get_order_book(
+        self,
+        force_refresh: bool = False,
+        *,
+        max_age: Optional[float] = None,
+        consumer: str = "default",
+        allow_stale: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Get broker order book no older than max_age seconds."""
+        if force_refresh:
+            max_age = 0.0
+        return self.read("orders", max_age=max_age, consumer=consumer, allow_stale=allow_stale)
+
+    def get_holdings(
+        self,
+        force_refresh: bool = False,
+        *,
+        max_age: Optional[float] = None,
+        consumer: str = "default",
+        allow_stale: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Get broker holdings no older than max_age seconds."""
+        if force_refresh:
+            max_age = 0.0
+        return self.read("holdings", max_age=max_age, consumer=consumer, allow_stale=allow_stale)
+
+    def get_limits(
+        self,
+        force_refresh: bool = False,
+        *,
+        max_age: Optional[float] = None,
+        consumer: str = "default",
+        allow_stale: bool = True,
+    ) -> Dict[str, Any]:
+        """Get account limits no older than max_age seconds."""
+        if force_refresh:
+            max_age = 0.0
+        return self.read("limits", max_age=max_age, consumer=consumer, allow_stale=allow_stale)
+
     def invalidate_cache(self, target: Optional[str] = None):
         """
-        Force cache invalidation.
-        
+        Invalidate cached data (and any fetch already in flight).
+
         Args:
             target: Specific cache to invalidate ('positions', 'orders', 'holdings', 'limits')
                    If None, invalidates ALL caches
-        
+
         Use Cases:
             - After placing/modifying/canceling orders
-            - After manual position changes
-            - When guaranteed fresh data is required
+            - After fills / manual position changes
         """
         with self._lock:
-            if target is None or target == "positions":
-                self._positions_timestamp = 0
-                logger.debug("🗑️  Positions cache invalidated")
-            
-            if target is None or target == "orders":
-                self._orders_timestamp = 0
-                logger.debug("🗑️  Orders cache invalidated")
-            
-            if target is None or target == "holdings":
-                self._holdings_timestamp = 0
-                logger.debug("🗑️  Holdings cache invalidated")
-            
-            if target is None or target == "limits":
-                self._limits_timestamp = 0
-                logger.debug("🗑️  Limits cache invalidated")
-    
+            now = time.monotonic()
+            for name, entry in self._entries.items():
+                if target is None or target == name:
+                    entry.valid_after = now
+                    logger.debug("🗑️  %s cache invalidated", name.capitalize())
+
+    def on_order_event(self, event: str = "placed") -> None:
+        """Order placed / modified / cancelled / filled → positions & orders change."""
+        self.invalidate_cache("positions")
+        self.invalidate_cache("orders")
+        if event == "filled":
+            self.invalidate_cache("limits")
+
     def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get cache performance metrics (for monitoring/debugging).
-        
+
         Returns:
             Dictionary with cache statistics
         """
         with self._lock:
-            now = time.time()
-            
-            total_requests = self._cache_hits + self._cache_misses
-            hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
-            
+            now = time.monotonic()
+
+            total_requests = self._cache_hits + self._cache_misses + self._coalesced
+            served = self._cache_hits + self._coalesced
+            hit_rate = (served / total_requests * 100) if total_requests > 0 else 0
+            pos, orders = self._entries["positions"], self._entries["orders"]
+
             return {
                 "cache_hits": self._cache_hits,
                 "cache_misses": self._cache_misses,
+                "coalesced": self._coalesced,
                 "api_errors": self._api_errors,
                 "hit_rate_percent": round(hit_rate, 1),
-                "positions_age_sec": round(now - self._positions_timestamp, 2),
-                "positions_valid": (now - self._positions_timestamp) < self.cache_ttl,
-                "orders_age_sec": round(now - self._orders_timestamp, 2),
-                "orders_valid": (now - self._orders_timestamp) < self.cache_ttl,
+                "rest_calls": dict(self._rest_calls),
+                "consumers": {k: dict(v) for k, v in self._consumers.items()},
+                "positions_age_sec": round(now - pos.fetched_at, 2),
+                "positions_valid": pos.data is not None and (now - pos.fetched_at) < self.cache_ttl
+                and pos.fetched_at >= pos.valid_after,
+                "orders_age_sec": round(now - orders.fetched_at, 2),
+                "orders_valid": orders.data is not None and (now - orders.fetched_at) < self.cache_ttl
+                and orders.fetched_at >= orders.valid_after,
                 "cache_ttl_sec": self.cache_ttl,
             }
-    
+
     def reset_stats(self):
         """Reset performance counters (for testing/monitoring)."""
         with self._lock:
             self._cache_hits = 0
             self._cache_misses = 0
+            self._coalesced = 0
             self._api_errors = 0
+            self._rest_calls = {name: 0 for name in _FETCHERS}
+            self._consumers = {}
+
+
+def read_broker(
+    bot,
+    target: str,
+    *,
+    max_age: Optional[float] = None,
+    consumer: str = "default",
+    allow_stale: bool = True,
+):
+    """
+    Broker read through bot.broker_view when the bot has one, else a direct
+    bot.api call (test bots / standalone tools). target: positions | orders |
+    holdings | limits.
+    """
+    view = getattr(bot, "broker_view", None)
+    if isinstance(view, BrokerView):
+        return view.read(target, max_age=max_age, consumer=consumer, allow_stale=allow_stale)
+    fetch: Callable[[], Any] = getattr(bot.api, _FETCHERS[target])
+    return fetch() or ({} if target == "limits" else [])
 
 
 class BrokerService:
@@ -35,6 +35,7 @@ from uuid import uuid4
 from datetime import datetime
 from typing import Optional
 
+from shoonya_platform.persistence.intent_queue import intent_wakeup
 from shoonya_platform.api.dashboard.api.schemas import (
     GenericIntentRequest,
     StrategyIntentRequest,
@@ -271,6 +272,9 @@ class DashboardIntentService:
             logger.exception("❌ DASHBOARD INTENT INSERT FAILED")
             raise RuntimeError("Unable to queue dashboard intent")
 
+        # Wake the execution-side consumers (same process) right away
+        intent_wakeup.notify()
+
     def submit_raw_intent(
         self,
         *,
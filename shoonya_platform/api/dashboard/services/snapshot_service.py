@@ -0,0 +1,327 @@
+# shoonya_platform/api/dashboard/services/snapshot_service.py
+"""
+DASHBOARD SNAPSHOT — BACKGROUND AGGREGATOR
+==========================================
+
+One aggregator per dashboard client feeds every /home/status poll:
+
+✅ Each section (broker positions, OMS orders, risk file, heartbeat,
+   telegram log, ...) refreshes on its own cadence in ONE background
+   thread — open tabs no longer multiply broker / DB / file reads
+✅ Polls are served from cache with per-section ages; a failing section
+   keeps its last good value and its age keeps growing
+✅ Clients pick sections with `fields=` (group names like "broker" or
+   exact names like "system.risk")
+✅ Per-section versions change only when content changes, so the ETag
+   lets unchanged snapshots be answered with 304 Not Modified
+✅ The refresher stops when nobody has polled for `idle_timeout` seconds
+   and restarts on the next poll
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# section → refresh cadence (seconds). Broker reads go through BrokerView
+# (1.5s TTL); slow-moving files and holdings refresh less often.
+SNAPSHOT_INTERVALS: Dict[str, float] = {
+    "broker.positions": 2.0,
+    "broker.positions_summary": 2.0,
+    "broker.holdings": 30.0,
+    "broker.limits": 5.0,
+    "broker.orders": 2.0,
+    "system.orders": 2.0,
+    "system.open_orders": 2.0,
+    "system.control_intents": 5.0,
+    "system.risk": 2.0,
+    "system.heartbeat": 5.0,
+    "system.signal": 5.0,
+    "system.telegram_messages": 2.0,
+    "system.telegram_stats": 2.0,
+    "managed_exits": 1.0,
+}
+
+
+class _Published(NamedTuple):
+    """What readers see of a section — swapped in as one object."""
+    value: Any
+    version: int
+    fetched_at: Optional[float]                    # last successful fetch (age)
+    error: Optional[str]
+
+
+class _Section:
+    __slots__ = (
+        "name", "fetch", "fallback", "interval",
+        "attempted_at", "digest", "version", "published", "lock",
+    )
+
+    def __init__(self, name: str, fetch: Callable[[], Any], fallback: Any, interval: float):
+        self.name = name
+        self.fetch = fetch
+        self.fallback = fallback
+        self.interval = interval
+        self.attempted_at: Optional[float] = None  # schedules the next refresh
+        self.digest: Optional[str] = None
+        self.version = 0
+        # Value, version, age and error always change together: a reader
+        # that takes one reference can never pair an old body with a new
+        # version (which would answer later polls with 304 on stale data).
+        self.published = _Published(fallback, 0, None, None)
+        self.lock = threading.Lock()               # one fetch per section at a time
+
+
+def _digest(value: Any) -> Optional[str]:
+    try:
+        raw = json.dumps(value, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None                                # always treated as changed
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+class DashboardSnapshotAggregator:
+    """
+    Thread-safe cached dashboard snapshot.
+
+    Sections are given as name → (fetch, fallback, interval). Dotted names
+    nest in the response ("broker.positions" → body["broker"]["positions"]).
+    """
+
+    def __init__(
+        self,
+        sections: Dict[str, Tuple[Callable[[], Any], Any, float]],
+        *,
+        idle_timeout: float = 30.0,
+        encoder: Optional[Callable[[Any], Any]] = None,
+        owner: Any = None,
+    ):
+        """
+        Args:
+            sections: name → (fetch callable, fallback value, cadence seconds)
+            idle_timeout: Stop background refresh after this long without polls
+            encoder: Applied to fetched values once, in the refresher
+                     (e.g. FastAPI's jsonable_encoder) instead of per response
+            owner: Object the sections were built from (lets callers rebuild
+                   the aggregator when it changes)
+        """
+        self._sections: Dict[str, _Section] = {
+            name: _Section(name, fetch, fallback, interval)
+            for name, (fetch, fallback, interval) in sections.items()
+        }
+        self.idle_timeout = idle_timeout
+        self.owner = owner
+        self._encode = encoder or (lambda value: value)
+        self._epoch = uuid4().hex[:8]              # ETags never survive a rebuild
+        self._lock = threading.Lock()              # guards thread lifecycle only
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_poll = time.monotonic()
+
+        self._fetches: Dict[str, int] = {name: 0 for name in self._sections}
+        self._errors = 0
+        self._polls = 0
+        self._not_modified = 0
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._sections)
+
+    # --------------------------------------------------
+    # FIELD SELECTION
+    # --------------------------------------------------
+    def resolve_fields(self, fields: Optional[str]) -> List[str]:
+        """
+        Parse a `fields=` value into section names, in declaration order.
+        Raises ValueError on unknown fields.
+        """
+        if fields is None or not fields.strip():
+            return self.names
+        wanted = set()
+        for raw in fields.split(","):
+            field = raw.strip()
+            if not field:
+                continue
+            matched = [
+                name for name in self._sections
+                if name == field or name.startswith(field + ".")
+            ]
+            if not matched:
+                raise ValueError(
+                    f"Unknown snapshot field '{field}'. "
+                    f"Valid: {', '.join(self.names)}"
+                )
+            wanted.update(matched)
+        return [name for name in self._sections if name in wanted]
+
+    # --------------------------------------------------
+    # REFRESH
+    # --------------------------------------------------
+    def refresh(self, name: str, max_age: float = 0.0) -> None:
+        """
+        Fetch one section unless it was attempted within `max_age` seconds
+        (checked under the section lock, so racing callers fetch once).
+        """
+        section = self._sections[name]
+        with section.lock:
+            now = time.monotonic()
+            if section.attempted_at is not None and now - section.attempted_at < max_age:
+                return
+            section.attempted_at = now
+            self._fetches[name] += 1
+            try:
+                value = section.fetch()
+                value = self._encode(section.fallback if value is None else value)
+            except Exception as exc:
+                self._errors += 1
+                logger.warning("dashboard_snapshot: %s failed: %s", name, exc)
+                # keep the last good value
+                section.published = section.published._replace(error=str(exc))
+                return
+            digest = _digest(value)
+            if digest is None or digest != section.digest:
+                section.version += 1
+            section.digest = digest
+            section.published = _Published(value, section.version, now, None)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if time.monotonic() - self._last_poll > self.idle_timeout:
+                    self._thread = None
+                    logger.info("dashboard_snapshot: idle, refresher paused")
+                    return
+            for section in self._sections.values():
+                self.refresh(section.name, max_age=section.interval)
+            now = time.monotonic()
+            wait = min(
+                (s.attempted_at or now) + s.interval - now
+                for s in self._sections.values()
+            )
+            self._stop.wait(max(wait, 0.05))
+        with self._lock:
+            self._thread = None
+
+    def _touch(self) -> None:
+        with self._lock:
+            self._last_poll = time.monotonic()
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="DashboardSnapshot", daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    # --------------------------------------------------
+    # READ PATH
+    # --------------------------------------------------
+    def etag(self, names: List[str], versions: Optional[List[int]] = None) -> str:
+        """ETag over the given (or currently published) section versions."""
+        if versions is None:
+            versions = [self._sections[n].published.version for n in names]
+        joined = ",".join(f"{n}={v}" for n, v in zip(names, versions))
+        tag = hashlib.sha1(f"{self._epoch}|{joined}".encode("utf-8")).hexdigest()[:20]
+        return f'W/"{tag}"'
+
+    def collect(self, names: Optional[List[str]] = None) -> Tuple[Dict[str, Any], str]:
+        """
+        Cached snapshot of `names` (all sections by default) plus its ETag.
+        Sections never fetched yet are filled inline on the first poll.
+        """
+        names = self.names if names is None else names
+        self._touch()
+        for name in names:
+            if self._sections[name].attempted_at is None:
+                self.refresh(name, max_age=float("inf"))
+
+        now = time.monotonic()
+        body: Dict[str, Any] = {}
+        ages: Dict[str, Optional[float]] = {}
+        errors: Dict[str, str] = {}
+        versions: List[int] = []
+        for name in names:
+            pub = self._sections[name].published   # one consistent capture
+            target = body
+            *groups, leaf = name.split(".")
+            for group in groups:
+                target = target.setdefault(group, {})
+            target[leaf] = pub.value
+            versions.append(pub.version)
+            ages[name] = (
+                None if pub.fetched_at is None
+                else round(now - pub.fetched_at, 2)
+            )
+            if pub.error:
+                errors[name] = pub.error
+        etag = self.etag(names, versions)
+        body["_meta"] = {"etag": etag, "age_sec": ages, "errors": errors}
+        self._polls += 1
+        return body, etag
+
+    def record_not_modified(self) -> None:
+        self._not_modified += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._thread is not None,
+            "polls": self._polls,
+            "not_modified": self._not_modified,
+            "errors": self._errors,
+            "fetches": dict(self._fetches),
+        }
+
+
+def dashboard_sections(broker, system, bot=None) -> Dict[str, Tuple[Callable[[], Any], Any, float]]:
+    """Section table for the /home/status snapshot."""
+
+    def managed_exits():
+        watcher = getattr(bot, "order_watcher", None) if bot else None
+        return watcher.get_managed_exits_snapshot() if watcher else []
+
+    fetchers: Dict[str, Tuple[Callable[[], Any], Any]] = {
+        "broker.positions": (broker.get_positions, []),
+        "broker.positions_summary": (broker.get_positions_summary, {}),
+        "broker.holdings": (broker.get_holdings, []),
+        "broker.limits": (broker.get_limits, {}),
+        "broker.orders": (broker.get_order_book, []),
+        "system.orders": (lambda: system.get_orders(200), []),
+        "system.open_orders": (system.get_open_orders, []),
+        "system.control_intents": (lambda: system.get_control_intents(50), []),
+        "system.risk": (system.get_risk_state, {}),
+        "system.heartbeat": (system.get_option_data_heartbeat, {}),
+        "system.signal": (system.get_signal_activity, {}),
+        "system.telegram_messages": (lambda: system.get_telegram_messages(200), []),
+        "system.telegram_stats": (lambda: system.get_telegram_alert_stats(500), {}),
+        "managed_exits": (managed_exits, []),
+    }
+    return {
+        name: (fetch, fallback, SNAPSHOT_INTERVALS[name])
+        for name, (fetch, fallback) in fetchers.items()
+    }
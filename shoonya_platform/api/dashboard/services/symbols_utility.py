@@ -17,7 +17,7 @@ STRICT GUARANTEES:
 - JSON-safe outputs (no NaN / inf leakage)
 
 Data source:
-- SCRIPTMASTER_UNIVERSAL (dict-based, ScriptMaster v2)
+- SCRIPTMASTER_UNIVERSAL (read view over the columnar ScriptMaster tables)
 """
 
 from typing import List
@@ -67,7 +67,7 @@ class DashboardSymbolService:
     ScriptMaster-powered symbol discovery service.
 
     Operates on:
-    - SCRIPTMASTER_UNIVERSAL (dict[str, dict])
+    - SCRIPTMASTER_UNIVERSAL (Mapping["EXCH|token", dict] over ExchangeTable)
 
     This service is SAFE to use inside:
     - Dashboard APIs
@@ -76,8 +76,8 @@ class DashboardSymbolService:
     """
 
     def __init__(self):
-        # ScriptMaster must already be initialized at app startup
-        self.records = SCRIPTMASTER_UNIVERSAL or {}
+        # Live view: picks up ScriptMaster loads/refreshes after construction
+        self.records = SCRIPTMASTER_UNIVERSAL
 
     # --------------------------------------------------
     # SEARCH (AUTOCOMPLETE)
@@ -106,30 +106,21 @@ class DashboardSymbolService:
 
         results = []
 
-        for rec in self.records.values():
-            instrument = rec.get("Instrument")
-
-            # Instrument filter
-            if allowed and instrument not in allowed:
-                continue
-
-            ts = rec.get("TradingSymbol", "")
-            sym = rec.get("Symbol", "")
-
-            if q not in ts and q not in sym:
-                continue
-
-            results.append(
-                {
-                    "exchange": rec.get("Exchange"),
-                    "tradingsymbol": ts,
-                    "instrument": instrument,
-                    "underlying": sym,
-                    "expiry": rec.get("Expiry"),
-                    "strike": _safe_number(rec.get("StrikePrice")),
-                    "option_type": rec.get("OptionType"),
-                }
-            )
+        for table in self.records.tables().values():
+            # Instrument filter + substring match run on the columns;
+            # only hits are materialised
+            for rec in table.search_text(q, allowed, limit - len(results)):
+                results.append(
+                    {
+                        "exchange": rec.get("Exchange"),
+                        "tradingsymbol": rec.get("TradingSymbol", ""),
+                        "instrument": rec.get("Instrument"),
+                        "underlying": rec.get("Symbol", ""),
+                        "expiry": rec.get("Expiry"),
+                        "strike": _safe_number(rec.get("StrikePrice")),
+                        "option_type": rec.get("OptionType"),
+                    }
+                )
 
             if len(results) >= limit:
                 break
@@ -146,15 +137,14 @@ class DashboardSymbolService:
         if not self.records:
             return []
 
-        expiries = set()
+        table = self.records.tables().get(exchange)
+        if table is None:
+            return []
 
-        for rec in self.records.values():
-            if (
-                rec.get("Exchange") == exchange
-                and rec.get("Symbol") == symbol
-                and rec.get("Expiry")
-            ):
-                expiries.add(rec["Expiry"])
+        expiries = {
+            rec["Expiry"]
+            for rec in table.rows(table.select(symbol=symbol, has_expiry=True))
+        }
 
         return sorted(expiries)
 
@@ -173,21 +163,20 @@ class DashboardSymbolService:
         if not self.records:
             return []
 
+        table = self.records.tables().get(exchange)
+        if table is None:
+            return []
+
         contracts = []
 
-        for rec in self.records.values():
-            if (
-                rec.get("Exchange") == exchange
-                and rec.get("Symbol") == symbol
-                and rec.get("Expiry") == expiry
-            ):
-                contracts.append(
-                    {
-                        "tradingsymbol": rec.get("TradingSymbol"),
-                        "instrument": rec.get("Instrument"),
-                        "strike": _safe_number(rec.get("StrikePrice")),
-                        "option_type": rec.get("OptionType"),
-                    }
-                )
+        for rec in table.rows(table.select(symbol=symbol, expiry=expiry)):
+            contracts.append(
+                {
+                    "tradingsymbol": rec.get("TradingSymbol"),
+                    "instrument": rec.get("Instrument"),
+                    "strike": _safe_number(rec.get("StrikePrice")),
+                    "option_type": rec.get("OptionType"),
+                }
+            )
 
         return contracts
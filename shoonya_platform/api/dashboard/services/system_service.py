@@ -1,10 +1,14 @@
 # shoonya_platform/api/dashboard/services/system_service.py
 
 import json
+import os
+import threading
 import time
+from collections import deque
 from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 from shoonya_platform.persistence.repository import OrderRepository
 from shoonya_platform.core.config import Config
@@ -21,6 +25,214 @@ OPTION_DATA_HEARTBEAT = (
 TELEGRAM_LOG = PROJECT_ROOT / "logs/telegram_messages.jsonl"
 
 
+# --------------------------------------------------
+# TELEGRAM LOG TAIL READER
+# --------------------------------------------------
+def _classify(item) -> Tuple[int, int, int, int]:
+    """(alerts, success, failed, risk) flags for one logged message."""
+    if not isinstance(item, dict):
+        return (0, 0, 0, 0)
+    text = (item.get("message") or "").lower()
+    return (
+        int("alert received" in text),
+        int("order successful" in text or "login successful" in text),
+        int("order failed" in text or "login failed" in text),
+        int("risk" in text or "force exit" in text),
+    )
+
+
+class TelegramLogReader:
+    """
+    Tail-indexed reader for the append-only telegram message log.
+
+    The dashboard polls the last few hundred messages every refresh while
+    the log grows all session. Instead of re-reading the whole file:
+
+    ✅ First read seeks backward from EOF until `capacity` records are found
+    ✅ Parsed records are cached against (device, inode, byte offset);
+       later reads only parse the bytes appended since
+    ✅ A partially written last line is left for the next refresh
+    ✅ Running (alerts, success, failed, risk) prefix counters make the
+       windowed stats O(new lines) instead of O(window)
+    ✅ Rotation (inode change) and truncation drop the cache and re-tail
+
+    Cached record dicts are shared between callers — treat them as read-only.
+    """
+
+    CHUNK = 64 * 1024
+
+    def __init__(self, path: Path, capacity: int = 1000):
+        self.path = Path(path)
+        self.capacity = max(int(capacity), 1)
+        self._lock = threading.Lock()
+        self.parsed_lines = 0      # lines JSON-decoded over the reader's lifetime
+        self._reset(None)
+
+    def _reset(self, file_id: Optional[Tuple[int, int]]) -> None:
+        self._file_id = file_id
+        self._offset = 0           # byte offset just past the last consumed newline
+        self._records: Deque = deque()
+        self._ts: Deque = deque()
+        # _cum[i] = running counters up to and including record i;
+        # _base = counters of everything evicted before the window
+        self._cum: Deque[Tuple[int, int, int, int]] = deque()
+        self._base: Tuple[int, int, int, int] = (0, 0, 0, 0)
+
+    # --------------------------------------------------
+    # INGEST
+    # --------------------------------------------------
+    def _parse(self, raw: bytes):
+        self.parsed_lines += 1
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def _append(self, item) -> None:
+        flags = _classify(item)
+        last = self._cum[-1] if self._cum else self._base
+        self._records.append(item)
+        self._ts.append(item.get("ts") if isinstance(item, dict) else None)
+        self._cum.append((
+            last[0] + flags[0], last[1] + flags[1],
+            last[2] + flags[2], last[3] + flags[3],
+        ))
+        if len(self._records) > self.capacity:
+            self._records.popleft()
+            self._ts.popleft()
+            self._base = self._cum.popleft()
+
+    def _tail(self, f, size: int) -> int:
+        """
+        Load the newest `capacity` records reading backward from EOF.
+        Returns the offset just past the last complete line.
+        """
+        newest_first: List = []
+        end: Optional[int] = None
+        pos = size
+        head = b""
+        while pos > 0 and len(newest_first) < self.capacity:
+            step = min(self.CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + head).split(b"\n")
+            # the first piece may continue in the previous chunk
+            head = lines.pop(0) if pos > 0 else b""
+            if end is None:
+                if not lines:
+                    continue           # no newline yet
+                torn = lines.pop()     # partial line still being written
+                end = size - len(torn)
+            for raw in reversed(lines):
+                if not raw.strip():
+                    continue
+                item = self._parse(raw)
+                if item is not None:
+                    newest_first.append(item)
+                    if len(newest_first) == self.capacity:
+                        break
+        for item in reversed(newest_first):
+            self._append(item)
+        return end or 0
+
+    def _consume(self, f, start: int, size: int) -> None:
+        """Parse lines appended between `start` and EOF."""
+        f.seek(start)
+        data = f.read(size - start)
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            return                     # still mid-write
+        for raw in data[:cut].split(b"\n"):
+            if not raw.strip():
+                continue
+            item = self._parse(raw)
+            if item is not None:
+                self._append(item)
+        self._offset = start + cut + 1
+
+    def refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._reset(None)
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._offset:
+            self._reset(file_id)       # rotated or truncated
+        if st.st_size == self._offset:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                if self._offset:
+                    # Same inode and no shrink, but a rewrite in place would
+                    # leave our offset mid-line: the byte before it must
+                    # still be the newline we stopped at.
+                    f.seek(self._offset - 1)
+                    if f.read(1) != b"\n":
+                        self._reset(file_id)
+                if self._offset:
+                    self._consume(f, self._offset, st.st_size)
+                else:
+                    self._offset = self._tail(f, st.st_size)
+        except OSError as exc:
+            logger.warning("Could not read telegram log %s: %s", self.path, exc)
+
+    # --------------------------------------------------
+    # QUERIES
+    # --------------------------------------------------
+    def _ensure_capacity(self, limit: int) -> None:
+        if limit > self.capacity:
+            self.capacity = limit
+            self._reset(None)          # re-tail with the larger window
+
+    def messages(self, limit: int = 200) -> list:
+        limit = max(int(limit), 0)
+        with self._lock:
+            self._ensure_capacity(limit)
+            self.refresh()
+            n = min(limit, len(self._records))
+            return list(islice(self._records, len(self._records) - n, None))
+
+    def stats(self, limit: int = 500) -> dict:
+        limit = max(int(limit), 0)
+        with self._lock:
+            self._ensure_capacity(limit)
+            self.refresh()
+            total = min(limit, len(self._records))
+            if not total:
+                return {
+                    "total": 0, "success": 0, "failed": 0,
+                    "alerts": 0, "risk": 0, "last_ts": None,
+                }
+            last = self._cum[-1]
+            before = self._cum[-total - 1] if total < len(self._cum) else self._base
+            stamps = [
+                ts for ts in islice(self._ts, len(self._ts) - total, None) if ts
+            ]
+        return {
+            "total": total,
+            "success": last[1] - before[1],
+            "failed": last[2] - before[2],
+            "alerts": last[0] - before[0],
+            "risk": last[3] - before[3],
+            "last_ts": max(stamps) if stamps else None,
+        }
+
+
+_TELEGRAM_READERS: Dict[str, TelegramLogReader] = {}
+_TELEGRAM_READERS_LOCK = threading.Lock()
+
+
+def telegram_log_reader(path: Path = TELEGRAM_LOG) -> TelegramLogReader:
+    """Process-wide reader per log path (services are built per request)."""
+    key = str(path)
+    with _TELEGRAM_READERS_LOCK:
+        reader = _TELEGRAM_READERS.get(key)
+        if reader is None:
+            reader = _TELEGRAM_READERS[key] = TelegramLogReader(path)
+        return reader
+
+
 class SystemTruthService:
     """
     SYSTEM TRUTH — READ ONLY (Dashboard Layer)
@@ -137,55 +349,10 @@ class SystemTruthService:
     # TELEGRAM MESSAGE LOG (SYSTEM-SCOPED)
     # ==================================================
     def get_telegram_messages(self, limit: int = 200) -> list:
-        if not TELEGRAM_LOG.exists():
-            return []
-
-        try:
-            with open(TELEGRAM_LOG, "r", encoding="utf-8") as f:
-                lines = f.read().splitlines()
-        except Exception:
-            return []
-
-        items = []
-        for line in lines[-limit:]:
-            try:
-                items.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-        return items
+        return telegram_log_reader(TELEGRAM_LOG).messages(limit)
 
     def get_telegram_alert_stats(self, limit: int = 500) -> dict:
-        messages = self.get_telegram_messages(limit=limit)
-        total = len(messages)
-        success = 0
-        failed = 0
-        alerts = 0
-        risk = 0
-        last_ts = None
-
-        for item in messages:
-            text = (item.get("message") or "").lower()
-            ts = item.get("ts")
-            if ts:
-                last_ts = max(last_ts or ts, ts)
-
-            if "alert received" in text:
-                alerts += 1
-            if "order successful" in text or "login successful" in text:
-                success += 1
-            if "order failed" in text or "login failed" in text:
-                failed += 1
-            if "risk" in text or "force exit" in text:
-                risk += 1
-
-        return {
-            "total": total,
-            "success": success,
-            "failed": failed,
-            "alerts": alerts,
-            "risk": risk,
-            "last_ts": last_ts,
-        }
+        return telegram_log_reader(TELEGRAM_LOG).stats(limit)
 
     # ==================================================
     # DERIVED SYSTEM ANALYTICS
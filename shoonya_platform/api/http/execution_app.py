@@ -192,6 +192,7 @@ class ExecutionApp:
                         "total_trades": stats.total_trades,
                         "today_trades": stats.today_trades,
                         "last_activity": stats.last_activity,
+                        "alert_handling": self.bot.get_alert_handling_stats(),
                         "timestamp": datetime.now().isoformat(),
                     }
                 ), 200
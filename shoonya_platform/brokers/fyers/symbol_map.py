@@ -260,12 +260,12 @@ class FyersSymbolMapper:
 
         # For FnO, the exchange in Shoonya is NFO/BFO not NSE/BSE
         shoonya_exchange = _FYERS_EXCHANGE_MAP.get(exchange, exchange)
-        exch_data = SCRIPTMASTER.get(shoonya_exchange, {})
+        exch_data = SCRIPTMASTER.get(shoonya_exchange)
 
-        # Linear scan for TradingSymbol match (scriptmaster keyed by token)
-        for token, rec in exch_data.items():
-            if rec.get("TradingSymbol") == shoonya_sym:
-                return f"{shoonya_exchange}|{token}"
+        # TradingSymbol hash index (scriptmaster keyed by token)
+        rec = exch_data.get_by_tradingsymbol(shoonya_sym) if exch_data is not None else None
+        if rec:
+            return f"{shoonya_exchange}|{rec['Token']}"
 
         logger.debug("FyersSymbolMapper: no scriptmaster match for %s", fyers_symbol)
         return None
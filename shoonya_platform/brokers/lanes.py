@@ -0,0 +1,335 @@
+"""
+===============================================================================
+BROKER ACCESS LANES v1.0
+===============================================================================
+
+Replaces the single "one broker call at a time" lock with independent
+concurrency lanes so a slow read never queues an order:
+
+    orders  — place / modify / cancel            (priority on the rate limiter)
+    reads   — order book, positions, limits, ...
+    quotes  — quotes, LTP, search, time series, option chain
+    session — login / logout                     (exclusive: drains all lanes)
+
+Building blocks:
+    SlidingWindowRateLimiter — shared broker-wide budget, with a reserve
+                               only priority (order) callers may use
+    SessionGate              — shared/exclusive gate: REST calls share it,
+                               session changes (login/logout) take it alone
+    BrokerLanes              — per-lane bounded concurrency + stats
+
+Calls made from inside a lane call on the same thread run straight through
+(the old proxy lock was re-entrant; nested calls must not self-deadlock).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from shoonya_platform.utils.latency import LatencyHistogram
+
+
+# -----------------------------------------------------------------------------
+# Method → lane routing
+# -----------------------------------------------------------------------------
+
+ORDER_METHODS = frozenset({
+    "place_order",
+    "modify_order",
+    "cancel_order",
+    "exit_order",
+})
+
+QUOTE_METHODS = frozenset({
+    "get_quotes",
+    "get_ltp",
+    "searchscrip",
+    "search_scrip",
+    "get_time_price_series",
+    "get_option_chain",
+    "get_security_info",
+})
+
+SESSION_METHODS = frozenset({
+    "login",
+    "logout",
+})
+
+# Default max concurrent calls per lane
+DEFAULT_LANE_LIMITS: Dict[str, int] = {
+    "orders": 4,
+    "reads": 2,
+    "quotes": 4,
+    "session": 1,
+}
+
+
+def lane_for(method: str) -> str:
+    """Lane a broker method runs in (unknown methods are treated as reads)."""
+    if method in ORDER_METHODS:
+        return "orders"
+    if method in QUOTE_METHODS:
+        return "quotes"
+    if method in SESSION_METHODS:
+        return "session"
+    return "reads"
+
+
+# -----------------------------------------------------------------------------
+# Shared rate limiter
+# -----------------------------------------------------------------------------
+
+class SlidingWindowRateLimiter:
+    """
+    At most `max_calls` per `window_sec` across every lane.
+
+    Non-priority callers may only use `max_calls - priority_reserve` slots
+    and yield to any waiting priority caller, so order placement is never
+    starved by a burst of reads. `clock` places calls in the window
+    (tests pass a manual clock).
+    """
+
+    def __init__(
+        self,
+        max_calls: int,
+        window_sec: float = 1.0,
+        priority_reserve: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_calls < 1:
+            raise ValueError("max_calls must be >= 1")
+        self.max_calls = max_calls
+        self.window_sec = window_sec
+        self.priority_reserve = max(0, min(priority_reserve, max_calls - 1))
+        self._clock = clock
+        self._calls: Deque[float] = deque()
+        self._cond = threading.Condition()
+        self._priority_waiting = 0
+        self._waiting = 0
+        self._stats = {"acquired": 0, "priority_acquired": 0, "throttled": 0}
+        self._wait = LatencyHistogram()
+
+    def _prune(self, now: float) -> None:
+        while self._calls and now - self._calls[0] >= self.window_sec:
+            self._calls.popleft()
+
+    def acquire(self, priority: bool = False) -> float:
+        """Block until a call may be made; returns the seconds spent waiting."""
+        started = time.monotonic()
+        throttled = False
+        with self._cond:
+            if priority:
+                self._priority_waiting += 1
+            try:
+                while True:
+                    now = self._clock()
+                    self._prune(now)
+                    limit = self.max_calls if priority else self.max_calls - self.priority_reserve
+                    if len(self._calls) < limit and (priority or not self._priority_waiting):
+                        self._calls.append(now)
+                        break
+                    if not throttled:
+                        throttled = True
+                        self._waiting += 1
+                    if len(self._calls) >= limit:
+                        timeout = self.window_sec - (now - self._calls[0])
+                    else:
+                        timeout = self.window_sec  # yielding to a priority caller
+                    self._cond.wait(max(timeout, 0.001))
+            finally:
+                if throttled:
+                    self._waiting -= 1
+                if priority:
+                    self._priority_waiting -= 1
+                    self._cond.notify_all()
+            self._stats["acquired"] += 1
+            if priority:
+                self._stats["priority_acquired"] += 1
+            if throttled:
+                self._stats["throttled"] += 1
+        waited = time.monotonic() - started
+        self._wait.observe(waited)
+        return waited
+
+    def calls_in_window(self) -> int:
+        with self._cond:
+            self._prune(self._clock())
+            return len(self._calls)
+
+    def waiting(self) -> int:
+        """Callers currently blocked on the window (or yielding to orders)."""
+        with self._cond:
+            return self._waiting
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "max_calls": self.max_calls,
+            "window_sec": self.window_sec,
+            "priority_reserve": self.priority_reserve,
+            "calls_in_window": self.calls_in_window(),
+            "waiting": self.waiting(),
+            "wait": self._wait.snapshot(),
+        }
+
+
+# -----------------------------------------------------------------------------
+# Session gate (shared REST / exclusive login)
+# -----------------------------------------------------------------------------
+
+class SessionGate:
+    """
+    Shared/exclusive gate. New shared holders are not blocked by a waiting
+    exclusive caller (a thread already inside a REST call may nest another),
+    and the exclusive owner passes through its own shared acquisitions.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._owner: Optional[int] = None
+        self._depth = 0
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                nested = True
+            else:
+                while self._owner is not None:
+                    self._cond.wait()
+                self._shared += 1
+                nested = False
+        try:
+            yield
+        finally:
+            with self._cond:
+                if nested:
+                    self._depth -= 1
+                else:
+                    self._shared -= 1
+                    if not self._shared:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+            else:
+                while self._owner is not None or self._shared:
+                    self._cond.wait()
+                self._owner = me
+                self._depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._depth -= 1
+                if not self._depth:
+                    self._owner = None
+                    self._cond.notify_all()
+
+
+# -----------------------------------------------------------------------------
+# Lanes
+# -----------------------------------------------------------------------------
+
+class _Lane:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._sem = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.wait = LatencyHistogram()
+        self.duration = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "wait": self.wait.snapshot(),
+            "duration": self.duration.snapshot(),
+        }
+
+
+class BrokerLanes:
+    """
+    Runs broker calls in their lane.
+
+        lanes = BrokerLanes(rate_limiter=limiter)
+        lanes.run("get_order_book", client.get_order_book)
+
+    `rate_limiter` is optional: pass one when the wrapped client does not
+    rate-limit itself (ShoonyaClient does, and shares its limiter instead).
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        rate_limiter: Optional[SlidingWindowRateLimiter] = None,
+        session_gate: Optional[SessionGate] = None,
+    ):
+        merged = dict(DEFAULT_LANE_LIMITS)
+        merged.update(limits or {})
+        self._lanes = {name: _Lane(name, max(1, int(n))) for name, n in merged.items()}
+        self.rate_limiter = rate_limiter
+        self.session_gate = session_gate or SessionGate()
+        self._local = threading.local()
+
+    def run(self, method: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        # Nested call from inside a lane call: already holds its resources
+        if getattr(self._local, "active", False):
+            return func(*args, **kwargs)
+
+        lane_name = lane_for(method)
+        lane = self._lanes[lane_name]
+        gate = (
+            self.session_gate.exclusive() if lane_name == "session"
+            else self.session_gate.shared()
+        )
+
+        queued_at = time.monotonic()
+        with lane._sem, gate:
+            if self.rate_limiter is not None and lane_name != "session":
+                self.rate_limiter.acquire(priority=lane_name == "orders")
+            started = time.monotonic()
+            lane.wait.observe(started - queued_at)
+            with lane._lock:
+                lane.calls += 1
+                lane.in_flight += 1
+                lane.max_in_flight = max(lane.max_in_flight, lane.in_flight)
+            self._local.active = True
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                with lane._lock:
+                    lane.errors += 1
+                raise
+            finally:
+                self._local.active = False
+                lane.duration.observe(time.monotonic() - started)
+                with lane._lock:
+                    lane.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "lanes": {name: lane.snapshot() for name, lane in self._lanes.items()},
+        }
+        if self.rate_limiter is not None:
+            stats["rate_limiter"] = self.rate_limiter.get_stats()
+        return stats
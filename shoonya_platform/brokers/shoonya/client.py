@@ -95,13 +95,13 @@ import threading
 from datetime import datetime, timedelta
 from typing import Optional, Callable, Any, List, Set, Union, Dict
 from threading import RLock
-from collections import deque
 
 import pyotp
 from NorenRestApiPy.NorenApi import NorenApi
 
 from shoonya_platform.core.config import Config
 from shoonya_platform.domain.business_models import OrderResult, AccountInfo
+from shoonya_platform.brokers.lanes import SessionGate, SlidingWindowRateLimiter
 
 
 logger = logging.getLogger(__name__)
@@ -147,6 +147,7 @@ class ShoonyaClient(NorenApi):
     # Rate limiting (configurable)
     MAX_API_CALLS_PER_SECOND = 10
     RATE_LIMIT_WINDOW_SECONDS = 1.0
+    ORDER_RATE_RESERVE = 2  # slots per window only order calls may use
     
     # WebSocket reconnection
     WS_MAX_RECONNECT_ATTEMPTS = 50  # 🔒 FIX: Was 5 (permanent death). Now retries indefinitely during market hours.
@@ -183,8 +184,10 @@ class ShoonyaClient(NorenApi):
         self._enable_auto_recovery = enable_auto_recovery
         
         # Thread safety (RLock for re-entrant protection)
+        # _api_lock: session / websocket state. REST calls no longer hold it —
+        # they share _session_gate, which login/logout take exclusively.
         self._api_lock = RLock()
-        self._rate_limit_lock = RLock()
+        self._session_gate = SessionGate()
         
         # Session state
         self._logged_in: bool = False
@@ -202,8 +205,13 @@ class ShoonyaClient(NorenApi):
         self._ws_reconnect_in_progress: bool = False
         self._subscribed_tokens: Set[str] = set()
         
-        # Rate limiting (sliding window)
-        self._api_call_times: deque = deque(maxlen=100)
+        # Rate limiting (sliding window, shared by every lane; orders get
+        # priority and a reserved slot)
+        self.rate_limiter = SlidingWindowRateLimiter(
+            self.MAX_API_CALLS_PER_SECOND,
+            self.RATE_LIMIT_WINDOW_SECONDS,
+            priority_reserve=self.ORDER_RATE_RESERVE,
+        )
         
         # Activity tracking
         self._last_api_call: float = 0
@@ -227,33 +235,17 @@ class ShoonyaClient(NorenApi):
     # RATE LIMITING
     # =========================================================================
 
-    def _check_api_rate_limit(self) -> None:
+    def _check_api_rate_limit(self, priority: bool = False) -> None:
         """
         Enforce API rate limits to prevent broker bans.
         
-        Thread-safe with separate lock to avoid blocking critical operations.
-        Uses sliding window algorithm for accurate rate limiting.
+        Sliding window shared by all callers. priority=True (order
+        placement / modify / cancel) may use the reserved slots and is
+        served before waiting reads.
         """
-        now = time.time()
-
-        with self._rate_limit_lock:
-            # Remove expired timestamps (sliding window)
-            while (self._api_call_times and 
-                   now - self._api_call_times[0] > self.RATE_LIMIT_WINDOW_SECONDS):
-                self._api_call_times.popleft()
-
-            # Check if rate limit exceeded
-            if len(self._api_call_times) >= self.MAX_API_CALLS_PER_SECOND:
-                oldest = self._api_call_times[0]
-                sleep_time = self.RATE_LIMIT_WINDOW_SECONDS - (now - oldest)
-                
-                if sleep_time > 0:
-                    logger.debug("⏱️  Rate limiting: sleeping %.3fs", sleep_time)
-                    time.sleep(sleep_time)
-                    now = time.time()
-
-            # Record this API call
-            self._api_call_times.append(now)
+        waited = self.rate_limiter.acquire(priority=priority)
+        if waited > 0.001:
+            logger.debug("⏱️  Rate limiting: waited %.3fs (priority=%s)", waited, priority)
 
     # =========================================================================
     # RESPONSE NORMALIZATION (BROKER-REALISTIC)
@@ -503,7 +495,7 @@ class ShoonyaClient(NorenApi):
             self._check_api_rate_limit()
             
             # Use lightweight get_watch_list_names() instead of heavy get_limits()
-            with self._api_lock:
+            with self._session_gate.shared():
                 resp = super().get_watch_list_names()
 
             # Check if session is still valid
@@ -696,7 +688,7 @@ class ShoonyaClient(NorenApi):
                     )
 
                     # Perform login
-                    with self._api_lock:
+                    with self._api_lock, self._session_gate.exclusive():
                         response = super().login(
                             userid=creds["user_id"],
                             password=creds["password"],
@@ -742,7 +734,7 @@ class ShoonyaClient(NorenApi):
 
     def logout(self) -> None:
         """Thread-safe logout with complete state cleanup."""
-        with self._api_lock:
+        with self._api_lock, self._session_gate.exclusive():
             if not self._logged_in:
                 logger.debug("Already logged out")
                 return
@@ -1038,10 +1030,10 @@ class ShoonyaClient(NorenApi):
             # Retry loop with exponential backoff
             for attempt in range(1, self.ORDER_MAX_RETRY_ATTEMPTS + 1):
                 # Rate limit protection
-                self._check_api_rate_limit()
+                self._check_api_rate_limit(priority=True)
                 
                 # Place order
-                with self._api_lock:
+                with self._session_gate.shared():
                     response = super().place_order(**params)
 
                 # Success case
@@ -1144,10 +1136,10 @@ class ShoonyaClient(NorenApi):
                 return None
 
             # Rate limit protection
-            self._check_api_rate_limit()
+            self._check_api_rate_limit(priority=True)
             
             # Modify order
-            with self._api_lock:
+            with self._session_gate.shared():
                 response = super().modify_order(**params)
             # 🔧 FIXED: Update activity timestamp
             self._last_api_call = time.time()
@@ -1194,10 +1186,10 @@ class ShoonyaClient(NorenApi):
 
         try:
             # Rate limit protection
-            self._check_api_rate_limit()
+            self._check_api_rate_limit(priority=True)
             
             # Cancel order
-            with self._api_lock:
+            with self._session_gate.shared():
                 response = super().cancel_order(orderno=orderno)
             # 🔧 FIXED: Update activity timestamp
             self._last_api_call = time.time()
@@ -1264,7 +1256,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
             
-            with self._api_lock:
+            with self._session_gate.shared():
                 resp = super().get_limits()
 
             self._last_api_call = time.time()
@@ -1298,7 +1290,7 @@ class ShoonyaClient(NorenApi):
                     # Force actual re-login (don't let login() skip with "Already logged in")
                     self._logged_in = False
                     if self.login():
-                        with self._api_lock:
+                        with self._session_gate.shared():
                             resp2 = super().get_limits()
                         self._last_api_call = time.time()
                         limits = self._normalize_dict_response(
@@ -1373,7 +1365,7 @@ class ShoonyaClient(NorenApi):
 
         try:
             self._check_api_rate_limit()
-            with self._api_lock:
+            with self._session_gate.shared():
                 resp = super().get_positions()
 
             # 🔧 FIXED: Update activity timestamp
@@ -1435,7 +1427,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
 
-            with self._api_lock:
+            with self._session_gate.shared():
                 resp = super().get_holdings()
 
             # Normalize response (non-critical - soft fail on broker errors)
@@ -1484,7 +1476,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
 
-            with self._api_lock:
+            with self._session_gate.shared():
                 resp = super().get_order_book()
 
             # 🔧 FIXED: Update activity timestamp
@@ -1565,7 +1557,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
             
-            with self._api_lock:
+            with self._session_gate.shared():
                 return super().searchscrip(
                     exchange=exchange,
                     searchtext=searchtext
@@ -1602,7 +1594,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
             
-            with self._api_lock:
+            with self._session_gate.shared():
                 return super().get_quotes(exchange=exchange, token=token)
         
         except RuntimeError:
@@ -1636,7 +1628,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
             
-            with self._api_lock:
+            with self._session_gate.shared():
                 resp = super().get_quotes(exchange=exchange, token=token)
             
             if not resp or resp.get("stat") != "Ok":
@@ -1692,7 +1684,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
             
-            with self._api_lock:
+            with self._session_gate.shared():
                 return super().get_time_price_series(
                     exchange=exchange,
                     token=token,
@@ -1740,7 +1732,7 @@ class ShoonyaClient(NorenApi):
         try:
             self._check_api_rate_limit()
             
-            with self._api_lock:
+            with self._session_gate.shared():
                 return super().get_option_chain(
                     exchange=exchange,
                     tradingsymbol=tradingsymbol,
@@ -1787,8 +1779,7 @@ class ShoonyaClient(NorenApi):
             })
         
         # Rate limiting stats
-        with self._rate_limit_lock:
-            info["api_calls_last_second"] = len(self._api_call_times)
+        info["api_calls_last_second"] = self.rate_limiter.calls_in_window()
         
         return info
 
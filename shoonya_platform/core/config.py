@@ -152,6 +152,12 @@ class Config:
             os.getenv("RISK_STATUS_UPDATE_MIN", "30"),
             "RISK_STATUS_UPDATE_MIN"
         )
+        # Max age of the heartbeat-refreshed risk verdict before can_execute()
+        # falls back to a synchronous broker PnL refresh
+        self.risk_verdict_max_staleness_sec: float = self._parse_float(
+            os.getenv("RISK_VERDICT_MAX_STALENESS_SEC", "15"),
+            "RISK_VERDICT_MAX_STALENESS_SEC"
+        )
         # === Risk State ===
         # Default to project's logs/ directory (survives reboots, unlike /tmp).
         _project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -428,6 +434,11 @@ class Config:
                 "RISK_STATUS_UPDATE_MIN must be >= 1 minute"
             )
 
+        if self.risk_verdict_max_staleness_sec <= 0:
+            raise ConfigValidationError(
+                "RISK_VERDICT_MAX_STALENESS_SEC must be > 0"
+            )
+
         # Webhook secret validation
         if self.webhook_secret and len(self.webhook_secret) < 16:
             logger.warning(
@@ -263,8 +263,7 @@ class AlertProcessingMixin:
 
         while time.time() < deadline:
             try:
-                self.broker_view.invalidate_cache("positions")
-                positions = self.broker_view.get_positions(force_refresh=True) or []
+                positions = self.broker_view.get_positions(max_age=0.0, consumer="alert_routing") or []
 
                 positions_flat = True
                 for p in positions:
@@ -330,8 +329,7 @@ class AlertProcessingMixin:
 
         try:
             try:
-                self.broker_view.invalidate_cache("positions")
-                broker_positions = self.broker_view.get_positions(force_refresh=True) or []
+                broker_positions = self.broker_view.get_positions(max_age=0.0, consumer="alert_routing") or []
             except Exception as e:
                 logger.warning(f"ATOMIC_BATCH | Failed to get positions: {e}")
                 broker_positions = []
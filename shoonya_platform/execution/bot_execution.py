@@ -28,6 +28,28 @@ class ExecutionMixin:
     """Methods for alert execution, command dispatch, and strategy startup."""
 
     def process_alert(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Alert entry point: handles the alert and records how long handling took."""
+        started = time.perf_counter()
+        try:
+            return self._process_alert_inner(alert_data)
+        finally:
+            duration = getattr(self, "_process_alert_duration", None)
+            if duration is not None:
+                duration.observe(time.perf_counter() - started)
+
+    def get_alert_handling_stats(self) -> Dict[str, Any]:
+        """
+        process_alert() duration percentiles (parse → RMS gate → broker
+        submit → response), the RMS gate's share and the current verdict.
+        """
+        duration = getattr(self, "_process_alert_duration", None)
+        return {
+            "process_alert_duration": duration.snapshot() if duration is not None else None,
+            "risk_gate": self.risk_manager.get_verdict_stats(),
+            "risk_verdict": self.risk_manager.get_risk_verdict(),
+        }
+
+    def _process_alert_inner(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         PURE EXECUTION ALERT HANDLER (PRODUCTION — FROZEN)
 
@@ -40,8 +62,8 @@ class ExecutionMixin:
         """
 
         try:
-            # RISK HEARTBEAT
-            self.risk_manager.heartbeat()
+            # RMS heartbeat runs on the scheduler (every 5 s); can_execute()
+            # below reads its verdict instead of a broker round-trip here.
             self._ensure_login()
 
             parsed = self.parse_alert_data(alert_data)
@@ -89,8 +111,7 @@ class ExecutionMixin:
                 # MOCK: reconcile from executor's tracked legs (no broker call)
                 if not parsed.test_mode:
                     try:
-                        self.broker_view.invalidate_cache("positions")
-                        positions = self.broker_view.get_positions(force_refresh=True)
+                        positions = self.broker_view.get_positions(max_age=0.0, consumer="alert_guard")
                     except Exception as pos_err:
                         logger.warning("Failed to fetch positions for guard reconciliation: %s", pos_err)
                         positions = []
@@ -203,8 +224,7 @@ class ExecutionMixin:
                 if execution_type == "EXIT":
                     if not parsed.test_mode:
                         try:
-                            self.broker_view.invalidate_cache("positions")
-                            exit_positions_cache = self.broker_view.get_positions(force_refresh=True) or []
+                            exit_positions_cache = self.broker_view.get_positions(max_age=0.0, consumer="alert_guard") or []
                         except Exception:
                             exit_positions_cache = []
                     else:
@@ -731,8 +751,7 @@ class ExecutionMixin:
                             )
                         else:
                             try:
-                                self.broker_view.invalidate_cache(target="positions")
-                                self.broker_view.invalidate_cache(target="orders")
+                                self.broker_view.on_order_event("placed")
                                 logger.debug(
                                     f"CACHE_INVALIDATED | cmd_id={command.command_id} | "
                                     f"targets=['positions', 'orders']"
@@ -0,0 +1,179 @@
+"""
+===============================================================================
+MANAGED-EXIT TRIGGER ENGINE v1.0
+===============================================================================
+
+Tick-driven companion to OrderWatcher STEP 8 (managed exits).
+
+    PriceLevelBook    — token → sorted trigger levels. A tick at price p hits
+                        every "below" level >= p and every "above" level <= p
+                        in O(log n + hits).
+    ExitTriggerEngine — waits on TickStore writes, reads only the watched
+                        tokens' LTPs and calls back for each hit level.
+
+The engine only answers "did a level get crossed?". Whether that means a
+trailing-SL move, an SL / target exit or nothing is decided by OrderWatcher,
+which also confirms the broker quantity before firing. The REST positions
+poll stays as the fallback when a token has no ticks.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from shoonya_platform.logging.logger_config import get_component_logger
+from shoonya_platform.utils.latency import LatencyHistogram
+
+logger = get_component_logger('order_watcher')
+
+# (cmd_id, tick LTP, tick write time on time.monotonic())
+TriggerCallback = Callable[[str, float, float], None]
+
+
+class _TokenLevels:
+    __slots__ = ("below", "above")
+
+    def __init__(self):
+        self.below: List[Tuple[float, str]] = []  # hit when ltp <= level
+        self.above: List[Tuple[float, str]] = []  # hit when ltp >= level
+
+
+class PriceLevelBook:
+    """
+    Sorted trigger levels per token. Each command has at most a handful of
+    levels (SL, target, trailing watch); set() replaces all of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, _TokenLevels] = {}
+        self._by_cmd: Dict[str, Tuple[str, Tuple[float, ...], Tuple[float, ...]]] = {}
+
+    def set(self, cmd_id: str, token: str,
+            below: Iterable[Optional[float]] = (),
+            above: Iterable[Optional[float]] = ()) -> None:
+        below = tuple(float(x) for x in below if x is not None)
+        above = tuple(float(x) for x in above if x is not None)
+        with self._lock:
+            self._remove_locked(cmd_id)
+            if not below and not above:
+                return
+            levels = self._tokens.setdefault(token, _TokenLevels())
+            for lvl in below:
+                bisect.insort(levels.below, (lvl, cmd_id))
+            for lvl in above:
+                bisect.insort(levels.above, (lvl, cmd_id))
+            self._by_cmd[cmd_id] = (token, below, above)
+
+    def remove(self, cmd_id: str) -> None:
+        with self._lock:
+            self._remove_locked(cmd_id)
+
+    def _remove_locked(self, cmd_id: str) -> None:
+        entry = self._by_cmd.pop(cmd_id, None)
+        if entry is None:
+            return
+        token, below, above = entry
+        levels = self._tokens[token]
+        for lvl in below:
+            levels.below.remove((lvl, cmd_id))
+        for lvl in above:
+            levels.above.remove((lvl, cmd_id))
+        if not levels.below and not levels.above:
+            del self._tokens[token]
+
+    def hits(self, token: str, ltp: float) -> List[str]:
+        """Commands with a level crossed by ``ltp`` (each listed once)."""
+        with self._lock:
+            levels = self._tokens.get(token)
+            if levels is None:
+                return []
+            out = [cmd for _, cmd in levels.below[bisect.bisect_left(levels.below, (ltp, "")):]]
+            out += [cmd for _, cmd in levels.above[:bisect.bisect_right(levels.above, (ltp, "\uffff"))]]
+        return list(dict.fromkeys(out))
+
+    def levels_for(self, cmd_id: str) -> Optional[Tuple[str, Tuple[float, ...], Tuple[float, ...]]]:
+        with self._lock:
+            return self._by_cmd.get(cmd_id)
+
+    def tokens(self) -> Set[str]:
+        with self._lock:
+            return set(self._tokens)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_cmd)
+
+
+class ExitTriggerEngine(threading.Thread):
+    """
+    Evaluates the level book on tick writes.
+
+    Pull-based like every other feed consumer: blocks in
+    TickStore.wait_for_seq() and reads only the watched tokens changed since
+    the last pass, so the feed thread never runs trigger code.
+    """
+
+    def __init__(self, book: PriceLevelBook, on_trigger: TriggerCallback,
+                 store=None, idle_timeout: float = 0.5):
+        super().__init__(daemon=True, name="ExitTriggerEngine")
+        if store is None:
+            from shoonya_platform.market_data.feeds.live_feed import tick_data_store
+            store = tick_data_store
+        self.book = book
+        self.on_trigger = on_trigger
+        self.store = store
+        self.idle_timeout = idle_timeout
+        self._running = threading.Event()
+        self._running.set()
+        self._tick_to_trigger = LatencyHistogram()
+        self._stats = {"passes": 0, "ticks": 0, "hits": 0, "errors": 0}
+
+    def stop(self) -> None:
+        self._running.clear()
+
+    def run(self) -> None:
+        logger.info("🎯 ExitTriggerEngine started (tick-driven managed exits)")
+        seq = self.store.seq
+        while self._running.is_set():
+            try:
+                seq = self.process(seq, wait=True)
+            except Exception:
+                self._stats["errors"] += 1
+                logger.exception("ExitTriggerEngine: pass failed")
+                time.sleep(self.idle_timeout)
+
+    def process(self, since_seq: int, wait: bool = False) -> int:
+        """One pass over ticks written after ``since_seq``; returns the new seq."""
+        if wait:
+            self.store.wait_for_seq(since_seq, self.idle_timeout)
+        tokens = self.book.tokens()
+        if not tokens:
+            return self.store.seq
+        seq, prices = self.store.prices_since(since_seq, tokens)
+        if not prices:
+            return seq
+
+        self._stats["passes"] += 1
+        for token, (ltp, written_at) in prices.items():
+            self._stats["ticks"] += 1
+            for cmd_id in self.book.hits(token, ltp):
+                self._stats["hits"] += 1
+                self._tick_to_trigger.observe(time.monotonic() - written_at)
+                try:
+                    self.on_trigger(cmd_id, ltp, written_at)
+                except Exception:
+                    self._stats["errors"] += 1
+                    logger.exception("ExitTriggerEngine: trigger failed | cmd_id=%s", cmd_id)
+        return seq
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self._stats,
+            "watched_exits": len(self.book),
+            "watched_tokens": len(self.book.tokens()),
+            "tick_to_trigger": self._tick_to_trigger.snapshot(),
+        }
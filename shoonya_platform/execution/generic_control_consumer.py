@@ -42,13 +42,22 @@ import time
 import logging
 import sqlite3
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from shoonya_platform.persistence.database import get_connection
+from shoonya_platform.persistence.intent_queue import (
+    CLAIM_BATCH_SIZE,
+    FALLBACK_POLL_SEC,
+    claim_pending_intents,
+    intent_wakeup,
+    release_intents,
+)
 
 logger = logging.getLogger("EXECUTION.CONTROL")
 
-POLL_INTERVAL_SEC = 1.0
+# Idle wait only matters for intents written by another process; in-process
+# writers (DashboardIntentService) wake the consumer via intent_wakeup.
+POLL_INTERVAL_SEC = FALLBACK_POLL_SEC
 
 
 class GenericControlIntentConsumer:
@@ -77,9 +86,12 @@ class GenericControlIntentConsumer:
 
         while not self.stop_event.is_set():
             try:
-                processed = self._process_next_intent()
+                # Read the wakeup version BEFORE claiming: an intent inserted
+                # after an empty claim bumps it and cuts the wait short.
+                seen = intent_wakeup.version
+                processed = self._process_pending_intents()
                 if not processed:
-                    time.sleep(POLL_INTERVAL_SEC)
+                    intent_wakeup.wait(seen, POLL_INTERVAL_SEC)
 
             # 🔥 FAIL-HARD: broker / session failure must kill process
             except RuntimeError:
@@ -249,13 +261,29 @@ class GenericControlIntentConsumer:
         return "REJECTED"
 
     # ==================================================
-    # PROCESS SINGLE INTENT
+    # PROCESS CLAIMED BATCH
     # ==================================================
+    def _process_pending_intents(self) -> int:
+        """Claim a batch of PENDING intents and process them in order."""
+        rows = self._claim_intents()
+        for idx, row in enumerate(rows):
+            if self.stop_event.is_set():
+                # Unstarted intents go back to PENDING for the next run
+                release_intents([r[0] for r in rows[idx:]])
+                return idx
+            self._process_intent(row)
+        return len(rows)
+
     def _process_next_intent(self) -> bool:
-        
-        row = self._claim_next_intent()
-        if not row:
+        rows = self._claim_intents(limit=1)
+        if not rows:
             return False
+        return self._process_intent(rows[0])
+
+    # ==================================================
+    # PROCESS SINGLE INTENT
+    # ==================================================
+    def _process_intent(self, row: Tuple[str, str, str]) -> bool:
 
         intent_id, intent_type, payload_json = row
 
@@ -527,44 +555,17 @@ class GenericControlIntentConsumer:
         conn.close()
 
     # ==================================================
-    # CLAIM NEXT INTENT (ATOMIC)
+    # CLAIM INTENTS (ATOMIC, BATCHED)
     # ==================================================
-    def _claim_next_intent(self) -> Optional[Tuple[str, str, str]]:
-        conn = get_connection()
-        cur = conn.cursor()
-
-        try:
-            cur.execute("BEGIN IMMEDIATE")
-
-            cur.execute(
-                """
-                SELECT id, type, payload
-                FROM control_intents
-                WHERE status = 'PENDING'
-                ORDER BY created_at
-                LIMIT 1
-                """
-            )
-
-            row = cur.fetchone()
-            if not row:
-                conn.commit()
-                return None
-
-            cur.execute(
-                """
-                UPDATE control_intents
-                SET status = 'PROCESSING'
-                WHERE id = ?
-                """,
-                (row[0],),
-            )
-
-            conn.commit()
-            return row
+    def _claim_intents(self, limit: int = CLAIM_BATCH_SIZE) -> List[Tuple[str, str, str]]:
+        # STRATEGY intents belong to StrategyControlConsumer — never claim them
+        return claim_pending_intents(
+            "id, type, payload", "type != 'STRATEGY'", limit=limit,
+        )
 
-        finally:
-            conn.close()
+    def _claim_next_intent(self) -> Optional[Tuple[str, str, str]]:
+        rows = self._claim_intents(limit=1)
+        return rows[0] if rows else None
 
     # ==================================================
     # UPDATE STATUS
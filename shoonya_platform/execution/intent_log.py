@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Intent Tracking Log Writer
+==========================
+
+Background, buffered writer behind IntentTracker so lifecycle events never
+open/close a file on the order path.
+
+- submit() only appends to an in-memory queue (+ the recent-events index)
+- Worker thread writes batches to one open handle every flush_interval
+- fsync policy: "none" (OS buffered), "interval" (after each flush),
+  "always" (flush + fsync as soon as a batch is queued)
+- Size-based rotation: path → path.1 → ... → path.<backup_count>
+- Formats: "jsonl" (one JSON object per line, grep-friendly) or "bin"
+  (length-prefixed records: stage code + epoch ts + command_id + compact
+  JSON of the remaining fields)
+- lifecycle(command_id): served from an in-memory index of recent events;
+  older ids (and ids that got new events after being evicted) fall back to
+  an offset index built once over the files
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from shoonya_platform.utils.latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    "INTENT_CREATED",
+    "DB_WRITE",
+    "SENT_TO_BROKER",
+    "BROKER_CONFIRMED",
+    "EXECUTED",
+    "FAILED",
+    "ERROR",
+)
+_STAGE_CODE = {s: i for i, s in enumerate(STAGES)}
+_UNKNOWN_STAGE = 255
+
+FSYNC_POLICIES = ("none", "interval", "always")
+FORMATS = ("jsonl", "bin")
+
+BIN_MAGIC = b"ITLOG1\n"
+# payload length, stage code, epoch seconds, command_id length
+_BIN_HEADER = struct.Struct("<IBdH")
+
+# evicted ids remembered (as a multiple of index_size) so a late event for
+# one of them does not pass off its new events as the whole lifecycle
+_EVICTED_FACTOR = 10
+
+
+# ---------------------------------------------------------------------------
+# Record codecs
+# ---------------------------------------------------------------------------
+
+def _epoch(ts: Optional[str]) -> float:
+    if not ts:
+        return time.time()
+    try:
+        return datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return time.time()
+
+
+def encode_record(msg: Dict[str, Any], fmt: str) -> bytes:
+    if fmt == "jsonl":
+        return (json.dumps(msg) + "\n").encode("utf-8")
+
+    rest = {k: v for k, v in msg.items() if k not in ("stage", "command_id", "timestamp")}
+    stage = msg.get("stage")
+    if stage not in _STAGE_CODE:
+        rest["stage"] = stage
+    cmd = str(msg.get("command_id") or "").encode("utf-8")
+    body = json.dumps(rest, separators=(",", ":")).encode("utf-8") if rest else b""
+    return _BIN_HEADER.pack(
+        len(cmd) + len(body), _STAGE_CODE.get(stage, _UNKNOWN_STAGE),
+        _epoch(msg.get("timestamp")), len(cmd),
+    ) + cmd + body
+
+
+def _iter_file(path: Path, fmt: str, start: int = 0) -> Iterator[Tuple[int, int, str, Optional[Dict[str, Any]]]]:
+    """
+    Yield (offset, end, command_id, record_or_None) from ``start``. Binary
+    records are yielded without decoding the JSON body (record is None).
+    Stops at a torn tail (partial last record).
+    """
+    with open(path, "rb") as f:
+        if fmt == "bin":
+            if start == 0:
+                if f.read(len(BIN_MAGIC)) != BIN_MAGIC:
+                    return
+                start = len(BIN_MAGIC)
+            f.seek(start)
+            data = f.read()
+            pos = 0
+            while pos + _BIN_HEADER.size <= len(data):
+                length, _, _, cmd_len = _BIN_HEADER.unpack_from(data, pos)
+                end = pos + _BIN_HEADER.size + length
+                if end > len(data):
+                    break
+                cmd = data[pos + _BIN_HEADER.size:pos + _BIN_HEADER.size + cmd_len].decode("utf-8")
+                yield start + pos, start + end, cmd, None
+                pos = end
+        else:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                end = offset + len(line)
+                try:
+                    rec = json.loads(line)
+                    yield offset, end, str(rec.get("command_id")), rec
+                except ValueError:
+                    pass
+                offset = end
+
+
+def _decode_at(path: Path, fmt: str, offset: int, end: int) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(end - offset)
+    if fmt == "jsonl":
+        return json.loads(data)
+    length, code, ts, cmd_len = _BIN_HEADER.unpack_from(data, 0)
+    body = data[_BIN_HEADER.size:]
+    rec: Dict[str, Any] = {
+        "stage": STAGES[code] if code < len(STAGES) else None,
+        "command_id": body[:cmd_len].decode("utf-8"),
+        "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None).isoformat(),
+    }
+    if len(body) > cmd_len:
+        rec.update(json.loads(body[cmd_len:]))
+    return rec
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+class IntentLogWriter:
+    """Single worker thread appending lifecycle events to a rotating log."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        fmt: str = "jsonl",
+        flush_interval: float = 0.2,
+        fsync: str = "interval",
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_queue: int = 100_000,
+        index_size: int = 20_000,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_queue = max_queue
+        self.index_size = index_size
+
+        self._queue: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self._fh = None
+        self._fh_size = 0
+
+        # command_id → events in first-seen order; oldest ids evicted first
+        self._recent: Dict[str, List[Dict[str, Any]]] = {}
+        # ids in _recent holding only the events since they were re-added
+        self._partial: Set[str] = set()
+        self._evicted: "OrderedDict[str, None]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        # Offset index over the files for ids that fell out of _recent
+        self._file_index: Dict[str, List[Tuple[str, int, int]]] = {}
+        self._file_scanned: Dict[str, int] = {}
+        self._file_lock = threading.Lock()
+
+        self._stats = {
+            "events": 0,
+            "batches": 0,
+            "bytes": 0,
+            "fsyncs": 0,
+            "rotations": 0,
+            "dropped": 0,
+            "errors": 0,
+        }
+        self._latency = LatencyHistogram()  # submit → written (+fsync)
+
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+
+    def start(self) -> "IntentLogWriter":
+        if self._thread and self._thread.is_alive():
+            return self
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="IntentLogWriter", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything queued, fsync (unless policy "none") and stop."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("IntentLogWriter did not drain within %.1fs | pending=%d",
+                               timeout, len(self._queue))
+        self._thread = None
+        self._close_file()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every submitted event has been written."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # --------------------------------------------------
+    # PRODUCER SIDE
+    # --------------------------------------------------
+
+    def submit(self, msg: Dict[str, Any]) -> bool:
+        """Queue one event and return immediately (drops oldest when full)."""
+        self._remember(msg)
+        with self._cond:
+            if self._stopping:
+                return False
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self._stats["dropped"] += 1
+                if self._stats["dropped"] % 1000 == 1:
+                    logger.warning("Intent log queue full (%d) — dropping oldest | dropped_total=%d",
+                                   self.max_queue, self._stats["dropped"])
+            self._queue.append((time.monotonic(), msg))
+            self._stats["events"] += 1
+            if self.fsync == "always":
+                self._cond.notify()
+        return True
+
+    def _remember(self, msg: Dict[str, Any]) -> None:
+        cmd = msg.get("command_id")
+        if cmd is None:
+            return
+        with self._recent_lock:
+            events = self._recent.get(cmd)
+            if events is None:
+                events = self._recent[cmd] = []
+                if cmd in self._evicted:
+                    # earlier events are only on disk now
+                    del self._evicted[cmd]
+                    self._partial.add(cmd)
+                if len(self._recent) > self.index_size:
+                    old = next(iter(self._recent))
+                    del self._recent[old]
+                    self._partial.discard(old)
+                    self._evicted[old] = None
+                    if len(self._evicted) > self.index_size * _EVICTED_FACTOR:
+                        self._evicted.popitem(last=False)
+            events.append(msg)
+
+    # --------------------------------------------------
+    # READER
+    # --------------------------------------------------
+
+    def lifecycle(self, command_id: str) -> List[Dict[str, Any]]:
+        """
+        All events of ``command_id`` in write order. Ids re-added after
+        eviction are read from the files, which hold the full history.
+        """
+        with self._recent_lock:
+            events = self._recent.get(command_id)
+            if events is not None and command_id not in self._partial:
+                return list(events)
+
+        self.flush(timeout=1.0)
+        with self._file_lock:
+            self._scan_files()
+            locations = list(self._file_index.get(command_id, ()))
+        out = []
+        for name, offset, end in locations:
+            try:
+                out.append(_decode_at(self.path.parent / name, self.fmt, offset, end))
+            except (OSError, ValueError):
+                continue
+        return out
+
+    def _log_files(self) -> List[Path]:
+        """Oldest first: path.N … path.1, path."""
+        files = [self.path.with_name(f"{self.path.name}.{i}") for i in range(self.backup_count, 0, -1)]
+        files.append(self.path)
+        return [p for p in files if p.exists()]
+
+    def _scan_files(self) -> None:
+        """Extend the offset index with bytes written since the last scan."""
+        for path in self._log_files():
+            start = self._file_scanned.get(path.name, 0)
+            size = path.stat().st_size
+            if size < start:
+                # rotated / truncated underneath us: rebuild from scratch
+                self._file_index.clear()
+                self._file_scanned.clear()
+                return self._scan_files()
+            if size == start:
+                continue
+            last = start
+            for offset, end, cmd, _ in _iter_file(path, self.fmt, start):
+                self._file_index.setdefault(cmd, []).append((path.name, offset, end))
+                last = end
+            self._file_scanned[path.name] = last
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                if not self._queue:
+                    if self._stopping:
+                        return
+                    continue
+                batch = list(self._queue)
+                self._queue.clear()
+                self._busy = True
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error("IntentLogWriter write failed: %s", e)
+                self._close_file()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+            if self.fsync != "always" and not self._stopping:
+                # Periodic flush: let events accumulate for one interval
+                with self._cond:
+                    self._cond.wait_for(lambda: self._stopping, self.flush_interval)
+
+    def _write_batch(self, batch: List[Tuple[float, Dict[str, Any]]]) -> None:
+        data = b"".join(encode_record(msg, self.fmt) for _, msg in batch)
+        fh = self._open_file()
+        if self._fh_size + len(data) > self.max_bytes and self._fh_size > self._header_size():
+            self._rotate()
+            fh = self._open_file()
+        fh.write(data)
+        fh.flush()
+        self._fh_size += len(data)
+        if self.fsync != "none":
+            os.fsync(fh.fileno())
+            self._stats["fsyncs"] += 1
+        self._stats["batches"] += 1
+        self._stats["bytes"] += len(data)
+        now = time.monotonic()
+        for queued_at, _ in batch:
+            self._latency.observe(now - queued_at)
+
+    def _header_size(self) -> int:
+        return len(BIN_MAGIC) if self.fmt == "bin" else 0
+
+    def _open_file(self):
+        if self._fh is None:
+            self._fh = open(self.path, "ab")
+            self._fh_size = self._fh.seek(0, os.SEEK_END)
+            if self._fh_size == 0 and self.fmt == "bin":
+                self._fh.write(BIN_MAGIC)
+                self._fh_size = len(BIN_MAGIC)
+        return self._fh
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.flush()
+                if self.fsync != "none":
+                    os.fsync(self._fh.fileno())
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+
+    def _rotate(self) -> None:
+        self._close_file()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        self._stats["rotations"] += 1
+        with self._file_lock:
+            self._file_index.clear()
+            self._file_scanned.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            pending = len(self._queue)
+        return {
+            **self._stats,
+            "pending": pending,
+            "format": self.fmt,
+            "fsync": self.fsync,
+            "write_latency": self._latency.snapshot(),
+        }
@@ -7,28 +7,53 @@ Logs complete order processing pipeline:
   Intent Created → DB Write → Broker Send → Broker Confirmation → Watcher Reconciliation
 
 Helps diagnose order failures at each stage.
+
+Events are handed to a shared IntentLogWriter (one per log file): the
+calling thread only enqueues, a background thread batches, rotates and
+fsyncs. get_lifecycle(command_id) answers from an in-memory index.
 """
 
+import atexit
 import logging
-import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from shoonya_platform.execution.intent_log import IntentLogWriter
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_LOG_FILE = Path(__file__).resolve().parents[3] / "logs" / "intent_tracking.log"
+
+# One writer per log file: all trackers share it so rotation has one owner
+_writers: Dict[Path, IntentLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_intent_log_writer(log_file: Path = DEFAULT_LOG_FILE, **options) -> IntentLogWriter:
+    """Get or start the shared writer for ``log_file`` (options apply on first use)."""
+    key = Path(log_file).resolve()
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = IntentLogWriter(key, **options).start()
+            atexit.register(writer.close)
+        return writer
+
 
 class IntentTracker:
     """Track order intent through complete pipeline"""
     
-    def __init__(self, client_id: str):
+    def __init__(
+        self,
+        client_id: str,
+        log_file: Optional[Path] = None,
+        writer: Optional[IntentLogWriter] = None,
+    ):
         self.client_id = client_id
-        self.log_file = (
-            Path(__file__).resolve().parents[3]
-            / "logs"
-            / "intent_tracking.log"
-        )
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or get_intent_log_writer(log_file or DEFAULT_LOG_FILE)
+        self.log_file = self.writer.path
         
     def log_intent_created(self, command_id: str, payload: Dict[str, Any]):
         """Log: Intent created in dashboard"""
@@ -116,13 +141,16 @@ class IntentTracker:
         self._write_log(msg)
         logger.error(f"⚠️ ERROR | {command_id} at {step} | {error}")
     
+    def get_lifecycle(self, command_id: str) -> List[Dict[str, Any]]:
+        """All logged stages of ``command_id``, oldest first."""
+        return self.writer.lifecycle(command_id)
+
     def _write_log(self, msg: Dict[str, Any]):
-        """Write to intent tracking log file"""
+        """Queue for the background intent log writer (never blocks on I/O)"""
         try:
-            with open(self.log_file, "a") as f:
-                f.write(json.dumps(msg) + "\n")
+            self.writer.submit(msg)
         except Exception as e:
-            logger.exception(f"Failed to write intent log: {e}")
+            logger.exception(f"Failed to queue intent log: {e}")
 
 
 # Global tracker instances (one per client)
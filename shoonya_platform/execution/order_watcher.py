@@ -39,12 +39,15 @@ import time
 import logging
 import threading
 from datetime import datetime, time as dtime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from shoonya_platform.logging.logger_config import get_component_logger
 from shoonya_platform.persistence.repository import OrderRepository
 from shoonya_platform.persistence.order_record import OrderRecord
 from shoonya_platform.execution.intent import UniversalOrderCommand
+from shoonya_platform.api.dashboard.services.broker_service import BrokerView, read_broker
+from shoonya_platform.execution.exit_triggers import ExitTriggerEngine, PriceLevelBook
+from shoonya_platform.utils.latency import LatencyHistogram
 
 logger = get_component_logger('order_watcher')
 
@@ -58,6 +61,14 @@ class OrderWatcherEngine(threading.Thread):
     ✅ Step 6: Poll broker, update DB to EXECUTED/FAILED, reconcile guard
     """
 
+    # Freshness contract for broker reads (shared BrokerView cache)
+    BROKER_MAX_AGE = 0.5
+
+    # Broker statuses after which an order never changes again
+    BROKER_TERMINAL_STATUSES = frozenset({"COMPLETE", "REJECTED", "CANCELLED", "EXPIRED"})
+    # Seconds an unknown terminal broker order is re-checked before skipping it
+    ORPHAN_GRACE_SEC = 30.0
+
     def __init__(self, bot, poll_interval: float = 1.0):
         super().__init__(daemon=True)
         self.bot = bot
@@ -73,6 +84,20 @@ class OrderWatcherEngine(threading.Thread):
         self._dispatch_lock = threading.Lock()
         self._dispatched_exits: set = set()  # Prevent re-dispatch within same session
 
+        # STEP 6 watermark: broker_id → terminal status, reset each trading day
+        self._settled_broker_ids: Dict[str, str] = {}
+        self._settled_day = None
+        self._orphan_first_seen: Dict[str, float] = {}
+        self._reconcile_stats = {"cycles": 0, "skipped_settled": 0, "updates": 0}
+
+        # STEP 8 on ticks: trigger levels per token, evaluated by the engine
+        # thread; _eval_lock serialises tick and poll evaluation of exits
+        self._eval_lock = threading.Lock()
+        self._trigger_book = PriceLevelBook()
+        self._trigger_engine = ExitTriggerEngine(self._trigger_book, self._on_exit_trigger)
+        self._tick_to_trigger = LatencyHistogram()
+        self._tick_to_dispatch = LatencyHistogram()
+
     def _should_log_failure(self, broker_id: str, status: str) -> bool:
         now = time.time()
         key = (broker_id, status)
@@ -91,13 +116,21 @@ class OrderWatcherEngine(threading.Thread):
     # Thread lifecycle
     # --------------------------------------------------
 
+    def _invalidate_broker_reads(self, event: str) -> None:
+        view = getattr(self.bot, "broker_view", None)
+        if isinstance(view, BrokerView):
+            view.on_order_event(event)
+
     def stop(self):
         self._running = False
+        self._trigger_engine.stop()
 
     def run(self):
         logger.info(
             "🧠 OrderWatcherEngine STEP 6+7+8: BROKER POLLING + EXIT DISPATCH + MANAGED EXITS"
         )
+        if not self._trigger_engine.is_alive():
+            self._trigger_engine.start()  # STEP 8 on ticks between polls
 
         while self._running:
             try:
@@ -121,9 +154,16 @@ class OrderWatcherEngine(threading.Thread):
         
         Updates DB status from SENT_TO_BROKER → EXECUTED/FAILED based on broker reality.
         This is the ONLY source of definitive execution status.
+
+        Indexed: open OMS orders are loaded in ONE query (broker_id → record),
+        broker orders already settled today are skipped without touching the
+        DB, and all status updates of a cycle commit in one transaction.
         """
         try:
-            broker_orders = self.bot.api.get_order_book() or []
+            broker_orders = read_broker(
+                self.bot, "orders", max_age=self.BROKER_MAX_AGE,
+                consumer="order_watcher", allow_stale=False,
+            )
         except Exception as _ob_err:
             self._ob_fail_count = getattr(self, '_ob_fail_count', 0) + 1
             if self._ob_fail_count <= 3 or self._ob_fail_count % 20 == 0:
@@ -134,6 +174,11 @@ class OrderWatcherEngine(threading.Thread):
             return
 
         self._ob_fail_count = 0  # Reset on success
+        self._roll_settled_day()
+        stats = self._reconcile_stats
+        stats["cycles"] += 1
+
+        pending = []
         for bo in broker_orders:
             broker_id = bo.get("norenordno")
             status = (bo.get("status") or "").upper()
@@ -141,83 +186,167 @@ class OrderWatcherEngine(threading.Thread):
             if not broker_id or not status:
                 continue
 
-            record = self.repo.get_by_broker_id(broker_id)
-            if not record:
+            # 🔒 Settled today (idempotency) — no DB work at all
+            if broker_id in self._settled_broker_ids:
+                stats["skipped_settled"] += 1
                 continue
-            
-            # 🔒 Skip already reconciled orders (idempotency)
-            if record.status in ("EXECUTED", "FAILED"):
+            pending.append((bo, broker_id, status))
+
+        if not pending:
+            return
+
+        try:
+            open_by_broker = self.repo.get_open_orders_by_broker_id()
+        except Exception:
+            logger.exception("OrderWatcher: loading open orders failed — reconcile skipped")
+            return
+
+        transitions = []      # (record, broker_order, broker_id, broker_status)
+        unknown_terminal = []
+        for bo, broker_id, status in pending:
+            record = open_by_broker.get(broker_id)
+            if record is None:
+                # Orphan, or OMS record already EXECUTED/FAILED
+                if status in self.BROKER_TERMINAL_STATUSES:
+                    unknown_terminal.append(broker_id)
                 continue
-            
-            # ==================================================
-            # 📍 BROKER FAILURE (STEP 6A)
-            # ==================================================
-            if status in ("REJECTED", "CANCELLED", "EXPIRED"):
-                logger.warning(
-                    f"STEP_6A_BROKER_FAILED | cmd_id={record.command_id} | "
-                    f"broker_id={broker_id} | status={status}"
+            if status in self.BROKER_TERMINAL_STATUSES:
+                transitions.append((record, bo, broker_id, status))
+
+        if transitions:
+            updates = [
+                (record.command_id, "EXECUTED", None) if status == "COMPLETE"
+                else (record.command_id, "FAILED", f"BROKER_{status}")
+                for record, _, _, status in transitions
+            ]
+            try:
+                self.repo.apply_status_updates(updates)
+            except Exception:
+                logger.exception(
+                    "OrderWatcher: status batch failed (%d orders) — retry next cycle",
+                    len(updates),
                 )
-                
-                self.repo.update_status(record.command_id, "FAILED")
-                if hasattr(self.repo, 'update_tag'):
-                    self.repo.update_tag(record.command_id, f"BROKER_{status}")
+                return
+            stats["updates"] += len(updates)
+            for _, _, broker_id, status in transitions:
+                self._settled_broker_ids[broker_id] = status
+                self._orphan_first_seen.pop(broker_id, None)
+
+            for record, bo, broker_id, status in transitions:
+                if status == "COMPLETE":
+                    self._on_broker_executed(record, bo, broker_id)
+                else:
+                    self._on_broker_failed(record, broker_id, status)
 
-                # 🔒 FIX: Clear guard state for failed leg
-                try:
-                    self.bot.execution_guard.force_clear_symbol(
-                        strategy_id=record.strategy_name,
-                        symbol=record.symbol,
-                    )
-                    logger.info(
-                        f"GUARD_CLEARED | strategy={record.strategy_name} | symbol={record.symbol}"
-                    )
-                except Exception:
-                    logger.exception(
-                        "OrderWatcher: failed to clear guard state | strategy=%s symbol=%s",
-                        record.strategy_name,
-                        record.symbol,
-                    )
+        if unknown_terminal:
+            self._settle_unknown_broker_orders(unknown_terminal)
 
-                if self._should_log_failure(broker_id, status):
-                    logger.error(
-                        "OrderWatcher: STEP_6A_BROKER_FAILURE | "
-                        "cmd_id=%s broker_id=%s status=%s",
-                        record.command_id,
-                        broker_id,
-                        status,
-                    )
-                continue
+    def _on_broker_failed(self, record: OrderRecord, broker_id: str, status: str) -> None:
+        # ==================================================
+        # 📍 BROKER FAILURE (STEP 6A)
+        # ==================================================
+        logger.warning(
+            f"STEP_6A_BROKER_FAILED | cmd_id={record.command_id} | "
+            f"broker_id={broker_id} | status={status}"
+        )
 
-            # ==================================================
-            # ✅ BROKER EXECUTED (STEP 6B - FINAL TRUTH)
-            # ==================================================
-            if status == "COMPLETE":
-                logger.info(
-                    f"STEP_6B_BROKER_EXECUTED | cmd_id={record.command_id} | broker_id={broker_id}"
-                )
-                
-                self.repo.update_status(record.command_id, "EXECUTED")
+        # 🔒 FIX: Clear guard state for failed leg
+        try:
+            self.bot.execution_guard.force_clear_symbol(
+                strategy_id=record.strategy_name,
+                symbol=record.symbol,
+            )
+            logger.info(
+                f"GUARD_CLEARED | strategy={record.strategy_name} | symbol={record.symbol}"
+            )
+        except Exception:
+            logger.exception(
+                "OrderWatcher: failed to clear guard state | strategy=%s symbol=%s",
+                record.strategy_name,
+                record.symbol,
+            )
 
-                logger.info(
-                    "OrderWatcher: EXECUTED_CONFIRMED | cmd_id=%s broker_id=%s",
-                    record.command_id,
-                    broker_id,
-                )
+        if self._should_log_failure(broker_id, status):
+            logger.error(
+                "OrderWatcher: STEP_6A_BROKER_FAILURE | "
+                "cmd_id=%s broker_id=%s status=%s",
+                record.command_id,
+                broker_id,
+                status,
+            )
 
-                # 🔔 Notify strategy of fill via on_fill() callback
-                try:
-                    self._notify_strategy_fill(record, bo)
-                except Exception:
-                    logger.exception(
-                        "OrderWatcher: on_fill callback failed | cmd_id=%s",
-                        record.command_id,
-                    )
+    def _on_broker_executed(self, record: OrderRecord, bo: dict, broker_id: str) -> None:
+        # ==================================================
+        # ✅ BROKER EXECUTED (STEP 6B - FINAL TRUTH)
+        # ==================================================
+        logger.info(
+            f"STEP_6B_BROKER_EXECUTED | cmd_id={record.command_id} | broker_id={broker_id}"
+        )
 
-                # 🔒 BROKER-TRUTH CONVERGENCE POINT
-                self._reconcile_execution_guard(
-                    strategy_name=record.strategy_name,
-                    executed_symbol=record.symbol,
-                )
+        # Fill changes positions / limits: drop cached broker reads
+        self._invalidate_broker_reads("filled")
+
+        logger.info(
+            "OrderWatcher: EXECUTED_CONFIRMED | cmd_id=%s broker_id=%s",
+            record.command_id,
+            broker_id,
+        )
+
+        # 🔔 Notify strategy of fill via on_fill() callback
+        try:
+            self._notify_strategy_fill(record, bo)
+        except Exception:
+            logger.exception(
+                "OrderWatcher: on_fill callback failed | cmd_id=%s",
+                record.command_id,
+            )
+
+        # 🔒 BROKER-TRUTH CONVERGENCE POINT
+        self._reconcile_execution_guard(
+            strategy_name=record.strategy_name,
+            executed_symbol=record.symbol,
+        )
+
+    def _settle_unknown_broker_orders(self, broker_ids: List[str]) -> None:
+        """
+        Terminal broker orders with no open OMS record. Those whose OMS
+        record is already EXECUTED/FAILED are settled at once; orphans
+        (manual / other-system orders) only after ORPHAN_GRACE_SEC, so an
+        OMS record whose broker id lands just after the fill still
+        reconciles.
+        """
+        try:
+            known = self.repo.get_statuses_by_broker_ids(broker_ids)
+        except Exception:
+            logger.debug("OrderWatcher: broker id status lookup failed", exc_info=True)
+            return
+
+        now = time.monotonic()
+        for broker_id in broker_ids:
+            oms_status = known.get(broker_id)
+            if oms_status in ("EXECUTED", "FAILED"):
+                self._settled_broker_ids[broker_id] = oms_status
+                self._orphan_first_seen.pop(broker_id, None)
+            elif oms_status is None:
+                first_seen = self._orphan_first_seen.setdefault(broker_id, now)
+                if now - first_seen >= self.ORPHAN_GRACE_SEC:
+                    self._settled_broker_ids[broker_id] = "ORPHAN"
+                    del self._orphan_first_seen[broker_id]
+
+    def _roll_settled_day(self) -> None:
+        """Broker order ids are per trading day: start a fresh watermark daily."""
+        today = datetime.now().date()
+        if self._settled_day != today:
+            self._settled_day = today
+            self._settled_broker_ids.clear()
+            self._orphan_first_seen.clear()
+
+    def get_reconcile_stats(self) -> Dict[str, int]:
+        return {
+            **self._reconcile_stats,
+            "settled_today": len(self._settled_broker_ids),
+            "orphans_pending": len(self._orphan_first_seen),
+        }
 
     # ==================================================
     # STEP 7: DISPATCH CREATED EXIT ORDERS
@@ -338,7 +467,10 @@ class OrderWatcherEngine(threading.Thread):
         initial_ltp = record.managed_anchor_ltp
         if initial_ltp is None:
             try:
-                positions = self.bot.api.get_positions() or []
+                positions = read_broker(
+                    self.bot, "positions", max_age=self.BROKER_MAX_AGE,
+                    consumer="order_watcher", allow_stale=False,
+                )
                 for pos in positions:
                     if pos.get("tsym") != record.symbol:
                         continue
@@ -411,16 +543,24 @@ class OrderWatcherEngine(threading.Thread):
         For each managed exit order, check current LTP against SL/target levels.
         Trail the SL as price moves in the position's favour.
         Trigger MARKET exit when conditions are met.
+
+        REST pass (every poll interval): refreshes quantity / token per exit,
+        detects flat positions and evaluates on the positions LTP. Between
+        passes the ExitTriggerEngine evaluates the same levels on ticks.
+
+        Like the tick path, levels are checked and hits claimed
+        (``_dispatching``) under _eval_lock; the exits are placed after it
+        is released.
         """
         with self._managed_exits_lock:
             if not self._managed_exits:
                 return
-            # Shallow-copy each state dict so workers operate on local copies
-            # and don't race with other threads mutating the originals.
-            snapshot = [(cmd_id, dict(state)) for cmd_id, state in self._managed_exits.items()]
 
         try:
-            positions = self.bot.api.get_positions() or []
+            positions = read_broker(
+                self.bot, "positions", max_age=self.BROKER_MAX_AGE,
+                consumer="order_watcher", allow_stale=False,
+            )
         except Exception as e:
             logger.warning("OrderWatcher: positions fetch for managed exits failed: %s", e)
             return
@@ -431,251 +571,383 @@ class OrderWatcherEngine(threading.Thread):
             if sym:
                 pos_map[sym] = p
 
-        to_remove: List[str] = []
-        updated_states: Dict[str, dict] = {}
+        # One query per pass (was repo.get_by_id per managed exit)
+        try:
+            still_created = {
+                r.command_id for r in self.repo.get_open_orders() if r.status == "CREATED"
+            }
+        except Exception:
+            logger.warning("OrderWatcher: get_open_orders failed for managed exits", exc_info=True)
+            return
 
-        for cmd_id, state in snapshot:
-            record = state["record"]
-            symbol = record.symbol
+        with self._eval_lock:
+            with self._managed_exits_lock:
+                # Shallow-copy each state dict so workers operate on local copies
+                # and don't race with other threads mutating the originals.
+                snapshot = [(cmd_id, dict(state)) for cmd_id, state in self._managed_exits.items()]
 
-            # Verify order still CREATED
-            try:
-                current_record = self.repo.get_by_id(cmd_id)
-                if not current_record or current_record.status not in ("CREATED",):
+            to_remove: List[str] = []
+            updated_states: Dict[str, dict] = {}
+            claimed: List[Tuple[str, dict, int, str]] = []
+
+            for cmd_id, state in snapshot:
+                record = state["record"]
+                symbol = record.symbol
+
+                # Verify order still CREATED
+                if cmd_id not in still_created:
                     to_remove.append(cmd_id)
                     continue
-            except Exception:
-                logger.warning("OrderWatcher: repo.get_by_id failed for cmd_id=%s", cmd_id, exc_info=True)
-                continue
+                if state.get("_dispatching"):
+                    continue  # a tick already claimed this exit
 
-            pos = pos_map.get(symbol)
-            net_qty = int(pos.get("netqty", 0)) if pos else 0
+                pos = pos_map.get(symbol)
+                net_qty = int(pos.get("netqty", 0)) if pos else 0
 
-            if net_qty == 0:
-                logger.info(
-                    "MANAGED_EXIT_POSITION_FLAT | cmd_id=%s | %s",
-                    cmd_id, symbol,
-                )
-                try:
-                    self.repo.update_status(cmd_id, "FAILED")
-                    self.repo.update_tag(cmd_id, "POSITION_ALREADY_FLAT")
-                except Exception:
-                    pass
-                to_remove.append(cmd_id)
-                continue
+                if net_qty == 0:
+                    self._mark_position_flat(cmd_id, symbol)
+                    to_remove.append(cmd_id)
+                    continue
 
-            # Broker payloads may expose live price as either `ltp` or `lp`.
-            # Fall back to `lp` so managed exits keep working across brokers.
-            ltp = float(pos.get("ltp", pos.get("lp", 0)) or 0)
-            if ltp <= 0:
-                continue
+                state["net_qty"] = net_qty
+                if pos.get("token"):
+                    state["token"] = str(pos["token"])
 
-            # Skip if we're in a retry backoff window after a failed dispatch
-            if time.time() < state.get("_exit_next_retry", 0):
-                updated_states[cmd_id] = state
-                continue
+                # Broker payloads may expose live price as either `ltp` or `lp`.
+                # Fall back to `lp` so managed exits keep working across brokers.
+                ltp = float(pos.get("ltp", pos.get("lp", 0)) or 0)
+                if ltp <= 0:
+                    updated_states[cmd_id] = state
+                    continue
 
-            # Skip if the exchange/segment is currently closed
-            # (e.g. MCX AGRI closes at 17:00; dispatching after close always
-            # returns an empty broker response)
-            if not self._is_exchange_open(record.exchange, record.symbol):
+                trigger_reason = self._check_exit_levels(state, ltp, net_qty)
+                if trigger_reason is not None:
+                    state["_dispatching"] = True
+                    claimed.append((cmd_id, state, net_qty, trigger_reason))
+                # Track locally-modified states to merge back
                 updated_states[cmd_id] = state
-                continue
 
-            is_long = net_qty > 0
-            sl = state.get("stop_loss")
-            target = state.get("target")
-            trailing_type = state.get("trailing_type")
-            trailing_value = state.get("trailing_value")
-            trigger_exit = False
-            trigger_reason = ""
+            new_tokens = self._merge_managed_states(updated_states, to_remove)
+        self._subscribe_exit_tokens(new_tokens)
 
-            # ── TRAILING SL LOGIC ──
-            if trailing_type and trailing_value and trailing_value > 0:
-                if state.get("initial_ltp") is None:
-                    state["initial_ltp"] = ltp
+        for cmd_id, state, net_qty, trigger_reason in claimed:
+            done = self._dispatch_managed_exit(cmd_id, state, net_qty, trigger_reason)
+            self._finish_managed_dispatch(cmd_id, state, done)
 
-                # Check trail_when activation
-                trail_when = state.get("trail_when")
-                trailing_activated = state.get("trailing_activated", False)
-                if not trailing_activated and trail_when and trail_when > 0:
-                    initial_ltp = float(state.get("initial_ltp") or 0)
-                    activation_price = initial_ltp + float(trail_when) if is_long else initial_ltp - float(trail_when)
-                    state["activation_price"] = activation_price
-
-                    # LONG: activate after favorable move above anchor by trail_when steps.
-                    # SHORT: activate after favorable move below anchor by trail_when steps.
-                    if is_long and ltp >= activation_price:
-                        state["trailing_activated"] = True
-                        trailing_activated = True
-                        logger.info(
-                            "TRAILING_ACTIVATED | %s | ltp=%s >= activation=%s | anchor=%s | trail_when=%s",
-                            symbol, ltp, activation_price, initial_ltp, trail_when,
-                        )
-                    elif not is_long and ltp <= activation_price:
-                        state["trailing_activated"] = True
-                        trailing_activated = True
-                        logger.info(
-                            "TRAILING_ACTIVATED | %s | ltp=%s <= activation=%s | anchor=%s | trail_when=%s",
-                            symbol, ltp, activation_price, initial_ltp, trail_when,
-                        )
-                elif not trail_when or trail_when <= 0:
-                    # No trail_when set — trailing is immediately active
+    def _on_exit_trigger(self, cmd_id: str, ltp: float, tick_at: float) -> None:
+        """
+        ExitTriggerEngine callback: a level of this exit was crossed by a tick.
+
+        Levels are checked and the exit claimed (``_dispatching``) under
+        _eval_lock; the status re-read, quantity confirm and order placement
+        run after it is released, so a slow broker call does not hold up
+        other tick exits or the poll pass.
+        """
+        with self._eval_lock:
+            with self._managed_exits_lock:
+                orig = self._managed_exits.get(cmd_id)
+                state = dict(orig) if orig is not None else None
+            if state is None:
+                self._trigger_book.remove(cmd_id)
+                return
+            net_qty = int(state.get("net_qty") or 0)
+            if not net_qty or state.get("_dispatching"):
+                return
+
+            trigger_reason = self._check_exit_levels(state, ltp, net_qty)
+            if trigger_reason is not None:
+                self._tick_to_trigger.observe(time.monotonic() - tick_at)
+                state["_dispatching"] = True
+            new_tokens = self._merge_managed_states({cmd_id: state}, [])
+        self._subscribe_exit_tokens(new_tokens)
+        if trigger_reason is None:
+            return
+
+        done = self._dispatch_managed_exit(cmd_id, state, net_qty, trigger_reason, tick_at=tick_at)
+        self._finish_managed_dispatch(cmd_id, state, done)
+
+    def _finish_managed_dispatch(self, cmd_id: str, state: dict, done: bool) -> None:
+        """Release a claimed exit after dispatch: drop it when done, else re-arm it."""
+        new_token = None
+        with self._managed_exits_lock:
+            orig = self._managed_exits.get(cmd_id)
+            if done:
+                self._managed_exits.pop(cmd_id, None)
+                self._trigger_book.remove(cmd_id)
+            elif orig is not None:
+                # Only dispatch bookkeeping: levels may have been edited meanwhile
+                orig["_dispatching"] = False
+                orig["net_qty"] = state.get("net_qty")
+                orig["_dispatch_failures"] = state.get("_dispatch_failures", 0)
+                orig["_exit_next_retry"] = state.get("_exit_next_retry", 0)
+                new_token = self._index_trigger_levels(cmd_id, orig)
+        if new_token:
+            self._subscribe_exit_tokens([new_token])
+
+    def _check_exit_levels(self, state: dict, ltp: float, net_qty: int) -> Optional[str]:
+        """
+        Trail / check SL and target for one managed exit at ``ltp``; mutates
+        ``state``. Returns the trigger reason when a level is hit, else None.
+        """
+        record = state["record"]
+        symbol = record.symbol
+
+        # Skip if we're in a retry backoff window after a failed dispatch
+        if time.time() < state.get("_exit_next_retry", 0):
+            return None
+
+        # Skip if the exchange/segment is currently closed
+        # (e.g. MCX AGRI closes at 17:00; dispatching after close always
+        # returns an empty broker response)
+        if not self._is_exchange_open(record.exchange, record.symbol):
+            return None
+
+        is_long = net_qty > 0
+        sl = state.get("stop_loss")
+        target = state.get("target")
+        trailing_type = state.get("trailing_type")
+        trailing_value = state.get("trailing_value")
+        trigger_exit = False
+        trigger_reason = ""
+
+        # ── TRAILING SL LOGIC ──
+        if trailing_type and trailing_value and trailing_value > 0:
+            if state.get("initial_ltp") is None:
+                state["initial_ltp"] = ltp
+
+            # Favourable extreme: the tick engine re-evaluates on a new one
+            extreme = state.get("_fav_extreme")
+            if extreme is None or (ltp > extreme if is_long else ltp < extreme):
+                state["_fav_extreme"] = ltp
+
+            # Check trail_when activation
+            trail_when = state.get("trail_when")
+            trailing_activated = state.get("trailing_activated", False)
+            if not trailing_activated and trail_when and trail_when > 0:
+                initial_ltp = float(state.get("initial_ltp") or 0)
+                activation_price = initial_ltp + float(trail_when) if is_long else initial_ltp - float(trail_when)
+                state["activation_price"] = activation_price
+
+                # LONG: activate after favorable move above anchor by trail_when steps.
+                # SHORT: activate after favorable move below anchor by trail_when steps.
+                if is_long and ltp >= activation_price:
+                    state["trailing_activated"] = True
                     trailing_activated = True
+                    logger.info(
+                        "TRAILING_ACTIVATED | %s | ltp=%s >= activation=%s | anchor=%s | trail_when=%s",
+                        symbol, ltp, activation_price, initial_ltp, trail_when,
+                    )
+                elif not is_long and ltp <= activation_price:
                     state["trailing_activated"] = True
-                    state["activation_price"] = state.get("initial_ltp")
-
-                if trailing_activated:
-                    # POINTS trailing (dashboard PM): move SL in fixed steps
-                    # from the original configured stop-loss, not as ltp +/- trail.
-                    if trailing_type == "POINTS":
-                        base_sl = state.get("base_stop_loss")
-                        if base_sl is None and sl is not None:
-                            base_sl = float(sl)
-                            state["base_stop_loss"] = base_sl
-
-                        initial_ltp = float(state.get("initial_ltp") or 0)
-                        step_trigger = float(trail_when) if trail_when and trail_when > 0 else float(trailing_value)
-                        step_move = float(trailing_value)
+                    trailing_activated = True
+                    logger.info(
+                        "TRAILING_ACTIVATED | %s | ltp=%s <= activation=%s | anchor=%s | trail_when=%s",
+                        symbol, ltp, activation_price, initial_ltp, trail_when,
+                    )
+            elif not trail_when or trail_when <= 0:
+                # No trail_when set — trailing is immediately active
+                trailing_activated = True
+                state["trailing_activated"] = True
+                state["activation_price"] = state.get("initial_ltp")
+
+            if trailing_activated:
+                # POINTS trailing (dashboard PM): move SL in fixed steps
+                # from the original configured stop-loss, not as ltp +/- trail.
+                if trailing_type == "POINTS":
+                    base_sl = state.get("base_stop_loss")
+                    if base_sl is None and sl is not None:
+                        base_sl = float(sl)
+                        state["base_stop_loss"] = base_sl
 
-                        if base_sl is not None and initial_ltp > 0 and step_trigger > 0 and step_move > 0:
-                            favorable_move = (ltp - initial_ltp) if is_long else (initial_ltp - ltp)
-                            favorable_move = max(0.0, favorable_move)
-                            steps = int(favorable_move // step_trigger)
-
-                            if steps > 0:
-                                if is_long:
-                                    new_sl = float(base_sl) + (steps * step_move)
-                                    if sl is None or new_sl > sl:
-                                        old_sl = sl
-                                        state["stop_loss"] = new_sl
-                                        sl = new_sl
-                                        logger.info(
-                                            "TRAILING_SL_UPDATED | %s | old_sl=%s | new_sl=%s | base_sl=%s | anchor=%s | ltp=%s | steps=%s",
-                                            symbol,
-                                            old_sl,
-                                            new_sl,
-                                            base_sl,
-                                            initial_ltp,
-                                            ltp,
-                                            steps,
-                                        )
-                                        try:
-                                            self._update_order_risk_fields(record.command_id, {
-                                                "stop_loss": new_sl,
-                                                "managed_anchor_ltp": initial_ltp,
-                                                "managed_base_stop_loss": base_sl,
-                                            })
-                                        except Exception:
-                                            logger.exception("Failed to persist trailed stop loss for %s", symbol)
-                                else:
-                                    new_sl = float(base_sl) - (steps * step_move)
-                                    if sl is None or new_sl < sl:
-                                        old_sl = sl
-                                        state["stop_loss"] = new_sl
-                                        sl = new_sl
-                                        logger.info(
-                                            "TRAILING_SL_UPDATED | %s | old_sl=%s | new_sl=%s | base_sl=%s | anchor=%s | ltp=%s | steps=%s",
-                                            symbol,
-                                            old_sl,
-                                            new_sl,
-                                            base_sl,
-                                            initial_ltp,
-                                            ltp,
-                                            steps,
-                                        )
-                                        try:
-                                            self._update_order_risk_fields(record.command_id, {
-                                                "stop_loss": new_sl,
-                                                "managed_anchor_ltp": initial_ltp,
-                                                "managed_base_stop_loss": base_sl,
-                                            })
-                                        except Exception:
-                                            logger.exception("Failed to persist trailed stop loss for %s", symbol)
-                    else:
-                        # Keep legacy behaviour for non-POINTS modes.
-                        if is_long:
-                            if state["highest_price"] is None or ltp > state["highest_price"]:
-                                state["highest_price"] = ltp
-                            if trailing_type == "PERCENT":
-                                new_sl = state["highest_price"] * (1 - trailing_value / 100)
-                            else:
-                                new_sl = state["highest_price"] - trailing_value
-                            if sl is None or new_sl > sl:
-                                state["stop_loss"] = new_sl
-                                sl = new_sl
-                        else:
-                            if state["lowest_price"] is None or ltp < state["lowest_price"]:
-                                state["lowest_price"] = ltp
-                            if trailing_type == "PERCENT":
-                                new_sl = state["lowest_price"] * (1 + trailing_value / 100)
+                    initial_ltp = float(state.get("initial_ltp") or 0)
+                    step_trigger = float(trail_when) if trail_when and trail_when > 0 else float(trailing_value)
+                    step_move = float(trailing_value)
+
+                    if base_sl is not None and initial_ltp > 0 and step_trigger > 0 and step_move > 0:
+                        favorable_move = (ltp - initial_ltp) if is_long else (initial_ltp - ltp)
+                        favorable_move = max(0.0, favorable_move)
+                        steps = int(favorable_move // step_trigger)
+
+                        if steps > 0:
+                            if is_long:
+                                new_sl = float(base_sl) + (steps * step_move)
+                                if sl is None or new_sl > sl:
+                                    old_sl = sl
+                                    state["stop_loss"] = new_sl
+                                    sl = new_sl
+                                    logger.info(
+                                        "TRAILING_SL_UPDATED | %s | old_sl=%s | new_sl=%s | base_sl=%s | anchor=%s | ltp=%s | steps=%s",
+                                        symbol,
+                                        old_sl,
+                                        new_sl,
+                                        base_sl,
+                                        initial_ltp,
+                                        ltp,
+                                        steps,
+                                    )
+                                    try:
+                                        self._update_order_risk_fields(record.command_id, {
+                                            "stop_loss": new_sl,
+                                            "managed_anchor_ltp": initial_ltp,
+                                            "managed_base_stop_loss": base_sl,
+                                        })
+                                    except Exception:
+                                        logger.exception("Failed to persist trailed stop loss for %s", symbol)
                             else:
-                                new_sl = state["lowest_price"] + trailing_value
-                            if sl is None or new_sl < sl:
-                                state["stop_loss"] = new_sl
-                                sl = new_sl
-
-            # ── CHECK SL HIT ──
-            if sl is not None:
-                if is_long and ltp <= sl:
-                    trigger_exit = True
-                    trigger_reason = f"SL_HIT ltp={ltp} <= sl={sl}"
-                elif not is_long and ltp >= sl:
-                    trigger_exit = True
-                    trigger_reason = f"SL_HIT ltp={ltp} >= sl={sl}"
-
-            # ── CHECK TARGET HIT ──
-            if target is not None and not trigger_exit:
-                if is_long and ltp >= target:
-                    trigger_exit = True
-                    trigger_reason = f"TARGET_HIT ltp={ltp} >= target={target}"
-                elif not is_long and ltp <= target:
-                    trigger_exit = True
-                    trigger_reason = f"TARGET_HIT ltp={ltp} <= target={target}"
-
-            if trigger_exit:
-                logger.warning(
-                    "MANAGED_EXIT_TRIGGERED | cmd_id=%s | %s | %s | net_qty=%d",
-                    cmd_id, symbol, trigger_reason, net_qty,
-                )
-                dispatched_ok = self._execute_managed_exit(record, abs(net_qty))
-                if dispatched_ok:
-                    to_remove.append(cmd_id)
+                                new_sl = float(base_sl) - (steps * step_move)
+                                if sl is None or new_sl < sl:
+                                    old_sl = sl
+                                    state["stop_loss"] = new_sl
+                                    sl = new_sl
+                                    logger.info(
+                                        "TRAILING_SL_UPDATED | %s | old_sl=%s | new_sl=%s | base_sl=%s | anchor=%s | ltp=%s | steps=%s",
+                                        symbol,
+                                        old_sl,
+                                        new_sl,
+                                        base_sl,
+                                        initial_ltp,
+                                        ltp,
+                                        steps,
+                                    )
+                                    try:
+                                        self._update_order_risk_fields(record.command_id, {
+                                            "stop_loss": new_sl,
+                                            "managed_anchor_ltp": initial_ltp,
+                                            "managed_base_stop_loss": base_sl,
+                                        })
+                                    except Exception:
+                                        logger.exception("Failed to persist trailed stop loss for %s", symbol)
                 else:
-                    # Dispatch failed (e.g. broker unavailable / market closed).
-                    # Keep the record alive but apply exponential backoff so we
-                    # don't hammer the broker every 6 seconds indefinitely.
-                    fail_count = state.get("_dispatch_failures", 0) + 1
-                    state["_dispatch_failures"] = fail_count
-                    max_failures = 5
-                    if fail_count >= max_failures:
-                        # Give up — mark DB record FAILED so it won't be
-                        # reloaded by _dispatch_pending_exits on next cycle.
-                        try:
-                            self.repo.update_status(record.command_id, "FAILED")
-                            self.repo.update_tag(record.command_id, "BROKER_UNAVAILABLE_GAVE_UP")
-                        except Exception:
-                            pass
-                        to_remove.append(cmd_id)
-                        logger.error(
-                            "MANAGED_EXIT_GAVE_UP | cmd_id=%s | %s | after %d failures — "
-                            "deactivating managed exit, position still open, manual action required",
-                            cmd_id, symbol, fail_count,
-                        )
+                    # Keep legacy behaviour for non-POINTS modes.
+                    if is_long:
+                        if state["highest_price"] is None or ltp > state["highest_price"]:
+                            state["highest_price"] = ltp
+                        if trailing_type == "PERCENT":
+                            new_sl = state["highest_price"] * (1 - trailing_value / 100)
+                        else:
+                            new_sl = state["highest_price"] - trailing_value
+                        if sl is None or new_sl > sl:
+                            state["stop_loss"] = new_sl
+                            sl = new_sl
                     else:
-                        # Exponential backoff: 30s, 60s, 120s, 240s before next trigger
-                        delay = min(30 * (2 ** (fail_count - 1)), 240)
-                        state["_exit_next_retry"] = time.time() + delay
-                        updated_states[cmd_id] = state
-                        logger.warning(
-                            "MANAGED_EXIT_RETRY_SCHEDULED | cmd_id=%s | %s | "
-                            "fail=%d/%d | retry_in=%ds",
-                            cmd_id, symbol, fail_count, max_failures - 1, delay,
-                        )
+                        if state["lowest_price"] is None or ltp < state["lowest_price"]:
+                            state["lowest_price"] = ltp
+                        if trailing_type == "PERCENT":
+                            new_sl = state["lowest_price"] * (1 + trailing_value / 100)
+                        else:
+                            new_sl = state["lowest_price"] + trailing_value
+                        if sl is None or new_sl < sl:
+                            state["stop_loss"] = new_sl
+                            sl = new_sl
+
+        # ── CHECK SL HIT ──
+        if sl is not None:
+            if is_long and ltp <= sl:
+                trigger_exit = True
+                trigger_reason = f"SL_HIT ltp={ltp} <= sl={sl}"
+            elif not is_long and ltp >= sl:
+                trigger_exit = True
+                trigger_reason = f"SL_HIT ltp={ltp} >= sl={sl}"
+
+        # ── CHECK TARGET HIT ──
+        if target is not None and not trigger_exit:
+            if is_long and ltp >= target:
+                trigger_exit = True
+                trigger_reason = f"TARGET_HIT ltp={ltp} >= target={target}"
+            elif not is_long and ltp <= target:
+                trigger_exit = True
+                trigger_reason = f"TARGET_HIT ltp={ltp} <= target={target}"
+
+        return trigger_reason if trigger_exit else None
+
+    def _dispatch_managed_exit(self, cmd_id: str, state: dict, net_qty: int,
+                               trigger_reason: str, tick_at: Optional[float] = None) -> bool:
+        """
+        Place the MARKET exit for a triggered managed exit; mutates ``state``
+        (retry backoff). Returns True when the exit is finished (dispatched,
+        flat, no longer wanted or given up). Runs without _eval_lock held;
+        ``tick_at`` is set on the tick path.
+        """
+        record = state["record"]
+        symbol = record.symbol
+        is_long = net_qty > 0
+
+        if tick_at is not None:
+            # Tick path: the poll pass has not re-read the record since the
+            # levels were indexed — a cancelled SL/target must not fire.
+            with self._managed_exits_lock:
+                registered = cmd_id in self._managed_exits
+            try:
+                current = self.repo.get_by_id(cmd_id) if registered else None
+            except Exception:
+                logger.warning("OrderWatcher: exit status re-read failed | %s", symbol, exc_info=True)
+                return False  # poll pass retries
+            if current is None or current.status != "CREATED":
+                logger.info(
+                    "MANAGED_EXIT_DROPPED | cmd_id=%s | %s | status=%s",
+                    cmd_id, symbol, current.status if current else None,
+                )
+                return True
+
+            # REST positions only confirm the quantity to exit
+            confirmed = self._confirm_position_qty(record)
+            if confirmed is None:
+                return False  # broker unavailable — poll pass retries
+            if confirmed == 0 or (confirmed > 0) != is_long:
+                state["net_qty"] = confirmed
+                if confirmed == 0:
+                    self._mark_position_flat(cmd_id, symbol)
+                    return True
+                return False
+            net_qty = confirmed
+
+        logger.warning(
+            "MANAGED_EXIT_TRIGGERED | cmd_id=%s | %s | %s | net_qty=%d | via=%s",
+            cmd_id, symbol, trigger_reason, net_qty,
+            "tick" if tick_at is not None else "poll",
+        )
+        dispatched_ok = self._execute_managed_exit(record, abs(net_qty))
+        if tick_at is not None:
+            self._tick_to_dispatch.observe(time.monotonic() - tick_at)
+        if dispatched_ok:
+            return True
+        else:
+            # Dispatch failed (e.g. broker unavailable / market closed).
+            # Keep the record alive but apply exponential backoff so we
+            # don't hammer the broker every 6 seconds indefinitely.
+            fail_count = state.get("_dispatch_failures", 0) + 1
+            state["_dispatch_failures"] = fail_count
+            max_failures = 5
+            if fail_count >= max_failures:
+                # Give up — mark DB record FAILED so it won't be
+                # reloaded by _dispatch_pending_exits on next cycle.
+                try:
+                    self.repo.update_status(record.command_id, "FAILED")
+                    self.repo.update_tag(record.command_id, "BROKER_UNAVAILABLE_GAVE_UP")
+                except Exception:
+                    pass
+                logger.error(
+                    "MANAGED_EXIT_GAVE_UP | cmd_id=%s | %s | after %d failures — "
+                    "deactivating managed exit, position still open, manual action required",
+                    cmd_id, symbol, fail_count,
+                )
+                return True
             else:
-                # Track locally-modified states to merge back
-                updated_states[cmd_id] = state
+                # Exponential backoff: 30s, 60s, 120s, 240s before next trigger
+                delay = min(30 * (2 ** (fail_count - 1)), 240)
+                state["_exit_next_retry"] = time.time() + delay
+                logger.warning(
+                    "MANAGED_EXIT_RETRY_SCHEDULED | cmd_id=%s | %s | "
+                    "fail=%d/%d | retry_in=%ds",
+                    cmd_id, symbol, fail_count, max_failures - 1, delay,
+                )
+        return False
 
+    def _merge_managed_states(
+        self, updated_states: Dict[str, dict], to_remove: List[str],
+    ) -> List[Tuple[str, str]]:
+        """Merge worker copies back; returns (token, exchange) pairs to subscribe."""
+        new_tokens: List[Tuple[str, str]] = []
         with self._managed_exits_lock:
             # Merge updated trailing state back into shared dict
             for cmd_id, local_state in updated_states.items():
@@ -690,8 +962,96 @@ class OrderWatcherEngine(threading.Thread):
                     orig["activation_price"] = local_state.get("activation_price")
                     orig["_dispatch_failures"] = local_state.get("_dispatch_failures", 0)
                     orig["_exit_next_retry"] = local_state.get("_exit_next_retry", 0)
+                    orig["_dispatching"] = local_state.get("_dispatching", False)
+                    orig["_fav_extreme"] = local_state.get("_fav_extreme")
+                    orig["net_qty"] = local_state.get("net_qty")
+                    orig["token"] = local_state.get("token")
+                    new_token = self._index_trigger_levels(cmd_id, orig)
+                    if new_token:
+                        new_tokens.append(new_token)
             for cmd_id in to_remove:
                 self._managed_exits.pop(cmd_id, None)
+                self._trigger_book.remove(cmd_id)
+        return new_tokens
+
+    def _index_trigger_levels(self, cmd_id: str, state: dict) -> Optional[Tuple[str, str]]:
+        """
+        (Re)place this exit's levels in the tick book. LONG: SL below,
+        target / trailing watch above; SHORT mirrored. Not indexed without a
+        token, without a known position, while a tick dispatch is in flight
+        or while in dispatch backoff.
+
+        Called under _managed_exits_lock, so it never talks to the broker:
+        a token new to the book is returned as (token, exchange) for the
+        caller to subscribe once the locks are released.
+        """
+        token = state.get("token")
+        net_qty = state.get("net_qty") or 0
+        if (not token or not net_qty or state.get("_dispatching")
+                or time.time() < state.get("_exit_next_retry", 0)):
+            self._trigger_book.remove(cmd_id)
+            return None
+
+        watch = None
+        if state.get("trailing_type") and (state.get("trailing_value") or 0) > 0:
+            if not state.get("trailing_activated") and state.get("activation_price") is not None:
+                watch = state["activation_price"]
+            else:
+                watch = state.get("_fav_extreme")
+
+        is_new_token = token not in self._trigger_book.tokens()
+        if net_qty > 0:
+            self._trigger_book.set(cmd_id, token, below=[state.get("stop_loss")],
+                                   above=[state.get("target"), watch])
+        else:
+            self._trigger_book.set(cmd_id, token, below=[state.get("target"), watch],
+                                   above=[state.get("stop_loss")])
+        if is_new_token and self._trigger_engine.is_alive():
+            return token, state["record"].exchange
+        return None
+
+    def _subscribe_exit_tokens(self, tokens: List[Tuple[str, str]]) -> None:
+        """Subscribe new exit tokens to the live feed (call without locks held)."""
+        for token, exchange in tokens:
+            try:
+                from shoonya_platform.market_data.feeds.live_feed import subscribe_livedata
+                subscribe_livedata(self.bot.api, [token], exchange=exchange or "NFO")
+            except Exception:
+                logger.debug("OrderWatcher: tick subscribe failed for %s|%s", exchange, token, exc_info=True)
+
+    def _confirm_position_qty(self, record: OrderRecord) -> Optional[int]:
+        """Fresh broker net quantity for the exit's symbol (None if unavailable)."""
+        try:
+            positions = read_broker(
+                self.bot, "positions", max_age=0.0,
+                consumer="exit_trigger", allow_stale=False,
+            )
+        except Exception:
+            logger.warning("OrderWatcher: exit qty confirm failed | %s", record.symbol, exc_info=True)
+            return None
+        for pos in positions:
+            if pos.get("tsym") == record.symbol:
+                return int(pos.get("netqty", 0) or 0)
+        return 0
+
+    def _mark_position_flat(self, cmd_id: str, symbol: str) -> None:
+        logger.info(
+            "MANAGED_EXIT_POSITION_FLAT | cmd_id=%s | %s",
+            cmd_id, symbol,
+        )
+        try:
+            self.repo.update_status(cmd_id, "FAILED")
+            self.repo.update_tag(cmd_id, "POSITION_ALREADY_FLAT")
+        except Exception:
+            pass
+
+    def get_exit_trigger_stats(self) -> dict:
+        """Tick-driven managed-exit latency: tick → trigger and tick → dispatch."""
+        return {
+            "engine": self._trigger_engine.get_stats(),
+            "tick_to_trigger": self._tick_to_trigger.snapshot(),
+            "tick_to_dispatch": self._tick_to_dispatch.snapshot(),
+        }
 
     # --------------------------------------------------
     # Exchange market hours helper
@@ -928,7 +1288,10 @@ class OrderWatcherEngine(threading.Thread):
               }
             }
         """
-        positions = self.bot.api.get_positions() or []
+        positions = read_broker(
+            self.bot, "positions", max_age=self.BROKER_MAX_AGE,
+            consumer="order_watcher", allow_stale=False,
+        )
         broker_map: Dict[str, Dict[str, int]] = {}
 
         for p in positions:
@@ -1039,6 +1402,8 @@ class OrderWatcherEngine(threading.Thread):
         Returns True if found and updated, False otherwise.
         Explicitly null/None values are honoured to allow the caller to clear a field.
         """
+        found = False
+        new_token = None
         with self._managed_exits_lock:
             for cmd_id, state in list(self._managed_exits.items()):
                 record = state["record"]
@@ -1064,6 +1429,8 @@ class OrderWatcherEngine(threading.Thread):
                         state["activation_price"] = None
                         state["highest_price"] = None
                         state["lowest_price"] = None
+                        state["_fav_extreme"] = None
+                    new_token = self._index_trigger_levels(cmd_id, state)
 
                     # Also update the DB record for persistence across restarts
                     try:
@@ -1081,8 +1448,11 @@ class OrderWatcherEngine(threading.Thread):
                         state.get("stop_loss"), state.get("target"),
                         state.get("trailing_type"), state.get("trailing_value"), state.get("trail_when"), state.get("initial_ltp"),
                     )
-                    return True
-        return False
+                    found = True
+                    break
+        if new_token:
+            self._subscribe_exit_tokens([new_token])
+        return found
 
     def remove_managed_exit(self, symbol: str, product: str = None) -> bool:
         """Remove a managed exit by symbol (disables SL/target monitoring)."""
@@ -1091,6 +1461,7 @@ class OrderWatcherEngine(threading.Thread):
                 record = state["record"]
                 if record.symbol == symbol and (product is None or record.product == product):
                     self._managed_exits.pop(cmd_id, None)
+                    self._trigger_book.remove(cmd_id)
                     try:
                         self.repo.update_status(cmd_id, "FAILED")
                         self.repo.update_tag(cmd_id, "MANAGER_DISABLED")
@@ -44,13 +44,21 @@ import logging
 import sqlite3
 import re
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from shoonya_platform.persistence.database import get_connection
+from shoonya_platform.persistence.intent_queue import (
+    CLAIM_BATCH_SIZE,
+    FALLBACK_POLL_SEC,
+    claim_pending_intents,
+    intent_wakeup,
+    release_intents,
+)
 
 logger = logging.getLogger("EXECUTION.CONTROL")
 
-POLL_INTERVAL_SEC = 1.0
+# Fallback for other-process writers only (see GenericControlIntentConsumer)
+POLL_INTERVAL_SEC = FALLBACK_POLL_SEC
 
 
 class StrategyControlConsumer:
@@ -82,9 +90,10 @@ class StrategyControlConsumer:
 
         while not self.stop_event.is_set():
             try:
-                processed = self._process_next_strategy_intent()
+                seen = intent_wakeup.version
+                processed = self._process_pending_strategy_intents()
                 if not processed:
-                    time.sleep(POLL_INTERVAL_SEC)
+                    intent_wakeup.wait(seen, POLL_INTERVAL_SEC)
 
             # 🔥 FAIL-HARD: broker / session failure must kill process
             except RuntimeError:
@@ -95,13 +104,28 @@ class StrategyControlConsumer:
                 time.sleep(2)
 
     # ==================================================
-    # PROCESS SINGLE STRATEGY INTENT
+    # PROCESS CLAIMED BATCH
     # ==================================================
+    def _process_pending_strategy_intents(self) -> int:
+        """Claim a batch of PENDING STRATEGY intents and process them in order."""
+        rows = self._claim_strategy_intents()
+        for idx, row in enumerate(rows):
+            if self.stop_event.is_set():
+                release_intents([r[0] for r in rows[idx:]])
+                return idx
+            self._process_strategy_intent(row)
+        return len(rows)
+
     def _process_next_strategy_intent(self) -> bool:
-        row = self._claim_next_strategy_intent()
-        if not row:
+        rows = self._claim_strategy_intents(limit=1)
+        if not rows:
             return False
+        return self._process_strategy_intent(rows[0])
 
+    # ==================================================
+    # PROCESS SINGLE STRATEGY INTENT
+    # ==================================================
+    def _process_strategy_intent(self, row: Tuple[str, str]) -> bool:
         intent_id, payload_json = row
 
         try:
@@ -367,45 +391,14 @@ class StrategyControlConsumer:
             return True  # Intent processed (failed)
 
     # ==================================================
-    # CLAIM NEXT STRATEGY INTENT (ATOMIC)
+    # CLAIM STRATEGY INTENTS (ATOMIC, BATCHED)
     # ==================================================
-    def _claim_next_strategy_intent(self) -> Optional[Tuple[str, str]]:
-        conn = get_connection()
-        cur = conn.cursor()
-
-        try:
-            cur.execute("BEGIN IMMEDIATE")
-
-            cur.execute(
-                """
-                SELECT id, payload
-                FROM control_intents
-                WHERE status = 'PENDING'
-                  AND type = 'STRATEGY'
-                ORDER BY created_at
-                LIMIT 1
-                """
-            )
-
-            row = cur.fetchone()
-            if not row:
-                conn.commit()
-                return None
-
-            cur.execute(
-                """
-                UPDATE control_intents
-                SET status = 'PROCESSING'
-                WHERE id = ?
-                """,
-                (row[0],),
-            )
+    def _claim_strategy_intents(self, limit: int = CLAIM_BATCH_SIZE) -> List[Tuple[str, str]]:
+        return claim_pending_intents("id, payload", "type = 'STRATEGY'", limit=limit)
 
-            conn.commit()
-            return row
-
-        finally:
-            conn.close()
+    def _claim_next_strategy_intent(self) -> Optional[Tuple[str, str]]:
+        rows = self._claim_strategy_intents(limit=1)
+        return rows[0] if rows else None
 
     # ==================================================
     # LOAD STRATEGY CONFIG (from saved JSON)
@@ -70,6 +70,7 @@ from shoonya_platform.execution.order_watcher import OrderWatcherEngine
 
 # ---------------- RISK ----------------
 from shoonya_platform.risk.supreme_risk import SupremeRiskManager
+from shoonya_platform.brokers.lanes import BrokerLanes, SlidingWindowRateLimiter
 
 # ----------------MODELS--------------
 from shoonya_platform.domain.business_models import TradeRecord
@@ -77,6 +78,7 @@ from shoonya_platform.domain.business_models import TradeRecord
 # ----------------UTILS--------------
 from shoonya_platform.utils.utils import log_exception
 from shoonya_platform.utils.text_sanitize import sanitize_text
+from shoonya_platform.utils.latency import LatencyHistogram
 
 # ---------------------- dashboard session ----------------
 from shoonya_platform.api.dashboard.services.broker_service import BrokerView
@@ -108,7 +110,9 @@ logger = get_component_logger('trading_bot')
 class ShoonyaApiProxy:
     """Thin, thread-safe proxy around ShoonyaClient.
 
-    - Serializes all API calls with a single lock to avoid concurrent hits
+    - Runs API calls in concurrency lanes (orders / reads / quotes) so a
+      slow order-book read never queues an order placement; login/logout
+      drain every lane first (see brokers/lanes.py)
     - Enforces session validation for Tier-1 operations
     - Delegates unknown attributes to the underlying client
     """
@@ -125,27 +129,38 @@ class ShoonyaApiProxy:
         'ensure_session',
     }
 
-    def __init__(self, client):
+    def __init__(self, client, lane_limits=None, rate_limiter=None):
         # Accepts any broker adapter (ShoonyaClient, FyersBrokerClient, etc.)
+        # rate_limiter: only for clients that don't rate-limit themselves
         self._client = client
-        self._lock = threading.RLock()
+        self._lanes = BrokerLanes(lane_limits, rate_limiter=rate_limiter)
         self._logger = get_component_logger('trading_bot')
 
     def _call(self, name: str, *args, **kwargs):
-        with self._lock:
-            try:
-                if name in self.TIER1_METHODS:
-                    self._client.ensure_session()
-            except Exception as e:
-                self._logger.error("Session validation failed before %s: %s", name, e)
-                raise
+        return self._lanes.run(name, self._invoke, name, *args, **kwargs)
 
-            func = getattr(self._client, name)
-            try:
-                return func(*args, **kwargs)
-            except Exception:
-                self._logger.error("API call failed: %s", name)
-                raise
+    def _invoke(self, name: str, *args, **kwargs):
+        try:
+            if name in self.TIER1_METHODS:
+                self._client.ensure_session()
+        except Exception as e:
+            self._logger.error("Session validation failed before %s: %s", name, e)
+            raise
+
+        func = getattr(self._client, name)
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            self._logger.error("API call failed: %s", name)
+            raise
+
+    def get_lane_stats(self) -> Dict[str, Any]:
+        """Per-lane concurrency / wait / duration stats (+ client rate limiter)."""
+        stats = self._lanes.get_stats()
+        limiter = getattr(self._client, "rate_limiter", None)
+        if "rate_limiter" not in stats and isinstance(limiter, SlidingWindowRateLimiter):
+            stats["rate_limiter"] = limiter.get_stats()
+        return stats
 
     def login(self, *args, **kwargs):
         return self._call('login', *args, **kwargs)
@@ -399,8 +414,7 @@ class ShoonyaBot(AlertProcessingMixin, ExecutionMixin, StatusSchedulingMixin):
         # STARTUP GUARD RECONCILIATION
         try:
             self._ensure_login()
-            self.broker_view.invalidate_cache("positions")
-            positions = self.broker_view.get_positions(force_refresh=True) or []
+            positions = self.broker_view.get_positions(max_age=0.0, consumer="startup_guard") or []
             broker_map: Dict[str, Dict[str, int]] = {}
             for p in positions:
                 sym = p.get("tsym")
@@ -435,6 +449,7 @@ class ShoonyaBot(AlertProcessingMixin, ExecutionMixin, StatusSchedulingMixin):
         self._alert_locks_guard = threading.Lock()
         self._atomic_locks: Dict[str, threading.Lock] = {}
         self._atomic_locks_guard = threading.Lock()
+        self._process_alert_duration = LatencyHistogram()
 
         # -------------------------------------------------
         # RISK MANAGER
@@ -458,6 +473,8 @@ class ShoonyaBot(AlertProcessingMixin, ExecutionMixin, StatusSchedulingMixin):
                     raise ValueError("Telegram bot_token and chat_id must be configured")
 
                 self.telegram = TelegramNotifier(bot_token, chat_id)
+                # Alert / RMS paths only enqueue; HTTP happens off-thread
+                self.telegram.start_dispatcher()
                 logger.info("Telegram integration enabled")
 
                 # Load saved notification prefs from disk  
@@ -626,26 +643,14 @@ class ShoonyaBot(AlertProcessingMixin, ExecutionMixin, StatusSchedulingMixin):
         """
         if self.telegram_enabled and self.telegram:
             try:
-                normalized = sanitize_text(message, ascii_only=False)
-                # Check BOTH master + category toggle
-                prefs_allow = self.telegram._should_send_to_telegram(
-                    "send_generic", category=category,
-                )
                 logger.info(
-                    "send_telegram: prefs_allow=%s | category=%s | _prefs=%s | msg_preview=%.40s",
-                    prefs_allow,
+                    "send_telegram: category=%s | msg_preview=%.40s",
                     category,
-                    self.telegram._prefs,
-                    normalized.replace('\n', ' ')[:40],
+                    sanitize_text(message, ascii_only=False).replace('\n', ' ')[:40],
                 )
-                if prefs_allow:
-                    result = self.telegram.send_message(normalized, _skip_log=True)
-                    # Log for dashboard with actual sent status
-                    self.telegram._append_message_log(normalized, sent=result)
-                    return result
-                # Log for dashboard with sent=False so UI shows blocked
-                self.telegram._append_message_log(normalized, sent=False)
-                return True
+                # Master + category toggles checked by notify(); enqueued when
+                # the dispatcher runs, blocked → logged with sent=False
+                return self.telegram.notify(message, category=category)
             except Exception as e:
                 logger.error(f"Telegram send error: {e}")
                 return False
@@ -818,8 +823,13 @@ class ShoonyaBot(AlertProcessingMixin, ExecutionMixin, StatusSchedulingMixin):
                         except Exception as tg_e:
                             logger.debug(f"Telegram send timeout (expected): {tg_e}")
 
-                    tg_thread = threading.Thread(target=send_shutdown_msg, daemon=True)
-                    tg_thread.start()
+                    if self.telegram and self.telegram.dispatcher_running:
+                        send_shutdown_msg()  # enqueue, then drain briefly
+                        remaining = shutdown_timeout - (time.time() - shutdown_start)
+                        self.telegram.stop_dispatcher(timeout=max(1.0, min(5.0, remaining - 2)))
+                    else:
+                        tg_thread = threading.Thread(target=send_shutdown_msg, daemon=True)
+                        tg_thread.start()
                 except Exception as e:
                     logger.debug(f"Telegram notification skipped: {e}")
 
@@ -1,5 +1,14 @@
-# 🔒 PRODUCTION FROZEN — LiveFeed v3.1
-# Date: 2026-02-21
+# 🔒 PRODUCTION FROZEN — LiveFeed v3.3
+# Date: 2026-10-16
+# Changes from v3.2:
+# - 🔥 TickStore.wait_for_seq(): pull consumers block until the next write
+#      instead of sleeping (still no callbacks on the feed thread)
+# - 🔥 TickStore.prices_since(): (ltp, write time) for watched tokens only
+# Changes from v3.1:
+# - 🔥 TickStore: preallocated per-token slots (__slots__, fixed field layout)
+# - 🔥 ONE lock per tick (store lock); heartbeat + tick counter folded into it
+# - 🔥 Global + per-token monotonic sequence numbers; get_ticks_since(seq)
+#      returns only what changed instead of copying the whole store
 # Changes from v3.0:
 # - ✅ BUG-029: Added extraction of bid/ask fields (bp1, sp1, bq1, sq1) in normalize_tick()
 # - ✅ BUG-035: Replaced unbounded defaultdict with TTLCache to prevent memory growth
@@ -22,16 +31,15 @@ ARCHITECTURE:
 - Consumers = Pull from tick_data_store on-demand
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 # ShoonyaClient kept for legacy type references; all public functions accept Any broker adapter
 from shoonya_platform.brokers.shoonya.client import ShoonyaClient  # noqa: F401
 import time
 import threading
-from collections import defaultdict
+from collections import OrderedDict
 from datetime import datetime
 from colorama import Fore, Style
 import logging
-from cachetools import TTLCache
 
 # ===============================
 # 📝 Configure Logging
@@ -57,8 +65,242 @@ config = FeedConfig()
 _TICK_TTL_SECONDS = 300   # evict ticks older than 5 minutes
 _TICK_MAX_TOKENS  = 10_000
 
-tick_data_store: TTLCache = TTLCache(maxsize=_TICK_MAX_TOKENS, ttl=_TICK_TTL_SECONDS)
-_tick_store_lock = threading.RLock()   # separate lock; do NOT hold _state_lock while holding this
+# Fixed tick field layout (normalize_tick output keys)
+TICK_FIELDS: Tuple[str, ...] = (
+    "ltp", "pc", "v", "o", "h", "l", "c", "ap", "oi",
+    "bp1", "sp1", "bq1", "sq1", "tt",
+)
+
+
+class TickSlot:
+    """
+    Latest tick for one token: fixed fields + sequence number.
+
+    Unset fields are None and are omitted from as_dict(), so consumers see
+    exactly the keys the feed has delivered (same as the old merged dict).
+    Unknown keys (e.g. ``_fyers_source``) go to ``extra``.
+    """
+
+    __slots__ = TICK_FIELDS + ("seq", "updated", "extra")
+
+    def __init__(self):
+        for f in TICK_FIELDS:
+            setattr(self, f, None)
+        self.seq = 0
+        self.updated = 0.0
+        self.extra: Optional[Dict[str, Any]] = None
+
+    def merge(self, tick: Dict[str, Any]) -> None:
+        for k, v in tick.items():
+            if k in _TICK_FIELD_SET:
+                setattr(self, k, v)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[k] = v
+
+    def clear_fields(self) -> None:
+        for f in TICK_FIELDS:
+            setattr(self, f, None)
+        self.extra = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = {}
+        for f in TICK_FIELDS:
+            v = getattr(self, f)
+            if v is not None:
+                out[f] = v
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+_TICK_FIELD_SET = frozenset(TICK_FIELDS)
+
+
+class TickStore:
+    """
+    Token → TickSlot store with monotonic sequence numbers.
+
+    - Every write bumps the global seq and stamps it on the token's slot
+    - Slots are kept in update order, so "changed since seq N" walks only
+      the tokens that changed (newest first) instead of the whole store
+    - TTL / max-size eviction like the previous TTLCache (lazy, amortized)
+    - Dict-style access kept for existing callers (``store[key] = tick``
+      replaces, ``store.get(key)`` returns a dict copy)
+    """
+
+    _PURGE_EVERY = 1024  # writes between TTL sweeps
+
+    def __init__(self, maxsize: int = _TICK_MAX_TOKENS, ttl: float = _TICK_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.RLock()
+        # Pull consumers may block until the next write (no callbacks)
+        self._changed = threading.Condition(self.lock)
+        self._slots: "OrderedDict[str, TickSlot]" = OrderedDict()
+        self._seq = 0
+
+    # ---------------- writes ----------------
+
+    def update(self, token: str, tick: Dict[str, Any], replace: bool = False) -> int:
+        """Merge (or replace) a token's tick. Returns the new global seq."""
+        now = time.monotonic()
+        with self.lock:
+            slot = self._slots.get(token)
+            if slot is None:
+                slot = TickSlot()
+                self._slots[token] = slot
+            else:
+                self._slots.move_to_end(token)
+                if replace:
+                    slot.clear_fields()
+            slot.merge(tick)
+            self._seq += 1
+            slot.seq = self._seq
+            slot.updated = now
+
+            if self._seq % self._PURGE_EVERY == 0 or len(self._slots) > self.maxsize:
+                self._purge(now)
+            self._changed.notify_all()
+            return self._seq
+
+    def _purge(self, now: float) -> None:
+        """Drop expired / excess slots (oldest first). Caller holds lock."""
+        slots = self._slots
+        cutoff = now - self.ttl
+        while slots:
+            token, slot = next(iter(slots.items()))
+            if slot.updated >= cutoff and len(slots) <= self.maxsize:
+                break
+            del slots[token]
+
+    def __setitem__(self, token: str, tick: Dict[str, Any]) -> None:
+        self.update(token, tick, replace=True)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._slots.clear()
+
+    # ---------------- reads ----------------
+
+    def _live(self, token: str, now: float) -> Optional[TickSlot]:
+        slot = self._slots.get(token)
+        if slot is None or now - slot.updated > self.ttl:
+            return None
+        return slot
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def get(self, token: str, default=None):
+        with self.lock:
+            slot = self._live(token, time.monotonic())
+            return slot.as_dict() if slot is not None else default
+
+    def __getitem__(self, token: str) -> Dict[str, Any]:
+        out = self.get(token)
+        if out is None:
+            raise KeyError(token)
+        return out
+
+    def __contains__(self, token) -> bool:
+        with self.lock:
+            return self._live(token, time.monotonic()) is not None
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        with self.lock:
+            return sum(1 for s in self._slots.values() if now - s.updated <= self.ttl)
+
+    def token_seq(self, token: str) -> int:
+        with self.lock:
+            slot = self._slots.get(token)
+            return slot.seq if slot is not None else 0
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        now = time.monotonic()
+        with self.lock:
+            return [
+                (tok, slot.as_dict())
+                for tok, slot in self._slots.items()
+                if now - slot.updated <= self.ttl
+            ]
+
+    def snapshot(self, tokens: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        out = {}
+        with self.lock:
+            for tok in tokens:
+                slot = self._live(tok, now)
+                if slot is not None:
+                    out[tok] = slot.as_dict()
+        return out
+
+    def changed_since(
+        self,
+        since_seq: int,
+        tokens: Optional[Iterable[str]] = None,
+    ) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """
+        Ticks written after ``since_seq``.
+
+        Returns (current seq, {token: tick}). Pass the returned seq back
+        on the next call to receive only newer changes.
+        """
+        wanted = set(tokens) if tokens is not None else None
+        now = time.monotonic()
+        out: Dict[str, Dict[str, Any]] = {}
+        with self.lock:
+            seq = self._seq
+            if since_seq >= seq:
+                return seq, out
+            for tok in reversed(self._slots):
+                slot = self._slots[tok]
+                if slot.seq <= since_seq:
+                    break  # update-ordered: everything older is unchanged
+                if wanted is not None and tok not in wanted:
+                    continue
+                if now - slot.updated <= self.ttl:
+                    out[tok] = slot.as_dict()
+        return seq, out
+
+    def wait_for_seq(self, since_seq: int, timeout: Optional[float] = None) -> int:
+        """Block until a write after ``since_seq`` (or timeout); returns seq."""
+        with self.lock:
+            self._changed.wait_for(lambda: self._seq > since_seq, timeout)
+            return self._seq
+
+    def prices_since(
+        self,
+        since_seq: int,
+        tokens: Iterable[str],
+    ) -> Tuple[int, Dict[str, Tuple[float, float]]]:
+        """
+        LTPs of ``tokens`` written after ``since_seq``, without dict copies.
+
+        Returns (current seq, {token: (ltp, write time on time.monotonic())}).
+        """
+        wanted = tokens if isinstance(tokens, (set, frozenset, dict)) else set(tokens)
+        now = time.monotonic()
+        out: Dict[str, Tuple[float, float]] = {}
+        with self.lock:
+            seq = self._seq
+            if since_seq >= seq or not wanted:
+                return seq, out
+            for tok in reversed(self._slots):
+                slot = self._slots[tok]
+                if slot.seq <= since_seq:
+                    break
+                if tok in wanted and slot.ltp is not None and now - slot.updated <= self.ttl:
+                    out[tok] = (slot.ltp, slot.updated)
+        return seq, out
+
+
+tick_data_store = TickStore(maxsize=_TICK_MAX_TOKENS, ttl=_TICK_TTL_SECONDS)
+# Kept for callers that wrap store writes in the store lock
+_tick_store_lock = tick_data_store.lock
 
 subscribed_tokens: set = set()
 _state_lock = threading.Lock()
@@ -67,9 +309,8 @@ _state_lock = threading.Lock()
 _api_client_ref: Optional[ShoonyaClient] = None
 _last_tick_time: Optional[float] = None
 
-# Tick counter for throttled logging
-_tick_counter = 0
-_tick_counter_lock = threading.Lock()
+# Tick counter baseline (total ticks = store seq - baseline)
+_tick_counter_base = 0
 
 EXPECTED_COLS = ["ltp", "pc", "v", "o", "h", "l", "c", "ap", "oi", "tt"]
 
@@ -184,8 +425,8 @@ def event_handler_feed_update(tick_data: dict) -> None:
     Args:
         tick_data: Raw tick data from WebSocket
     """
-    global _tick_counter, _last_tick_time
-    
+    global _last_tick_time
+
     # NOTE: Do NOT gate ticks on session state.
     # WS ticks arrive independently of REST session validity.
     # Dropping ticks here causes zero-data cascading failures.
@@ -202,30 +443,23 @@ def event_handler_feed_update(tick_data: dict) -> None:
         # Normalize tick
         normalized = normalize_tick(tick_data)
 
-        with _tick_store_lock:
-            existing = tick_data_store.get(token, {})
-            existing.update(normalized)
-            tick_data_store[token] = existing
-        
-        # Update heartbeat
-        with _state_lock:
-            _last_tick_time = time.time()
-            
+        # Single lock: slot merge + seq (doubles as the tick counter)
+        seq = tick_data_store.update(token, normalized)
+        tick_count = seq - _tick_counter_base
+
+        # Heartbeat: plain assignment is atomic, no lock needed
+        _last_tick_time = time.time()
+
         # Throttled logging to reduce verbosity
-        with _tick_counter_lock:
-            _tick_counter += 1
-            should_log = (_tick_counter % config.LOG_TICK_INTERVAL) == 0
-            is_first = (_tick_counter == 1)
-        
-        if is_first:
+        if tick_count == 1:
             ltp = normalized.get('ltp')
-            logger.info(f"🎯 FIRST TICK received | token={token} | LTP={ltp} | store_size={len(tick_data_store)}")
+            logger.info(f"🎯 FIRST TICK received | token={token} | LTP={ltp}")
         
-        if should_log:
+        if tick_count % config.LOG_TICK_INTERVAL == 0 and logger.isEnabledFor(logging.DEBUG):
             ltp = normalized.get('ltp')
             oi = normalized.get('oi')
             if ltp is not None:
-                logger.debug(f"📈 Tick #{_tick_counter} | {token} | LTP: {ltp} | OI: {oi} | store={len(tick_data_store)}")
+                logger.debug(f"📈 Tick #{tick_count} | {token} | LTP: {ltp} | OI: {oi} | store={len(tick_data_store)}")
                     
     except Exception as e:
         logger.error(f"Error handling feed update: {e}", exc_info=True)
@@ -505,12 +739,11 @@ def get_ltp_map() -> Dict[str, Optional[float]]:
     Returns:
         Dictionary mapping token strings to LTP values
     """
-    with _tick_store_lock:
-        return {
-            token: data.get("ltp")
-            for token, data in tick_data_store.items()
-            if "ltp" in data
-        }
+    return {
+        token: data.get("ltp")
+        for token, data in tick_data_store.items()
+        if "ltp" in data
+    }
 
 
 def get_tick_data(token: str) -> Optional[Dict[str, Any]]:
@@ -526,9 +759,7 @@ def get_tick_data(token: str) -> Optional[Dict[str, Any]]:
     Returns:
         Tick data dictionary or None if not found
     """
-    token = _normalize_token_key(token)
-    with _tick_store_lock:
-        return tick_data_store.get(token, {}).copy() if token in tick_data_store else None
+    return tick_data_store.get(_normalize_token_key(token))
 
 
 def get_all_tick_data() -> Dict[str, Dict[str, Any]]:
@@ -536,12 +767,12 @@ def get_all_tick_data() -> Dict[str, Dict[str, Any]]:
     Get complete tick data for all subscribed tokens.
     
     🔥 v3.0: Batch pull for efficiency (OptionChain uses this).
+    Prefer get_ticks_since() for repeated polling.
     
     Returns:
         Dictionary mapping tokens to their complete tick data
     """
-    with _tick_store_lock:
-        return {token: data.copy() for token, data in tick_data_store.items()}
+    return dict(tick_data_store.items())
 
 
 def get_tick_data_batch(tokens: List[str]) -> Dict[str, Dict[str, Any]]:
@@ -557,16 +788,35 @@ def get_tick_data_batch(tokens: List[str]) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary mapping normalized tokens to their tick data
     """
-    with _tick_store_lock:
-        out = {}
-        for t in tokens:
-            key = _normalize_token_key(t)
-            if key in tick_data_store:
-                out[key] = tick_data_store[key].copy()
-        return out
+    return tick_data_store.snapshot(_normalize_token_key(t) for t in tokens)
+
+
+def get_tick_seq() -> int:
+    """Current global tick sequence number (monotonic, never reset)."""
+    return tick_data_store.seq
+
+
+def get_ticks_since(
+    since_seq: int,
+    tokens: Optional[List[str]] = None,
+) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """
+    🔥 NEW v3.2: Ticks that changed after ``since_seq``.
 
+    Cost is proportional to the number of changed tokens, not the store
+    size. Start with ``since_seq=0`` and pass back the returned seq.
 
+    Args:
+        since_seq: Sequence number from the previous call (0 = everything)
+        tokens: Optional filter (plain or exchange-prefixed)
 
+    Returns:
+        (current seq, {normalized token: tick data})
+    """
+    wanted = (
+        [_normalize_token_key(t) for t in tokens] if tokens is not None else None
+    )
+    return tick_data_store.changed_since(since_seq, wanted)
 
 
 def is_feed_connected() -> bool:
@@ -609,16 +859,15 @@ def reset_all_state() -> None:
     WARNING: Does not unsubscribe from API, only clears local state.
     Use for testing or manual cleanup only.
     """
-    global _tick_counter, _last_tick_time
+    global _tick_counter_base, _last_tick_time
     
     with _tick_store_lock:
         tick_data_store.clear()
+        # seq stays monotonic (consumers hold cursors); counter restarts
+        _tick_counter_base = tick_data_store.seq
     with _state_lock:
         subscribed_tokens.clear()
     
-    with _tick_counter_lock:
-        _tick_counter = 0
-    
     _last_tick_time = None
     
     logger.warning("All state reset (tick data + subscriptions)")
@@ -633,11 +882,9 @@ def get_feed_stats() -> Dict[str, Any]:
     """
     with _state_lock:
         num_subscribed = len(subscribed_tokens)
-    with _tick_store_lock:
-        num_ticks = len(tick_data_store)
-    
-    with _tick_counter_lock:
-        total_ticks = _tick_counter
+    num_ticks = len(tick_data_store)
+    tick_seq = tick_data_store.seq
+    total_ticks = tick_seq - _tick_counter_base
     
     # Heartbeat check
     connected = is_feed_connected()
@@ -654,6 +901,7 @@ def get_feed_stats() -> Dict[str, Any]:
         "subscribed_tokens": num_subscribed,
         "tokens_with_data": num_ticks,
         "total_ticks_received": total_ticks,
+        "tick_seq": tick_seq,
         "seconds_since_last_tick": seconds_since_last_tick,
         "feed_stale": stale,
     }
@@ -323,17 +323,15 @@ def get_options(
 
     insts = OPTION_INSTRUMENTS.get(exchange, set())
 
-    rows = [
-        rec for rec in SCRIPTMASTER.get(exchange, {}).values()
-        # ✅ Check both Symbol and Underlying (critical for BFO)
-        if (
-            (rec.get("Symbol") == symbol or rec.get("Underlying") == symbol)
-            and rec.get("Instrument") in insts
-            and (not expiry or rec.get("Expiry") == expiry)
-        )
-    ]
-
-    return rows
+    table = SCRIPTMASTER.get(exchange)
+    if table is None:
+        return []
+
+    # ✅ Check both Symbol and Underlying (critical for BFO) — via the
+    # Symbol / Underlying indexes instead of a full scan
+    return table.rows(
+        table.select(name=symbol, instruments=insts, expiry=expiry or None)
+    )
 
 
 # =============================================================================
@@ -2,6 +2,11 @@
 ===============================================================================
 OPTION CHAIN v6.1 - PULL-BASED ARCHITECTURE
 ===============================================================================
+🔥 v6.2 PERFORMANCE:
+    1. Persistent token → row-position index (rebuilt only on chain load).
+    2. Ticks applied as one batched assignment per column (no per-cell .at/.loc).
+    3. Pull latency tracked and exposed in get_pull_stats().
+
 🔥 v6.1 BUG FIXES:
     1. Fixed crash in get_nearest_premium_option() / get_nearest_greek_option()
        (accessing scalar Series without .iloc[0]).
@@ -56,7 +61,9 @@ OPTION CHAIN v6.1 - PULL-BASED ARCHITECTURE
 from __future__ import annotations
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Literal
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List, Literal
+import numpy as np
 import pandas as pd
 import threading
 import time
@@ -69,11 +76,11 @@ from shoonya_platform.market_data.feeds.live_feed import (
     is_feed_connected,
     check_feed_health,
     get_all_tick_data,      # 🔥 NEW: Pull all ticks
-    get_tick_data_batch,    # 🔥 NEW: Efficient batch pull
+    get_ticks_since,        # 🔥 v3.2: Only ticks changed since last pull
 )
 from shoonya_platform.utils.bs_greeks import (
-    implied_volatility,
-    bs_greeks,
+    bs_greeks_vec,
+    implied_volatility_vec,
     time_to_expiry_seconds
 )
 logger = logging.getLogger(__name__)
@@ -93,6 +100,26 @@ class GreekCoverageError(Exception):
     pass
 
 
+# Live-feed tick field → chain column
+TICK_FIELD_MAP: Dict[str, str] = {
+    "ltp": "ltp",
+    "pc": "change_pct",
+    "v": "volume",
+    "oi": "oi",
+    "o": "open",
+    "h": "high",
+    "l": "low",
+    "c": "close",
+    "bp1": "bid",
+    "sp1": "ask",
+    "bq1": "bid_qty",
+    "sq1": "ask_qty",
+}
+
+# Recent pull latencies kept for get_pull_stats()
+PULL_LATENCY_WINDOW = 256
+
+
 # ============================================================================
 # CORE DATA CLASS
 # ============================================================================
@@ -140,6 +167,13 @@ class OptionChainData:
         # ✅ NEW: Pull statistics
         self._last_pull_time: Optional[float] = None
         self._total_pulls: int = 0
+        self._pull_latencies_ms: Deque[float] = deque(maxlen=PULL_LATENCY_WINDOW)
+
+        # 🔥 Persistent token → row positions (rebuilt only when _df is replaced)
+        self._token_rows: Dict[str, tuple] = {}
+        self._indexed_df: Optional[pd.DataFrame] = None
+        # Feed seq cursor: pull_ticks_efficient only fetches newer ticks
+        self._tick_seq: int = 0
         
         logger.info("OptionChainData v6.0 initialized")
 
@@ -190,7 +224,13 @@ class OptionChainData:
 
             rows: List[Dict[str, Any]] = []
 
-            for rec in data.values():
+            # Indexed candidates (Symbol/Underlying + expiry + instrument);
+            # the per-row checks below stay authoritative
+            candidates = data.rows(
+                data.select(name=symbol, expiry=expiry, instruments=valid_instruments)
+            )
+
+            for rec in candidates:
                 # ✅ FIXED: Check both Symbol and Underlying (critical for BFO)
                 symbol_match = (
                     rec.get("Symbol") == symbol 
@@ -319,6 +359,7 @@ class OptionChainData:
             self._df = df
             # ✅ FIX: Validate tokens (remove empty/None)
             self._token_set = {str(t) for t in df["token"].tolist() if t and str(t).strip()}
+            self._rebuild_token_index()
 
             self._exchange = exchange
             self._symbol = symbol
@@ -461,6 +502,7 @@ class OptionChainData:
             self._df = df
             # ✅ FIX: Validate tokens (remove empty/None)
             self._token_set = {str(t) for t in df["token"].astype(str) if t and str(t).strip()}
+            self._rebuild_token_index()
             self._exchange = exchange
             self._symbol = symbol
             self._expiry = expiry
@@ -480,6 +522,106 @@ class OptionChainData:
     # 🔥 v6.0: PULL-BASED TICK UPDATES (REPLACES CALLBACKS)
     # ------------------------------------------------------------------
 
+    def _rebuild_token_index(self) -> None:
+        """
+        Rebuild the token → row-position index. Caller holds self._lock.
+
+        Called when the chain is (re)loaded; tick pulls reuse the index.
+        """
+        index: Dict[str, List[int]] = {}
+        if self._df is not None:
+            for pos, tok in enumerate(self._df["token"].tolist()):
+                index.setdefault(str(tok), []).append(pos)
+        self._token_rows = {tok: tuple(rows) for tok, rows in index.items()}
+        self._indexed_df = self._df
+        # New rows have no prices yet → next pull fetches every tick
+        self._tick_seq = 0
+
+    def _apply_ticks(self, ticks: Dict[str, Dict[str, Any]]) -> tuple:
+        """
+        Apply feed ticks to the chain as one batched update per column.
+        Caller holds self._lock and has checked self._df is not None.
+
+        Returns:
+            (tokens matched, rows updated)
+        """
+        # ✅ BUG-033: the DF may have been replaced since the index was built
+        if self._indexed_df is not self._df:
+            self._rebuild_token_index()
+
+        token_rows = self._token_rows
+        fields = [
+            (src, [], []) for src in TICK_FIELD_MAP
+        ]  # (tick field, row positions, values)
+        ts_positions: List[int] = []
+        ts_values: List[Any] = []
+        tokens_matched = 0
+
+        now = None
+        for returned_token, tick in ticks.items():
+            # Normalize token (handle both plain and prefixed)
+            normalized = returned_token.split("|")[-1] if "|" in returned_token else returned_token
+
+            rows = token_rows.get(normalized)
+            if rows is None:
+                continue
+            tokens_matched += 1
+
+            ts = tick.get("tt")
+            if ts is None:
+                if now is None:
+                    now = datetime.now()
+                ts = now
+
+            if len(rows) == 1:
+                pos = rows[0]
+                for src, pos_list, val_list in fields:
+                    val = tick.get(src)
+                    if val is not None:
+                        pos_list.append(pos)
+                        val_list.append(val)
+                ts_positions.append(pos)
+                ts_values.append(ts)
+                continue
+
+            for src, pos_list, val_list in fields:
+                val = tick.get(src)
+                if val is not None:
+                    pos_list.extend(rows)
+                    val_list.extend([val] * len(rows))
+            ts_positions.extend(rows)
+            ts_values.extend([ts] * len(rows))
+
+        if not tokens_matched:
+            return 0, 0
+
+        updates = [(TICK_FIELD_MAP[src], pos, vals) for src, pos, vals in fields]
+        updates.append(("last_update", ts_positions, ts_values))
+
+        # One assignment per column
+        df = self._df
+        for col, pos, vals in updates:
+            if not pos:
+                continue
+            if col in df.columns:
+                arr = df[col].to_numpy(copy=True)
+            else:
+                arr = np.full(len(df), None, dtype=object)
+            try:
+                arr[pos] = vals
+            except (TypeError, ValueError):
+                arr = arr.astype(object)
+                arr[pos] = vals
+            df[col] = arr
+
+        return tokens_matched, len(ts_positions)
+
+    def _record_pull(self, started: float) -> None:
+        """Track pull statistics. Caller holds self._lock."""
+        self._last_pull_time = time.time()
+        self._total_pulls += 1
+        self._pull_latencies_ms.append((time.perf_counter() - started) * 1000)
+
     def pull_latest_ticks(self) -> int:
         """
         🔥 NEW v6.0: Pull latest tick data from feed store.
@@ -490,6 +632,8 @@ class OptionChainData:
         Returns:
             Number of contracts updated
         """
+        started = time.perf_counter()
+
         # Get all current tick data from feed
         all_ticks = get_all_tick_data()
         
@@ -517,49 +661,10 @@ class OptionChainData:
             if self._df is None:
                 return updated_count
             
-            # Map tick fields to dataframe columns
-            field_mapping = {
-                "ltp": "ltp",
-                "pc": "change_pct",
-                "v": "volume",
-                "oi": "oi",
-                "o": "open",
-                "h": "high",
-                "l": "low",
-                "c": "close",
-                "bp1": "bid",
-                "sp1": "ask",
-                "bq1": "bid_qty",
-                "sq1": "ask_qty",
-            }
-            
-            # ✅ FIX: Build mask lookup and normalize tokens
-            token_to_mask = {}
-            for token in self._token_set:
-                token_to_mask[token] = self._df["token"] == token
-            
-            # Update each token in the chain
-            for returned_token, tick in all_ticks.items():
-                # ✅ FIX: Normalize token (handle both plain and prefixed)
-                normalized = returned_token.split("|")[-1] if "|" in returned_token else returned_token
-                
-                if normalized not in token_to_mask:
-                    continue
-                
-                mask = token_to_mask[normalized]
-                
-                # Update all available fields
-                for src, col in field_mapping.items():
-                    if src in tick and tick[src] is not None:
-                        self._df.loc[mask, col] = tick[src]
-                
-                # Update timestamp
-                if "tt" in tick:
-                    self._df.loc[mask, "last_update"] = tick["tt"]
-                else:
-                    self._df.loc[mask, "last_update"] = datetime.now()
-                
-                updated_count += 1
+            tokens_matched, _ = self._apply_ticks(all_ticks)
+            updated_count += tokens_matched
+
+            self._record_pull(started)
         
         return updated_count
 
@@ -568,11 +673,14 @@ class OptionChainData:
         🔥 NEW v6.0: Efficient batch pull for option chain tokens.
         
         More efficient than pull_latest_ticks() for large chains
-        as it only fetches tokens we care about.
+        as it only fetches tokens we care about, and (v6.2) only the
+        ticks that changed since the previous pull (feed seq cursor).
         
         Returns:
             Number of contracts updated
         """
+        started = time.perf_counter()
+
         with self._lock:
             if self._df is None:
                 return 0
@@ -583,9 +691,14 @@ class OptionChainData:
                 tokens_to_fetch.append(self._spot_token)
             if self._fut_token:
                 tokens_to_fetch.append(self._fut_token)
+
+            if self._indexed_df is not self._df:
+                self._rebuild_token_index()
+            since_seq = self._tick_seq
+            indexed_df = self._df
         
         # Batch fetch outside lock (IO operation — safe to release lock here)
-        ticks = get_tick_data_batch(tokens_to_fetch)
+        seq, ticks = get_ticks_since(since_seq, tokens_to_fetch)
         
         if not ticks:
             return 0
@@ -605,51 +718,20 @@ class OptionChainData:
                     self._fut_ltp = ticks[self._fut_token]["ltp"]
                     updated_count += 1
             
-            # Update options
-            field_mapping = {
-                "ltp": "ltp",
-                "pc": "change_pct",
-                "v": "volume",
-                "oi": "oi",
-                "o": "open",
-                "h": "high",
-                "l": "low",
-                "c": "close",
-                "bp1": "bid",
-                "sp1": "ask",
-                "bq1": "bid_qty",
-                "sq1": "ask_qty",
-            }
-            
-            # ✅ BUG-033 FIX: Rebuild mask lookup INSIDE the lock — the DF may have
-            # changed between the first lock release and this second acquisition (TOCTOU).
-            # 🔥 OPTIMIZATION: Build token -> list of indices for O(1) updates instead of boolean masks
-            if self._df is not None:
-                df_tokens = self._df["token"].reset_index(drop=True)
-                token_to_indices = {}
-                for idx, tok in df_tokens.items():
-                    token_to_indices.setdefault(tok, []).append(idx)
-            else:
+            # ✅ BUG-033 FIX: DF may have been replaced between the two lock
+            # acquisitions (TOCTOU) — _apply_ticks re-validates the index.
+            if self._df is None:
                 return updated_count
 
-            for returned_token, tick_data in ticks.items():
-                # Normalize token (handle both plain and prefixed)
-                normalized = returned_token.split("|")[-1] if "|" in returned_token else returned_token
-                
-                if normalized not in token_to_indices:
-                    continue
-                
-                indices = token_to_indices[normalized]
-                for idx in indices:
-                    for src, col in field_mapping.items():
-                        if src in tick_data and tick_data[src] is not None:
-                            self._df.at[idx, col] = tick_data[src]
-                    self._df.at[idx, "last_update"] = tick_data.get("tt", datetime.now())
-                    updated_count += 1
+            _, rows_updated = self._apply_ticks(ticks)
+            updated_count += rows_updated
+
+            # Advance the cursor only if these ticks were fetched for this DF
+            if self._df is indexed_df:
+                self._tick_seq = seq
 
             # Track pull statistics (inside same lock — avoids third lock acquisition)
-            self._last_pull_time = time.time()
-            self._total_pulls += 1
+            self._record_pull(started)
             
         return updated_count
 
@@ -658,9 +740,12 @@ class OptionChainData:
         🔥 NEW v6.0: Get statistics about tick pulls.
         
         Returns:
-            Dictionary with pull metrics
+            Dictionary with pull metrics (latency over the last
+            PULL_LATENCY_WINDOW pulls, in milliseconds)
         """
         with self._lock:
+            latencies = sorted(self._pull_latencies_ms)
+            last_ms = self._pull_latencies_ms[-1] if self._pull_latencies_ms else None
             return {
                 "last_pull_time": self._last_pull_time,
                 "seconds_since_pull": (
@@ -669,8 +754,16 @@ class OptionChainData:
                 ),
                 "total_pulls": self._total_pulls,
                 "tokens_subscribed": len(self._token_set),
+                "contracts": len(self._df) if self._df is not None else 0,
                 "spot_token": self._spot_token,
                 "future_token": self._fut_token,
+                "pull_latency_ms": {
+                    "last": round(last_ms, 3) if last_ms is not None else None,
+                    "avg": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                    "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+                    "max": round(latencies[-1], 3) if latencies else None,
+                    "samples": len(latencies),
+                },
             }
 
     def capture_snapshot(self) -> Dict[str, Any]:
@@ -1115,6 +1208,8 @@ class OptionChainData:
             # Clear data
             self._df = None
             self._token_set.clear()
+            self._token_rows = {}
+            self._indexed_df = None
             
             # Clear Greeks
             if hasattr(self, "_greeks_df"):
@@ -1365,78 +1460,66 @@ def calculate_greeks(
     eligible = 0
     computed = 0
 
+    strikes = pd.to_numeric(df["Strike Price"], errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+
+    # Whole side at once (vectorized IV + Greeks), same eligibility rules
     for opt in ("CE", "PE"):
         price_col = ("Last Price", opt)
         if price_col not in df.columns:
             continue
 
-        prices = pd.to_numeric(df[price_col], errors="coerce")
-        strikes = pd.to_numeric(df["Strike Price"], errors="coerce")
-
-        ivs = [None] * len(df)
-        deltas = [None] * len(df)
-        gammas = [None] * len(df)
-        thetas = [None] * len(df)
-        vegas = [None] * len(df)
-        rhos = [None] * len(df)
-
-        for i in range(len(df)):
-            price = prices.iloc[i]
-            strike = strikes.iloc[i]
-
-            if pd.isna(price) or pd.isna(strike) or price < config.min_price:
-                continue
+        prices = pd.to_numeric(df[price_col], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        is_call = opt == "CE"
 
+        with np.errstate(invalid="ignore"):
             intrinsic = (
-                max(spot_price - strike, 0)
-                if opt == "CE"
-                else max(strike - spot_price, 0)
+                np.maximum(spot_price - strikes, 0.0)
+                if is_call
+                else np.maximum(strikes - spot_price, 0.0)
             )
+            is_eligible = (
+                ~np.isnan(prices)
+                & ~np.isnan(strikes)
+                & (prices >= config.min_price)
+                & ~((intrinsic > 0) & (prices <= intrinsic * 1.01))
+            )
+        eligible += int(is_eligible.sum())
 
-            if intrinsic > 0 and price <= intrinsic * 1.01:
-                continue
-
-            eligible += 1
-
-            try:
-                iv_raw = implied_volatility(
-                    price, spot_price, strike, T, risk_free_rate, opt,
-                    q=q,
-                )
-                sigma = iv_raw / 100 if iv_raw > 1 else iv_raw
-
-                if not (config.min_iv <= sigma <= config.max_iv):
-                    continue
-
-                greeks = bs_greeks(
-                    S=spot_price,
-                    K=strike,
-                    T=T,
-                    r=risk_free_rate,
-                    sigma=sigma,
-                    opt_type=opt,
-                    q=q,
-                )
-
-                ivs[i] = iv_raw
-                deltas[i] = greeks["delta"]
-                gammas[i] = greeks["gamma"]
-                thetas[i] = greeks["theta"]
-                vegas[i] = greeks["vega"]
-                rhos[i] = greeks["rho"]
-
-                computed += 1
+        iv_raw = implied_volatility_vec(
+            np.where(is_eligible, prices, np.nan),
+            spot_price, strikes, T, risk_free_rate, is_call,
+            q=q,
+        )
+        sigma = np.where(iv_raw > 1, iv_raw / 100, iv_raw)
+        with np.errstate(invalid="ignore"):
+            ok = (
+                is_eligible
+                & ~np.isnan(iv_raw)
+                & (sigma >= config.min_iv)
+                & (sigma <= config.max_iv)
+            )
+        computed += int(ok.sum())
 
-            except Exception:
-                # INTENTIONAL: Bad instruments are expected
-                continue
+        greeks = bs_greeks_vec(
+            spot_price, strikes[ok], T, risk_free_rate, sigma[ok], is_call,
+            q=q,
+        )
 
-        df[("IV", opt)] = ivs
-        df[("Delta", opt)] = deltas
-        df[("Gamma", opt)] = gammas
-        df[("Theta", opt)] = thetas
-        df[("Vega", opt)] = vegas
-        df[("Rho", opt)] = rhos
+        def _side(values):
+            col = np.full(len(df), np.nan)
+            col[ok] = values
+            return col
+
+        df[("IV", opt)] = _side(iv_raw[ok])
+        df[("Delta", opt)] = _side(greeks["delta"])
+        df[("Gamma", opt)] = _side(greeks["gamma"])
+        df[("Theta", opt)] = _side(greeks["theta"])
+        df[("Vega", opt)] = _side(greeks["vega"])
+        df[("Rho", opt)] = _side(greeks["rho"])
 
     coverage = computed / eligible if eligible else 0.0
 
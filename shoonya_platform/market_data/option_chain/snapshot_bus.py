@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+OptionChain Snapshot Bus (PRODUCTION)
+=====================================
+
+In-process publication of immutable, versioned option-chain snapshots.
+
+The supervisor publishes one ChainSnapshot per chain per cycle. Consumers
+living in the same process (MarketReader in ``bus`` / ``auto`` mode) read
+the column arrays directly instead of round-tripping through SQLite.
+
+RULES:
+- SINGLE publisher per chain key (OptionChainSupervisor)
+- Snapshots are IMMUTABLE (read-only NumPy columns)
+- Versions are monotonic per chain key (survive re-centering)
+- NO calculations beyond row indexing
+- Mirrors OptionChainStore fields and meta exactly
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Column layout mirrors the option_chain table in OptionChainStore.
+TEXT_COLUMNS: Tuple[str, ...] = ("option_type", "token", "trading_symbol", "exchange")
+INTEGER_COLUMNS: Tuple[str, ...] = ("lot_size", "volume", "oi", "bid_qty", "ask_qty")
+REAL_COLUMNS: Tuple[str, ...] = (
+    "strike",
+    "ltp", "change_pct",
+    "open", "high", "low", "close",
+    "bid", "ask",
+    "iv", "delta", "gamma", "theta", "vega",
+)
+# last_update is heterogeneous (exchange tick time or datetime) → kept as object
+OBJECT_COLUMNS: Tuple[str, ...] = ("last_update",)
+
+CHAIN_COLUMNS: Tuple[str, ...] = (
+    "strike", "option_type",
+    "token", "trading_symbol", "exchange", "lot_size",
+    "ltp", "change_pct", "volume", "oi",
+    "open", "high", "low", "close",
+    "bid", "ask", "bid_qty", "ask_qty",
+    "last_update",
+    "iv", "delta", "gamma", "theta", "vega",
+)
+
+_NUMERIC_COLUMNS = frozenset(REAL_COLUMNS + INTEGER_COLUMNS)
+_INTEGER_SET = frozenset(INTEGER_COLUMNS)
+
+
+def _sqlite_value(value: Any) -> Any:
+    """Normalize a cell the way sqlite3 would hand it back to a reader."""
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    if isinstance(value, datetime):
+        # sqlite3 default adapter
+        return value.isoformat(" ")
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime().isoformat(" ")
+    return value
+
+
+def _parse_expiry(expiry: str) -> Optional[date]:
+    try:
+        return datetime.strptime(expiry, "%d-%b-%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+
+# =====================================================================
+# SNAPSHOT
+# =====================================================================
+
+class ChainSnapshot:
+    """
+    Immutable column-oriented view of one option chain at one instant.
+
+    Columns are NumPy arrays with ``writeable=False``; numeric columns are
+    float64 with NaN for missing values, text columns are object arrays.
+    """
+
+    __slots__ = (
+        "key", "exchange", "symbol", "expiry",
+        "version", "snapshot_ts",
+        "meta", "columns", "_index",
+    )
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        exchange: str,
+        symbol: str,
+        expiry: str,
+        version: int,
+        snapshot_ts: float,
+        meta: Dict[str, str],
+        columns: Dict[str, np.ndarray],
+    ):
+        self.key = key
+        self.exchange = exchange
+        self.symbol = symbol
+        self.expiry = expiry
+        self.version = version
+        self.snapshot_ts = snapshot_ts
+        self.meta = meta
+        self.columns = columns
+
+        for arr in columns.values():
+            arr.flags.writeable = False
+
+        strikes = columns["strike"]
+        types = columns["option_type"]
+        self._index: Dict[Tuple[float, str], int] = {}
+        for i in range(len(strikes)):
+            self._index.setdefault((float(strikes[i]), str(types[i])), i)
+
+    # --------------------------------------------------
+    # BUILD
+    # --------------------------------------------------
+
+    @classmethod
+    def from_option_chain(
+        cls,
+        oc,
+        *,
+        key: str,
+        version: int,
+        snapshot_ts: Optional[float] = None,
+    ) -> Optional["ChainSnapshot"]:
+        """
+        Build a snapshot from a live OptionChainData.
+
+        Returns None if the chain has no rows yet.
+        """
+        df = oc.get_dataframe(copy=True)
+        stats = oc.get_stats()
+
+        if df is None or df.empty:
+            return None
+
+        if snapshot_ts is None:
+            snapshot_ts = time.time()
+
+        n = len(df)
+        columns: Dict[str, np.ndarray] = {}
+        for col in CHAIN_COLUMNS:
+            if col not in df.columns:
+                if col in _NUMERIC_COLUMNS:
+                    columns[col] = np.full(n, np.nan, dtype=np.float64)
+                else:
+                    columns[col] = np.full(n, None, dtype=object)
+                continue
+
+            series = df[col]
+            if col in _NUMERIC_COLUMNS:
+                columns[col] = pd.to_numeric(series, errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+            else:
+                values = series.astype(object).to_numpy()
+                columns[col] = np.array(
+                    [_sqlite_value(v) for v in values], dtype=object
+                )
+
+        parts = key.split(":", 2)
+        exchange = parts[0] if len(parts) > 0 else str(stats.get("exchange"))
+        symbol = parts[1] if len(parts) > 1 else str(stats.get("symbol"))
+        expiry = parts[2] if len(parts) > 2 else str(stats.get("expiry"))
+
+        meta = {
+            "exchange": str(stats.get("exchange")),
+            "symbol": str(stats.get("symbol")),
+            "expiry": str(stats.get("expiry")),
+            "atm": str(stats.get("atm")),
+            "spot_ltp": str(stats.get("spot_ltp")),
+            "fut_ltp": str(stats.get("fut_ltp")),
+            "snapshot_ts": str(snapshot_ts),
+        }
+
+        return cls(
+            key=key,
+            exchange=exchange,
+            symbol=symbol,
+            expiry=expiry,
+            version=version,
+            snapshot_ts=snapshot_ts,
+            meta=meta,
+            columns=columns,
+        )
+
+    # --------------------------------------------------
+    # ACCESSORS
+    # --------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.columns["strike"])
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def age_seconds(self) -> float:
+        return time.time() - self.snapshot_ts
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Return row ``i`` as a dict shaped like a sqlite3.Row of option_chain."""
+        out: Dict[str, Any] = {}
+        for col in CHAIN_COLUMNS:
+            v = self.columns[col][i]
+            if col in _NUMERIC_COLUMNS:
+                v = float(v)
+                if v != v:
+                    v = None
+                elif col in _INTEGER_SET:
+                    v = int(v)
+            out[col] = v
+        return out
+
+    def rows(self, indices) -> List[Dict[str, Any]]:
+        return [self.row(int(i)) for i in indices]
+
+    def find(self, strike: float, option_type: str) -> Optional[int]:
+        """O(1) row lookup by (strike, option_type)."""
+        return self._index.get((float(strike), str(option_type).upper()))
+
+    def get_row(self, strike: float, option_type: str) -> Optional[Dict[str, Any]]:
+        i = self.find(strike, option_type)
+        return self.row(i) if i is not None else None
+
+    def type_mask(self, option_type: str) -> np.ndarray:
+        return self.columns["option_type"] == str(option_type).upper()
+
+    def nearest(
+        self,
+        values: np.ndarray,
+        target: float,
+        mask: np.ndarray,
+        tolerance: Optional[float] = None,
+    ) -> Optional[int]:
+        """
+        Index of the row minimizing ``|values - target|`` among ``mask``.
+
+        NaN values never match (same as NULL in the SQL readers). Ties
+        resolve to the first row in chain order.
+        """
+        dist = np.abs(values - target)
+        ok = mask & ~np.isnan(dist)
+        if tolerance is not None:
+            ok &= dist <= tolerance
+        if not ok.any():
+            return None
+        candidates = np.flatnonzero(ok)
+        return int(candidates[np.argmin(dist[candidates])])
+
+
+# =====================================================================
+# BUS
+# =====================================================================
+
+class OptionChainSnapshotBus:
+    """
+    Latest-value registry of ChainSnapshots keyed by ``EXCHANGE:SYMBOL:EXPIRY``.
+
+    Publishing replaces the reference atomically; readers never block on
+    the publisher and always see a complete, immutable snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, ChainSnapshot] = {}
+        # Kept separately so versions stay monotonic across remove/re-add.
+        self._versions: Dict[str, int] = {}
+        self._published = 0
+        # Called as callback(key, snapshot) after every publish
+        self._subscribers: List[Callable[[str, "ChainSnapshot"], None]] = []
+
+    def publish(self, key: str, oc) -> Optional[ChainSnapshot]:
+        """Build and publish a snapshot for ``oc`` under ``key``."""
+        with self._lock:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+
+        snap = ChainSnapshot.from_option_chain(oc, key=key, version=version)
+        if snap is None:
+            return None
+
+        with self._lock:
+            current = self._snapshots.get(key)
+            if current is None or current.version < snap.version:
+                self._snapshots[key] = snap
+            self._published += 1
+            subscribers = list(self._subscribers)
+
+        # Outside the lock: subscribers may read the bus
+        for callback in subscribers:
+            try:
+                callback(key, snap)
+            except Exception:
+                logger.exception("Snapshot bus subscriber failed for %s", key)
+        return snap
+
+    def subscribe(self, callback: Callable[[str, "ChainSnapshot"], None]) -> None:
+        """Register ``callback(key, snapshot)`` to run after each publish."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, "ChainSnapshot"], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def get(
+        self,
+        exchange: str,
+        symbol: str,
+        expiry: Optional[str] = None,
+    ) -> Optional[ChainSnapshot]:
+        """
+        Latest snapshot for a chain.
+
+        If ``expiry`` is None the nearest non-expired expiry is chosen (same
+        rule as MarketReader's DB file resolution).
+        """
+        exchange = str(exchange).upper()
+        symbol = str(symbol).upper()
+
+        if expiry is not None:
+            with self._lock:
+                return self._snapshots.get(f"{exchange}:{symbol}:{expiry}")
+
+        prefix = f"{exchange}:{symbol}:"
+        with self._lock:
+            candidates = [s for k, s in self._snapshots.items() if k.startswith(prefix)]
+        if not candidates:
+            return None
+
+        today = date.today()
+        dated = [(s, _parse_expiry(s.expiry)) for s in candidates]
+        dated = [(s, d) for s, d in dated if d is not None]
+        if not dated:
+            return candidates[0]
+        future = sorted((x for x in dated if x[1] >= today), key=lambda x: x[1])
+        if future:
+            return future[0][0]
+        return max(dated, key=lambda x: x[1])[0]
+
+    def get_by_key(self, key: str) -> Optional[ChainSnapshot]:
+        with self._lock:
+            return self._snapshots.get(key)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._snapshots.pop(key, None)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._snapshots.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snaps = list(self._snapshots.values())
+            published = self._published
+        now = time.time()
+        return {
+            "chains": len(snaps),
+            "published_total": published,
+            "snapshots": {
+                s.key: {
+                    "version": s.version,
+                    "rows": len(s),
+                    "age_seconds": round(now - s.snapshot_ts, 3),
+                }
+                for s in snaps
+            },
+        }
+
+
+_SNAPSHOT_BUS = OptionChainSnapshotBus()
+
+
+def get_snapshot_bus() -> OptionChainSnapshotBus:
+    """Process-wide snapshot bus shared by the supervisor and all readers."""
+    return _SNAPSHOT_BUS
@@ -11,6 +11,7 @@ RULES:
 - NO calculations
 - NO live feed control
 - Mirrors OptionChainData fields exactly
+- INCREMENTAL: only rows whose fields changed are UPSERTed
 """
 
 import sqlite3
@@ -18,15 +19,59 @@ import time
 from pathlib import Path
 import threading
 import logging
+from typing import Any, Dict, List, Tuple
+
+from shoonya_platform.market_data.option_chain.snapshot_bus import CHAIN_COLUMNS
 
 logger = logging.getLogger(__name__)
 
+# Data columns after the (strike, option_type) primary key
+_VALUE_COLUMNS: Tuple[str, ...] = CHAIN_COLUMNS[2:]
+
+_UPSERT_SQL = (
+    "INSERT INTO option_chain ("
+    + ", ".join(CHAIN_COLUMNS)
+    + ") VALUES ("
+    + ", ".join("?" for _ in CHAIN_COLUMNS)
+    + ") ON CONFLICT(strike, option_type) DO UPDATE SET "
+    + ", ".join(f"{c}=excluded.{c}" for c in _VALUE_COLUMNS)
+)
+
+_META_UPSERT_SQL = (
+    "INSERT INTO meta (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+)
+
+
+def _column_values(df, col: str, n: int) -> List[Any]:
+    """Column as a Python list with NaN/NaT → None (what sqlite stores as NULL)."""
+    if col not in df.columns:
+        return [None] * n
+    values = df[col].tolist()
+    return [None if v is None or v != v else v for v in values]
+
 
 class OptionChainStore:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self._lock = threading.Lock()
 
+        # Last persisted row per (strike, option_type) and meta values.
+        # Empty → next write rewrites the table in full.
+        self._persisted: Dict[Tuple[Any, Any], tuple] = {}
+        self._meta: Dict[str, str] = {}
+        self._metrics: Dict[str, Any] = {
+            "snapshots": 0,
+            "full_rewrites": 0,
+            "rows_written": 0,
+            "rows_skipped": 0,
+            "last_rows_written": 0,
+            "last_write_ms": 0.0,
+            "max_write_ms": 0.0,
+            "total_write_ms": 0.0,
+            "last_snapshot_ts": None,
+        }
+
         self._conn = sqlite3.connect(
             self.db_path,
             timeout=3,
@@ -109,102 +154,127 @@ class OptionChainStore:
         self._conn.commit()
 
     # --------------------------------------------------
-    # SNAPSHOT WRITE (ATOMIC)
+    # SNAPSHOT WRITE (ATOMIC, INCREMENTAL)
     # --------------------------------------------------
 
-    def write_snapshot(self, oc) -> None:
+    def write_snapshot(self, oc) -> int:
         """
         Atomically mirror OptionChainData into SQLite.
+
+        Only rows whose tick fields / Greeks differ from the last persisted
+        version are UPSERTed; rows that left the chain are deleted. The
+        first write of a store instance rewrites the table in full.
+        ``meta.snapshot_ts`` is updated in the same transaction, so readers
+        always see rows and snapshot_ts together.
+
+        Returns:
+            Number of option rows written (upserted + deleted)
         """
+        started = time.perf_counter()
+
         df = oc.get_dataframe(copy=True)
         stats = oc.get_stats()
 
         if df is None or df.empty:
-            return
+            return 0
 
         snapshot_ts = time.time()
 
-        rows = []
-        for _, r in df.iterrows():
-            rows.append((
-                r["strike"],
-                r["option_type"],
-
-                r.get("token"),
-                r.get("trading_symbol"),
-                r.get("exchange"),
-                r.get("lot_size"),
-
-                r.get("ltp"),
-                r.get("change_pct"),
-                r.get("volume"),
-                r.get("oi"),
-                r.get("open"),
-                r.get("high"),
-                r.get("low"),
-                r.get("close"),
-                r.get("bid"),
-                r.get("ask"),
-                r.get("bid_qty"),
-                r.get("ask_qty"),
-
-                r.get("last_update"),
-
-                # Greeks
-                r.get("iv"),
-                r.get("delta"),
-                r.get("gamma"),
-                r.get("theta"),
-                r.get("vega"),
-            ))
+        # Build rows from column arrays (no iterrows)
+        n = len(df)
+        columns = [_column_values(df, col, n) for col in CHAIN_COLUMNS]
+        rows = list(zip(*columns))
+
+        meta = {
+            "exchange": str(stats.get("exchange")),
+            "symbol": str(stats.get("symbol")),
+            "expiry": str(stats.get("expiry")),
+            "atm": str(stats.get("atm")),
+            "spot_ltp": str(stats.get("spot_ltp")),
+            "fut_ltp": str(stats.get("fut_ltp")),
+        }
 
         with self._lock:
+            full = not self._persisted
+
+            current: Dict[Tuple[Any, Any], tuple] = {}
+            changed: List[tuple] = []
+            for row in rows:
+                key = (row[0], row[1])
+                current[key] = row
+                if full or self._persisted.get(key) != row:
+                    changed.append(row)
+            removed = [k for k in self._persisted if k not in current]
+
+            meta_changed = [
+                (k, v) for k, v in meta.items() if full or self._meta.get(k) != v
+            ]
+            meta_changed.append(("snapshot_ts", str(snapshot_ts)))
+
             cur = self._conn.cursor()
             try:
                 cur.execute("BEGIN IMMEDIATE")
 
-                cur.execute("DELETE FROM option_chain")
-
-                cur.executemany("""
-                    INSERT INTO option_chain (
-                        strike, option_type,
-                        token, trading_symbol, exchange, lot_size,
-                        ltp, change_pct, volume, oi,
-                        open, high, low, close,
-                        bid, ask, bid_qty, ask_qty,
-                        last_update,
-                        iv, delta, gamma, theta, vega
-                    ) VALUES (
-                        ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?,
-                        ?, ?, ?, ?,
-                        ?, ?, ?, ?,
-                        ?,
-                        ?, ?, ?, ?, ?
+                if full:
+                    cur.execute("DELETE FROM option_chain")
+                    cur.execute("DELETE FROM meta")
+                elif removed:
+                    cur.executemany(
+                        "DELETE FROM option_chain WHERE strike = ? AND option_type = ?",
+                        removed,
                     )
-                """, rows)
-
-                cur.execute("DELETE FROM meta")
-                cur.executemany(
-                    "INSERT INTO meta VALUES (?, ?)",
-                    [
-                        ("exchange", str(stats.get("exchange"))),
-                        ("symbol", str(stats.get("symbol"))),
-                        ("expiry", str(stats.get("expiry"))),
-                        ("atm", str(stats.get("atm"))),
-                        ("spot_ltp", str(stats.get("spot_ltp"))),
-                        ("fut_ltp", str(stats.get("fut_ltp"))),
-                        ("snapshot_ts", str(snapshot_ts)),
-                    ],
-                )
+
+                if changed:
+                    cur.executemany(_UPSERT_SQL, changed)
+
+                cur.executemany(_META_UPSERT_SQL, meta_changed)
 
                 cur.execute("COMMIT")
 
             except Exception:
                 cur.execute("ROLLBACK")
+                # Cache may no longer match the table → next write is full
+                self._persisted = {}
+                self._meta = {}
                 logger.exception("❌ OptionChain snapshot write failed")
                 raise
 
+            self._persisted = current
+            self._meta = meta
+
+            written = len(changed) + len(removed)
+            latency_ms = (time.perf_counter() - started) * 1000
+            m = self._metrics
+            m["snapshots"] += 1
+            m["full_rewrites"] += 1 if full else 0
+            m["rows_written"] += written
+            m["rows_skipped"] += len(rows) - len(changed)
+            m["last_rows_written"] = written
+            m["last_write_ms"] = latency_ms
+            m["max_write_ms"] = max(m["max_write_ms"], latency_ms)
+            m["total_write_ms"] += latency_ms
+            m["last_snapshot_ts"] = snapshot_ts
+
+        return written
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Writer metrics: rows written per snapshot and write latency."""
+        with self._lock:
+            m = dict(self._metrics)
+        snapshots = m["snapshots"]
+        return {
+            "snapshots": snapshots,
+            "full_rewrites": m["full_rewrites"],
+            "rows_written_total": m["rows_written"],
+            "rows_skipped_total": m["rows_skipped"],
+            "last_rows_written": m["last_rows_written"],
+            "avg_rows_written": round(m["rows_written"] / snapshots, 2) if snapshots else 0.0,
+            "last_write_ms": round(m["last_write_ms"], 3),
+            "avg_write_ms": round(m["total_write_ms"] / snapshots, 3) if snapshots else 0.0,
+            "max_write_ms": round(m["max_write_ms"], 3),
+            "last_snapshot_ts": m["last_snapshot_ts"],
+        }
+
     # --------------------------------------------------
     # LIFECYCLE
     # --------------------------------------------------
@@ -40,6 +40,7 @@ from typing import Dict, Tuple, Optional, List, Any
 
 from shoonya_platform.market_data.option_chain.option_chain import live_option_chain
 from shoonya_platform.market_data.option_chain.store import OptionChainStore
+from shoonya_platform.market_data.option_chain.snapshot_bus import get_snapshot_bus
 from scripts.scriptmaster import refresh_scriptmaster
 
 from shoonya_platform.market_data.feeds.live_feed import (
@@ -60,7 +61,11 @@ DB_BASE_DIR = (
     Path(__file__).resolve().parent / "data"
 )
 
-SNAPSHOT_INTERVAL = 1.0          # seconds
+SNAPSHOT_INTERVAL = 1.0          # seconds (in-process snapshot bus publish)
+# SQLite mirror (dashboard / recovery / other processes) runs at a lower rate.
+# 0 → mirror every cycle, negative → disabled.
+# Env override: OPTION_CHAIN_SQLITE_MIRROR_INTERVAL=5
+SQLITE_MIRROR_INTERVAL = 5.0     # seconds
 DEFAULT_EXPIRIES_PER_SYMBOL = 1  # nearest N expiries (fallback)
 # Per-symbol default overrides (customizable):
 # NIFTY -> 2 expiries, others -> DEFAULT_EXPIRIES_PER_SYMBOL
@@ -224,6 +229,16 @@ class OptionChainSupervisor:
             int(self._symbol_expiry_overrides.get("DEFAULT", DEFAULT_EXPIRIES_PER_SYMBOL)),
         )
 
+        # In-process snapshot bus (primary) + SQLite mirror (secondary)
+        self._snapshot_bus = get_snapshot_bus()
+        self._sqlite_mirror_interval = SQLITE_MIRROR_INTERVAL
+        raw_mirror = os.getenv("OPTION_CHAIN_SQLITE_MIRROR_INTERVAL", "").strip()
+        if raw_mirror:
+            try:
+                self._sqlite_mirror_interval = float(raw_mirror)
+            except ValueError:
+                logger.warning("Invalid OPTION_CHAIN_SQLITE_MIRROR_INTERVAL ignored: %s", raw_mirror)
+
     def _get_expiry_count(self, exchange: str, symbol: str) -> int:
         """
         Get configured expiry count for a symbol.
@@ -374,6 +389,7 @@ class OptionChainSupervisor:
                             "db_path": db_path,
                             "start_time": time.time(),
                             "last_health_check": time.time(),
+                            "last_mirror_ts": 0.0,
                             "source": source,
                         }
                         self._failed_chains.pop(key, None)
@@ -752,6 +768,19 @@ class OptionChainSupervisor:
         except Exception as e:
             logger.exception("Re-center chain critical error for %s: %s", key, e)
 
+    def _mirror_due(self, bundle: Dict, now: float) -> bool:
+        """
+        True when the chain's SQLite mirror should be rewritten this cycle.
+
+        When enabled, the first snapshot is mirrored immediately so DB files
+        exist for expiry resolution and the dashboard.
+        """
+        interval = self._sqlite_mirror_interval
+        if interval < 0:
+            return False
+        last = bundle.get("last_mirror_ts", 0.0)
+        return not last or now - last >= interval
+
     # --------------------------------------------------
     # MAIN LOOP
     # --------------------------------------------------
@@ -802,22 +831,31 @@ class OptionChainSupervisor:
                     last_session_check = now
 
                 # --------------------------------------------------
-                # SNAPSHOT WRITES (existing)
+                # SNAPSHOT PUBLISH (bus) + SQLITE MIRROR (throttled)
                 # --------------------------------------------------
                 with self._lock:
                     items = list(self._chains.items())
 
                 for key, bundle in items:
                     try:
-                        bundle["store"].write_snapshot(bundle["oc"])
+                        self._snapshot_bus.publish(key, bundle["oc"])
                         self._last_snapshot_ts = now
                     except Exception as e:
                         logger.error(
-                            "Snapshot write failed | %s | %s", key, e
+                            "Snapshot publish failed | %s | %s", key, e
                         )
                         # 🔥 IMPROVED: Continue with other chains
                         continue
 
+                    if self._mirror_due(bundle, now):
+                        try:
+                            bundle["store"].write_snapshot(bundle["oc"])
+                            bundle["last_mirror_ts"] = now
+                        except Exception as e:
+                            logger.error(
+                                "Snapshot write failed | %s | %s", key, e
+                            )
+
                 # --------------------------------------------------
                 # 🔥 IMPROVED: FEED STALL DETECTION + RECOVERY
                 # --------------------------------------------------
@@ -959,6 +997,7 @@ class OptionChainSupervisor:
                 "stale": stale,
                 "stall_count": self._feed_stall_count,
             },
+            "snapshot_bus": self._snapshot_bus.get_stats(),
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -988,6 +1027,7 @@ class OptionChainSupervisor:
                 "stats": stats,
                 "health": health,
                 "db_path": str(bundle["db_path"]),
+                "store": bundle["store"].get_write_stats(),
                 "start_time": bundle["start_time"],
                 "uptime_seconds": time.time() - bundle["start_time"],
             }
@@ -1037,6 +1077,8 @@ class OptionChainSupervisor:
             logger.warning("remove_chain: key %s not found", key)
             return False
 
+        self._snapshot_bus.remove(key)
+
         # Clean up resources outside the lock
         try:
             oc = bundle.get("oc")
@@ -1074,8 +1116,12 @@ class OptionChainSupervisor:
         logger.info("🛑 Supervisor shutting down")
 
         with self._lock:
+            keys = list(self._chains.keys())
             bundles = list(self._chains.values())
 
+        for key in keys:
+            self._snapshot_bus.remove(key)
+
         # Close all stores
         for b in bundles:
             try:
@@ -8,13 +8,22 @@
 # - Restart-safe, concurrency-safe
 
 # Any future modification requires full OMS + consumer re-audit.
+#
+# Connection pooling:
+# - get_connection() hands out a per-thread long-lived connection
+# - Schema / migrations run ONCE per process per DB path
+# - close() on a pooled connection only releases it (open txn rolled back)
+# - A lease taken while this thread's connection is mid-transaction gets a
+#   dedicated connection, so inner commit/rollback never touch the outer txn
 #===================================================================
 
 import sqlite3
 import threading
 import os
+import time
 import logging
 from pathlib import Path
+from typing import Any, Dict, Set
 
 logger = logging.getLogger(__name__)
 
@@ -53,342 +62,590 @@ def _resolve_db_path():
     logger.info(f"DB PATH IN USE: {_DB_PATH}")
     return _DB_PATH
 
-def get_connection():
-    with _DB_LOCK:
-        db_path = _resolve_db_path()
-        conn = sqlite3.connect(
-            db_path,
-            check_same_thread=False
-        )
-        conn.row_factory = sqlite3.Row
-
-        # 🔒 CRITICAL: WAL mode for concurrent read/write from multiple threads
-        conn.execute("PRAGMA journal_mode=WAL")
-        # 🔒 Wait up to 5s for locked DB instead of failing immediately
-        conn.execute("PRAGMA busy_timeout=5000")
-        
-        # Ensure minimal schema exists for tests and runtime
+# ======================================================
+# POOL STATE & COUNTERS
+# ======================================================
+
+# One long-lived connection per (thread, db path). Threads are the unit of
+# isolation: a sqlite3 connection carries its own transaction state, so
+# sharing one across threads would interleave unrelated transactions.
+_LOCAL = threading.local()
+
+# DB paths whose schema/migrations already ran in this process
+_SCHEMA_READY: Set[str] = set()
+
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, Any] = {
+    "connections_opened": 0,
+    "connections_reused": 0,
+    "schema_inits": 0,
+    "queries": 0,
+    "query_time_s": 0.0,
+    # Time blocked on write locks: BEGIN IMMEDIATE/EXCLUSIVE, COMMIT
+    # (sqlite busy_timeout waits) plus the pool's own _DB_LOCK.
+    "lock_wait_s": 0.0,
+    "orphan_rollbacks": 0,
+    "nested_txn_connections": 0,
+}
+
+
+def _bump(key: str, value=1) -> None:
+    with _STATS_LOCK:
+        _STATS[key] += value
+
+
+def get_db_stats() -> Dict[str, Any]:
+    """Snapshot of connection-pool counters (for health / diagnostics)."""
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    stats["query_time_s"] = round(stats["query_time_s"], 6)
+    stats["lock_wait_s"] = round(stats["lock_wait_s"], 6)
+    stats["schema_ready_paths"] = len(_SCHEMA_READY)
+    return stats
+
+
+class _CountingCursor(sqlite3.Cursor):
+    """Cursor that feeds the pool query / lock-wait counters."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
         try:
-            # Create orders table
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    client_id TEXT,
-                    command_id TEXT,
-                    source TEXT,
-                    user TEXT,
-                    strategy_name TEXT,
-
-                    exchange TEXT,
-                    symbol TEXT,
-                    side TEXT,
-                    quantity INTEGER,
-                    product TEXT,
-
-                    order_type TEXT,
-                    price REAL,
-
-                    stop_loss REAL,
-                    target REAL,
-                    trailing_type TEXT,
-                    trailing_value REAL,
-                    managed_anchor_ltp REAL,
-                    managed_base_stop_loss REAL,
-
-                    broker_order_id TEXT,
-                    execution_type TEXT,
-
-                    status TEXT,
-                    created_at TEXT,
-                    updated_at TEXT,
-                    tag TEXT
-                )
-                """
-            )
-            conn.commit()
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            with _STATS_LOCK:
+                _STATS["queries"] += 1
+                _STATS["query_time_s"] += elapsed
+                if sql.lstrip()[:5].upper() == "BEGIN":
+                    _STATS["lock_wait_s"] += elapsed
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            with _STATS_LOCK:
+                _STATS["queries"] += 1
+                _STATS["query_time_s"] += elapsed
+
+
+class _ThreadSlot:
+    """Per-thread pooled connection plus its live lease count."""
+
+    __slots__ = ("conn", "leases", "pooled")
+
+    def __init__(self, conn: sqlite3.Connection, pooled: bool = True):
+        self.conn = conn
+        self.leases = 0
+        self.pooled = pooled     # False: one-off connection, closed on release
+
+    def __del__(self):
+        # Thread exited → its thread-local slot is collected
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class PooledConnection:
+    """
+    Lease on the calling thread's pooled sqlite3 connection.
+
+    Behaves like sqlite3.Connection for everything callers use
+    (execute / cursor / commit / rollback / close / context manager).
+    close() does NOT close the underlying connection: it releases the
+    lease and, when no other lease on this thread is alive, rolls back
+    any transaction left open — exactly what closing (or dropping) a
+    dedicated connection used to do.
+    """
+
+    __slots__ = ("_slot", "_conn", "_released", "__weakref__")
+
+    def __init__(self, slot: _ThreadSlot):
+        self._slot = slot
+        self._conn = slot.conn
+        self._released = False
+        slot.leases += 1
+
+    # ---------------- sqlite3.Connection surface ----------------
+
+    def cursor(self, factory=_CountingCursor):
+        return self._conn.cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        _bump("queries")
+        return self._conn.executescript(script)
 
-            # Add missing columns (migrations)
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            self._conn.commit()
+        finally:
+            _bump("lock_wait_s", time.perf_counter() - started)
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._release()
+
+    def __getattr__(self, name):
+        # row_factory, in_transaction, total_changes, ...
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    # ---------------- lease handling ----------------
+
+    def _release(self):
+        if self._released:
+            return
+        self._released = True
+        slot = self._slot
+        slot.leases = max(0, slot.leases - 1)
+        if not slot.pooled:
+            # closing rolls back anything left open, like before pooling
             try:
-                existing_cols = {row[1] for row in conn.execute("PRAGMA table_info('orders')").fetchall()}
-                if 'trail_when' not in existing_cols:
-                    conn.execute("ALTER TABLE orders ADD COLUMN trail_when REAL")
-                if 'managed_anchor_ltp' not in existing_cols:
-                    conn.execute("ALTER TABLE orders ADD COLUMN managed_anchor_ltp REAL")
-                if 'managed_base_stop_loss' not in existing_cols:
-                    conn.execute("ALTER TABLE orders ADD COLUMN managed_base_stop_loss REAL")
-                conn.commit()
-            except sqlite3.OperationalError:
-                # Column already exists or table locked — non-fatal
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
+                slot.conn.close()
             except Exception:
-                logger.exception("Unexpected error adding trail_when column")
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
-                raise
-
-            # 🔒 PRODUCTION INDEXES — prevent full table scans on client_id
-            # and enforce uniqueness on (command_id, client_id) to prevent
-            # duplicate order execution from retries or race conditions.
+                pass
+            return
+        if slot.leases == 0 and slot.conn.in_transaction:
             try:
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_orders_client_id "
-                    "ON orders(client_id)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_orders_client_status "
-                    "ON orders(client_id, status)"
-                )
-                conn.execute(
-                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_orders_command_client "
-                    "ON orders(command_id, client_id)"
-                )
-                conn.commit()
+                slot.conn.rollback()
+                _bump("orphan_rollbacks")
             except Exception:
-                # Best-effort: indexes improve performance but are not fatal
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
+                pass
 
-            # Detect and migrate away from UNIQUE(command_id) if present in older DBs
+    def __del__(self):
+        # Callers that never close() release when the lease goes out of scope
+        try:
+            self._release()
+        except Exception:
+            pass
+
+
+# ======================================================
+# CONNECTIONS
+# ======================================================
+
+def _open_connection(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False
+    )
+    conn.row_factory = sqlite3.Row
+
+    # 🔒 CRITICAL: WAL mode for concurrent read/write from multiple threads
+    conn.execute("PRAGMA journal_mode=WAL")
+    # 🔒 Wait up to 5s for locked DB instead of failing immediately
+    conn.execute("PRAGMA busy_timeout=5000")
+    _bump("connections_opened")
+    return conn
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create / migrate orders, control_intents and audit_log (idempotent)."""
+    # Ensure minimal schema exists for tests and runtime
+    try:
+        # Create orders table
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                client_id TEXT,
+                command_id TEXT,
+                source TEXT,
+                user TEXT,
+                strategy_name TEXT,
+
+                exchange TEXT,
+                symbol TEXT,
+                side TEXT,
+                quantity INTEGER,
+                product TEXT,
+
+                order_type TEXT,
+                price REAL,
+
+                stop_loss REAL,
+                target REAL,
+                trailing_type TEXT,
+                trailing_value REAL,
+                managed_anchor_ltp REAL,
+                managed_base_stop_loss REAL,
+
+                broker_order_id TEXT,
+                execution_type TEXT,
+
+                status TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                tag TEXT
+            )
+            """
+        )
+        conn.commit()
+
+        # Add missing columns (migrations)
+        try:
+            existing_cols = {row[1] for row in conn.execute("PRAGMA table_info('orders')").fetchall()}
+            if 'trail_when' not in existing_cols:
+                conn.execute("ALTER TABLE orders ADD COLUMN trail_when REAL")
+            if 'managed_anchor_ltp' not in existing_cols:
+                conn.execute("ALTER TABLE orders ADD COLUMN managed_anchor_ltp REAL")
+            if 'managed_base_stop_loss' not in existing_cols:
+                conn.execute("ALTER TABLE orders ADD COLUMN managed_base_stop_loss REAL")
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Column already exists or table locked — non-fatal
             try:
-                indexes = conn.execute("PRAGMA index_list('orders')").fetchall()
-                need_migrate = False
-                
-                for idx in indexes:
-                    if idx[2] == 1:  # unique flag
-                        idx_name = idx[1]
-                        cols = conn.execute(f"PRAGMA index_info('{idx_name}')").fetchall()
-                        for c in cols:
-                            # c[2] is column name in pragma index_info
-                            if c[2] == 'command_id':
-                                need_migrate = True
-                                break
-                    if need_migrate:
-                        break
+                conn.rollback()
+            except Exception:
+                pass
+        except Exception:
+            logger.exception("Unexpected error adding trail_when column")
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
 
+        # Detect and migrate away from UNIQUE(command_id) if present in older DBs
+        try:
+            indexes = conn.execute("PRAGMA index_list('orders')").fetchall()
+            need_migrate = False
+            
+            for idx in indexes:
+                if idx[2] == 1:  # unique flag
+                    idx_name = idx[1]
+                    cols = conn.execute(f"PRAGMA index_info('{idx_name}')").fetchall()
+                    # c[2] is column name in pragma index_info. Only a UNIQUE on
+                    # command_id alone is legacy; (command_id, client_id) is ours.
+                    if [c[2] for c in cols] == ['command_id']:
+                        need_migrate = True
                 if need_migrate:
-                    # Recreate table without UNIQUE constraint on command_id
-                    conn.execute('BEGIN IMMEDIATE')
-                    conn.execute("ALTER TABLE orders RENAME TO orders_old")
-                    # Check if old table has trail_when column
-                    old_cols = {row[1] for row in conn.execute("PRAGMA table_info('orders_old')").fetchall()}
-                    has_trail_when = 'trail_when' in old_cols
+                    break
 
+            if need_migrate:
+                # Recreate table without UNIQUE constraint on command_id
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute("ALTER TABLE orders RENAME TO orders_old")
+                # Check if old table has trail_when column
+                old_cols = {row[1] for row in conn.execute("PRAGMA table_info('orders_old')").fetchall()}
+                has_trail_when = 'trail_when' in old_cols
+
+                conn.execute(
+                    """
+                    CREATE TABLE orders (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        client_id TEXT,
+                        command_id TEXT,
+                        source TEXT,
+                        user TEXT,
+                        strategy_name TEXT,
+
+                        exchange TEXT,
+                        symbol TEXT,
+                        side TEXT,
+                        quantity INTEGER,
+                        product TEXT,
+
+                        order_type TEXT,
+                        price REAL,
+
+                        stop_loss REAL,
+                        target REAL,
+                        trailing_type TEXT,
+                        trailing_value REAL,
+                        trail_when REAL,
+                        managed_anchor_ltp REAL,
+                        managed_base_stop_loss REAL,
+
+                        broker_order_id TEXT,
+                        execution_type TEXT,
+
+                        status TEXT,
+                        created_at TEXT,
+                        updated_at TEXT,
+                        tag TEXT
+                    )
+                    """
+                )
+                if has_trail_when:
                     conn.execute(
                         """
-                        CREATE TABLE orders (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            client_id TEXT,
-                            command_id TEXT,
-                            source TEXT,
-                            user TEXT,
-                            strategy_name TEXT,
-
-                            exchange TEXT,
-                            symbol TEXT,
-                            side TEXT,
-                            quantity INTEGER,
-                            product TEXT,
-
-                            order_type TEXT,
-                            price REAL,
-
-                            stop_loss REAL,
-                            target REAL,
-                            trailing_type TEXT,
-                            trailing_value REAL,
-                            trail_when REAL,
-                            managed_anchor_ltp REAL,
-                            managed_base_stop_loss REAL,
-
-                            broker_order_id TEXT,
-                            execution_type TEXT,
-
-                            status TEXT,
-                            created_at TEXT,
-                            updated_at TEXT,
-                            tag TEXT
+                        INSERT INTO orders (
+                            id, client_id, command_id, source, user, strategy_name,
+                            exchange, symbol, side, quantity, product,
+                            order_type, price, stop_loss, target, trailing_type,
+                            trailing_value, trail_when, managed_anchor_ltp, managed_base_stop_loss, broker_order_id, execution_type,
+                            status, created_at, updated_at, tag
                         )
+                        SELECT id, client_id, command_id, source, user, strategy_name,
+                               exchange, symbol, side, quantity, product,
+                               order_type, price, stop_loss, target, trailing_type,
+                               trailing_value, trail_when, NULL, NULL, broker_order_id, execution_type,
+                               status, created_at, updated_at, tag
+                        FROM orders_old
                         """
                     )
-                    if has_trail_when:
-                        conn.execute(
-                            """
-                            INSERT INTO orders (
-                                id, client_id, command_id, source, user, strategy_name,
-                                exchange, symbol, side, quantity, product,
-                                order_type, price, stop_loss, target, trailing_type,
-                                trailing_value, trail_when, managed_anchor_ltp, managed_base_stop_loss, broker_order_id, execution_type,
-                                status, created_at, updated_at, tag
-                            )
-                            SELECT id, client_id, command_id, source, user, strategy_name,
-                                   exchange, symbol, side, quantity, product,
-                                   order_type, price, stop_loss, target, trailing_type,
-                                   trailing_value, trail_when, NULL, NULL, broker_order_id, execution_type,
-                                   status, created_at, updated_at, tag
-                            FROM orders_old
-                            """
-                        )
-                    else:
-                        conn.execute(
-                            """
-                            INSERT INTO orders (
-                                id, client_id, command_id, source, user, strategy_name,
-                                exchange, symbol, side, quantity, product,
-                                order_type, price, stop_loss, target, trailing_type,
-                                          trailing_value, managed_anchor_ltp, managed_base_stop_loss, broker_order_id, execution_type,
-                                status, created_at, updated_at, tag
-                            )
-                            SELECT id, client_id, command_id, source, user, strategy_name,
-                                   exchange, symbol, side, quantity, product,
-                                   order_type, price, stop_loss, target, trailing_type,
-                                              trailing_value, NULL, NULL, broker_order_id, execution_type,
-                                   status, created_at, updated_at, tag
-                            FROM orders_old
-                            """
-                        )
-                    conn.execute("DROP TABLE orders_old")
-                    conn.commit()
-                    
-            except Exception:
-                # Migration best-effort; fall back to existing table
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
-
-            # Ensure control_intents table exists (dashboard control plane)
-            try:
-                cur = conn.cursor()
-
-                # Check existing columns
-                cols = cur.execute(
-                    "PRAGMA table_info(control_intents)"
-                ).fetchall()
-                col_names = {c[1] for c in cols}
-
-                required_cols = {
-                    "id",
-                    "client_id",
-                    "parent_client_id",
-                    "type",
-                    "payload",
-                    "source",
-                    "status",
-                    "created_at",
-                }
-
-                if not cols:
-                    # Fresh DB → create correct schema
-                    cur.execute(
+                else:
+                    conn.execute(
                         """
-                        CREATE TABLE control_intents (
-                            id TEXT PRIMARY KEY,
-
-                            client_id TEXT NOT NULL,
-                            parent_client_id TEXT,
-
-                            type TEXT NOT NULL,
-                            payload TEXT NOT NULL,
-                            source TEXT NOT NULL,
-                            status TEXT NOT NULL,
-                            created_at TEXT NOT NULL
+                        INSERT INTO orders (
+                            id, client_id, command_id, source, user, strategy_name,
+                            exchange, symbol, side, quantity, product,
+                            order_type, price, stop_loss, target, trailing_type,
+                                      trailing_value, managed_anchor_ltp, managed_base_stop_loss, broker_order_id, execution_type,
+                            status, created_at, updated_at, tag
                         )
+                        SELECT id, client_id, command_id, source, user, strategy_name,
+                               exchange, symbol, side, quantity, product,
+                               order_type, price, stop_loss, target, trailing_type,
+                                          trailing_value, NULL, NULL, broker_order_id, execution_type,
+                               status, created_at, updated_at, tag
+                        FROM orders_old
                         """
                     )
-                    conn.commit()
-
-                elif not required_cols.issubset(col_names):
-                    # Older schema → migrate
-                    conn.execute("BEGIN")
-
-                    cur.execute("ALTER TABLE control_intents RENAME TO control_intents_old")
+                conn.execute("DROP TABLE orders_old")
+                conn.commit()
+                
+        except Exception:
+            # Migration best-effort; fall back to existing table
+            try:
+                conn.rollback()
+            except Exception:
+                pass
 
-                    cur.execute(
-                        """
-                        CREATE TABLE control_intents (
-                            id TEXT PRIMARY KEY,
+        # 🔒 PRODUCTION INDEXES — prevent full table scans on client_id
+        # and enforce uniqueness on (command_id, client_id) to prevent
+        # duplicate order execution from retries or race conditions.
+        # Created after the migration above: rebuilding the table drops them.
+        try:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_orders_client_id "
+                "ON orders(client_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_orders_client_status "
+                "ON orders(client_id, status)"
+            )
+            # OrderWatcher reconciliation: broker order id → OMS record
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_orders_client_broker "
+                "ON orders(client_id, broker_order_id)"
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_orders_command_client "
+                "ON orders(command_id, client_id)"
+            )
+            conn.commit()
+        except Exception:
+            # Best-effort: indexes improve performance but are not fatal
+            try:
+                conn.rollback()
+            except Exception:
+                pass
 
-                            client_id TEXT NOT NULL,
-                            parent_client_id TEXT,
+        # Ensure control_intents table exists (dashboard control plane)
+        try:
+            cur = conn.cursor()
+
+            # Check existing columns
+            cols = cur.execute(
+                "PRAGMA table_info(control_intents)"
+            ).fetchall()
+            col_names = {c[1] for c in cols}
+
+            required_cols = {
+                "id",
+                "client_id",
+                "parent_client_id",
+                "type",
+                "payload",
+                "source",
+                "status",
+                "created_at",
+            }
+
+            if not cols:
+                # Fresh DB → create correct schema
+                cur.execute(
+                    """
+                    CREATE TABLE control_intents (
+                        id TEXT PRIMARY KEY,
 
-                            type TEXT NOT NULL,
-                            payload TEXT NOT NULL,
-                            source TEXT NOT NULL,
-                            status TEXT NOT NULL,
-                            created_at TEXT NOT NULL
-                        )
-                        """
-                    )
+                        client_id TEXT NOT NULL,
+                        parent_client_id TEXT,
 
-                    # Best-effort copy (migrated rows get client_id='MIGRATED')
-                    cur.execute(
-                        """
-                        INSERT INTO control_intents (
-                            id, client_id, parent_client_id,
-                            type, payload, source, status, created_at
-                        )
-                        SELECT
-                            COALESCE(id, hex(randomblob(16))),
-                            'MIGRATED',
-                            NULL,
-                            type,
-                            payload,
-                            'MIGRATED',
-                            status,
-                            created_at
-                        FROM control_intents_old
-                        """
+                        type TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        created_at TEXT NOT NULL
                     )
+                    """
+                )
+                conn.commit()
 
-                    cur.execute("DROP TABLE control_intents_old")
-                    conn.commit()
+            elif not required_cols.issubset(col_names):
+                # Older schema → migrate
+                conn.execute("BEGIN")
 
-            except Exception:
-                conn.rollback()
+                cur.execute("ALTER TABLE control_intents RENAME TO control_intents_old")
 
-            # Ensure audit_log table exists (order change audit trail)
-            try:
-                conn.execute(
+                cur.execute(
                     """
-                    CREATE TABLE IF NOT EXISTS audit_log (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
+                    CREATE TABLE control_intents (
+                        id TEXT PRIMARY KEY,
+
                         client_id TEXT NOT NULL,
-                        command_id TEXT,
-                        action TEXT NOT NULL,
-                        old_value TEXT,
-                        new_value TEXT,
-                        source TEXT,
-                        detail TEXT
+                        parent_client_id TEXT,
+
+                        type TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        created_at TEXT NOT NULL
                     )
                     """
                 )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_audit_client "
-                    "ON audit_log(client_id)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_audit_timestamp "
-                    "ON audit_log(timestamp)"
+
+                # Best-effort copy (migrated rows get client_id='MIGRATED')
+                cur.execute(
+                    """
+                    INSERT INTO control_intents (
+                        id, client_id, parent_client_id,
+                        type, payload, source, status, created_at
+                    )
+                    SELECT
+                        COALESCE(id, hex(randomblob(16))),
+                        'MIGRATED',
+                        NULL,
+                        type,
+                        payload,
+                        'MIGRATED',
+                        status,
+                        created_at
+                    FROM control_intents_old
+                    """
                 )
+
+                cur.execute("DROP TABLE control_intents_old")
                 conn.commit()
-            except Exception:
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
 
-                
         except Exception:
-            # Best-effort: if schema creation fails, tests will report error
             conn.rollback()
 
-        return conn
+        # Queue index: consumers claim PENDING intents oldest-first per type
+        try:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_control_intents_status_created "
+                "ON control_intents(status, created_at, type)"
+            )
+            conn.commit()
+        except Exception:
+            pass
+
+        # Ensure audit_log table exists (order change audit trail)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS audit_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    client_id TEXT NOT NULL,
+                    command_id TEXT,
+                    action TEXT NOT NULL,
+                    old_value TEXT,
+                    new_value TEXT,
+                    source TEXT,
+                    detail TEXT
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audit_client "
+                "ON audit_log(client_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audit_timestamp "
+                "ON audit_log(timestamp)"
+            )
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+
+            
+    except Exception:
+        # Best-effort: if schema creation fails, tests will report error
+        conn.rollback()
+
+
+def get_connection() -> PooledConnection:
+    """
+    Return a lease on this thread's pooled connection to the orders DB.
+
+    The first call on a thread opens the connection; the first call in the
+    process for a DB path also runs the schema/migration block.
+
+    If the pooled connection is already leased and inside a transaction
+    (a nested call from code holding it), a dedicated connection is
+    returned instead: sharing would let the inner caller's commit or
+    rollback end the outer caller's transaction.
+    """
+    db_path = _resolve_db_path()
+    key = str(db_path)
+
+    slots = getattr(_LOCAL, "slots", None)
+    if slots is None:
+        slots = _LOCAL.slots = {}
+
+    slot = slots.get(key)
+    if slot is not None:
+        if slot.leases > 0 and slot.conn.in_transaction:
+            _bump("nested_txn_connections")
+            return PooledConnection(_ThreadSlot(_open_connection(db_path), pooled=False))
+        _bump("connections_reused")
+        return PooledConnection(slot)
+
+    started = time.perf_counter()
+    with _DB_LOCK:
+        _bump("lock_wait_s", time.perf_counter() - started)
+        conn = _open_connection(db_path)
+        if key not in _SCHEMA_READY:
+            _init_schema(conn)
+            _SCHEMA_READY.add(key)
+            _bump("schema_inits")
+
+    slot = slots[key] = _ThreadSlot(conn)
+    return PooledConnection(slot)
+
+
+def close_thread_connection() -> None:
+    """Close the calling thread's pooled connection(s), if any."""
+    slots = getattr(_LOCAL, "slots", None)
+    if not slots:
+        return
+    for slot in slots.values():
+        try:
+            slot.conn.close()
+        except Exception:
+            pass
+    slots.clear()
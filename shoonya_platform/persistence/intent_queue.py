@@ -0,0 +1,124 @@
+#===================================================================
+# Control-intent queue helpers (dashboard → execution consumers)
+#
+# - intent_wakeup: in-process signal raised by intent writers, so
+#   consumers block on it instead of polling the table every second
+# - claim_pending_intents(): claims up to N PENDING intents in ONE
+#   BEGIN IMMEDIATE transaction; a cheap read runs first so an empty
+#   queue never takes the DB write lock
+# - Intents written by OTHER processes are still picked up by the
+#   consumers' slow fallback poll (FALLBACK_POLL_SEC)
+#===================================================================
+
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+from shoonya_platform.persistence.database import get_connection
+
+CLAIM_BATCH_SIZE = 16
+FALLBACK_POLL_SEC = 5.0
+
+
+class IntentWakeup:
+    """Version counter + condition: wait(v) returns once version > v."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def notify(self) -> None:
+        with self._cond:
+            self._version += 1
+            self._cond.notify_all()
+
+    def wait(self, since_version: int, timeout: Optional[float] = None) -> int:
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > since_version, timeout)
+            return self._version
+
+
+# Process-wide: DashboardIntentService notifies, consumers wait
+intent_wakeup = IntentWakeup()
+
+
+def claim_pending_intents(
+    columns: str,
+    type_clause: str,
+    limit: int = CLAIM_BATCH_SIZE,
+) -> List[Tuple]:
+    """
+    Atomically move up to ``limit`` oldest PENDING intents to PROCESSING.
+
+    ``columns``     SELECT list, must start with ``id``
+    ``type_clause`` SQL condition on ``type`` (constant, no parameters)
+
+    Returns the claimed rows in created_at order.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        # Read-only probe (covered by idx_control_intents_status_created):
+        # an idle queue costs no write lock
+        probe = cur.execute(
+            f"""
+            SELECT 1
+            FROM control_intents
+            WHERE status = 'PENDING'
+              AND {type_clause}
+            LIMIT 1
+            """
+        ).fetchone()
+        if not probe:
+            return []
+
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(
+            f"""
+            SELECT {columns}
+            FROM control_intents
+            WHERE status = 'PENDING'
+              AND {type_clause}
+            ORDER BY created_at
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        rows = cur.fetchall()
+        if rows:
+            cur.execute(
+                f"""
+                UPDATE control_intents
+                SET status = 'PROCESSING'
+                WHERE id IN ({",".join("?" * len(rows))})
+                """,
+                [row[0] for row in rows],
+            )
+        conn.commit()
+        return [tuple(row) for row in rows]
+
+    finally:
+        conn.close()
+
+
+def release_intents(intent_ids: Sequence[str]) -> None:
+    """Put claimed-but-unprocessed intents back to PENDING (e.g. on shutdown)."""
+    if not intent_ids:
+        return
+    conn = get_connection()
+    try:
+        conn.execute(
+            f"""
+            UPDATE control_intents
+            SET status = 'PENDING'
+            WHERE status = 'PROCESSING'
+              AND id IN ({",".join("?" * len(intent_ids))})
+            """,
+            list(intent_ids),
+        )
+        conn.commit()
+    finally:
+        conn.close()
@@ -14,6 +14,7 @@
 # Recommended Indexes (for scale):
 # CREATE INDEX idx_orders_client_status ON orders(client_id, status);
 # CREATE INDEX idx_orders_client_updated ON orders(client_id, updated_at);
+# CREATE INDEX idx_orders_client_broker ON orders(client_id, broker_order_id);
 # ===================================================================
 
 # ===================================================================
@@ -28,26 +29,39 @@
 # ===================================================================
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from shoonya_platform.persistence.database import get_connection
 from shoonya_platform.persistence.order_record import OrderRecord
 
 
+_AUDIT_INSERT = """
+    INSERT INTO audit_log (timestamp, client_id, command_id, action,
+                           old_value, new_value, source, detail)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _audit_row(client_id: str, command_id: str, action: str,
+               old_value: str = None, new_value: str = None,
+               source: str = "system", detail: str = None) -> tuple:
+    """One audit_log row, in _AUDIT_INSERT column order."""
+    return (datetime.utcnow().isoformat(), client_id, command_id, action,
+            old_value, new_value, source, detail)
+
+
 def _write_audit(conn, client_id: str, command_id: str, action: str,
                  old_value: str = None, new_value: str = None,
                  source: str = "system", detail: str = None):
     """Append a row to audit_log. Best-effort — never raises."""
+    _write_audit_rows(conn, [_audit_row(client_id, command_id, action,
+                                        old_value, new_value, source, detail)])
+
+
+def _write_audit_rows(conn, rows: List[tuple]):
+    """Append _audit_row() rows to audit_log. Best-effort — never raises."""
     try:
-        conn.execute(
-            """
-            INSERT INTO audit_log (timestamp, client_id, command_id, action,
-                                   old_value, new_value, source, detail)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (datetime.utcnow().isoformat(), client_id, command_id, action,
-             old_value, new_value, source, detail),
-        )
+        conn.executemany(_AUDIT_INSERT, rows)
     except Exception:
         pass  # audit is best-effort; never block order flow
 
@@ -461,6 +475,97 @@ class OrderRepository:
         data.pop("client_id", None)
         return OrderRecord(**data) if row else None
 
+    # =====================================================
+    # BROKER RECONCILIATION (OrderWatcher STEP 6)
+    # =====================================================
+
+    def get_open_orders_by_broker_id(self) -> Dict[str, OrderRecord]:
+        """
+        Open (CREATED / SENT_TO_BROKER) orders that already carry a broker
+        order id, keyed by it. One query per reconcile cycle instead of a
+        lookup per broker order.
+        """
+        conn = get_connection()
+        rows = conn.execute(
+            """
+            SELECT *
+            FROM orders
+            WHERE client_id = ?
+            AND broker_order_id IS NOT NULL
+            AND status IN ('CREATED', 'SENT_TO_BROKER')
+            """,
+            (self.client_id,),
+        ).fetchall()
+
+        records = {}
+        for r in rows:
+            d = dict(r)
+            d.pop("id", None)
+            d.pop("client_id", None)
+            records[d["broker_order_id"]] = OrderRecord(**d)
+        return records
+
+    def get_statuses_by_broker_ids(self, broker_order_ids: Iterable[str]) -> Dict[str, str]:
+        """broker_order_id → OMS status for the given ids (unknown ids omitted)."""
+        ids = list(dict.fromkeys(broker_order_ids))
+        statuses: Dict[str, str] = {}
+        if not ids:
+            return statuses
+
+        conn = get_connection()
+        # Stay well below SQLITE_MAX_VARIABLE_NUMBER
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = conn.execute(
+                f"""
+                SELECT broker_order_id, status
+                FROM orders
+                WHERE client_id = ?
+                AND broker_order_id IN ({",".join("?" * len(chunk))})
+                """,
+                (self.client_id, *chunk),
+            ).fetchall()
+            for r in rows:
+                statuses[r["broker_order_id"]] = r["status"]
+        return statuses
+
+    def apply_status_updates(self, updates: List[Tuple[str, str, Optional[str]]]) -> int:
+        """
+        Apply (command_id, status, tag) updates in ONE transaction.
+        tag=None leaves the tag untouched. Audit rows match update_status /
+        update_tag. All-or-nothing: on error nothing is written.
+        """
+        if not updates:
+            return 0
+
+        now = datetime.utcnow().isoformat()
+        audit_rows = []
+        for command_id, status, tag in updates:
+            audit_rows.append(_audit_row(self.client_id, command_id, "STATUS_CHANGE",
+                                         new_value=status))
+            if tag is not None:
+                audit_rows.append(_audit_row(self.client_id, command_id, "TAG_UPDATE",
+                                             new_value=tag))
+
+        conn = get_connection()
+        try:
+            conn.executemany(
+                """
+                UPDATE orders
+                SET status = ?, tag = COALESCE(?, tag), updated_at = ?
+                WHERE command_id = ?
+                AND client_id = ?
+                """,
+                [(status, tag, now, command_id, self.client_id)
+                 for command_id, status, tag in updates],
+            )
+            _write_audit_rows(conn, audit_rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(updates)
+
     # =====================================================
     # DASHBOARD READ-ONLY HELPERS
     # =====================================================
@@ -27,6 +27,8 @@ from typing import Dict, Optional, List, Tuple
 
 from shoonya_platform.logging.logger_config import get_component_logger
 from shoonya_platform.utils.utils import log_exception
+from shoonya_platform.utils.latency import LatencyHistogram
+from shoonya_platform.api.dashboard.services.broker_service import read_broker
 
 logger = get_component_logger('risk_manager')
 
@@ -82,6 +84,10 @@ class SupremeRiskManager:
         self.MAX_CONSECUTIVE_LOSS_DAYS = cfg.risk_max_consecutive_loss_days
         self.STATUS_UPDATE_INTERVAL = cfg.risk_status_update_min
         self.PNL_RETENTION = cfg.risk_pnl_retention
+        self.BROKER_MAX_AGE = 1.0  # freshness contract for shared broker reads
+        self.VERDICT_MAX_STALENESS_SEC = float(
+            getattr(cfg, "risk_verdict_max_staleness_sec", 15.0)
+        )
 
         # ---------------- Runtime state ----------------
         self.current_day: date = date.today()
@@ -107,6 +113,14 @@ class SupremeRiskManager:
         self.last_status_update: Optional[datetime] = None
         self.last_known_pnl: Optional[float] = None
 
+        # Heartbeat-refreshed verdict read by can_execute() on the alert path
+        self._pnl_refreshed_at: Optional[float] = None  # monotonic
+        self._verdict: Optional[Dict] = None
+        self._verdict_stats = {"cached": 0, "sync_refreshes": 0}
+        # Own lock: the cached path must not wait on the heartbeat's _lock
+        self._verdict_stats_lock = threading.Lock()
+        self._can_execute_latency = LatencyHistogram()
+
         self.pnl_ohlc = {
             "1m": OrderedDict(),
             "5m": OrderedDict(),
@@ -234,57 +248,137 @@ class SupremeRiskManager:
     # --------------------------------------------------
 
     def can_execute(self) -> bool:
-        with self._lock:
+        """
+        Entry gate for alerts / commands.
+
+        Reads the PnL refreshed by heartbeat() without touching the broker
+        (and without waiting on the heartbeat's lock). Only when that PnL is
+        older than VERDICT_MAX_STALENESS_SEC, or the day rolled over, does it
+        refresh synchronously from the broker like before.
+        """
+        started = time.perf_counter()
+        try:
             today = date.today()
-            try:
-                self._update_pnl()
-            except RuntimeError:
-                # 🔥 FAIL-HARD: broker/session failure must kill process
-                raise
+            refreshed_at = self._pnl_refreshed_at
+            if (
+                refreshed_at is None
+                or today != self.current_day
+                or time.monotonic() - refreshed_at > self.VERDICT_MAX_STALENESS_SEC
+            ):
+                self._count_verdict("sync_refreshes")
+                with self._lock:
+                    try:
+                        self._update_pnl()
+                    except RuntimeError:
+                        # 🔥 FAIL-HARD: broker/session failure must kill process
+                        raise
+
+                    if today != self.current_day:
+                        logger.info("RMS: New day detected | old=%s | new=%s", self.current_day, today)
+                        self._reset_daily_state(today)
+
+                    return self._apply_verdict(today)
+
+            self._count_verdict("cached")
+            return self._apply_verdict(today)
+        finally:
+            self._can_execute_latency.observe(time.perf_counter() - started)
+
+    def _count_verdict(self, key: str) -> None:
+        with self._verdict_stats_lock:
+            self._verdict_stats[key] += 1
+
+    def _evaluate_verdict(self, today: date) -> Tuple[bool, str]:
+        """Pure O(1) check of the in-memory risk state (no I/O, no logging)."""
+        if self.cooldown_until and today < self.cooldown_until:
+            return False, "COOLDOWN"
+        if self.force_exit_in_progress:
+            return False, "FORCE_EXIT_IN_PROGRESS"
+        if self.daily_loss_hit:
+            return False, "DAILY_LOSS_HIT"
+        if self.daily_pnl <= self.dynamic_max_loss:
+            return False, "MAX_LOSS_BREACH"
+        return True, "OK"
+
+    def _publish_verdict(self, today: date) -> Tuple[bool, str]:
+        allowed, reason = self._evaluate_verdict(today)
+        self._verdict = {
+            "allowed": allowed,
+            "reason": reason,
+            "daily_pnl": self.daily_pnl,
+            "max_loss": self.dynamic_max_loss,
+            "ts": time.time(),
+        }
+        return allowed, reason
 
-            if today != self.current_day:
-                logger.info("RMS: New day detected | old=%s | new=%s", self.current_day, today)
-                self._reset_daily_state(today)
+    def _apply_verdict(self, today: date) -> bool:
+        allowed, reason = self._publish_verdict(today)
 
-            if self.cooldown_until and today < self.cooldown_until:
-                logger.warning(
-                    "RMS: Entry BLOCKED | reason=COOLDOWN | until=%s | current=%s",
-                    self.cooldown_until,
-                    today,
-                )
-                return False
+        if reason == "COOLDOWN":
+            logger.warning(
+                "RMS: Entry BLOCKED | reason=COOLDOWN | until=%s | current=%s",
+                self.cooldown_until,
+                today,
+            )
+            return False
 
-            if self.force_exit_in_progress:
-                logger.warning(
-                    "RMS: Entry BLOCKED | reason=FORCE_EXIT_IN_PROGRESS | pnl=%.2f",
-                    self.daily_pnl,
-                )
-                return False
+        if reason == "FORCE_EXIT_IN_PROGRESS":
+            logger.warning(
+                "RMS: Entry BLOCKED | reason=FORCE_EXIT_IN_PROGRESS | pnl=%.2f",
+                self.daily_pnl,
+            )
+            return False
 
-            if self.daily_loss_hit:
-                logger.warning(
-                    "RMS: Entry BLOCKED | reason=DAILY_LOSS_HIT | pnl=%.2f | max_loss=%.2f",
-                    self.daily_pnl,
-                    self.dynamic_max_loss,
-                )
-                return False
+        if reason == "DAILY_LOSS_HIT":
+            logger.warning(
+                "RMS: Entry BLOCKED | reason=DAILY_LOSS_HIT | pnl=%.2f | max_loss=%.2f",
+                self.daily_pnl,
+                self.dynamic_max_loss,
+            )
+            return False
 
-            if self.daily_pnl <= self.dynamic_max_loss:
+        if reason == "MAX_LOSS_BREACH":
+            with self._lock:
                 logger.critical(
                     "RMS: Max loss breach detected | pnl=%.2f | max_loss=%.2f | triggering exit",
                     self.daily_pnl,
                     self.dynamic_max_loss,
                 )
                 self._handle_daily_loss_breach()
-                return False
+                self._publish_verdict(today)
+            return False
 
-            logger.debug(
-                "RMS: Entry ALLOWED | pnl=%.2f | max_loss=%.2f | margin=%.2f",
-                self.daily_pnl,
-                self.dynamic_max_loss,
-                self.daily_pnl - self.dynamic_max_loss,
-            )
-            return True
+        logger.debug(
+            "RMS: Entry ALLOWED | pnl=%.2f | max_loss=%.2f | margin=%.2f",
+            self.daily_pnl,
+            self.dynamic_max_loss,
+            self.daily_pnl - self.dynamic_max_loss,
+        )
+        return allowed
+
+    def get_risk_verdict(self) -> Optional[Dict]:
+        """Last published verdict with its age (None before the first refresh)."""
+        verdict = self._verdict
+        if verdict is None:
+            return None
+        refreshed_at = self._pnl_refreshed_at
+        return {
+            **verdict,
+            "age_sec": round(time.time() - verdict["ts"], 3),
+            "pnl_age_sec": (
+                round(time.monotonic() - refreshed_at, 3) if refreshed_at is not None else None
+            ),
+            "max_staleness_sec": self.VERDICT_MAX_STALENESS_SEC,
+        }
+
+    def get_verdict_stats(self) -> Dict:
+        """Fast-path vs synchronous-refresh counts and can_execute() latency."""
+        with self._verdict_stats_lock:
+            counts = dict(self._verdict_stats)
+        return {
+            **counts,
+            "can_execute_latency": self._can_execute_latency.snapshot(),
+        }
 
     def can_execute_command(self, command) -> Tuple[bool, str]:
         with self._lock:
@@ -483,6 +577,7 @@ class SupremeRiskManager:
                     self._update_trailing_max_loss()
                     self._check_warning_threshold()
                 self.track_pnl_ohlc()
+                self._publish_verdict(today)
                 self._save_state()  # Keep dashboard risk widget up-to-date
                 self._send_periodic_status()
             except RuntimeError:
@@ -501,7 +596,9 @@ class SupremeRiskManager:
         Called after breach to prevent any pending buy/sell from filling.
         """
         try:
-            order_book = self.bot.api.get_order_book()
+            order_book = read_broker(
+                self.bot, "orders", max_age=0.0, consumer="risk_manager", allow_stale=False
+            )
             if not order_book:
                 return
 
@@ -579,7 +676,10 @@ class SupremeRiskManager:
         self.bot._ensure_login()
         
         try:
-            positions = self.bot.api.get_positions() or []
+            positions = read_broker(
+                self.bot, "positions", max_age=self.BROKER_MAX_AGE,
+                consumer="risk_manager", allow_stale=False,
+            )
         except Exception as e:
             # API call failed entirely — preserve last known PnL
             logger.warning(
@@ -658,6 +758,7 @@ class SupremeRiskManager:
                 "RMS: Ignoring stale pre-market PnL | broker_total=%.2f | keeping daily_pnl=%.2f",
                 total, self.daily_pnl,
             )
+            self._pnl_refreshed_at = time.monotonic()
             return positions
 
         pnl_change = total - self.daily_pnl if self.last_known_pnl is not None else 0.0
@@ -674,6 +775,7 @@ class SupremeRiskManager:
         
         self.daily_pnl = total
         self.last_known_pnl = total
+        self._pnl_refreshed_at = time.monotonic()
         
         return positions  # Return for reuse in heartbeat
 
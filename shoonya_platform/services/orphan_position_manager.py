@@ -23,6 +23,7 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 from shoonya_platform.persistence.database import get_connection
+from shoonya_platform.api.dashboard.services.broker_service import read_broker
 
 logger = logging.getLogger("ORPHAN_POSITION_MANAGER")
 
@@ -100,7 +101,10 @@ class OrphanPositionManager:
         try:
             # Get current broker positions
             self.bot._ensure_login()
-            positions = self.bot.api.get_positions() or []
+            positions = read_broker(
+                self.bot, "positions", max_age=1.0,
+                consumer="orphan_manager", allow_stale=False,
+            )
             
             # Get strategy-owned symbols (exclude from orphan management)
             orders = self.bot.order_repo.get_all() or []
@@ -8,6 +8,7 @@ from typing import Dict, List
 from shoonya_platform.persistence.repository import OrderRepository
 from shoonya_platform.execution.intent import UniversalOrderCommand
 from shoonya_platform.persistence.database import get_connection
+from shoonya_platform.api.dashboard.services.broker_service import read_broker
 
 logger = logging.getLogger(__name__)
 
@@ -44,8 +45,12 @@ class RecoveryBootstrap:
         # 1️⃣ FETCH BROKER TRUTH FIRST
         try:
             self.bot._ensure_login()
-            broker_positions = self.bot.api.get_positions() or []
-            broker_orders = self.bot.api.get_order_book() or []
+            broker_positions = read_broker(
+                self.bot, "positions", max_age=0.0, consumer="recovery", allow_stale=False
+            )
+            broker_orders = read_broker(
+                self.bot, "orders", max_age=0.0, consumer="recovery", allow_stale=False
+            )
         except Exception as e:
             logger.warning("♻️ Recovery skipped (broker unreachable)")
             logger.warning(str(e))
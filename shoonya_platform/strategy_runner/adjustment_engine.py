@@ -29,6 +29,15 @@ class AdjustmentEngine:
 
     def load_rules(self, rules_config: List[Dict[str, Any]]):
         self.rules_config = sorted(rules_config, key=lambda r: r.get("priority", 999))
+        # Compile IF/ELSE conditions once per config load, not per tick
+        self.condition_engine.invalidate()
+        for rule in self.rules_config:
+            try:
+                self.condition_engine.compiled(rule.get("conditions", []))
+                if rule.get("else_enabled"):
+                    self.condition_engine.compiled(rule.get("else_conditions", []))
+            except Exception as e:
+                logger.warning("Could not compile conditions for rule %s: %s", rule.get("name"), e)
 
     def check_and_apply(self, current_time: datetime) -> List[str]:
         actions_taken = []
@@ -41,8 +50,7 @@ class AdjustmentEngine:
                 continue
 
             if_conds = rule.get("conditions", [])
-            cond_objs = [self._dict_to_condition(c) for c in if_conds]
-            if self.condition_engine.evaluate(cond_objs):
+            if self.condition_engine.compiled(if_conds)():
                 action = rule["action"]
                 # ✅ BUG-COUNTER FIX: snapshot leg keys before execute to detect NOOP
                 legs_before = {t: (l.is_active, l.strike, l.option_type, l.expiry, l.qty)
@@ -83,8 +91,7 @@ class AdjustmentEngine:
 
             elif rule.get("else_enabled"):
                 else_conds = rule.get("else_conditions", [])
-                else_cond_objs = [self._dict_to_condition(c) for c in else_conds]
-                if self.condition_engine.evaluate(else_cond_objs):
+                if self.condition_engine.compiled(else_conds)():
                     else_action = rule["else_action"]
                     # ✅ BUG-COUNTER FIX: snapshot leg keys before execute to detect NOOP
                     legs_before = {t: (l.is_active, l.strike, l.option_type, l.expiry, l.qty)
@@ -376,7 +383,7 @@ class AdjustmentEngine:
             new_leg.lot_size = old_leg.lot_size
             new_leg.is_active = False
             new_leg.order_status = "PENDING"
-            new_leg.order_placed_at = datetime.now()
+            new_leg.order_placed_at = self.state.now()
 
             # Add new leg to state
             self.state.legs[new_tag] = new_leg
@@ -705,7 +712,7 @@ class AdjustmentEngine:
         # 🔒 Mark as pending, not active – will become active only after fill
         leg.is_active = False
         leg.order_status = "PENDING"
-        leg.order_placed_at = datetime.now()
+        leg.order_placed_at = self.state.now()
 
         self.state.legs[tag] = leg
         return tag
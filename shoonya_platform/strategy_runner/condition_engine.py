@@ -2,19 +2,87 @@
 """
 condition_engine.py — Rule & Condition Evaluation Engine (Final)
 =================================================================
+
+Two ways in:
+  • evaluate(conditions)  – interpreted, for ad-hoc Condition lists
+  • compiled(cond_dicts)  – config condition lists compiled once into
+    closures (pre-resolved parameter accessor + comparator) with a
+    short-circuit AND/OR fold. Cached per config list; engines drop the
+    cache when their config is (re)loaded.
 """
 import re
 import logging
+import operator
+from functools import lru_cache
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from .models import Condition, Comparator, JoinOperator
 from .state import StrategyState
 
 logger = logging.getLogger(__name__)
 
+
+# --- Helper conversion functions ---
+def to_numeric(x: Any) -> Optional[float]:
+    if isinstance(x, (int, float)):
+        return float(x)
+    if isinstance(x, str):
+        try:
+            return float(x)
+        except ValueError:
+            return None
+    return None
+
+
+def to_bool(x: Any) -> Optional[bool]:
+    if isinstance(x, bool):
+        return x
+    # BUG-025 FIX: numeric 0/1 must be accepted as boolean bounds.
+    if isinstance(x, (int, float)) and not isinstance(x, bool):
+        if x == 0:
+            return False
+        if x == 1:
+            return True
+        return None  # 2, -1, etc. — ambiguous, reject
+    # ✅ BUG-011 FIX: Extended string boolean support
+    if isinstance(x, str):
+        lower = x.lower().strip()
+        if lower in ('true', 'yes', '1'):
+            return True
+        if lower in ('false', 'no', '0'):
+            return False
+    return None
+
+
+def to_minutes(x: Any) -> Optional[float]:
+    if isinstance(x, str) and ':' in x:
+        return _hhmm_minutes(x)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _hhmm_minutes(x: str) -> Optional[float]:
+    try:
+        t = datetime.strptime(x, "%H:%M").time()
+        return t.hour * 60 + t.minute
+    except ValueError:
+        return None
+
+
+def condition_from_dict(d: Dict[str, Any]) -> Condition:
+    return Condition(
+        parameter=d["parameter"],
+        comparator=Comparator(d["comparator"]),
+        value=d.get("value"),
+        value2=d.get("value2"),
+        join=JoinOperator(d["join"]) if d.get("join") else None,
+    )
+
 class ConditionEngine:
     def __init__(self, state: StrategyState):
         self.state = state
+        # (id(config list), each) → (config list, compiled form)
+        self._compiled: Dict[Tuple[int, bool], Tuple[List[Dict[str, Any]], Any]] = {}
 
     def evaluate(self, conditions: List[Condition]) -> bool:
         if not conditions:
@@ -34,50 +102,13 @@ class ConditionEngine:
         return bool(result)
 
     def _evaluate_single(self, cond: Condition) -> bool:
-        param_value = self._resolve_parameter(cond.parameter)
+        return self._compare(cond, self._resolve_parameter(cond.parameter))
+
+    def _compare(self, cond: Condition, param_value: Any) -> bool:
         comp = cond.comparator
         val1 = cond.value
         val2 = cond.value2
 
-        # --- Helper conversion functions ---
-        def to_numeric(x: Any) -> Optional[float]:
-            if isinstance(x, (int, float)):
-                return float(x)
-            if isinstance(x, str):
-                try:
-                    return float(x)
-                except ValueError:
-                    return None
-            return None
-
-        def to_bool(x: Any) -> Optional[bool]:
-            if isinstance(x, bool):
-                return x
-            # BUG-025 FIX: numeric 0/1 must be accepted as boolean bounds.
-            if isinstance(x, (int, float)) and not isinstance(x, bool):
-                if x == 0:
-                    return False
-                if x == 1:
-                    return True
-                return None  # 2, -1, etc. — ambiguous, reject
-            # ✅ BUG-011 FIX: Extended string boolean support
-            if isinstance(x, str):
-                lower = x.lower().strip()
-                if lower in ('true', 'yes', '1'):
-                    return True
-                if lower in ('false', 'no', '0'):
-                    return False
-            return None
-
-        def to_minutes(x: Any) -> Optional[float]:
-            if isinstance(x, str) and ':' in x:
-                try:
-                    t = datetime.strptime(x, "%H:%M").time()
-                    return t.hour * 60 + t.minute
-                except ValueError:
-                    return None
-            return None
-
         # Determine intended comparison type
         param_is_bool = isinstance(param_value, bool)
         val1_is_bool = isinstance(val1, bool)
@@ -290,244 +321,391 @@ class ConditionEngine:
             raise ValueError(f"Unknown comparator: {comp}")
 
     def _resolve_parameter(self, param: str) -> Any:
-        # Handle abs(...)
-        abs_match = re.match(r'^abs\((.+)\)$', param)
-        if abs_match:
-            inner = abs_match.group(1)
-            return abs(self._resolve_parameter(inner))
-
-        # Handle moneyness (needs spot price)
-        # For PE, use (spot - strike) / spot so OTM PE → positive.
-        if param in ("ce_moneyness", "pe_moneyness"):
-            opt_type = "CE" if param.startswith("ce") else "PE"
-            leg = self._find_leg_by_option_type(opt_type)
-            if leg and leg.strike and self.state.spot_price:
+        return parameter_accessor(param)(self.state)
+
+    def _find_leg_by_option_type(self, opt_type: str):
+        """Helper to find first active leg with given option type (for CE/PE-centric params)."""
+        return _find_leg(self.state, opt_type)
+
+    # ------------------------------------------------------------------
+    # COMPILED EVALUATION
+    # ------------------------------------------------------------------
+
+    def compile(self, conditions: List[Union[Condition, Dict[str, Any]]]) -> "CompiledConditions":
+        """Compile a condition list (Condition objects or config dicts)."""
+        steps = []
+        for cond in conditions:
+            if isinstance(cond, dict):
+                cond = condition_from_dict(cond)
+            else:  # snapshot: later edits to the object must not leak in
+                cond = Condition(cond.parameter, cond.comparator, cond.value, cond.value2, cond.join)
+            is_and = (cond.join or JoinOperator.AND) == JoinOperator.AND
+            stateful = cond.comparator in (Comparator.CROSSES_ABOVE, Comparator.CROSSES_BELOW)
+            steps.append((is_and, stateful, self._compile_single(cond)))
+        return CompiledConditions(self, steps)
+
+    def compiled(self, cond_dicts: List[Dict[str, Any]], each: bool = False):
+        """
+        Compiled form of a config condition list, built on first use and
+        reused until invalidate(). Keyed by the list object itself.
+        each=True returns one single-condition CompiledConditions per entry
+        (for callers that OR/AND conditions themselves and ignore "join").
+        """
+        if not cond_dicts:
+            return [] if each else _ALWAYS_TRUE
+        key = (id(cond_dicts), each)
+        entry = self._compiled.get(key)
+        if entry is not None and entry[0] is cond_dicts:
+            return entry[1]
+        if each:
+            compiled = [self.compile([c]) for c in cond_dicts]
+        else:
+            compiled = self.compile(cond_dicts)
+        self._compiled[key] = (cond_dicts, compiled)
+        return compiled
+
+    def invalidate(self) -> None:
+        """Drop compiled condition lists (call when the config changes)."""
+        self._compiled.clear()
+
+    def _compile_single(self, cond: Condition) -> Callable[[Any], bool]:
+        accessor = parameter_accessor(cond.parameter)
+        compare = self._compare
+        fast = _numeric_comparator(cond)
+        if fast is None:
+            return lambda state: compare(cond, accessor(state))
+
+        def check(state, _fast_types=_FAST_TYPES):
+            pv = accessor(state)
+            if type(pv) in _fast_types:
+                return fast(state, pv)
+            return compare(cond, pv)
+        return check
+
+
+class CompiledConditions:
+    """
+    Condition list as (is_and, stateful, check) steps folded left to right
+    like ConditionEngine.evaluate(), skipping checks that cannot change the
+    result. crosses_above/below are always run so prev_values stays current.
+    """
+
+    __slots__ = ("engine", "steps")
+
+    def __init__(self, engine: ConditionEngine, steps: List[Tuple[bool, bool, Callable[[Any], bool]]]):
+        self.engine = engine
+        self.steps = steps
+
+    def __call__(self) -> bool:
+        steps = self.steps
+        if not steps:
+            return True
+        state = self.engine.state
+        result = steps[0][2](state)
+        for is_and, stateful, check in steps[1:]:
+            if is_and:
+                if result:
+                    result = check(state)
+                elif stateful:
+                    check(state)
+            elif not result:
+                result = check(state)
+            elif stateful:
+                check(state)
+        return bool(result)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+_ALWAYS_TRUE = CompiledConditions(None, [])
+
+
+# ----------------------------------------------------------------------
+# Numeric fast path: numeric parameter vs numeric threshold resolves to
+# the NUMERIC BRANCH of ConditionEngine._compare, so the comparison (and
+# the threshold conversion) can be fixed at compile time.
+# ----------------------------------------------------------------------
+
+_FAST_TYPES = frozenset((int, float))
+
+
+def _numeric_comparator(cond: Condition) -> Optional[Callable[[Any, float], bool]]:
+    val1 = cond.value
+    if isinstance(val1, bool) or (isinstance(val1, str) and ':' in val1):
+        return None
+    v1 = to_numeric(val1)
+    if v1 is None:
+        return None
+    comp = cond.comparator
+    v2 = to_numeric(cond.value2) if cond.value2 is not None else None
+
+    if comp == Comparator.GT:
+        return lambda state, pv: pv > v1
+    if comp == Comparator.GTE:
+        return lambda state, pv: pv >= v1
+    if comp == Comparator.LT:
+        return lambda state, pv: pv < v1
+    if comp == Comparator.LTE:
+        return lambda state, pv: pv <= v1
+    if comp == Comparator.EQ:
+        return lambda state, pv: pv == v1
+    if comp == Comparator.NEQ:
+        return lambda state, pv: pv != v1
+    if comp == Comparator.APPROX:
+        if v1 == 0:
+            return lambda state, pv: abs(pv) < 0.02 * (abs(pv) + 1e-9)
+        return lambda state, pv: abs((pv - v1) / v1) <= 0.02
+    if comp == Comparator.BETWEEN:
+        if v2 is None:
+            return lambda state, pv: False
+        return lambda state, pv: v1 <= pv <= v2
+    if comp == Comparator.NOT_BETWEEN:
+        if v2 is None:
+            return lambda state, pv: False
+        return lambda state, pv: not (v1 <= pv <= v2)
+    if comp == Comparator.IS_TRUE:
+        return lambda state, pv: bool(pv)
+    if comp == Comparator.IS_FALSE:
+        return lambda state, pv: not pv
+    if comp in (Comparator.CROSSES_ABOVE, Comparator.CROSSES_BELOW):
+        param = cond.parameter
+        above = comp == Comparator.CROSSES_ABOVE
+
+        def crosses(state, pv):
+            pv = float(pv)
+            prev = state.prev_values.get(param)
+            state.prev_values[param] = pv
+            if prev is None:
+                return False
+            prev_num = to_numeric(prev)
+            if prev_num is None:
+                return False
+            if above:
+                return prev_num <= v1 and pv > v1
+            return prev_num >= v1 and pv < v1
+        return crosses
+    return None
+
+
+# ----------------------------------------------------------------------
+# Parameter accessor table: each parameter name is resolved once into a
+# state → value function (same precedence as the original if/elif chain).
+# ----------------------------------------------------------------------
+
+_ACCESSORS: Dict[str, Callable[[Any], Any]] = {}
+
+_ABS_RE = re.compile(r'^abs\((.+)\)$')
+_TAG_RE = re.compile(r"tag\.([^.]+)\.(.+)")
+
+# Parameter name → StrategyState attribute (read directly, no default)
+_STATE_PARAMS = {
+    "days_to_expiry": "days_to_expiry",
+    "is_expiry_day": "is_expiry_day",
+    "session_type": "session_type",
+    "minutes_to_exit": "minutes_to_exit",
+    "pcr": "pcr",
+    "pcr_volume": "pcr_volume",
+    "spot_price": "spot_price",
+    "spot_ltp": "spot_price",
+    "spot_open": "spot_open",
+    "atm_strike": "atm_strike",
+    "fut_ltp": "fut_ltp",
+    "net_delta": "net_delta",
+    "combined_pnl": "combined_pnl",
+    "combined_pnl_pct": "combined_pnl_pct",
+    "delta_diff": "delta_diff",
+    "unrealised_pnl": "unrealised_pnl",
+    "realised_pnl": "realised_pnl",
+    "profit_step": "profit_step",
+    "premium_collected": "premium_collected",
+    "total_cost_basis": "total_cost_basis",
+    "total_premium_decay_pct": "total_premium_decay_pct",
+    "max_profit_potential": "max_profit_potential",
+    "iv_skew": "iv_skew",
+    "atm_iv": "atm_iv",
+    "adjustment_count": "adjustment_count",
+    "all_legs_active": "all_legs_active",
+    "total_premium": "total_premium",
+    "max_leg_delta": "max_leg_delta",
+    "min_leg_delta": "min_leg_delta",
+    "any_leg_delta_above": "max_leg_delta",
+    "all_legs_delta_below": "max_leg_delta",
+    "most_profitable_leg": "most_profitable_leg",
+    "least_profitable_leg": "least_profitable_leg",
+    "spot_change": "spot_change",
+    "spot_change_pct": "spot_change_pct",
+    "adj_count_today": "adjustments_today",
+    # BUG-A5 FIX: Breakeven and market params declared in config_schema KNOWN_PARAMETERS
+    # must resolve to the state property, not fall through to getattr(state, param, 0.0).
+    "breakeven_upper": "breakeven_upper",
+    "breakeven_lower": "breakeven_lower",
+    "breakeven_distance": "breakeven_distance",
+    "spot_vs_upper_be": "spot_vs_upper_be",
+    "spot_vs_lower_be": "spot_vs_lower_be",
+    "spot_vs_max_pain": "spot_vs_max_pain",
+    "max_pain_strike": "max_pain_strike",
+    "total_oi_ce": "total_oi_ce",
+    "total_oi_pe": "total_oi_pe",
+    "oi_buildup_ce": "oi_buildup_ce",
+    "oi_buildup_pe": "oi_buildup_pe",
+    "portfolio_delta": "portfolio_delta",
+    "portfolio_gamma": "portfolio_gamma",
+    "portfolio_theta": "portfolio_theta",
+    "portfolio_vega": "portfolio_vega",
+    "active_legs_count": "active_legs_count",
+    "closed_legs_count": "closed_legs_count",
+    "any_leg_active": "any_leg_active",
+    "time_in_position_sec": "time_in_position_sec",
+    "time_since_last_adj_sec": "time_since_last_adj_sec",
+}
+
+
+def _find_leg(state, opt_type: str):
+    # ✅ BUG FIX: Filter for is_active to avoid returning stale data from closed legs
+    for leg in state.legs.values():
+        if leg.is_active and leg.option_type and leg.option_type.value == opt_type:
+            return leg
+    return None
+
+
+def parameter_accessor(param: str) -> Callable[[Any], Any]:
+    """state → value function for ``param`` (built once per name, then cached)."""
+    accessor = _ACCESSORS.get(param)
+    if accessor is None:
+        accessor = _ACCESSORS[param] = _build_accessor(param)
+    return accessor
+
+
+def _build_accessor(param: str) -> Callable[[Any], Any]:
+    # Handle abs(...)
+    abs_match = _ABS_RE.match(param)
+    if abs_match:
+        inner = parameter_accessor(abs_match.group(1))
+        return lambda state: abs(inner(state))
+
+    # Handle moneyness (needs spot price)
+    # For PE, use (spot - strike) / spot so OTM PE → positive.
+    if param in ("ce_moneyness", "pe_moneyness"):
+        opt_type = "CE" if param.startswith("ce") else "PE"
+
+        def moneyness(state):
+            leg = _find_leg(state, opt_type)
+            if leg and leg.strike and state.spot_price:
                 if opt_type == "PE":
-                    return (self.state.spot_price - leg.strike) / self.state.spot_price
-                return (leg.strike - self.state.spot_price) / self.state.spot_price
+                    return (state.spot_price - leg.strike) / state.spot_price
+                return (leg.strike - state.spot_price) / state.spot_price
             return 0.0
+        return moneyness
 
-        if param == "ce_bid_ask_spread":
-            leg = self._find_leg_by_option_type("CE")
-            return leg.bid_ask_spread if leg else 0.0
-        if param == "pe_bid_ask_spread":
-            leg = self._find_leg_by_option_type("PE")
+    if param in ("ce_bid_ask_spread", "pe_bid_ask_spread"):
+        opt_type = "CE" if param.startswith("ce") else "PE"
+
+        def spread(state):
+            leg = _find_leg(state, opt_type)
             return leg.bid_ask_spread if leg else 0.0
-        
-        # New parameters
-        if param == "days_to_expiry":
-            return self.state.days_to_expiry
-        if param == "is_expiry_day":
-            return self.state.is_expiry_day
-        if param == "session_type":
-            return self.state.session_type
-        if param == "minutes_to_exit":
-            return self.state.minutes_to_exit
-        if param == "india_vix":
-            idx = self.state.index_data.get("INDIAVIX", {})
-            return idx.get("ltp", 0.0)
-        if param == "pcr":
-            return self.state.pcr
-        if param == "pcr_volume":
-            return self.state.pcr_volume
-
-        # CE/PE parameter handling
-        if param.startswith("ce_") or param.startswith("pe_"):
-            opt_type = "CE" if param.startswith("ce_") else "PE"
-            attr = param[3:]  # remove ce_ or pe_
-            leg = self._find_leg_by_option_type(opt_type)
+        return spread
+
+    if param == "india_vix":
+        return lambda state: state.index_data.get("INDIAVIX", {}).get("ltp", 0.0)
+
+    if param in _STATE_PARAMS:
+        return operator.attrgetter(_STATE_PARAMS[param])
+
+    # CE/PE parameter handling
+    if param.startswith("ce_") or param.startswith("pe_"):
+        opt_type = "CE" if param.startswith("ce_") else "PE"
+        attr = param[3:]  # remove ce_ or pe_
+
+        def leg_attr(state):
+            leg = _find_leg(state, opt_type)
             if leg and hasattr(leg, attr):
                 return getattr(leg, attr)
             return 0.0
-        
-        # Direct attributes + properties
-        if param == "spot_price":
-            return self.state.spot_price
-        elif param == "spot_ltp":
-            return self.state.spot_price
-        elif param == "spot_open":
-            return self.state.spot_open
-        elif param == "atm_strike":
-            return self.state.atm_strike
-        elif param == "fut_ltp":
-            return self.state.fut_ltp
-        elif param == "time_current":
-            t = self.state.current_time or datetime.now()
+        return leg_attr
+
+    if param == "time_current":
+        def time_current(state):
+            t = state.current_time or datetime.now()
             return t.strftime("%H:%M")
-        elif param == "net_delta":
-            return self.state.net_delta
-        elif param == "combined_pnl":
-            return self.state.combined_pnl
-        elif param == "combined_pnl_pct":
-            return self.state.combined_pnl_pct
-        elif param == "delta_diff":
-            return self.state.delta_diff
-        elif param == "unrealised_pnl":
-            return self.state.unrealised_pnl
-        elif param == "realised_pnl":
-            return self.state.realised_pnl
-        elif param == "profit_step":
-            return self.state.profit_step
-        elif param == "premium_collected":
-            return self.state.premium_collected
-        elif param == "total_cost_basis":
-            return self.state.total_cost_basis
-        elif param == "ce_premium_decay_pct":
-            return self.state.ce_premium_decay_pct
-        elif param == "pe_premium_decay_pct":
-            return self.state.pe_premium_decay_pct
-        elif param == "total_premium_decay_pct":
-            return self.state.total_premium_decay_pct
-        elif param == "max_profit_potential":
-            return self.state.max_profit_potential
-        elif param == "iv_skew":
-            return self.state.iv_skew
-        elif param == "atm_iv":
-            return self.state.atm_iv
-        elif param == "adjustment_count":
-            return self.state.adjustment_count
-        elif param == "all_legs_active":
-            return self.state.all_legs_active
-        elif param == "total_premium":
-            return self.state.total_premium
-        elif param == "max_leg_delta":
-            return self.state.max_leg_delta
-        elif param == "min_leg_delta":
-            return self.state.min_leg_delta
-        elif param == "any_leg_delta_above":
-            return self.state.max_leg_delta
-        elif param == "all_legs_delta_below":
-            return self.state.max_leg_delta
-        elif param == "higher_delta_leg":
-            return self.state.higher_delta_leg or ""
-        elif param == "lower_delta_leg":
-            return self.state.lower_delta_leg or ""
-        elif param == "most_profitable_leg":
-            return self.state.most_profitable_leg
-        elif param == "least_profitable_leg":
-            return self.state.least_profitable_leg
-        elif param == "spot_change":
-            return self.state.spot_change
-        elif param == "spot_change_pct":
-            return self.state.spot_change_pct
-        elif param == "ce_iv":
-            return self.state.ce_iv
-        elif param == "pe_iv":
-            return self.state.pe_iv
-        elif param == "adj_count_today":
-            return self.state.adjustments_today
-        # BUG-A5 FIX: Breakeven and market params declared in config_schema KNOWN_PARAMETERS
-        # but were missing from _resolve_parameter, causing them to fall through to
-        # getattr(state, param, 0.0) which silently returns 0.0 for properties.
-        elif param == "breakeven_upper":
-            return self.state.breakeven_upper
-        elif param == "breakeven_lower":
-            return self.state.breakeven_lower
-        elif param == "breakeven_distance":
-            return self.state.breakeven_distance
-        elif param == "spot_vs_upper_be":
-            return self.state.spot_vs_upper_be
-        elif param == "spot_vs_lower_be":
-            return self.state.spot_vs_lower_be
-        elif param == "spot_vs_max_pain":
-            return self.state.spot_vs_max_pain
-        elif param == "max_pain_strike":
-            return self.state.max_pain_strike
-        elif param == "total_oi_ce":
-            return self.state.total_oi_ce
-        elif param == "total_oi_pe":
-            return self.state.total_oi_pe
-        elif param == "oi_buildup_ce":
-            return self.state.oi_buildup_ce
-        elif param == "oi_buildup_pe":
-            return self.state.oi_buildup_pe
-        elif param == "portfolio_delta":
-            return self.state.portfolio_delta
-        elif param == "portfolio_gamma":
-            return self.state.portfolio_gamma
-        elif param == "portfolio_theta":
-            return self.state.portfolio_theta
-        elif param == "portfolio_vega":
-            return self.state.portfolio_vega
-        elif param == "active_legs_count":
-            return self.state.active_legs_count
-        elif param == "closed_legs_count":
-            return self.state.closed_legs_count
-        elif param == "any_leg_active":
-            return self.state.any_leg_active
-        elif param == "time_in_position_sec":
-            return self.state.time_in_position_sec
-        elif param == "time_since_last_adj_sec":
-            return self.state.time_since_last_adj_sec
-        elif param.startswith("index_"):
-            payload = param[len("index_"):]
-            attr = None
-            idx = None
-            for suffix in ("change_pct", "ltp", "pc", "change", "open", "high", "low", "close"):
-                token = f"_{suffix}"
-                if payload.endswith(token):
-                    idx = payload[: -len(token)].upper()
-                    attr = suffix
-                    break
-            if idx and attr:
-                if attr == "pc":
-                    attr = "change_pct"
-                idx_map = self.state.index_data.get(idx)
-                if isinstance(idx_map, dict):
-                    return idx_map.get(attr, 0.0)
-                fallback_key = f"{idx}_{attr}"
-                if fallback_key in self.state.index_data:
-                    return self.state.index_data.get(fallback_key, 0.0)
-            return 0.0
-        elif param.startswith("tag."):
-            match = re.match(r"tag\.([^.]+)\.(.+)", param)
-            if match:
-                tag, metric = match.groups()
-                leg = self.state.legs.get(tag)
-                if leg:
-                    if metric == "pnl":
-                        return leg.pnl
-                    elif metric == "pnl_pct":
-                        return leg.pnl_pct
-                    elif metric == "abs_delta":
-                        return leg.abs_delta
-                    elif metric == "is_itm":
-                        if leg.strike is None or leg.option_type is None:
-                            return False
-                        if leg.option_type.value == "CE":
-                            return self.state.spot_price > leg.strike
-                        return self.state.spot_price < leg.strike
-                    elif metric == "moneyness":
-                        if leg.strike is None or leg.option_type is None or not self.state.spot_price:
-                            return 0.0
-                        # BUG-M1 FIX: For PE, use (spot - strike) / spot so OTM PE → positive.
-                        if leg.option_type.value == "PE":
-                            return (self.state.spot_price - leg.strike) / self.state.spot_price
-                        return (leg.strike - self.state.spot_price) / self.state.spot_price
-                    elif hasattr(leg, metric):
-                        return getattr(leg, metric)
+        return time_current
+    if param in ("higher_delta_leg", "lower_delta_leg"):
+        getter = operator.attrgetter(param)
+        return lambda state: getter(state) or ""
+
+    if param.startswith("index_"):
+        payload = param[len("index_"):]
+        attr = None
+        idx = None
+        for suffix in ("change_pct", "ltp", "pc", "change", "open", "high", "low", "close"):
+            token = f"_{suffix}"
+            if payload.endswith(token):
+                idx = payload[: -len(token)].upper()
+                attr = suffix
+                break
+        if not (idx and attr):
+            return lambda state: 0.0
+        if attr == "pc":
+            attr = "change_pct"
+        fallback_key = f"{idx}_{attr}"
+
+        def index_value(state):
+            idx_map = state.index_data.get(idx)
+            if isinstance(idx_map, dict):
+                return idx_map.get(attr, 0.0)
+            if fallback_key in state.index_data:
+                return state.index_data.get(fallback_key, 0.0)
             return 0.0
-        else:
-            return getattr(self.state, param, 0.0)
+        return index_value
+
+    if param.startswith("tag."):
+        match = _TAG_RE.match(param)
+        if not match:
+            return lambda state: 0.0
+        tag, metric = match.groups()
+        return _tag_accessor(tag, metric)
+
+    return lambda state: getattr(state, param, 0.0)
+
+
+def _tag_accessor(tag: str, metric: str) -> Callable[[Any], Any]:
+    if metric == "is_itm":
+        def is_itm(state):
+            leg = state.legs.get(tag)
+            if not leg:
+                return 0.0
+            if leg.strike is None or leg.option_type is None:
+                return False
+            if leg.option_type.value == "CE":
+                return state.spot_price > leg.strike
+            return state.spot_price < leg.strike
+        return is_itm
+
+    if metric == "moneyness":
+        def moneyness(state):
+            leg = state.legs.get(tag)
+            if not leg:
+                return 0.0
+            if leg.strike is None or leg.option_type is None or not state.spot_price:
+                return 0.0
+            # BUG-M1 FIX: For PE, use (spot - strike) / spot so OTM PE → positive.
+            if leg.option_type.value == "PE":
+                return (state.spot_price - leg.strike) / state.spot_price
+            return (leg.strike - state.spot_price) / state.spot_price
+        return moneyness
+
+    # pnl / pnl_pct / abs_delta and any other leg attribute
+    def leg_metric(state):
+        leg = state.legs.get(tag)
+        if leg and hasattr(leg, metric):
+            return getattr(leg, metric)
+        return 0.0
+    return leg_metric
 
-    def _find_leg_by_option_type(self, opt_type: str):
-        """Helper to find first active leg with given option type (for CE/PE-centric params)."""
-        # ✅ BUG FIX: Filter for is_active to avoid returning stale data from closed legs
-        for leg in self.state.legs.values():
-            if leg.is_active and leg.option_type and leg.option_type.value == opt_type:
-                return leg
-        return None
 
 def evaluate_condition(condition_dict: Dict[str, Any], state: StrategyState) -> bool:
     """
     Helper for modules/tests that evaluate one condition dict.
     """
     engine = ConditionEngine(state)
-    cond = Condition(
-        parameter=condition_dict["parameter"],
-        comparator=Comparator(condition_dict["comparator"]),
-        value=condition_dict.get("value"),
-        value2=condition_dict.get("value2"),
-        join=JoinOperator(condition_dict["join"]) if condition_dict.get("join") else None,
-    )
-    return engine.evaluate([cond])
+    return engine.evaluate([condition_from_dict(condition_dict)])
@@ -16,6 +16,19 @@ class EntryEngine:
         self.market = market
         self.condition_engine = ConditionEngine(state)
 
+    def load_config(self, entry_config: Dict[str, Any]):
+        """Compile global and per-leg conditions once per config load."""
+        self.condition_engine.invalidate()
+        lists = [entry_config.get("global_conditions", [])]
+        for leg_cfg in entry_config.get("legs", []):
+            lists.append(leg_cfg.get("conditions", []))
+            lists.append(leg_cfg.get("else_conditions", []))
+        for conds in lists:
+            try:
+                self.condition_engine.compiled(conds)
+            except Exception as e:
+                logger.warning("Could not compile entry conditions: %s", e)
+
     def process_entry(self, entry_config: Dict[str, Any], symbol: str, default_expiry: str) -> List[LegState]:
         """
         Process entry legs according to JSON config.
@@ -32,8 +45,7 @@ class EntryEngine:
 
         entry_cooldown = int(entry_config.get("entry_cooldown_sec", 0))
         if entry_cooldown > 0 and self.state.entry_time:
-            from datetime import datetime as _dt
-            elapsed = (_dt.now() - self.state.entry_time).total_seconds()
+            elapsed = (self.state.now() - self.state.entry_time).total_seconds()
             if elapsed < entry_cooldown:
                 logger.info(
                     "ENTRY_BLOCKED | cooldown %.0fs < %ss",
@@ -43,8 +55,7 @@ class EntryEngine:
 
         # 1. Evaluate global conditions
         global_conds = entry_config.get("global_conditions", [])
-        cond_objs = [self._dict_to_condition(c) for c in global_conds]
-        if not self.condition_engine.evaluate(cond_objs):
+        if not self.condition_engine.compiled(global_conds)():
             logger.info(
                 "ENTRY_SKIPPED_GLOBAL_CONDITIONS | strategy_symbol=%s | conditions=%s",
                 symbol,
@@ -85,15 +96,13 @@ class EntryEngine:
 
         # Evaluate IF conditions
         if_conds = leg_cfg.get("conditions", [])
-        cond_objs = [self._dict_to_condition(c) for c in if_conds]
-        if_condition_true = self.condition_engine.evaluate(cond_objs)
+        if_condition_true = self.condition_engine.compiled(if_conds)()
 
         # Decide which branch to use (IF or ELSE)
         use_else = leg_cfg.get("else_enabled", False) and not if_condition_true
         if use_else:
             else_conds = leg_cfg.get("else_conditions", [])
-            else_cond_objs = [self._dict_to_condition(c) for c in else_conds]
-            if not self.condition_engine.evaluate(else_cond_objs):
+            if not self.condition_engine.compiled(else_conds)():
                 logger.info(
                     "ENTRY_LEG_SKIPPED | tag=%s | reason=ELSE_CONDITIONS_FALSE | if_conditions=%s | else_conditions=%s",
                     tag,
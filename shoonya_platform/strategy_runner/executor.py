@@ -2,7 +2,7 @@ import time
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from .state import StrategyState, LegState
 from .models import Side, InstrumentType
@@ -20,16 +20,35 @@ from shoonya_platform.market_data.feeds import index_tokens_subscriber
 logger = logging.getLogger(__name__)
 
 class StrategyExecutor:
-    def __init__(self, config_path: str, state_path: Optional[str] = None):
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        state_path: Optional[str] = None,
+        *,
+        config: Optional[Dict[str, Any]] = None,
+        market: Optional[MarketReader] = None,
+    ):
+        """
+        Args:
+            config_path: strategy JSON file (ignored when ``config`` is given)
+            state_path: persisted state file (default "state.json")
+            config: already-loaded strategy config
+            market: market reader to use instead of the live MarketReader
+                    (replay passes its ReplayMarketReader here)
+        """
+        if config is None:
+            if not config_path:
+                raise ValueError("StrategyExecutor needs config_path or config")
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        self.config = config
 
         self.state_path = state_path or "state.json"  # ✅ BUG-006: JSON instead of pkl
         self.state = self._load_or_create_state()
 
         # Initialize market reader
         identity = self.config["identity"]
-        self.market = MarketReader(
+        self.market = market or MarketReader(
             exchange=identity["exchange"],
             symbol=identity["underlying"],
             max_stale_seconds=30
@@ -48,6 +67,7 @@ class StrategyExecutor:
 
         # Load rules
         self.adjustment_engine.load_rules(self.config.get("adjustment", {}).get("rules", []))
+        self.entry_engine.load_config(self.config.get("entry", {}))
         self.exit_engine.load_config(self.config.get("exit", {}))
 
         # NEW: Sequential entry state (not fully implemented in base executor)
@@ -111,7 +131,7 @@ class StrategyExecutor:
                 _backoff = min(_backoff * 2, 60)  # cap at 60s backoff
 
     def _tick(self):
-        now = datetime.now()
+        now = self.state.now()
         self.state.current_time = now
 
         # Daily reset
@@ -176,7 +196,7 @@ class StrategyExecutor:
 
     def _update_market_data(self):
         """Update spot, ATM, futures, per‑leg LTP, greeks, bid/ask, OI change, and index data."""
-        self.state.current_time = datetime.now()
+        self.state.current_time = self.state.now()
         self.state.spot_price = self.market.get_spot_price(self._cycle_expiry_date)
         if not self.state.spot_open and self.state.spot_price:
             self.state.spot_open = self.state.spot_price
@@ -231,13 +251,17 @@ class StrategyExecutor:
 
         # NEW: Fetch index data from live feed
         try:
-            index_prices = index_tokens_subscriber.get_index_prices()
+            index_prices = self._fetch_index_prices()
             if index_prices:
                 # Type ignore: index_prices may contain None, but set_index_ticks handles it.
                 self.state.set_index_ticks(index_prices)  # type: ignore
         except Exception as e:
             logger.debug(f"Could not fetch index data: {e}")
 
+    def _fetch_index_prices(self) -> Dict[str, Dict[str, Any]]:
+        """Index ticks for conditions (live feed; replay serves recorded ticks)."""
+        return index_tokens_subscriber.get_index_prices()
+
     def _fetch_broker_positions(self) -> list:
         # Placeholder - would call broker API
         # For simulation, we return current legs as positions
@@ -331,7 +355,7 @@ class StrategyExecutor:
             self.state.legs[leg.tag] = leg
         self.state.entered_today = True
         self.state.total_trades_today += 1
-        self.state.entry_time = datetime.now()
+        self.state.entry_time = self.state.now()
         logger.info(f"Entered {len(new_legs)} legs")
 
     def _execute_exit(self, action: str):
@@ -494,7 +518,7 @@ class StrategyExecutor:
                     trading_symbol=opt_data.get("trading_symbol", ""),
                 )
                 new_leg.order_status = "PENDING"
-                new_leg.order_placed_at = datetime.now()
+                new_leg.order_placed_at = self.state.now()
                 self.state.legs[new_tag] = new_leg
                 new_legs.append(new_leg)
                 # Deactivate old leg
@@ -17,6 +17,15 @@ class ExitEngine:
 
     def load_config(self, exit_config: Dict[str, Any]):
         self.exit_config = exit_config
+        # Compile combined / per-leg conditions once per config load
+        self.condition_engine.invalidate()
+        try:
+            combined = exit_config.get("combined_conditions", {})
+            self.condition_engine.compiled(combined.get("rules", []), each=True)
+            for rule in exit_config.get("leg_rules", []):
+                self.condition_engine.compiled(rule.get("conditions", []))
+        except Exception as e:
+            logger.warning("Could not compile exit conditions: %s", e)
 
     @staticmethod
     def _to_float(value: Any) -> Optional[float]:
@@ -72,19 +81,19 @@ class ExitEngine:
         if combined.get("operator") == "OR":
             rules = combined.get("rules", [])
             if rules:
-                cond_objs = [self._dict_to_condition(c) for c in rules]
+                compiled = self.condition_engine.compiled(rules, each=True)
                 # ✅ BUG FIX: Use any() to OR individual conditions, matching
                 # how AND uses all(). Previous code passed all conds to evaluate()
                 # which chained with per-condition join fields (defaulting to AND).
-                if any(self.condition_engine.evaluate([c]) for c in cond_objs):
+                if any(check() for check in compiled):
                     self.last_exit_reason = "combined_conditions_or"
                     return "combined_conditions"
         elif combined.get("operator") == "AND":
             # ✅ BUG-011 FIX: AND operator was silently ignored — all conditions must hold
             rules = combined.get("rules", [])
             if rules:
-                cond_objs = [self._dict_to_condition(c) for c in rules]
-                if all(self.condition_engine.evaluate([c]) for c in cond_objs):
+                compiled = self.condition_engine.compiled(rules, each=True)
+                if all(check() for check in compiled):
                     self.last_exit_reason = "combined_conditions_and"
                     return "combined_conditions"
 
@@ -245,7 +254,7 @@ class ExitEngine:
     def _check_time_exit(self, current_time: Optional[datetime]) -> Optional[str]:
         # ✅ BUG-010 FIX: Guard against None current_time
         if current_time is None:
-            current_time = datetime.now()
+            current_time = self.state.now()
 
         # ✅ BUG-TIMEEXIT FIX: Never fire time-exit when no legs are active.
         # Without this guard, a redundant EXIT_TRIGGERED fires at 15:28 on every
@@ -281,11 +290,11 @@ class ExitEngine:
         conds = rule.get("conditions", [])
         if not conds:
             return False
-        cond_objs = [self._dict_to_condition(c) for c in conds]
+        compiled = self.condition_engine.compiled(conds)
         # If any applicable leg, evaluate conditions (they may refer to specific leg via tag)
         for leg in applicable_legs:
             # Condition engine already resolves tag references using state
-            if self.condition_engine.evaluate(cond_objs):
+            if compiled():
                 return True
         return False
 
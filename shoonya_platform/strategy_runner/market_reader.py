@@ -9,19 +9,37 @@ Reads live option chain data from SQLite databases in:
 Supports multiple expiries, strike step auto‑detection, snapshot freshness checks,
 and robust match_leg attribute handling. Fully compatible with the Universal
 Multi‑Leg Strategy Execution Engine.
+
+Data sources (``source=`` / env ``MARKET_READER_SOURCE``):
+    sqlite — read the supervisor's SQLite mirror only (legacy)
+    bus    — read the in-process OptionChainSnapshotBus only
+    auto   — snapshot bus when the chain is published in this process,
+             otherwise SQLite (default)
 """
 
 import glob
 import logging
+import os
 import re
 import sqlite3
-from collections import Counter
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from .models import StrikeConfig, OptionType, StrikeMode
 from scripts.scriptmaster import get_future, universal_symbol_search
+from shoonya_platform.market_data.option_chain.snapshot_bus import (
+    ChainSnapshot,
+    get_snapshot_bus,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +63,25 @@ MATCH_PARAM_TO_SQL = {
     "moneyness": "strike",
 }
 
+# Same mapping for snapshot-bus reads: param -> (column, take_abs)
+MATCH_PARAM_TO_COLUMN = {
+    "delta": ("delta", False),
+    "abs_delta": ("delta", True),
+    "gamma": ("gamma", False),
+    "theta": ("theta", False),
+    "abs_theta": ("theta", True),
+    "vega": ("vega", False),
+    "iv": ("iv", False),
+    "ltp": ("ltp", False),
+    "oi": ("oi", False),
+    "volume": ("volume", False),
+    "strike": ("strike", False),
+    "moneyness": ("strike", False),
+}
+
+READER_SOURCES = ("sqlite", "bus", "auto")
+DEFAULT_READER_SOURCE = "auto"
+
 # Adaptive tolerance for find_option_by_criteria depending on the Greek/attribute.
 # None → proportional: max(base, |target| * fraction).  Keeps match_leg reliable
 # for ANY parameter, not just delta.
@@ -76,25 +113,184 @@ DEFAULT_LOT_SIZES = {
 }
 
 
+# ----------------------------------------------------------------------
+# Chain aggregates (max pain / PCR / PCR inflection), shared per snapshot
+# ----------------------------------------------------------------------
+# Every strategy holds its own MarketReader, but they all read the same
+# chains. Aggregates are computed once per (chain, snapshot) and shared.
+_AGG_CACHE_SIZE = 64
+_agg_cache: "OrderedDict[tuple, Dict[str, float]]" = OrderedDict()
+_agg_cache_lock = threading.Lock()
+_agg_stats = {"hits": 0, "misses": 0}
+
+
+def compute_chain_aggregates(
+    strikes: np.ndarray,
+    option_types: np.ndarray,
+    oi: np.ndarray,
+    volume: np.ndarray,
+    atm: float = 0.0,
+) -> Dict[str, float]:
+    """
+    One vectorized pass over a chain: OI/volume totals, PCR, max pain and
+    PCR inflection strike.
+
+    Max pain uses prefix sums over sorted strikes instead of strike x strike:
+        call pain(s) = s * sum(ce_oi[k<=s]) - sum(ce_oi[k<=s] * k)
+        put  pain(s) = sum(pe_oi[k>=s] * k) - s * sum(pe_oi[k>=s])
+    so the whole curve costs O(n log n) (the sort) instead of O(n^2).
+    NaN OI / volume count as 0; rows without a strike only count in totals.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    types = np.asarray(option_types, dtype=object)
+    oi = np.nan_to_num(np.asarray(oi, dtype=np.float64), nan=0.0)
+    volume = np.nan_to_num(np.asarray(volume, dtype=np.float64), nan=0.0)
+    is_ce = types == "CE"
+    is_pe = types == "PE"
+
+    total_oi_ce = float(oi[is_ce].sum())
+    total_oi_pe = float(oi[is_pe].sum())
+    total_vol_ce = float(volume[is_ce].sum())
+    total_vol_pe = float(volume[is_pe].sum())
+
+    out = {
+        "total_oi_ce": total_oi_ce,
+        "total_oi_pe": total_oi_pe,
+        "total_vol_ce": total_vol_ce,
+        "total_vol_pe": total_vol_pe,
+        "pcr": (total_oi_pe / total_oi_ce) if total_oi_ce > 0 else 0.0,
+        "pcr_volume": (total_vol_pe / total_vol_ce) if total_vol_ce > 0 else 0.0,
+        "max_pain_strike": 0.0,
+        "pcr_inflection_strike": 0.0,
+    }
+
+    valid = np.isfinite(strikes) & (is_ce | is_pe)
+    if not valid.any():
+        return out
+
+    uniq, inv = np.unique(strikes[valid], return_inverse=True)
+    n = len(uniq)
+    ce_k = np.bincount(inv, weights=np.where(is_ce[valid], oi[valid], 0.0), minlength=n)
+    pe_k = np.bincount(inv, weights=np.where(is_pe[valid], oi[valid], 0.0), minlength=n)
+
+    call_pain = uniq * np.cumsum(ce_k) - np.cumsum(ce_k * uniq)
+    put_pain = np.cumsum((pe_k * uniq)[::-1])[::-1] - uniq * np.cumsum(pe_k[::-1])[::-1]
+    # argmin → lowest strike on ties (same as the old strict "<" scan)
+    out["max_pain_strike"] = float(uniq[int(np.argmin(call_pain + put_pain))])
+
+    # Strike whose PE/CE OI ratio is closest to 1, biased toward ATM
+    has_ce = ce_k > 0
+    if has_ce.any():
+        pcr_k = pe_k[has_ce] / ce_k[has_ce]
+        score = np.abs(pcr_k - 1.0) + np.abs(uniq[has_ce] - atm) / max(1.0, atm)
+        best = float(uniq[has_ce][int(np.argmin(score))])
+        out["pcr_inflection_strike"] = best if best > 0 else atm
+    else:
+        out["pcr_inflection_strike"] = atm
+    return out
+
+
+def get_chain_aggregate_stats() -> Dict[str, int]:
+    """Shared aggregate cache counters (hits = computations saved)."""
+    with _agg_cache_lock:
+        return dict(_agg_stats, entries=len(_agg_cache))
+
+
+def _serialized(method: Callable) -> Callable:
+    """Run a reader method under its connection lock (SQLite handles are shared)."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._conn_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """
+    Immutable view of one chain (exchange, symbol, expiry) for one service
+    cycle: meta prices, chain metrics and every option row.
+
+    Built once per cycle by StrategyExecutorService and shared by all
+    executors on the chain, so legs are O(1) lookups instead of one query
+    (plus a freshness check) each.
+    """
+
+    exchange: str
+    symbol: str
+    expiry: Optional[str]
+    built_at: float
+    spot_price: float
+    atm_strike: float
+    fut_ltp: float
+    chain_metrics: Mapping[str, float]
+    # (strike, option_type) -> row, for SQLite-backed snapshots
+    rows: Mapping[Tuple[float, str], Mapping[str, Any]] = field(default_factory=dict)
+    # Bus-backed snapshots look rows up in the ChainSnapshot index directly
+    chain: Optional[ChainSnapshot] = None
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        return (self.exchange, self.symbol, self.expiry)
+
+    def get_option(
+        self, strike: float, option_type: Union[str, OptionType]
+    ) -> Optional[Dict[str, Any]]:
+        """Row for (strike, option_type) as a fresh dict, or None."""
+        if isinstance(option_type, OptionType):
+            option_type = option_type.value
+        opt = str(option_type).upper()
+        if self.chain is not None:
+            return self.chain.get_row(strike, opt)
+        row = self.rows.get((float(strike), opt))
+        return dict(row) if row is not None else None
+
+
 class MarketReader:
     """
     Production‑ready market reader with connection pooling, freshness checks,
     and dynamic strike step detection.
     """
 
-    def __init__(self, exchange: str, symbol: str, max_stale_seconds: int = 120):
+    def __init__(
+        self,
+        exchange: str,
+        symbol: str,
+        max_stale_seconds: int = 120,
+        source: Optional[str] = None,
+    ):
         """
         Args:
             exchange: NFO, MCX, etc.
             symbol: NIFTY, BANKNIFTY, etc.
             max_stale_seconds: Maximum allowed age of snapshot (seconds) before
                                 warning in data retrieval (default 120s).
+            source: "sqlite", "bus" or "auto" (default: env MARKET_READER_SOURCE
+                    or "auto").
         """
         self.exchange = exchange.upper()
         self.symbol = symbol.upper()
         self.max_stale_seconds = max_stale_seconds
-        # Store connection info per expiry key: {key: {'conn': conn, 'path': str, 'mtime': float}}
+        src = (source or os.getenv("MARKET_READER_SOURCE", DEFAULT_READER_SOURCE)).strip().lower()
+        if src not in READER_SOURCES:
+            logger.warning("Unknown MarketReader source %r; using %s", src, DEFAULT_READER_SOURCE)
+            src = DEFAULT_READER_SOURCE
+        self.source = src
+        # Persistent read-only connection per expiry key:
+        # {key: {'conn', 'path', 'ino', 'data_version', 'changed_at'}}
         self._conn_info: Dict[str, Dict] = {}
+        # Connections are opened with check_same_thread=False and shared by
+        # whichever thread runs the reader (executor pool threads); this
+        # lock serializes their bookkeeping and every query on them.
+        self._conn_lock = threading.RLock()
+        self._conn_stats: Dict[str, int] = {
+            "opens": 0,             # new connections (each validated once)
+            "reuses": 0,            # calls served by an open connection
+            "snapshot_changes": 0,  # data_version moved (supervisor wrote)
+            "reopens": 0,           # file recreated, idle too long or probe failed
+        }
         self._strike_step_cache: Dict[str, float] = {}  # expiry -> strike step
         self._prev_total_oi: Dict[str, Dict[str, float]] = {}
     # ----------------------------------------------------------------------
@@ -145,46 +341,99 @@ class MarketReader:
             candidates.sort(key=lambda x: x[1], reverse=True)
             chosen = candidates[0]
 
-        logger.info(f"Resolved default DB: {chosen[0].name} (expiry: {chosen[1]})")
+        logger.debug(f"Resolved default DB: {chosen[0].name} (expiry: {chosen[1]})")
         return str(chosen[0])
 
+    def _get_snapshot(self, expiry: Optional[str] = None) -> Optional[ChainSnapshot]:
+        """Latest in-process snapshot for this chain, or None (→ SQLite path)."""
+        if self.source == "sqlite":
+            return None
+        return get_snapshot_bus().get(self.exchange, self.symbol, expiry)
+
+    def _row_source(
+        self, expiry: Optional[str] = None
+    ) -> Tuple[Optional[ChainSnapshot], Optional[sqlite3.Connection]]:
+        """
+        Where this chain's rows come from: ``(snapshot, None)`` when the bus
+        has it, ``(None, conn)`` for the SQLite mirror, ``(None, None)`` when
+        neither is available.
+        """
+        snap = self._get_snapshot(expiry)
+        if snap is not None:
+            return snap, None
+        return None, self._get_connection(expiry)
+
     def _get_connection(self, expiry: Optional[str] = None) -> Optional[sqlite3.Connection]:
-        key = expiry or "default"
-        # Resolve the expected database path
-        path = self._resolve_db_path(expiry)
-        if not path:
+        """
+        Persistent read-only WAL connection for this chain.
+
+        The supervisor rewrites the chain in place every second, so file
+        mtime is useless as a cache key. The connection stays open; new
+        snapshots are detected with PRAGMA data_version and validation
+        (tables present, rows > 0) only runs when a file is first opened.
+        The connection is only replaced if the file itself was deleted and
+        recreated (chain restart / expiry cleanup), detected by inode, or if
+        no write was seen for max_stale_seconds.
+
+        The path is resolved (a directory glob when expiry is None) only
+        when a connection is opened; the default expiry is re-resolved
+        once a day.
+
+        Callers run their queries under ``_conn_lock`` (see ``_serialized``).
+        """
+        if self.source == "bus":
+            # Bus-only readers never touch SQLite.
             return None
+        key = expiry or "default"
+        with self._conn_lock:
+            return self._get_connection_locked(key, expiry)
 
-        # Check if we have a cached connection for this key with the same path
-        if key in self._conn_info:
-            info = self._conn_info[key]
-            if info['path'] == path:
-                # Same path – check if file modification time changed
-                try:
-                    current_mtime = Path(path).stat().st_mtime
-                    if current_mtime == info['mtime']:
-                        # Also verify connection is alive
-                        info['conn'].execute("SELECT 1")
-                        return info['conn']
-                except Exception:
-                    # File missing, stat error, or connection dead – will close and reopen
-                    pass
-            # If we reach here, the cached connection is stale – close it
+    def _get_connection_locked(self, key: str, expiry: Optional[str]) -> Optional[sqlite3.Connection]:
+        info = self._conn_info.get(key)
+        if info is not None:
             try:
-                info['conn'].close()
+                # Also proves the connection is alive
+                version = info['conn'].execute("PRAGMA data_version").fetchone()[0]
+                now = time.monotonic()
+                if version != info['data_version']:
+                    info['data_version'] = version
+                    info['changed_at'] = now
+                    self._conn_stats["snapshot_changes"] += 1
+                    # Only the live file sees new writes: no stat needed
+                    same_file = True
+                else:
+                    same_file = os.stat(info['path']).st_ino == info['ino']
+                if expiry is None and info['resolved_on'] != date.today():
+                    same_file = False  # nearest expiry may have rolled
+                # No writes for a long time: the file may have been
+                # recreated with a recycled inode — reopen to be sure.
+                if same_file and now - info['changed_at'] <= self.max_stale_seconds:
+                    self._conn_stats["reuses"] += 1
+                    return info['conn']
             except Exception:
+                # File missing, stat error, or connection dead – will close and reopen
                 pass
-            del self._conn_info[key]
+            self._conn_stats["reopens"] += 1
+            self._close_connection(key)
+
+        # Resolve the expected database path
+        path = self._resolve_db_path(expiry)
+        if not path:
+            return None
 
         # Open a new connection
         path_obj = Path(path)
-        if not path_obj.exists() or path_obj.stat().st_size < 1024:
+        try:
+            st = path_obj.stat()
+        except OSError:
+            st = None
+        if st is None or st.st_size < 1024:
             logger.error(f"DB file missing or too small: {path}")
             return None
 
         try:
             uri = f"file:{path}?mode=ro"
-            conn = sqlite3.connect(uri, uri=True, timeout=5)
+            conn = sqlite3.connect(uri, uri=True, timeout=5, check_same_thread=False)
             conn.row_factory = sqlite3.Row
 
             tables = conn.execute(
@@ -203,31 +452,43 @@ class MarketReader:
                 conn.close()
                 return None
 
-            # Get file modification time
-            mtime = path_obj.stat().st_mtime
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            self._conn_stats["opens"] += 1
 
             logger.info(f"Connected to DB: {path_obj.name} ({row_count} rows)")
-            self._conn_info[key] = {'conn': conn, 'path': path, 'mtime': mtime}
+            self._conn_info[key] = {
+                'conn': conn, 'path': path, 'ino': st.st_ino,
+                'data_version': version, 'changed_at': time.monotonic(),
+                'resolved_on': date.today(),
+            }
             return conn
         except Exception as e:
             logger.error(f"Connection failed: {path} | {e}")
             return None
 
+    def get_connection_stats(self) -> Dict[str, int]:
+        """Open/reuse counters for this reader's SQLite connections."""
+        with self._conn_lock:
+            return dict(self._conn_stats, open_connections=len(self._conn_info))
+
     def _close_connection(self, key: str):
-        if key in self._conn_info:
+        with self._conn_lock:
+            info = self._conn_info.pop(key, None)
+        if info is not None:
             try:
-                self._conn_info[key]['conn'].close()
+                info['conn'].close()
             except Exception:
                 pass
-            del self._conn_info[key]
 
     def close_all(self):
-        for key in list(self._conn_info.keys()):
-            self._close_connection(key)
+        with self._conn_lock:
+            for key in list(self._conn_info.keys()):
+                self._close_connection(key)
 
     def __del__(self):
         self.close_all()
 
+    @_serialized
     def _get_strike_step(self, expiry: Optional[str] = None) -> float:
         """
         Determine the strike price step (minimum difference between consecutive strikes)
@@ -237,15 +498,18 @@ class MarketReader:
         if key in self._strike_step_cache:
             return self._strike_step_cache[key]
 
-        conn = self._get_connection(expiry)
-        if not conn:
+        snap, conn = self._row_source(expiry)
+        if snap is None and not conn:
             return 50.0  # fallback
-        assert conn is not None  # for type checker
 
         try:
-            cur = conn.cursor()
-            cur.execute("SELECT DISTINCT strike FROM option_chain ORDER BY strike")
-            strikes = [row[0] for row in cur.fetchall()]
+            if snap is not None:
+                strikes = np.unique(snap.column("strike")).tolist()
+            else:
+                assert conn is not None  # for type checker
+                cur = conn.cursor()
+                cur.execute("SELECT DISTINCT strike FROM option_chain ORDER BY strike")
+                strikes = [row[0] for row in cur.fetchall()]
             if len(strikes) < 2:
                 return 50.0
 
@@ -286,11 +550,13 @@ class MarketReader:
     # ----------------------------------------------------------------------
     # Public data retrieval methods (with optional expiry)
     # ----------------------------------------------------------------------
+    @_serialized
     def get_meta(self, expiry: Optional[str] = None) -> Dict[str, str]:
-        conn = self._get_connection(expiry)
+        snap, conn = self._row_source(expiry)
+        if snap is not None:
+            return dict(snap.meta)
         if not conn:
             return {}
-        assert conn is not None
         try:
             cur = conn.cursor()
             cur.execute("SELECT key, value FROM meta")
@@ -328,16 +594,17 @@ class MarketReader:
         except (ValueError, TypeError):
             return 99999.0
 
+    @_serialized
     def get_lot_size(self, expiry: Optional[str] = None) -> int:
-        conn = self._get_connection(expiry)
-        if not conn:
-            conn_lot = None
-        else:
-            conn_lot = conn
-        if conn_lot:
-            assert conn_lot is not None
+        snap, conn = self._row_source(expiry)
+        if snap is not None:
+            lots = snap.column("lot_size")
+            valid = lots[~np.isnan(lots)]
+            if len(valid) and valid[0]:
+                return int(valid[0])
+        if conn:
             try:
-                cur = conn_lot.cursor()
+                cur = conn.cursor()
                 cur.execute("SELECT lot_size FROM option_chain WHERE lot_size IS NOT NULL LIMIT 1")
                 row = cur.fetchone()
                 if row and row["lot_size"]:
@@ -372,12 +639,16 @@ class MarketReader:
         # Final static fallback.
         return DEFAULT_LOT_SIZES.get(self.symbol, 1)
 
+    @_serialized
     def get_full_chain(self, expiry: Optional[str] = None) -> List[Dict[str, Any]]:
         self._check_freshness(expiry)   # optional safety
-        conn = self._get_connection(expiry)
+        snap, conn = self._row_source(expiry)
+        if snap is not None:
+            idx = np.flatnonzero(snap.column("ltp") > 0)
+            order = np.lexsort((snap.column("option_type")[idx].astype(str), snap.column("strike")[idx]))
+            return snap.rows(idx[order])
         if not conn:
             return []
-        assert conn is not None
         try:
             cur = conn.cursor()
             cur.execute("SELECT * FROM option_chain WHERE ltp > 0 ORDER BY strike, option_type")
@@ -386,16 +657,18 @@ class MarketReader:
             logger.error(f"get_full_chain error: {e}")
             return []
 
+    @_serialized
     def get_option_at_strike(
         self, strike: float, option_type: Union[str, OptionType], expiry: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         self._check_freshness(expiry)
         if isinstance(option_type, OptionType):
             option_type = option_type.value
-        conn = self._get_connection(expiry)
+        snap, conn = self._row_source(expiry)
+        if snap is not None:
+            return snap.get_row(strike, option_type)
         if not conn:
             return None
-        assert conn is not None
         try:
             cur = conn.cursor()
             cur.execute(
@@ -408,6 +681,7 @@ class MarketReader:
             logger.error(f"get_option_at_strike error: {e}")
             return None
 
+    @_serialized
     def find_option_by_delta(
         self,
         option_type: Union[str, OptionType],
@@ -429,43 +703,53 @@ class MarketReader:
         self._check_freshness(expiry)
         if isinstance(option_type, OptionType):
             option_type = option_type.value
-        conn = self._get_connection(expiry)
-        if not conn:
+        snap, conn = self._row_source(expiry)
+        if snap is None and not conn:
             return None
-        assert conn is not None
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT * FROM option_chain
-                WHERE option_type = ?
-                  AND delta IS NOT NULL
-                  AND ltp > 0
-                  AND ABS(ABS(delta) - ?) <= ?
-                ORDER BY ABS(ABS(delta) - ?) ASC
-                LIMIT 1
-            """, (option_type.upper(), target_delta, tolerance, target_delta))
-            row = cur.fetchone()
-            if row:
-                return dict(row)
 
-            # Fallback: if strict tolerance has no hit, choose nearest available
-            # non-null delta — but enforce a hard maximum deviation to prevent
-            # entering positions with wildly wrong risk profiles (e.g. on gap days
-            # where the option chain is truncated).
-            MAX_DELTA_FALLBACK = 0.15  # never accept delta off by more than 0.15 from target
-            cur.execute(
-                """
-                SELECT * FROM option_chain
-                WHERE option_type = ?
-                  AND delta IS NOT NULL
-                  AND ltp > 0
-                  AND ABS(ABS(delta) - ?) <= ?
-                ORDER BY ABS(ABS(delta) - ?) ASC
-                LIMIT 1
-                """,
-                (option_type.upper(), target_delta, MAX_DELTA_FALLBACK, target_delta),
-            )
-            row = cur.fetchone()
+        # Fallback: if strict tolerance has no hit, choose nearest available
+        # non-null delta — but enforce a hard maximum deviation to prevent
+        # entering positions with wildly wrong risk profiles (e.g. on gap days
+        # where the option chain is truncated).
+        MAX_DELTA_FALLBACK = 0.15  # never accept delta off by more than 0.15 from target
+        try:
+            if snap is not None:
+                values = np.abs(snap.column("delta"))
+                mask = snap.type_mask(option_type) & (snap.column("ltp") > 0)
+                i = snap.nearest(values, target_delta, mask, tolerance)
+                if i is not None:
+                    return snap.row(i)
+                i = snap.nearest(values, target_delta, mask, MAX_DELTA_FALLBACK)
+                row = snap.row(i) if i is not None else None
+            else:
+                assert conn is not None
+                cur = conn.cursor()
+                cur.execute("""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ?
+                      AND delta IS NOT NULL
+                      AND ltp > 0
+                      AND ABS(ABS(delta) - ?) <= ?
+                    ORDER BY ABS(ABS(delta) - ?) ASC
+                    LIMIT 1
+                """, (option_type.upper(), target_delta, tolerance, target_delta))
+                row = cur.fetchone()
+                if row:
+                    return dict(row)
+
+                cur.execute(
+                    """
+                    SELECT * FROM option_chain
+                    WHERE option_type = ?
+                      AND delta IS NOT NULL
+                      AND ltp > 0
+                      AND ABS(ABS(delta) - ?) <= ?
+                    ORDER BY ABS(ABS(delta) - ?) ASC
+                    LIMIT 1
+                    """,
+                    (option_type.upper(), target_delta, MAX_DELTA_FALLBACK, target_delta),
+                )
+                row = cur.fetchone()
             if row:
                 best = dict(row)
                 logger.warning(
@@ -491,6 +775,7 @@ class MarketReader:
             logger.error(f"find_option_by_delta error: {e}")
             return None
 
+    @_serialized
     def find_straddle_strike_by_delta(
         self,
         option_type: Union[str, OptionType],
@@ -515,25 +800,33 @@ class MarketReader:
         else:
             opt_type = option_type.upper()
 
-        conn = self._get_connection(expiry)
-        if not conn:
+        snap, conn = self._row_source(expiry)
+        if snap is None and not conn:
             return None
 
         try:
-            cur = conn.cursor()
-            # Step 1: Fetch CE rows with delta
-            cur.execute("""
-                SELECT strike, delta FROM option_chain
-                WHERE option_type = 'CE' AND delta IS NOT NULL AND ltp > 0
-            """)
-            ce_map = {row["strike"]: row["delta"] for row in cur.fetchall()}
-
-            # Step 2: Fetch PE rows with delta
-            cur.execute("""
-                SELECT strike, delta FROM option_chain
-                WHERE option_type = 'PE' AND delta IS NOT NULL AND ltp > 0
-            """)
-            pe_map = {row["strike"]: row["delta"] for row in cur.fetchall()}
+            if snap is not None:
+                # Step 1/2: CE and PE rows with delta
+                strikes = snap.column("strike")
+                deltas = snap.column("delta")
+                live = ~np.isnan(deltas) & (snap.column("ltp") > 0)
+                ce_map = {float(strikes[i]): float(deltas[i]) for i in np.flatnonzero(live & snap.type_mask("CE"))}
+                pe_map = {float(strikes[i]): float(deltas[i]) for i in np.flatnonzero(live & snap.type_mask("PE"))}
+            else:
+                cur = conn.cursor()
+                # Step 1: Fetch CE rows with delta
+                cur.execute("""
+                    SELECT strike, delta FROM option_chain
+                    WHERE option_type = 'CE' AND delta IS NOT NULL AND ltp > 0
+                """)
+                ce_map = {row["strike"]: row["delta"] for row in cur.fetchall()}
+
+                # Step 2: Fetch PE rows with delta
+                cur.execute("""
+                    SELECT strike, delta FROM option_chain
+                    WHERE option_type = 'PE' AND delta IS NOT NULL AND ltp > 0
+                """)
+                pe_map = {row["strike"]: row["delta"] for row in cur.fetchall()}
 
             # Step 3: Find strikes present in both
             common_strikes = set(ce_map.keys()) & set(pe_map.keys())
@@ -568,6 +861,9 @@ class MarketReader:
             )
 
             # Step 5: Fetch full option data for the requested type at that strike
+            if snap is not None:
+                # best_strike is in both maps → delta present and ltp > 0
+                return snap.get_row(best_strike, opt_type)
             cur.execute("""
                 SELECT * FROM option_chain
                 WHERE strike = ? AND option_type = ? AND delta IS NOT NULL AND ltp > 0
@@ -579,6 +875,7 @@ class MarketReader:
             logger.error(f"find_straddle_strike_by_delta error: {e}")
             return None
 
+    @_serialized
     def find_option_by_premium(
         self,
         option_type: Union[str, OptionType],
@@ -589,32 +886,42 @@ class MarketReader:
         self._check_freshness(expiry)
         if isinstance(option_type, OptionType):
             option_type = option_type.value
-        conn = self._get_connection(expiry)
-        if not conn:
+        snap, conn = self._row_source(expiry)
+        if snap is None and not conn:
             return None
-        assert conn is not None
         try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT * FROM option_chain
-                WHERE option_type = ?
-                  AND ltp > 0
-                  AND ABS(ltp - ?) <= ?
-                ORDER BY ABS(ltp - ?) ASC
-                LIMIT 1
-            """, (option_type.upper(), target_premium, tolerance, target_premium))
-            row = cur.fetchone()
-            if row:
-                return dict(row)
-
-            # Fallback: nearest premium without tolerance filter
-            cur.execute("""
-                SELECT * FROM option_chain
-                WHERE option_type = ? AND ltp > 0
-                ORDER BY ABS(ltp - ?) ASC
-                LIMIT 1
-            """, (option_type.upper(), target_premium))
-            row = cur.fetchone()
+            if snap is not None:
+                ltp = snap.column("ltp")
+                mask = snap.type_mask(option_type) & (ltp > 0)
+                i = snap.nearest(ltp, target_premium, mask, tolerance)
+                if i is not None:
+                    return snap.row(i)
+                # Fallback: nearest premium without tolerance filter
+                i = snap.nearest(ltp, target_premium, mask)
+                row = snap.row(i) if i is not None else None
+            else:
+                assert conn is not None
+                cur = conn.cursor()
+                cur.execute("""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ?
+                      AND ltp > 0
+                      AND ABS(ltp - ?) <= ?
+                    ORDER BY ABS(ltp - ?) ASC
+                    LIMIT 1
+                """, (option_type.upper(), target_premium, tolerance, target_premium))
+                row = cur.fetchone()
+                if row:
+                    return dict(row)
+
+                # Fallback: nearest premium without tolerance filter
+                cur.execute("""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ? AND ltp > 0
+                    ORDER BY ABS(ltp - ?) ASC
+                    LIMIT 1
+                """, (option_type.upper(), target_premium))
+                row = cur.fetchone()
             if row:
                 best = dict(row)
                 logger.warning(
@@ -629,6 +936,7 @@ class MarketReader:
             logger.error(f"find_option_by_premium error: {e}")
             return None
 
+    @_serialized
     def find_option_by_iv(
         self,
         option_type: Union[str, OptionType],
@@ -639,33 +947,43 @@ class MarketReader:
         self._check_freshness(expiry)
         if isinstance(option_type, OptionType):
             option_type = option_type.value
-        conn = self._get_connection(expiry)
-        if not conn:
+        snap, conn = self._row_source(expiry)
+        if snap is None and not conn:
             return None
-        assert conn is not None
         try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT * FROM option_chain
-                WHERE option_type = ?
-                  AND iv IS NOT NULL AND iv > 0
-                  AND ltp > 0
-                  AND ABS(iv - ?) <= ?
-                ORDER BY ABS(iv - ?) ASC
-                LIMIT 1
-            """, (option_type.upper(), target_iv, tolerance, target_iv))
-            row = cur.fetchone()
-            if row:
-                return dict(row)
-
-            # Fallback: nearest IV without tolerance filter
-            cur.execute("""
-                SELECT * FROM option_chain
-                WHERE option_type = ? AND iv IS NOT NULL AND iv > 0 AND ltp > 0
-                ORDER BY ABS(iv - ?) ASC
-                LIMIT 1
-            """, (option_type.upper(), target_iv))
-            row = cur.fetchone()
+            if snap is not None:
+                iv = snap.column("iv")
+                mask = snap.type_mask(option_type) & (iv > 0) & (snap.column("ltp") > 0)
+                i = snap.nearest(iv, target_iv, mask, tolerance)
+                if i is not None:
+                    return snap.row(i)
+                # Fallback: nearest IV without tolerance filter
+                i = snap.nearest(iv, target_iv, mask)
+                row = snap.row(i) if i is not None else None
+            else:
+                assert conn is not None
+                cur = conn.cursor()
+                cur.execute("""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ?
+                      AND iv IS NOT NULL AND iv > 0
+                      AND ltp > 0
+                      AND ABS(iv - ?) <= ?
+                    ORDER BY ABS(iv - ?) ASC
+                    LIMIT 1
+                """, (option_type.upper(), target_iv, tolerance, target_iv))
+                row = cur.fetchone()
+                if row:
+                    return dict(row)
+
+                # Fallback: nearest IV without tolerance filter
+                cur.execute("""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ? AND iv IS NOT NULL AND iv > 0 AND ltp > 0
+                    ORDER BY ABS(iv - ?) ASC
+                    LIMIT 1
+                """, (option_type.upper(), target_iv))
+                row = cur.fetchone()
             if row:
                 best = dict(row)
                 logger.warning(
@@ -680,6 +998,7 @@ class MarketReader:
             logger.error(f"find_option_by_iv error: {e}")
             return None
 
+    @_serialized
     def find_option_by_criteria(
         self,
         option_type: Union[str, OptionType],
@@ -700,41 +1019,53 @@ class MarketReader:
             raise ValueError(f"Unsupported attribute for match: {target_attr}")
 
         sql_expr = MATCH_PARAM_TO_SQL[target_attr]
-        conn = self._get_connection(expiry)
-        if not conn:
+        snap, conn = self._row_source(expiry)
+        if snap is None and not conn:
             return None
-        assert conn is not None
+        # Fallback: nearest match with a hard max deviation limit.
+        # Prevents entering positions with wildly wrong attributes on
+        # truncated/stale chains.
+        max_fallback = _adaptive_tolerance(target_attr, target_value)
         try:
-            cur = conn.cursor()
-            # Safe because sql_expr comes from our controlled mapping
-            query = f"""
-                SELECT * FROM option_chain
-                WHERE option_type = ?
-                  AND ltp > 0
-                  AND ABS({sql_expr} - ?) <= ?
-                ORDER BY ABS({sql_expr} - ?) ASC
-                LIMIT 1
-            """
-            cur.execute(query, (option_type.upper(), target_value, tolerance, target_value))
-            row = cur.fetchone()
-            if row:
-                return dict(row)
-
-            # Fallback: nearest match with a hard max deviation limit.
-            # Prevents entering positions with wildly wrong attributes on
-            # truncated/stale chains.
-            max_fallback = _adaptive_tolerance(target_attr, target_value)
-            fallback_query = f"""
-                SELECT * FROM option_chain
-                WHERE option_type = ?
-                  AND {sql_expr} IS NOT NULL
-                  AND ltp > 0
-                  AND ABS({sql_expr} - ?) <= ?
-                ORDER BY ABS({sql_expr} - ?) ASC
-                LIMIT 1
-            """
-            cur.execute(fallback_query, (option_type.upper(), target_value, max_fallback, target_value))
-            row = cur.fetchone()
+            if snap is not None:
+                column, take_abs = MATCH_PARAM_TO_COLUMN[target_attr]
+                values = snap.column(column)
+                if take_abs:
+                    values = np.abs(values)
+                mask = snap.type_mask(option_type) & (snap.column("ltp") > 0)
+                i = snap.nearest(values, target_value, mask, tolerance)
+                if i is not None:
+                    return snap.row(i)
+                i = snap.nearest(values, target_value, mask, max_fallback)
+                row = snap.row(i) if i is not None else None
+            else:
+                assert conn is not None
+                cur = conn.cursor()
+                # Safe because sql_expr comes from our controlled mapping
+                query = f"""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ?
+                      AND ltp > 0
+                      AND ABS({sql_expr} - ?) <= ?
+                    ORDER BY ABS({sql_expr} - ?) ASC
+                    LIMIT 1
+                """
+                cur.execute(query, (option_type.upper(), target_value, tolerance, target_value))
+                row = cur.fetchone()
+                if row:
+                    return dict(row)
+
+                fallback_query = f"""
+                    SELECT * FROM option_chain
+                    WHERE option_type = ?
+                      AND {sql_expr} IS NOT NULL
+                      AND ltp > 0
+                      AND ABS({sql_expr} - ?) <= ?
+                    ORDER BY ABS({sql_expr} - ?) ASC
+                    LIMIT 1
+                """
+                cur.execute(fallback_query, (option_type.upper(), target_value, max_fallback, target_value))
+                row = cur.fetchone()
             if row:
                 best = dict(row)
                 logger.warning(
@@ -1009,51 +1340,105 @@ class MarketReader:
             raise ValueError(f"Internal error: opt_data not assigned for strike {strike}")
         return strike, opt_data
 
-    def get_max_pain_strike(self, expiry: Optional[str] = None) -> float:
+    @_serialized
+    def _chain_aggregates(self, expiry: Optional[str] = None) -> Optional[Dict[str, float]]:
         """
-        Compute max-pain strike (minimum aggregate option writer payout at expiry).
+        Aggregates for the current snapshot of this chain (see
+        compute_chain_aggregates), shared across readers via a module cache
+        keyed by (chain, snapshot). None when no data source is available.
         """
-        self._check_freshness(expiry)
-        conn = self._get_connection(expiry)
+        snap, conn = self._row_source(expiry)
+        if snap is not None:
+            return self._bus_aggregates(snap)
         if not conn:
-            return 0.0
-        assert conn is not None
+            return None
+        # One read transaction: the snapshot_ts cache key and the rows it
+        # labels come from the same write
+        conn.execute("BEGIN")
         try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT strike, option_type, oi
-                FROM option_chain
-                WHERE strike IS NOT NULL AND option_type IN ('CE','PE')
-                """
+            meta = {
+                r["key"]: r["value"]
+                for r in conn.execute("SELECT key, value FROM meta").fetchall()
+            }
+            return self._cached_aggregates(
+                self._sqlite_aggregates_key(expiry, meta),
+                lambda: self._rows_aggregates(
+                    conn.execute(
+                        """
+                        SELECT strike, option_type, oi, volume
+                        FROM option_chain
+                        WHERE option_type IN ('CE','PE')
+                        """
+                    ).fetchall(),
+                    meta,
+                ),
             )
-            rows = cur.fetchall()
-            if not rows:
-                return 0.0
+        finally:
+            conn.execute("COMMIT")
+
+    def _sqlite_aggregates_key(self, expiry: Optional[str], meta: Mapping[str, Any]) -> Optional[tuple]:
+        info = self._conn_info.get(expiry or "default", {})
+        ts = meta.get("snapshot_ts")
+        return ("sqlite", info.get("path"), ts) if ts else None
+
+    def _bus_aggregates(self, snap: ChainSnapshot) -> Dict[str, float]:
+        return self._cached_aggregates(
+            ("bus", snap.key, snap.version),
+            lambda: compute_chain_aggregates(
+                snap.column("strike"),
+                snap.column("option_type"),
+                snap.column("oi"),
+                snap.column("volume"),
+                atm=float(snap.meta.get("atm") or 0.0),
+            ),
+        )
+
+    @staticmethod
+    def _rows_aggregates(rows: Sequence[Mapping[str, Any]], meta: Mapping[str, Any]) -> Dict[str, float]:
+        """Aggregates over SQLite option rows (CE / PE only)."""
+        rows = [r for r in rows if r["option_type"] in ("CE", "PE")]
+        try:
+            atm = float(meta.get("atm", 0) or 0)
+        except (ValueError, TypeError):
+            atm = 0.0
+        return compute_chain_aggregates(
+            np.array([r["strike"] for r in rows], dtype=np.float64),
+            np.array([r["option_type"] for r in rows], dtype=object),
+            np.array([r["oi"] for r in rows], dtype=np.float64),
+            np.array([r["volume"] for r in rows], dtype=np.float64),
+            atm=atm,
+        )
+
+    @staticmethod
+    def _cached_aggregates(
+        cache_key: Optional[tuple], compute: Callable[[], Dict[str, float]]
+    ) -> Dict[str, float]:
+        if cache_key is not None:
+            with _agg_cache_lock:
+                cached = _agg_cache.get(cache_key)
+                if cached is not None:
+                    _agg_cache.move_to_end(cache_key)
+                    _agg_stats["hits"] += 1
+                    return cached
+
+        aggregates = compute()
+
+        with _agg_cache_lock:
+            _agg_stats["misses"] += 1
+            if cache_key is not None:
+                _agg_cache[cache_key] = aggregates
+                while len(_agg_cache) > _AGG_CACHE_SIZE:
+                    _agg_cache.popitem(last=False)
+        return aggregates
 
-            strikes: List[float] = sorted({float(r["strike"]) for r in rows if r["strike"] is not None})
-            ce_oi: Dict[float, float] = {}
-            pe_oi: Dict[float, float] = {}
-            for r in rows:
-                k = float(r["strike"])
-                oi = float(r["oi"] or 0.0)
-                if r["option_type"] == "CE":
-                    ce_oi[k] = ce_oi.get(k, 0.0) + oi
-                else:
-                    pe_oi[k] = pe_oi.get(k, 0.0) + oi
-
-            best_strike = 0.0
-            best_pain = float("inf")
-            for s in strikes:
-                pain = 0.0
-                for k, oi in ce_oi.items():
-                    pain += max(0.0, s - k) * oi
-                for k, oi in pe_oi.items():
-                    pain += max(0.0, k - s) * oi
-                if pain < best_pain:
-                    best_pain = pain
-                    best_strike = s
-            return best_strike
+    def get_max_pain_strike(self, expiry: Optional[str] = None) -> float:
+        """
+        Compute max-pain strike (minimum aggregate option writer payout at expiry).
+        """
+        self._check_freshness(expiry)
+        try:
+            agg = self._chain_aggregates(expiry)
+            return agg["max_pain_strike"] if agg else 0.0
         except Exception as e:
             logger.error(f"get_max_pain_strike error: {e}")
             return 0.0
@@ -1063,42 +1448,9 @@ class MarketReader:
         Find strike where PCR (PE_OI / CE_OI) is closest to 1, preferring near-ATM.
         """
         self._check_freshness(expiry)
-        conn = self._get_connection(expiry)
-        if not conn:
-            return 0.0
-        assert conn is not None
         try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT strike,
-                       SUM(CASE WHEN option_type='CE' THEN COALESCE(oi,0) ELSE 0 END) AS ce_oi,
-                       SUM(CASE WHEN option_type='PE' THEN COALESCE(oi,0) ELSE 0 END) AS pe_oi
-                FROM option_chain
-                WHERE strike IS NOT NULL
-                GROUP BY strike
-                """
-            )
-            rows = cur.fetchall()
-            if not rows:
-                return 0.0
-            atm = self.get_atm_strike(expiry)
-            best_strike = 0.0
-            best_score = float("inf")
-            for r in rows:
-                strike = float(r["strike"])
-                ce_oi = float(r["ce_oi"] or 0.0)
-                pe_oi = float(r["pe_oi"] or 0.0)
-                if ce_oi <= 0:
-                    continue
-                pcr = pe_oi / ce_oi
-                score = abs(pcr - 1.0) + (abs(strike - atm) / max(1.0, atm))
-                if score < best_score:
-                    best_score = score
-                    best_strike = strike
-            if best_strike > 0:
-                return best_strike
-            return atm
+            agg = self._chain_aggregates(expiry)
+            return agg["pcr_inflection_strike"] if agg else 0.0
         except Exception as e:
             logger.error(f"get_pcr_inflection_strike error: {e}")
             return 0.0
@@ -1106,50 +1458,36 @@ class MarketReader:
     def get_chain_metrics(self, expiry: Optional[str] = None) -> Dict[str, float]:
         """
         Return chain-level aggregate metrics used by strategy conditions.
+
+        Totals, PCR and max pain come from the shared per-snapshot
+        aggregates; OI buildup is relative to this reader's previous call.
         """
         self._check_freshness(expiry)
-        conn = self._get_connection(expiry)
-        if not conn:
-            return {
-                "pcr": 0.0,
-                "pcr_volume": 0.0,
-                "total_oi_ce": 0.0,
-                "total_oi_pe": 0.0,
-                "oi_buildup_ce": 0.0,
-                "oi_buildup_pe": 0.0,
-                "max_pain_strike": 0.0,
-            }
-        assert conn is not None
+        return self._chain_metrics(expiry)
+
+    def _chain_metrics(
+        self, expiry: Optional[str] = None, agg: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """Metrics from ``agg`` (aggregates already read) or a fresh read."""
+        empty = {
+            "pcr": 0.0,
+            "pcr_volume": 0.0,
+            "total_oi_ce": 0.0,
+            "total_oi_pe": 0.0,
+            "prev_total_oi_ce": 0.0,
+            "prev_total_oi_pe": 0.0,
+            "oi_buildup_ce": 0.0,
+            "oi_buildup_pe": 0.0,
+            "max_pain_strike": 0.0,
+        }
         try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT
-                  SUM(CASE WHEN option_type='CE' THEN COALESCE(oi,0) ELSE 0 END) AS ce_oi,
-                  SUM(CASE WHEN option_type='PE' THEN COALESCE(oi,0) ELSE 0 END) AS pe_oi,
-                  SUM(CASE WHEN option_type='CE' THEN COALESCE(volume,0) ELSE 0 END) AS ce_vol,
-                  SUM(CASE WHEN option_type='PE' THEN COALESCE(volume,0) ELSE 0 END) AS pe_vol
-                FROM option_chain
-                """
-            )
-            row = cur.fetchone()
-            if not row:
-                return {
-                    "pcr": 0.0,
-                    "pcr_volume": 0.0,
-                    "total_oi_ce": 0.0,
-                    "total_oi_pe": 0.0,
-                    "oi_buildup_ce": 0.0,
-                    "oi_buildup_pe": 0.0,
-                    "max_pain_strike": 0.0,
-                    "prev_total_oi_ce": 0.0,
-                    "prev_total_oi_pe": 0.0,
-                }
-
-            ce_oi = float(row["ce_oi"] or 0.0)
-            pe_oi = float(row["pe_oi"] or 0.0)
-            ce_vol = float(row["ce_vol"] or 0.0)
-            pe_vol = float(row["pe_vol"] or 0.0)
+            if agg is None:
+                agg = self._chain_aggregates(expiry)
+            if not agg:
+                return empty
+
+            ce_oi = agg["total_oi_ce"]
+            pe_oi = agg["total_oi_pe"]
 
             # Use a safe key: if expiry is None, store under "default"
             cache_key = expiry if expiry is not None else "default"
@@ -1158,39 +1496,138 @@ class MarketReader:
             oi_buildup_pe = pe_oi - prev.get('PE', pe_oi)
             self._prev_total_oi[cache_key] = {'CE': ce_oi, 'PE': pe_oi}
 
-            pcr = (pe_oi / ce_oi) if ce_oi > 0 else 0.0
-            pcr_volume = (pe_vol / ce_vol) if ce_vol > 0 else 0.0
-
             return {
-                "pcr": pcr,
-                "pcr_volume": pcr_volume,
+                "pcr": agg["pcr"],
+                "pcr_volume": agg["pcr_volume"],
                 "total_oi_ce": ce_oi,
                 "total_oi_pe": pe_oi,
                 "prev_total_oi_ce": prev.get('CE', ce_oi),
                 "prev_total_oi_pe": prev.get('PE', pe_oi),
                 "oi_buildup_ce": oi_buildup_ce,
                 "oi_buildup_pe": oi_buildup_pe,
-                "max_pain_strike": self.get_max_pain_strike(expiry),
+                "max_pain_strike": agg["max_pain_strike"],
             }
         except Exception as e:
             logger.error(f"get_chain_metrics error: {e}")
-            return {
-                "pcr": 0.0,
-                "pcr_volume": 0.0,
-                "total_oi_ce": 0.0,
-                "total_oi_pe": 0.0,
-                "prev_total_oi_ce": 0.0,
-                "prev_total_oi_pe": 0.0,
-                "oi_buildup_ce": 0.0,
-                "oi_buildup_pe": 0.0,
-                "max_pain_strike": 0.0,
-            }
+            return empty
+
+    @_serialized
+    def build_market_snapshot(self, expiry: Optional[str] = None) -> Optional[MarketSnapshot]:
+        """
+        One consistent MarketSnapshot of this chain: a single freshness
+        check, one meta read and one pass over the option rows.
+        Returns None when no data source is available.
+        """
+        self._check_freshness(expiry)
+
+        def _num(meta: Mapping[str, Any], name: str) -> float:
+            try:
+                return float(meta.get(name, 0) or 0)
+            except (ValueError, TypeError):
+                return 0.0
+
+        snap, conn = self._row_source(expiry)
+        rows: Dict[Tuple[float, str], Mapping[str, Any]] = {}
+        agg: Optional[Dict[str, float]] = None
+        if snap is not None:
+            meta: Mapping[str, Any] = snap.meta
+            try:
+                agg = self._bus_aggregates(snap)
+            except Exception as e:
+                logger.error(f"build_market_snapshot aggregates error: {e}")
+        else:
+            if not conn:
+                return None
+            try:
+                # One read transaction: meta, rows and the chain metrics
+                # derived from them all come from the same write
+                conn.execute("BEGIN")
+                try:
+                    meta = {
+                        r["key"]: r["value"]
+                        for r in conn.execute("SELECT key, value FROM meta").fetchall()
+                    }
+                    raw = conn.execute("SELECT * FROM option_chain").fetchall()
+                    for r in raw:
+                        if r["strike"] is None or r["option_type"] is None:
+                            continue
+                        k = (float(r["strike"]), str(r["option_type"]).upper())
+                        if k not in rows:
+                            rows[k] = MappingProxyType(dict(r))
+                    try:
+                        agg = self._cached_aggregates(
+                            self._sqlite_aggregates_key(expiry, meta),
+                            lambda: self._rows_aggregates(raw, meta),
+                        )
+                    except Exception as e:
+                        logger.error(f"build_market_snapshot aggregates error: {e}")
+                finally:
+                    conn.execute("COMMIT")
+            except Exception as e:
+                logger.error(f"build_market_snapshot error: {e}")
+                return None
+
+        return MarketSnapshot(
+            exchange=self.exchange,
+            symbol=self.symbol,
+            expiry=expiry,
+            built_at=time.time(),
+            spot_price=_num(meta, "spot_ltp"),
+            atm_strike=_num(meta, "atm"),
+            fut_ltp=_num(meta, "fut_ltp"),
+            chain_metrics=MappingProxyType(self._chain_metrics(expiry, agg or {})),
+            rows=MappingProxyType(rows),
+            chain=snap,
+        )
+
+    def _today(self) -> date:
+        """Trading date used for expiry resolution (replay overrides)."""
+        return date.today()
+
+    def _available_expiries(self, error: type = ValueError) -> List[Tuple[date, str]]:
+        """
+        Sorted (date, "DD-MMM-YYYY") expiries this reader can serve: chains
+        published on the snapshot bus (unless source is "sqlite") plus chain
+        DBs in DB_FOLDER (unless source is "bus"), so expiry modes resolve in
+        bus-only mode and with the SQLite mirror switched off.
+        Raises ``error`` when none can be found.
+        """
+        found: Dict[str, date] = {}
+
+        if self.source != "sqlite":
+            prefix = f"{self.exchange}:{self.symbol}:"
+            for key in get_snapshot_bus().keys():
+                if not key.startswith(prefix):
+                    continue
+                date_str = key[len(prefix):]
+                try:
+                    found[date_str] = datetime.strptime(date_str, "%d-%b-%Y").date()
+                except ValueError:
+                    continue
+
+        if self.source != "bus" and DB_FOLDER.exists():
+            # Parse expiry dates from filenames
+            for f in DB_FOLDER.glob(f"{self.exchange}_{self.symbol}_*.sqlite"):
+                parts = f.stem.split("_", 2)
+                if len(parts) < 3 or parts[2] in found:
+                    continue
+                try:
+                    found[parts[2]] = datetime.strptime(parts[2], "%d-%b-%Y").date()
+                except ValueError:
+                    continue
+
+        if not found:
+            raise error(
+                f"No option chain expiries for {self.exchange}_{self.symbol} "
+                f"(source={self.source}; snapshot bus / {DB_FOLDER})"
+            )
+        return sorted(((d, s) for s, d in found.items()), key=lambda x: x[0])
 
     def resolve_expiry_mode(self, mode: str) -> str:
         """
         Convert an expiry mode string (e.g., 'weekly_current', 'weekly_next')
-        into an actual expiry date string (format DD-MMM-YYYY) by scanning
-        the available DB files.
+        into an actual expiry date string (format DD-MMM-YYYY) from the
+        expiries on the snapshot bus and in the DB folder.
 
         Raises ValueError if mode cannot be resolved.
         """
@@ -1199,34 +1636,8 @@ class MarketReader:
             return mode
 
         # Determine target based on mode
-        today = date.today()
-        pattern = f"{self.exchange}_{self.symbol}_*.sqlite"
-        folder = DB_FOLDER
-        if not folder.exists():
-            raise ValueError(f"DB folder not found: {folder}")
-
-        matches = list(folder.glob(pattern))
-        if not matches:
-            raise ValueError(f"No database files for {self.exchange}_{self.symbol}")
-
-        # Parse expiry dates from filenames
-        expiries = []
-        for f in matches:
-            name = f.stem
-            parts = name.split("_", 2)
-            if len(parts) < 3:
-                continue
-            date_str = parts[2]
-            try:
-                exp_date = datetime.strptime(date_str, "%d-%b-%Y").date()
-                expiries.append((exp_date, date_str))
-            except ValueError:
-                continue
-
-        if not expiries:
-            raise ValueError("No valid expiry dates found in filenames")
-
-        expiries.sort(key=lambda x: x[0])  # sort by date
+        today = self._today()
+        expiries = self._available_expiries(ValueError)
 
         if mode == "weekly_current" or mode == "monthly_current":
             # Find the nearest future expiry (>= today)
@@ -1275,47 +1686,21 @@ class MarketReader:
         """
         Given a current expiry string (format DD-MMM-YYYY) and a mode
         ('weekly_next', 'monthly_next', 'weekly_current', 'monthly_current'),
-        return the next available expiry date string from the DB folder.
+        return the next available expiry date string (snapshot bus or DB folder).
         """
         # If mode is *_current, return current_expiry (assumed to be a valid date)
         if mode in ("weekly_current", "monthly_current"):
             return current_expiry
 
         # For next modes, find the next expiry after current_expiry
-        pattern = f"{self.exchange}_{self.symbol}_*.sqlite"
-        folder = DB_FOLDER
-        if not folder.exists():
-            raise RuntimeError(f"DB folder not found: {folder}")
-
-        matches = list(folder.glob(pattern))
-        if not matches:
-            raise RuntimeError(f"No database files for {self.exchange}_{self.symbol}")
-
-        # Parse expiry dates from filenames
-        expiries = []
-        for f in matches:
-            name = f.stem
-            parts = name.split("_", 2)
-            if len(parts) < 3:
-                continue
-            date_str = parts[2]
-            try:
-                exp_date = datetime.strptime(date_str, "%d-%b-%Y").date()
-                expiries.append((exp_date, date_str))
-            except ValueError:
-                continue
-
-        if not expiries:
-            raise RuntimeError("No valid expiry dates found in filenames")
-
-        expiries.sort(key=lambda x: x[0])  # sort by date
+        expiries = self._available_expiries(RuntimeError)
 
         # Parse current_expiry
         try:
             cur_date = datetime.strptime(current_expiry, "%d-%b-%Y").date()
         except ValueError:
             # Fallback: return the first future expiry
-            today = datetime.now().date()
+            today = self._today()
             future = [d for d in expiries if d[0] >= today]
             if future:
                 return future[0][1]
@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+"""
+replay.py — Offline strategy replay / backtest
+===============================================
+
+Plays the tables recorded by HistoricalAnalyticsService (option_ticks,
+option_chain_metrics, index_ticks) through the real EntryEngine /
+AdjustmentEngine / ExitEngine, as fast as the CPU allows:
+
+    ReplayTape           one load of the recorded rows, grouped into frames
+                         (one frame per recorder cycle, local IST time)
+    ReplayMarketReader   MarketReader serving each frame as a ChainSnapshot
+                         (greeks rebuilt from the recorded IV)
+    FillModel            bid/ask + slippage fills
+    ReplayExecutor       StrategyExecutor on a virtual clock; produces a
+                         trade log and a per-frame PnL curve
+
+Usage:
+    result = replay_day(store, config, date(2026, 2, 10))
+    result.trades, result.pnl_curve, result.summary()
+
+    python -m shoonya_platform.strategy_runner.replay \\
+        --db analytics.sqlite --config strategy.json --date 2026-02-10
+
+Notes:
+- Only what the recorder keeps is replayed: ATM ± N strikes every
+  HISTORICAL_OPTION_TICK_SEC seconds, no recorded greeks.
+- PCR / max pain come from the recorded chain-wide metrics when present.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .executor import StrategyExecutor
+from .market_reader import DEFAULT_LOT_SIZES, MarketReader
+from .models import InstrumentType, Side
+from .state import LegState, StrategyState
+from shoonya_platform.market_data.option_chain.snapshot_bus import (
+    CHAIN_COLUMNS,
+    INTEGER_COLUMNS,
+    REAL_COLUMNS,
+    ChainSnapshot,
+)
+from shoonya_platform.utils.bs_greeks import bs_greeks_vec
+
+logger = logging.getLogger(__name__)
+
+# Recorder timestamps are UTC; strategies run on exchange-local time.
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Same rate / dividend defaults the live option chain uses for greeks.
+_GREEK_PARAMS: Dict[str, Tuple[float, float]] = {
+    "NFO": (0.065, 0.012),
+    "BFO": (0.065, 0.012),
+    "MCX": (0.065, 0.065),
+    "NSE": (0.065, 0.012),
+}
+_SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+_NUMERIC = frozenset(REAL_COLUMNS + INTEGER_COLUMNS)
+_TICK_NUMERIC = ("strike", "ltp", "volume", "oi", "bid", "ask", "iv")
+_INDEX_PARAM_RE = re.compile(r"index_([a-z0-9]+?)_(?:change_pct|ltp|pc|change|open|high|low|close)\b")
+_replay_ids = itertools.count(1)
+
+
+def _to_local(ts: Union[str, datetime]) -> datetime:
+    """Recorder ts (ISO string or datetime, UTC) -> naive IST datetime."""
+    if not isinstance(ts, datetime):
+        ts = datetime.fromisoformat(str(ts))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(IST).replace(tzinfo=None)
+
+
+def _epoch(local: datetime) -> float:
+    """Naive IST datetime -> POSIX timestamp (independent of the host TZ)."""
+    return local.replace(tzinfo=IST).timestamp()
+
+
+def _parse_expiry(expiry: str) -> Optional[date]:
+    try:
+        return datetime.strptime(expiry, "%d-%b-%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _asof(epochs: np.ndarray, t: float) -> int:
+    """Index of the last entry with epoch <= t, or -1."""
+    return int(np.searchsorted(epochs, t, side="right")) - 1
+
+
+# ==============================================================================
+# TAPE
+# ==============================================================================
+
+class ReplayTape:
+    """
+    Recorded market data for one underlying, grouped into frames.
+
+    A frame is one recorder cycle: every option_ticks row sharing a ts.
+    Option rows are kept as column arrays; a frame is a (start, end) slice
+    per expiry. Metrics and index ticks are joined as-of frame time.
+    """
+
+    def __init__(
+        self,
+        exchange: str,
+        symbol: str,
+        ticks: List[Dict[str, Any]],
+        metrics: Optional[List[Dict[str, Any]]] = None,
+        index_ticks: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.exchange = exchange.upper()
+        self.symbol = symbol.upper()
+        # trading dates the tape was loaded for (set by load())
+        self.start: Optional[date] = None
+        self.end: Optional[date] = None
+
+        # rows arrive ordered by ts; parse each distinct ts once
+        times: List[datetime] = []
+        bounds: List[int] = []
+        last_ts = None
+        for i, row in enumerate(ticks):
+            ts = row["ts"]
+            if ts != last_ts:
+                times.append(_to_local(ts))
+                bounds.append(i)
+                last_ts = ts
+        bounds.append(len(ticks))
+        self.times = times
+        self.epochs = np.array([_epoch(t) for t in times], dtype=np.float64)
+
+        self.columns: Dict[str, np.ndarray] = {
+            col: np.array([r.get(col) for r in ticks], dtype=np.float64)
+            for col in _TICK_NUMERIC
+        }
+        self.columns["option_type"] = np.array(
+            [str(r.get("option_type") or "").upper() for r in ticks], dtype=object
+        )
+        expiries = np.array([str(r.get("expiry") or "") for r in ticks], dtype=object)
+
+        # frame -> {expiry: (start, end)}; rows within a ts are ordered by expiry
+        self.slices: List[Dict[str, Tuple[int, int]]] = []
+        for f in range(len(times)):
+            lo, hi = bounds[f], bounds[f + 1]
+            frame: Dict[str, Tuple[int, int]] = {}
+            start = lo
+            for j in range(lo + 1, hi + 1):
+                if j == hi or expiries[j] != expiries[start]:
+                    frame[expiries[start]] = (start, j)
+                    start = j
+            self.slices.append(frame)
+
+        parsed = {e: _parse_expiry(e) for e in set(expiries.tolist())}
+        self.expiries: List[Tuple[date, str]] = sorted(
+            (d, e) for e, d in parsed.items() if d is not None
+        )
+
+        self._metrics: Dict[str, Tuple[np.ndarray, List[Dict[str, Any]]]] = {}
+        by_expiry: Dict[str, List[Dict[str, Any]]] = {}
+        for row in metrics or []:
+            by_expiry.setdefault(str(row.get("expiry")), []).append(row)
+        for exp, rows in by_expiry.items():
+            rows.sort(key=lambda r: str(r["ts"]))
+            self._metrics[exp] = (
+                np.array([_epoch(_to_local(r["ts"])) for r in rows]), rows
+            )
+
+        self._index: Dict[str, Tuple[np.ndarray, List[Dict[str, Any]]]] = {}
+        by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for row in index_ticks or []:
+            by_symbol.setdefault(str(row.get("symbol")).upper(), []).append(row)
+        for sym, rows in by_symbol.items():
+            rows.sort(key=lambda r: str(r["ts"]))
+            self._index[sym] = (
+                np.array([_epoch(_to_local(r["ts"])) for r in rows]), rows
+            )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    # ---- shared on-disk form (sweep workers map it read-only) ----
+    def save(self, directory: Union[str, Path]) -> Path:
+        """
+        Write the tape as one .npy file per column plus tape.json. Text
+        columns are stored fixed-width so every array can be mapped.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, arr in self.columns.items():
+            if arr.dtype == object:
+                arr = arr.astype("U8")
+            np.save(directory / f"{name}.npy", arr)
+        np.save(directory / "epochs.npy", self.epochs)
+
+        def _rows(table):
+            return {k: {"epochs": e.tolist(), "rows": rows} for k, (e, rows) in table.items()}
+
+        manifest = {
+            "exchange": self.exchange,
+            "symbol": self.symbol,
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "columns": sorted(self.columns),
+            "slices": [{e: list(b) for e, b in f.items()} for f in self.slices],
+            "expiries": [e for _, e in self.expiries],
+            "metrics": _rows(self._metrics),
+            "index": _rows(self._index),
+        }
+        # manifest last: its presence marks a complete tape
+        tmp = directory / "tape.json.tmp"
+        tmp.write_text(json.dumps(manifest, default=str))
+        tmp.replace(directory / "tape.json")
+        return directory
+
+    @classmethod
+    def open(cls, directory: Union[str, Path]) -> "ReplayTape":
+        """Map a saved tape read-only; pages are shared between processes."""
+        directory = Path(directory)
+        manifest = json.loads((directory / "tape.json").read_text())
+        tape = cls.__new__(cls)
+        tape.exchange = manifest["exchange"]
+        tape.symbol = manifest["symbol"]
+        tape.start, tape.end = (
+            date.fromisoformat(manifest[k]) if manifest.get(k) else None
+            for k in ("start", "end")
+        )
+        tape.columns = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in manifest["columns"]
+        }
+        tape.epochs = np.load(directory / "epochs.npy", mmap_mode="r")
+        tape.times = [_to_local(datetime.fromtimestamp(float(t), timezone.utc)) for t in tape.epochs]
+        tape.slices = [{e: tuple(b) for e, b in f.items()} for f in manifest["slices"]]
+        tape.expiries = sorted((_parse_expiry(e), e) for e in manifest["expiries"])
+
+        def _table(raw):
+            return {k: (np.array(v["epochs"], dtype=np.float64), v["rows"]) for k, v in raw.items()}
+
+        tape._metrics = _table(manifest["metrics"])
+        tape._index = _table(manifest["index"])
+        return tape
+
+    @classmethod
+    def load(
+        cls,
+        store,
+        exchange: str,
+        symbol: str,
+        start: date,
+        end: Optional[date] = None,
+        *,
+        expiry: Optional[str] = None,
+        index_symbols: Sequence[str] = (),
+    ) -> "ReplayTape":
+        """
+        Read [start, end] (IST trading dates, inclusive) from a
+        SQLiteHistoricalStore / PostgresHistoricalStore. Queried one day at
+        a time so the per-call row caps of the store are never hit.
+        """
+        end = end or start
+        ticks: List[Dict[str, Any]] = []
+        metrics: List[Dict[str, Any]] = []
+        index_rows: List[Dict[str, Any]] = []
+        symbols = sorted({s.upper() for s in index_symbols})
+        day = start
+        while day <= end:
+            lo = datetime.combine(day, dtime.min, tzinfo=IST).astimezone(timezone.utc)
+            hi = lo + timedelta(days=1) - timedelta(microseconds=1)
+            day_ticks = store.fetch_option_chain_ticks(exchange, symbol, lo, hi, expiry=expiry)
+            ticks.extend(day_ticks)
+            for exp in sorted({str(r["expiry"]) for r in day_ticks}):
+                metrics.extend(store.fetch_option_metrics(exchange, symbol, exp, lo, hi))
+            for sym in symbols:
+                index_rows.extend(store.fetch_index_ticks([sym], lo, hi))
+            day += timedelta(days=1)
+        logger.info(
+            "Replay tape %s:%s %s..%s | option rows=%d metrics=%d index=%d",
+            exchange, symbol, start, end, len(ticks), len(metrics), len(index_rows),
+        )
+        tape = cls(exchange, symbol, ticks, metrics, index_rows)
+        tape.start, tape.end = start, end
+        return tape
+
+    def metrics_at(self, frame: int, expiry: str) -> Optional[Dict[str, Any]]:
+        """Latest recorded option_chain_metrics row at or before this frame."""
+        entry = self._metrics.get(expiry)
+        if entry is None:
+            return None
+        i = _asof(entry[0], self.epochs[frame])
+        return entry[1][i] if i >= 0 else None
+
+    def index_at(self, frame: int) -> Dict[str, Dict[str, Any]]:
+        """Latest recorded index tick per symbol at or before this frame."""
+        out: Dict[str, Dict[str, Any]] = {}
+        t = self.epochs[frame]
+        for sym, (epochs, rows) in self._index.items():
+            i = _asof(epochs, t)
+            if i >= 0:
+                r = rows[i]
+                out[sym] = {k: r.get(k) for k in ("ltp", "pc", "open", "high", "low", "close", "volume", "oi")}
+        return out
+
+
+# ==============================================================================
+# MARKET READER
+# ==============================================================================
+
+class ReplayMarketReader(MarketReader):
+    """
+    MarketReader over a ReplayTape. ``seek(frame)`` moves the virtual clock;
+    every read method of the base class then sees that frame's snapshot.
+    """
+
+    def __init__(self, tape: ReplayTape, lot_size: Optional[int] = None):
+        super().__init__(tape.exchange, tape.symbol, source="bus")
+        self.tape = tape
+        self.lot_size = int(lot_size or DEFAULT_LOT_SIZES.get(self.symbol, 1))
+        self._rate, self._div = _GREEK_PARAMS.get(self.exchange, _GREEK_PARAMS["NFO"])
+        self._close = dtime(23, 30) if self.exchange == "MCX" else dtime(15, 30)
+        self._key_prefix = f"REPLAY-{next(_replay_ids)}"
+        self._frame = 0
+        self._snaps: Dict[str, ChainSnapshot] = {}        # current frame
+        self._last_snap: Dict[str, ChainSnapshot] = {}    # carried forward
+
+    # ---- clock ----
+    def seek(self, frame: int) -> None:
+        self._frame = frame
+        self._snaps = {}
+
+    def now(self) -> datetime:
+        return self.tape.times[self._frame]
+
+    def _today(self) -> date:
+        return self.now().date()
+
+    def _available_expiries(self, error: type = ValueError) -> List[Tuple[date, str]]:
+        if not self.tape.expiries:
+            raise error(f"No recorded expiries for {self.exchange}_{self.symbol}")
+        return self.tape.expiries
+
+    # ---- data source ----
+    def _get_snapshot(self, expiry: Optional[str] = None) -> Optional[ChainSnapshot]:
+        if expiry is None:
+            try:
+                expiry = self.resolve_expiry_mode("weekly_current")
+            except ValueError:
+                return None
+        snap = self._snaps.get(expiry)
+        if snap is None:
+            bounds = self.tape.slices[self._frame].get(expiry)
+            if bounds is None:
+                # expiry missing from this cycle: keep serving the last one seen
+                return self._last_snap.get(expiry)
+            snap = self._build_snapshot(expiry, *bounds)
+            self._snaps[expiry] = self._last_snap[expiry] = snap
+        return snap
+
+    def _get_connection(self, expiry: Optional[str] = None):
+        return None
+
+    def _check_freshness(self, expiry: Optional[str] = None):
+        return None
+
+    def get_snapshot_age_seconds(self, expiry: Optional[str] = None) -> float:
+        return 0.0
+
+    def get_lot_size(self, expiry: Optional[str] = None) -> int:
+        return self.lot_size
+
+    def _build_snapshot(self, expiry: str, start: int, end: int) -> ChainSnapshot:
+        tape = self.tape
+        n = end - start
+        src = {name: arr[start:end] for name, arr in tape.columns.items()}
+        if src["option_type"].dtype != object:  # mapped tape: fixed-width text
+            src["option_type"] = src["option_type"].astype(object)
+        columns: Dict[str, np.ndarray] = {}
+        for col in CHAIN_COLUMNS:
+            if col in src:
+                columns[col] = src[col]
+            elif col in _NUMERIC:
+                columns[col] = np.full(n, np.nan)
+            else:
+                columns[col] = np.full(n, None, dtype=object)
+        columns["exchange"] = np.full(n, self.exchange, dtype=object)
+        columns["lot_size"] = np.full(n, float(self.lot_size))
+        columns["bid_qty"] = np.zeros(n)
+        columns["ask_qty"] = np.zeros(n)
+
+        strikes, types, ltp = src["strike"], src["option_type"], src["ltp"]
+        spot, atm = self._spot_atm(expiry, strikes, types, ltp)
+
+        exp_date = _parse_expiry(expiry)
+        now = self.now()
+        if exp_date is not None and spot > 0:
+            expiry_dt = datetime.combine(exp_date, self._close)
+            T = max((expiry_dt - now).total_seconds() / _SECONDS_PER_YEAR, 1e-6)
+            iv = src["iv"]
+            sigma = np.where(iv > 1, iv / 100, iv)
+            greeks = bs_greeks_vec(spot, strikes, T, self._rate, np.nan_to_num(sigma),
+                                   types == "CE", q=self._div)
+            missing = ~np.isfinite(iv) | (iv <= 0)
+            for name in ("delta", "gamma", "theta", "vega"):
+                columns[name] = np.where(missing, np.nan, greeks[name])
+
+        meta = {
+            "exchange": self.exchange,
+            "symbol": self.symbol,
+            "expiry": expiry,
+            "atm": str(atm),
+            "spot_ltp": str(spot),
+            "fut_ltp": str(spot),
+            "snapshot_ts": str(tape.epochs[self._frame]),
+        }
+        return ChainSnapshot(
+            key=f"{self._key_prefix}:{self.exchange}:{self.symbol}:{expiry}",
+            exchange=self.exchange,
+            symbol=self.symbol,
+            expiry=expiry,
+            version=self._frame,
+            snapshot_ts=float(tape.epochs[self._frame]),
+            meta=meta,
+            columns=columns,
+        )
+
+    def _spot_atm(self, expiry: str, strikes, types, ltp) -> Tuple[float, float]:
+        """Recorded spot/ATM when available, otherwise put-call parity."""
+        row = self.tape.metrics_at(self._frame, expiry)
+        if row and (row.get("spot_price") or 0) > 0:
+            spot = float(row["spot_price"])
+            atm = float(row.get("atm_strike") or 0)
+            if atm <= 0 and len(strikes):
+                atm = float(strikes[np.argmin(np.abs(strikes - spot))])
+            return spot, atm
+
+        ce = {float(k): float(p) for k, t, p in zip(strikes, types, ltp) if t == "CE"}
+        pe = {float(k): float(p) for k, t, p in zip(strikes, types, ltp) if t == "PE"}
+        both = [k for k in ce if k in pe]
+        if not both:
+            return 0.0, 0.0
+        atm = min(both, key=lambda k: abs(ce[k] - pe[k]))
+        return atm + ce[atm] - pe[atm], atm
+
+    def _chain_metrics(
+        self, expiry: Optional[str] = None, agg: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """
+        OI totals / buildup from the recorded strikes; PCR and max pain from
+        the recorded chain-wide metrics (the tape only holds ATM ± N strikes).
+        """
+        metrics = super()._chain_metrics(expiry, agg)
+        snap = self._get_snapshot(expiry)
+        row = self.tape.metrics_at(self._frame, snap.expiry) if snap is not None else None
+        if row:
+            for name, src in (("pcr", "pcr_oi"), ("pcr_volume", "pcr_volume"),
+                              ("max_pain_strike", "max_pain_strike")):
+                if row.get(src) is not None:
+                    metrics[name] = float(row[src])
+        return metrics
+
+
+# ==============================================================================
+# FILLS
+# ==============================================================================
+
+@dataclass
+class FillModel:
+    """
+    Marketable fills: BUY at the ask, SELL at the bid (LTP when the side
+    has no quote), then an adverse slippage of ``slippage_points`` plus
+    ``slippage_pct`` of the price.
+    """
+    slippage_points: float = 0.0
+    slippage_pct: float = 0.0
+    use_quotes: bool = True
+
+    def price(self, side: Side, ltp: float, bid: float = 0.0, ask: float = 0.0) -> float:
+        px = float(ltp or 0.0)
+        if self.use_quotes:
+            if side == Side.BUY and ask and ask > 0:
+                px = float(ask)
+            elif side == Side.SELL and bid and bid > 0:
+                px = float(bid)
+        slip = self.slippage_points + px * self.slippage_pct / 100.0
+        if side == Side.BUY:
+            return px + slip
+        return max(px - slip, 0.0)
+
+
+# ==============================================================================
+# EXECUTOR
+# ==============================================================================
+
+@dataclass
+class ReplayResult:
+    name: str
+    trades: List[Dict[str, Any]] = field(default_factory=list)
+    pnl_curve: List[Dict[str, Any]] = field(default_factory=list)
+    frames: int = 0
+    errors: int = 0
+    elapsed_sec: float = 0.0
+
+    @property
+    def net_pnl(self) -> float:
+        return self.pnl_curve[-1]["total"] if self.pnl_curve else 0.0
+
+    @property
+    def max_drawdown(self) -> float:
+        peak, dd = 0.0, 0.0
+        for point in self.pnl_curve:
+            peak = max(peak, point["total"])
+            dd = max(dd, peak - point["total"])
+        return dd
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "frames": self.frames,
+            "trades": len(self.trades),
+            "net_pnl": round(self.net_pnl, 2),
+            "max_drawdown": round(self.max_drawdown, 2),
+            "errors": self.errors,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+        }
+
+
+class ReplayExecutor(StrategyExecutor):
+    """
+    StrategyExecutor driven by a ReplayTape instead of the wall clock.
+
+    Orders fill immediately through the FillModel: a leg that becomes
+    active (entry, roll) or is left PENDING by an adjustment opens at the
+    fill price; a leg that goes inactive or loses lots closes at the fill
+    price. Realized PnL is from fills, unrealized is marked at LTP.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        tape: ReplayTape,
+        *,
+        fill_model: Optional[FillModel] = None,
+        lot_size: Optional[int] = None,
+        close_at_end: bool = True,
+    ):
+        if not len(tape):
+            raise ValueError(f"Empty replay tape for {tape.exchange}:{tape.symbol}")
+        market = ReplayMarketReader(tape, lot_size=lot_size)
+        self.tape = tape
+        self.fill_model = fill_model or FillModel()
+        self.close_at_end = close_at_end
+        super().__init__(config=config, market=market)
+        self.state.clock = market.now
+
+        self.result = ReplayResult(name=str(config.get("name", "")))
+        self._open: Dict[str, Dict[str, Any]] = {}   # tag -> {side, units, price}
+        self._realized = 0.0
+        self._fill_reason = ""
+
+    def _load_or_create_state(self) -> StrategyState:
+        return StrategyState()
+
+    def _save_state(self):
+        pass
+
+    def _fetch_index_prices(self) -> Dict[str, Dict[str, Any]]:
+        return self.tape.index_at(self.market._frame)
+
+    def _execute_entry(self):
+        self._fill_reason = "entry"
+        super()._execute_entry()
+        self._settle_fills()
+
+    def _execute_exit(self, action: str):
+        self._fill_reason = self.exit_engine.last_exit_reason or action
+        super()._execute_exit(action)
+        self._settle_fills()
+
+    # ---- run ----
+    def run(self, interval_sec: int = 0) -> ReplayResult:
+        started = time.perf_counter()
+        result = self.result
+        for frame in range(len(self.tape)):
+            self.market.seek(frame)
+            self._fill_reason = "adjustment"
+            try:
+                self._tick()
+            except Exception as e:
+                result.errors += 1
+                logger.debug("Replay tick %d failed: %s", frame, e, exc_info=True)
+            self._settle_fills()
+            self._mark()
+        if self.close_at_end and self._open and len(self.tape):
+            self._fill_reason = "end_of_replay"
+            for leg in self.state.legs.values():
+                leg.is_active = False
+            self._settle_fills()
+            result.pnl_curve[-1] = self._point()
+        result.frames = len(self.tape)
+        result.elapsed_sec = time.perf_counter() - started
+        logger.info("Replay done | %s", result.summary())
+        return result
+
+    # ---- fills / marks ----
+    def _quote(self, leg: LegState) -> Tuple[float, float, float]:
+        if leg.instrument == InstrumentType.OPT and leg.strike is not None and leg.option_type is not None:
+            row = self.market.get_option_at_strike(leg.strike, leg.option_type, leg.expiry)
+            if row and row.get("ltp"):
+                return float(row["ltp"]), float(row.get("bid") or 0), float(row.get("ask") or 0)
+        elif leg.instrument == InstrumentType.FUT:
+            fut = self.market.get_fut_ltp(leg.expiry)
+            if fut:
+                return fut, 0.0, 0.0
+        return float(leg.ltp or leg.entry_price or 0.0), 0.0, 0.0
+
+    def _fill(self, leg: LegState, side: Side, units: int) -> float:
+        ltp, bid, ask = self._quote(leg)
+        price = self.fill_model.price(side, ltp, bid, ask)
+        self.result.trades.append({
+            "time": self.state.now(),
+            "tag": leg.tag,
+            "side": side.value,
+            "instrument": leg.instrument.value,
+            "option_type": leg.option_type.value if leg.option_type else None,
+            "strike": leg.strike,
+            "expiry": leg.expiry,
+            "units": units,
+            "price": round(price, 2),
+            "ltp": ltp,
+            "reason": self._fill_reason,
+            "realized_pnl": 0.0,
+        })
+        return price
+
+    def _settle_fills(self):
+        legs = self.state.legs
+        # closes first: inactive / removed legs, then reduced quantities
+        for tag in list(self._open):
+            pos = self._open[tag]
+            leg = legs.get(tag)
+            units = leg.order_qty if leg is not None and leg.is_active else 0
+            if units >= pos["units"] or leg is None:
+                if leg is None:
+                    self._open.pop(tag)
+                continue
+            closed = pos["units"] - units
+            close_side = Side.BUY if pos["side"] == Side.SELL else Side.SELL
+            price = self._fill(leg, close_side, closed)
+            sign = 1.0 if pos["side"] == Side.BUY else -1.0
+            pnl = sign * (price - pos["price"]) * closed
+            self._realized += pnl
+            self.result.trades[-1]["realized_pnl"] = round(pnl, 2)
+            if units:
+                pos["units"] = units
+            else:
+                self._open.pop(tag)
+                leg.order_status = "CLOSED"
+                leg.exit_price = price
+                leg.exit_timestamp = self.state.now()
+                leg.exit_reason = self._fill_reason
+
+        for tag, leg in legs.items():
+            if leg.order_status == "PENDING" and not leg.is_active:
+                leg.is_active = True  # adjustment legs wait for a fill
+            if not leg.is_active:
+                continue
+            pos = self._open.get(tag)
+            units = leg.order_qty
+            if pos is not None and units <= pos["units"]:
+                continue
+            added = units - (pos["units"] if pos else 0)
+            price = self._fill(leg, leg.side, added)
+            if pos is None:
+                self._open[tag] = {"side": leg.side, "units": units, "price": price}
+                leg.entry_timestamp = self.state.now()
+                leg.entry_reason = self._fill_reason
+            else:
+                pos["price"] = (pos["price"] * pos["units"] + price * added) / units
+                pos["units"] = units
+            leg.order_status = "FILLED"
+            leg.filled_qty = units
+            leg.entry_price = self._open[tag]["price"]
+
+    def _unrealized(self) -> float:
+        total = 0.0
+        for tag, pos in self._open.items():
+            leg = self.state.legs[tag]
+            mark = leg.ltp or pos["price"]
+            sign = 1.0 if pos["side"] == Side.BUY else -1.0
+            total += sign * (mark - pos["price"]) * pos["units"]
+        return total
+
+    def _point(self) -> Dict[str, Any]:
+        unrealized = self._unrealized()
+        return {
+            "time": self.state.now(),
+            "realized": round(self._realized, 2),
+            "unrealized": round(unrealized, 2),
+            "total": round(self._realized + unrealized, 2),
+            "spot": self.state.spot_price,
+            "open_legs": len(self._open),
+        }
+
+    def _mark(self):
+        self.result.pnl_curve.append(self._point())
+
+
+def config_index_symbols(config: Dict[str, Any]) -> List[str]:
+    """Index symbols referenced by index_<SYMBOL>_<field> / india_vix conditions."""
+    text = json.dumps(config).lower()
+    symbols = {m.upper() for m in _INDEX_PARAM_RE.findall(text)}
+    if "india_vix" in text:
+        symbols.add("INDIAVIX")
+    return sorted(symbols)
+
+
+def replay_day(
+    store,
+    config: Dict[str, Any],
+    day: date,
+    end: Optional[date] = None,
+    *,
+    fill_model: Optional[FillModel] = None,
+    lot_size: Optional[int] = None,
+    tape: Optional[ReplayTape] = None,
+) -> ReplayResult:
+    """Replay one strategy config over the recorded day(s) [day, end]."""
+    identity = config["identity"]
+    if tape is None:
+        tape = ReplayTape.load(
+            store, identity["exchange"], identity["underlying"], day, end,
+            index_symbols=config_index_symbols(config),
+        )
+    executor = ReplayExecutor(config, tape, fill_model=fill_model, lot_size=lot_size)
+    return executor.run()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from shoonya_platform.analytics.sqlite_historical_store import SQLiteHistoricalStore
+
+    parser = argparse.ArgumentParser(description="Replay a strategy over recorded option ticks")
+    parser.add_argument("--db", required=True, help="historical analytics SQLite file")
+    parser.add_argument("--config", required=True, help="strategy JSON config")
+    parser.add_argument("--date", required=True, help="first trading day (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last trading day (default: --date)")
+    parser.add_argument("--slippage-pct", type=float, default=0.0)
+    parser.add_argument("--trades", action="store_true", help="print the trade log")
+    args = parser.parse_args(argv)
+
+    with open(args.config, "r") as f:
+        config = json.load(f)
+    start = date.fromisoformat(args.date)
+    end = date.fromisoformat(args.end) if args.end else None
+    store = SQLiteHistoricalStore(args.db)
+    result = replay_day(store, config, start, end,
+                        fill_model=FillModel(slippage_pct=args.slippage_pct))
+    if args.trades:
+        for t in result.trades:
+            print(json.dumps(t, default=str))
+    print(json.dumps(result.summary()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Optional, List, Any
 from datetime import datetime, date
 from .models import InstrumentType, OptionType, Side
 
@@ -188,11 +188,18 @@ class StrategyState:
     entry_reason: str = ""
     exit_reason: str = ""
 
+    # Wall clock used by time-based fields; replay installs a virtual clock.
+    # Not persisted.
+    clock: Optional[Callable[[], datetime]] = field(default=None, repr=False, compare=False)
+
+    def now(self) -> datetime:
+        return self.clock() if self.clock is not None else datetime.now()
+
     def record_adjustment(self, rule_name: str, action_type: str,
                           affected_legs: List[str], reason: str = ""):
         """Record an adjustment event for audit trail."""
         event = AdjustmentEvent(
-            timestamp=datetime.now(),
+            timestamp=self.now(),
             rule_name=rule_name,
             action_type=action_type,
             affected_legs=affected_legs,
@@ -484,14 +491,14 @@ class StrategyState:
     def time_in_position_sec(self) -> float:
         if self.entry_time is None:
             return 0.0
-        delta = (datetime.now() - self.entry_time).total_seconds()
+        delta = (self.now() - self.entry_time).total_seconds()
         return max(0.0, delta)
 
     @property
     def time_since_last_adj_sec(self) -> float:
         if self.last_adjustment_time is None:
             return 999999.0
-        return (datetime.now() - self.last_adjustment_time).total_seconds()
+        return (self.now() - self.last_adjustment_time).total_seconds()
 
     # Breakeven calculations (simplified – assumes short strangle/straddle)
     # BUG-H1 FIX: Use per-unit premium (sum of entry prices), not total_premium
@@ -540,7 +547,7 @@ class StrategyState:
         """Minimum days to expiry among active legs."""
         if not self.legs:
             return 0
-        today = datetime.now().date()
+        today = self.now().date()
         min_days = 999
         # ✅ BUG-018 FIX: Scripmaster uses "%d-%b-%Y" (e.g. "27-FEB-2025") but state/config
         # may store ISO "2025-02-27". A ValueError from the wrong format was silently caught,
@@ -571,7 +578,7 @@ class StrategyState:
     @property
     def session_type(self) -> str:
         """Return 'morning' if before 12:00, else 'afternoon'."""
-        now = datetime.now()
+        now = self.now()
         return "morning" if now.hour < 12 else "afternoon"
 
     def set_index_ticks(self, ticks: Dict[str, Dict[str, float]]):
@@ -21,7 +21,9 @@ from .models import (
 )
 from .state import StrategyState, LegState
 from .condition_engine import ConditionEngine
-from .market_reader import MarketReader
+from .market_reader import MarketReader, MarketSnapshot
+from shoonya_platform.market_data.option_chain.snapshot_bus import get_snapshot_bus
+from shoonya_platform.utils.latency import LatencyHistogram
 from .entry_engine import EntryEngine
 from .adjustment_engine import AdjustmentEngine
 from .exit_engine import ExitEngine
@@ -378,6 +380,14 @@ class StrategyExecutorService:
         self._completed_monitor_history: List[Dict[str, Any]] = []
         self._max_completed_monitor_history = 100
         self._timed_out_strategies: Dict[str, int] = {}  # name -> consecutive timeout count
+        # One reader per underlying builds the per-cycle MarketSnapshots
+        self._snapshot_readers: Dict[Tuple[str, str], MarketReader] = {}
+        self._snapshot_stats: Dict[str, int] = {
+            "cycles": 0,
+            "snapshots_built": 0,
+            "executors_served": 0,
+        }
+        self._init_scheduler()
         try:
             self._completed_monitor_history = self.state_mgr.get_completed_monitor_history(
                 limit=self._max_completed_monitor_history
@@ -516,6 +526,7 @@ class StrategyExecutorService:
                     logger.debug("Could not prune stale monitor rows for %s: %s", name, _e)
             self._monitor_cache[name] = persisted_cache if isinstance(persisted_cache, dict) else {}
             logger.info(f"Registered strategy: {name}")
+        self._request_tick(name, "register")
 
     def unregister_strategy(self, name: str):
         """Remove a strategy from the service."""
@@ -524,6 +535,9 @@ class StrategyExecutorService:
             self._strategies.pop(name, None)
             self._exec_states.pop(name, None)
             self._monitor_cache.pop(name, None)
+            with self._sched_lock:
+                self._dirty.pop(name, None)
+                self._last_tick_at.pop(name, None)
             try:
                 self.state_mgr.clear_monitor_snapshot(name)
             except Exception as e:
@@ -659,21 +673,7 @@ class StrategyExecutorService:
                     except Exception as e:
                         logger.error("♻️ AUTO-RESUME RECONCILE [%s] failed: %s", name, e)
 
-            # Send telegram notification
-            telegram = getattr(self.bot, "telegram", None)
-            if telegram:
-                try:
-                    msg = (
-                        f"<b>♻️ STRATEGY AUTO-RESUME</b>\n"
-                        f"Strategies recovered: {len(resumed)}\n"
-                        f"Names: {', '.join(resumed)}\n"
-                        f"Time: {datetime.now().strftime('%H:%M:%S')}\n\n"
-                        f"Monitoring, adjustments, and exits will continue "
-                        f"from last persisted state."
-                    )
-                    telegram.send_message(msg, parse_mode="HTML")
-                except Exception:
-                    pass
+            self._notify_auto_resume(resumed)
 
             logger.warning(
                 "♻️ AUTO-RESUME COMPLETE | %d strategy(ies) recovered: %s",
@@ -682,6 +682,24 @@ class StrategyExecutorService:
 
         return resumed
 
+    def _notify_auto_resume(self, resumed: List[str]) -> None:
+        """Telegram notice for resumed strategies (dispatcher queue, never a blocking HTTP call)."""
+        telegram = getattr(self.bot, "telegram", None)
+        if not telegram:
+            return
+        try:
+            telegram.notify(
+                f"<b>♻️ STRATEGY AUTO-RESUME</b>\n"
+                f"Strategies recovered: {len(resumed)}\n"
+                f"Names: {', '.join(resumed)}\n"
+                f"Time: {datetime.now().strftime('%H:%M:%S')}\n\n"
+                f"Monitoring, adjustments, and exits will continue "
+                f"from last persisted state.",
+                category="strategy",
+            )
+        except Exception as e:
+            logger.warning("♻️ AUTO-RESUME telegram notify failed: %s", e)
+
     @staticmethod
     def _mark_config_status(strategy_key: str, status: str) -> None:
         """Update the ``status`` field in a strategy's saved config JSON."""
@@ -716,6 +734,7 @@ class StrategyExecutorService:
         self._cleanup_stale_monitor_rows()
         self._running = True
         self._stop_event.clear()
+        get_snapshot_bus().subscribe(self._on_chain_published)
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info("StrategyExecutorService started")
@@ -823,6 +842,8 @@ class StrategyExecutorService:
             logger.warning("EOD order cleanup during stop() failed: %s", e)
         self._running = False
         self._stop_event.set()
+        get_snapshot_bus().unsubscribe(self._on_chain_published)
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=5)
         logger.info("StrategyExecutorService stopped")
@@ -830,16 +851,207 @@ class StrategyExecutorService:
     # Seconds to wait for a single strategy tick before declaring it timed-out
     PROCESS_TICK_TIMEOUT = 60
 
+    # Event-driven scheduling: a strategy ticks when its chain publishes a
+    # new snapshot or a fill arrives, at most once per MIN_TICK_INTERVAL
+    # (override: schedule.min_tick_interval_sec), and at least once per
+    # HEARTBEAT_INTERVAL so time-based rules still fire on a quiet chain.
+    MIN_TICK_INTERVAL = 0.5
+    HEARTBEAT_INTERVAL = 2.0
+
+    # ------------------------------------------------------------------
+    # SCHEDULER
+    # ------------------------------------------------------------------
+
+    def _init_scheduler(self) -> None:
+        self._sched_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dirty: Dict[str, Tuple[float, str]] = {}     # name -> (enqueued_at, reason)
+        self._last_tick_at: Dict[str, float] = {}          # name -> monotonic dispatch time
+        self._in_flight: Dict[str, Tuple[Any, float]] = {}  # name -> (future, started)
+        self._timeout_flagged: set = set()
+        self._published_chains: Dict[Tuple[str, str, str], float] = {}  # chain -> first publish
+        self._queue_delay_hist: Dict[str, LatencyHistogram] = {}
+        self._tick_duration_hist: Dict[str, LatencyHistogram] = {}
+        self._wake_counts: Dict[str, int] = {
+            "chain": 0, "fill": 0, "register": 0, "heartbeat": 0,
+        }
+
+    def _request_tick(self, name: str, reason: str) -> None:
+        """Mark a strategy as needing a tick and wake the scheduler."""
+        with self._sched_lock:
+            if name not in self._dirty:
+                self._dirty[name] = (time.monotonic(), reason)
+            self._wake_counts[reason] = self._wake_counts.get(reason, 0) + 1
+        self._wake.set()
+
+    def _on_chain_published(self, key: str, snapshot: Any) -> None:
+        """
+        Snapshot bus callback (supervisor thread). Only records the chain;
+        the scheduler maps it to strategies, so the publisher never waits
+        on the service lock.
+        """
+        try:
+            exchange, symbol, expiry = key.split(":", 2)
+        except ValueError:
+            return
+        with self._sched_lock:
+            self._published_chains.setdefault((exchange, symbol, expiry), time.monotonic())
+        self._wake.set()
+
+    def _min_tick_interval(self, name: str) -> float:
+        schedule = (self._strategies.get(name) or {}).get("schedule", {}) or {}
+        try:
+            value = float(schedule.get("min_tick_interval_sec", self.MIN_TICK_INTERVAL))
+        except (TypeError, ValueError):
+            value = self.MIN_TICK_INTERVAL
+        return max(0.0, value)
+
+    def _collect_due(self, now: float) -> Tuple[List[Tuple[str, float, str]], float]:
+        """
+        Strategies to tick now as (name, enqueued_at, reason), and seconds
+        until the next one becomes due. In-flight strategies are skipped;
+        their pending wake-up is kept for after they finish.
+        """
+        with self._lock:
+            executors = list(self._executors.items())
+
+        with self._sched_lock:
+            published, self._published_chains = self._published_chains, {}
+        for name, executor in executors:
+            if not published:
+                break
+            try:
+                published_at = published.get(executor.market_snapshot_key())
+            except Exception:
+                continue
+            if published_at is not None:
+                with self._sched_lock:
+                    if name not in self._dirty:
+                        self._dirty[name] = (published_at, "chain")
+                    self._wake_counts["chain"] += 1
+
+        due: List[Tuple[str, float, str]] = []
+        next_in = self.HEARTBEAT_INTERVAL
+        with self._sched_lock:
+            for name, _ in executors:
+                if name in self._in_flight:
+                    continue
+                last = self._last_tick_at.get(name)
+                since = now - last if last is not None else float("inf")
+                pending = self._dirty.get(name)
+                if pending is not None:
+                    min_iv = self._min_tick_interval(name)
+                    if since >= min_iv:
+                        del self._dirty[name]
+                        due.append((name, pending[0], pending[1]))
+                        continue
+                    next_in = min(next_in, min_iv - since)
+                if since >= self.HEARTBEAT_INTERVAL:
+                    if pending is not None:
+                        # Heartbeat also serves the pending wake-up
+                        del self._dirty[name]
+                        due.append((name, pending[0], pending[1]))
+                        continue
+                    enqueued = last + self.HEARTBEAT_INTERVAL if last is not None else now
+                    due.append((name, enqueued, "heartbeat"))
+                    self._wake_counts["heartbeat"] += 1
+                else:
+                    next_in = min(next_in, self.HEARTBEAT_INTERVAL - since)
+            for name, _, _ in due:
+                self._last_tick_at[name] = now
+        return due, max(0.01, next_in)
+
+    def _run_strategy_tick(self, name: str, enqueued_at: float, market_snapshots: Dict) -> Optional[str]:
+        """Worker: one process_tick. Returns name if the cycle completed."""
+        with self._lock:
+            executor = self._executors.get(name)
+        if not executor:
+            return None
+        started = time.monotonic()
+        self._queue_delay_hist.setdefault(name, LatencyHistogram()).observe(started - enqueued_at)
+        try:
+            executor.process_tick(
+                market_snapshot=market_snapshots.get(executor.market_snapshot_key())
+            )
+            with executor._tick_lock:
+                if getattr(executor, "cycle_completed", False) and not executor.state.any_leg_active:
+                    return name
+        except Exception as e:
+            logger.exception(f"Error processing strategy {name}: {e}")
+        finally:
+            self._tick_duration_hist.setdefault(name, LatencyHistogram()).observe(
+                time.monotonic() - started
+            )
+        return None
+
+    def _reap_finished(self, now: float) -> List[str]:
+        """Collect finished ticks; flag (once) ticks exceeding the timeout."""
+        completed: List[str] = []
+        with self._sched_lock:
+            items = list(self._in_flight.items())
+        for name, (future, started) in items:
+            if not future.done():
+                if now - started > self.PROCESS_TICK_TIMEOUT and name not in self._timeout_flagged:
+                    logger.warning("Strategy '%s' timed out after %s seconds during process_tick",
+                                   name, self.PROCESS_TICK_TIMEOUT)
+                    # A running thread cannot be interrupted; it stays in flight
+                    # (never re-submitted) until it returns.
+                    self._timed_out_strategies[name] = self._timed_out_strategies.get(name, 0) + 1
+                    self._timeout_flagged.add(name)
+                continue
+            with self._sched_lock:
+                self._in_flight.pop(name, None)
+            self._timeout_flagged.discard(name)
+            try:
+                res = future.result()
+            except Exception as e:
+                logger.exception("Unexpected error collecting result for strategy '%s': %s",
+                                 name, e)
+                continue
+            if res:
+                completed.append(res)
+        return completed
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Wake-up counters and per-strategy queue delay / process_tick histograms."""
+        with self._sched_lock:
+            wake_counts = dict(self._wake_counts)
+            pending = len(self._dirty)
+            in_flight = list(self._in_flight)
+        names = set(self._queue_delay_hist) | set(self._tick_duration_hist)
+        return {
+            "min_tick_interval_sec": self.MIN_TICK_INTERVAL,
+            "heartbeat_interval_sec": self.HEARTBEAT_INTERVAL,
+            "wakeups": wake_counts,
+            "pending": pending,
+            "in_flight": in_flight,
+            "market_snapshots": dict(self._snapshot_stats),
+            "strategies": {
+                name: {
+                    "queue_delay": self._queue_delay_hist[name].snapshot()
+                    if name in self._queue_delay_hist else None,
+                    "process_tick": self._tick_duration_hist[name].snapshot()
+                    if name in self._tick_duration_hist else None,
+                }
+                for name in sorted(names)
+            },
+        }
+
     def _run_loop(self):
-        """Main loop: iterate over all strategies and process each concurrently."""
+        """Main loop: tick strategies when their chain or fills change (heartbeat fallback)."""
         import concurrent.futures
 
         # Track nightly cleanup so it fires at most once per day.
         _eod_cleanup_done_date = None
+        wait_for = 0.0
         
         # Use a thread pool with a reasonable max workers
         with concurrent.futures.ThreadPoolExecutor(max_workers=20) as thread_pool:
             while self._running and not self._stop_event.is_set():
+                self._wake.wait(timeout=wait_for)
+                self._wake.clear()
+                if not self._running or self._stop_event.is_set():
+                    break
 
                 # ── Nightly EOD order cleanup at 23:45 ──
                 now = datetime.now()
@@ -850,43 +1062,20 @@ class StrategyExecutorService:
                     except Exception as e:
                         logger.warning("Nightly EOD cleanup failed: %s", e)
 
-                with self._lock:
-                    names = list(self._executors.keys())
-                
-                completed_names: List[str] = []
-                
-                def _process_one(name: str):
-                    with self._lock:
-                        executor = self._executors.get(name)
-                    if executor:
-                        try:
-                            executor.process_tick()
-                            with executor._tick_lock:
-                                if getattr(executor, "cycle_completed", False) and not executor.state.any_leg_active:
-                                    return name
-                        except Exception as e:
-                            logger.exception(f"Error processing strategy {name}: {e}")
-                    return None
-                
-                futures = {thread_pool.submit(_process_one, name): name for name in names}
-                for future in concurrent.futures.as_completed(futures):
-                    if self._stop_event.is_set():
-                        break
-                    strategy_name = futures[future]
-                    try:
-                        res = future.result(timeout=self.PROCESS_TICK_TIMEOUT)
-                    except concurrent.futures.TimeoutError:
-                        logger.warning("Strategy '%s' timed out after %s seconds during process_tick",
-                                       strategy_name, self.PROCESS_TICK_TIMEOUT)
-                        # cancel() only prevents queued tasks; it cannot interrupt a running thread.
-                        self._timed_out_strategies[strategy_name] = self._timed_out_strategies.get(strategy_name, 0) + 1
-                        continue
-                    except Exception as e:
-                        logger.exception("Unexpected error collecting result for strategy '%s': %s",
-                                         strategy_name, e)
-                        continue
-                    if res:
-                        completed_names.append(res)
+                mono = time.monotonic()
+                completed_names = self._reap_finished(mono)
+                due, wait_for = self._collect_due(mono)
+
+                if due:
+                    # One immutable market snapshot per chain, shared by all executors
+                    market_snapshots = self._build_market_snapshots([n for n, _, _ in due])
+                    for name, enqueued_at, _reason in due:
+                        future = thread_pool.submit(
+                            self._run_strategy_tick, name, enqueued_at, market_snapshots
+                        )
+                        with self._sched_lock:
+                            self._in_flight[name] = (future, mono)
+                        future.add_done_callback(lambda _f: self._wake.set())
                         
                 for name in completed_names:
                     try:
@@ -908,8 +1097,52 @@ class StrategyExecutorService:
                         logger.info(f"Strategy cycle completed and auto-stopped: {name}")
                     except Exception as e:
                         logger.error(f"Failed to auto-stop completed strategy {name}: {e}")
-                        
-                time.sleep(2)  # same as old service
+
+                if self._in_flight:
+                    # Re-check the timeout even if nothing wakes us
+                    wait_for = min(wait_for, 1.0)
+
+    def _build_market_snapshots(
+        self, names: List[str]
+    ) -> Dict[Tuple[str, str, Optional[str]], MarketSnapshot]:
+        """
+        Build one MarketSnapshot per (exchange, symbol, expiry) needed by
+        the given executors. A chain that cannot be read is left out and
+        its executors fall back to their own MarketReader queries.
+        """
+        with self._lock:
+            executors = [self._executors[n] for n in names if n in self._executors]
+
+        keys = set()
+        for executor in executors:
+            try:
+                keys.add(executor.market_snapshot_key())
+            except Exception:
+                continue
+
+        snapshots: Dict[Tuple[str, str, Optional[str]], MarketSnapshot] = {}
+        for exchange, symbol, expiry in keys:
+            reader = self._snapshot_readers.get((exchange, symbol))
+            if reader is None:
+                reader = MarketReader(exchange, symbol, max_stale_seconds=30)
+                self._snapshot_readers[(exchange, symbol)] = reader
+            try:
+                snap = reader.build_market_snapshot(expiry)
+            except Exception as e:
+                logger.warning(
+                    "MARKET_SNAPSHOT_FAILED | chain=%s:%s:%s | error=%s",
+                    exchange, symbol, expiry, e,
+                )
+                continue
+            if snap is not None:
+                snapshots[snap.key] = snap
+
+        self._snapshot_stats["cycles"] += 1
+        self._snapshot_stats["snapshots_built"] += len(snapshots)
+        self._snapshot_stats["executors_served"] += sum(
+            1 for e in executors if e.market_snapshot_key() in snapshots
+        )
+        return snapshots
 
     def acquire_mode_change_lock(self, strategy_name: str) -> threading.Lock:
         with self._mode_change_dict_lock:
@@ -953,6 +1186,8 @@ class StrategyExecutorService:
         executor = self._executors.get(strategy_name)
         if executor:
             executor.notify_fill(**kwargs)
+            # React to the fill on the next scheduler pass, not the next heartbeat
+            self._request_tick(strategy_name, "fill")
         else:
             logger.warning(f"Fill notification for unknown strategy: {strategy_name}")
 
@@ -1455,6 +1690,9 @@ class PerStrategyExecutor:
     Encapsulates the engine components for a single strategy.
     """
 
+    # Freshness contract for broker positions read via the shared BrokerView
+    BROKER_MAX_AGE = 1.0
+
     def __init__(self, name: str, config: Dict[str, Any], bot, state_db_path: str):
         self.name = name
         self.config = config
@@ -1486,6 +1724,7 @@ class PerStrategyExecutor:
         self.exit_engine = ExitEngine(self.state)
         self.exit_engine.load_config(config.get("exit", {}))
         self.adjustment_engine.load_rules(config.get("adjustment", {}).get("rules", []))
+        self.entry_engine.load_config(config.get("entry", {}))
         self.reconciliation = BrokerReconciliation(
             self.state,
             lot_size_resolver=self.market.get_lot_size,
@@ -1522,6 +1761,9 @@ class PerStrategyExecutor:
         self._last_entry_skip_reason: str = ""
         self._last_entry_skip_log_at: Optional[datetime] = None
 
+        # Shared MarketSnapshot for the tick in progress (None → query reader)
+        self._market_snapshot: Optional[MarketSnapshot] = None
+
         # Event tracking for monitor snapshot reason/event_type columns
         self._last_event_type: str = ""
         self._last_event_reason: str = ""
@@ -1594,10 +1836,18 @@ class PerStrategyExecutor:
             rules_block,
         )
 
-    def process_tick(self):
-        """Called by the service loop each tick."""
+    def market_snapshot_key(self) -> Tuple[str, str, Optional[str]]:
+        """(exchange, symbol, expiry) of the chain this strategy reads."""
+        return (self.market.exchange, self.market.symbol, self._cycle_expiry_date)
+
+    def process_tick(self, market_snapshot: Optional[MarketSnapshot] = None):
+        """Called by the service loop each tick (with the cycle's shared snapshot)."""
         with self._tick_lock:
-            self._process_tick_inner()
+            self._market_snapshot = market_snapshot
+            try:
+                self._process_tick_inner()
+            finally:
+                self._market_snapshot = None
 
     def _process_tick_inner(self):
         """Core tick logic (runs under _tick_lock)."""
@@ -1859,8 +2109,11 @@ class PerStrategyExecutor:
             try:
                 broker_view = getattr(self.bot, "broker_view", None)
                 if broker_view is not None:
-                    broker_view.invalidate_cache("positions")
-                    broker_positions = broker_view.get_positions(force_refresh=True) or []
+                    # Fills / placements invalidate the shared cache, so a
+                    # 1 s freshness contract is enough here (no per-tick REST)
+                    broker_positions = broker_view.get_positions(
+                        max_age=self.BROKER_MAX_AGE, consumer="strategy_reconcile"
+                    ) or []
             except Exception:
                 broker_positions = None
 
@@ -2032,21 +2285,34 @@ class PerStrategyExecutor:
 
     def _update_market_data(self):
         """Refresh spot, ATM, and per‑leg data, but only for filled legs."""
-        self.state.spot_price = self.market.get_spot_price(self._cycle_expiry_date)
-        if not self.state.spot_open and self.state.spot_price:
-            self.state.spot_open = self.state.spot_price
-        self.state.atm_strike = self.market.get_atm_strike(self._cycle_expiry_date)
-        self.state.fut_ltp = self.market.get_fut_ltp(self._cycle_expiry_date)
-        try:
-            chain_metrics = self.market.get_chain_metrics(self._cycle_expiry_date)
-        except Exception as e:
-            logger.warning(
-                "MARKET_METRICS_UNAVAILABLE | strategy=%s | expiry=%s | error=%s",
-                self.name,
-                self._cycle_expiry_date,
-                e,
-            )
-            chain_metrics = {}
+        snap = getattr(self, "_market_snapshot", None)
+        if snap is not None and snap.key != self.market_snapshot_key():
+            snap = None
+
+        if snap is not None:
+            # Shared per-cycle snapshot: no queries, no freshness re-checks
+            self.state.spot_price = snap.spot_price
+            if not self.state.spot_open and self.state.spot_price:
+                self.state.spot_open = self.state.spot_price
+            self.state.atm_strike = snap.atm_strike
+            self.state.fut_ltp = snap.fut_ltp
+            chain_metrics = snap.chain_metrics
+        else:
+            self.state.spot_price = self.market.get_spot_price(self._cycle_expiry_date)
+            if not self.state.spot_open and self.state.spot_price:
+                self.state.spot_open = self.state.spot_price
+            self.state.atm_strike = self.market.get_atm_strike(self._cycle_expiry_date)
+            self.state.fut_ltp = self.market.get_fut_ltp(self._cycle_expiry_date)
+            try:
+                chain_metrics = self.market.get_chain_metrics(self._cycle_expiry_date)
+            except Exception as e:
+                logger.warning(
+                    "MARKET_METRICS_UNAVAILABLE | strategy=%s | expiry=%s | error=%s",
+                    self.name,
+                    self._cycle_expiry_date,
+                    e,
+                )
+                chain_metrics = {}
         self.state.pcr = float(chain_metrics.get("pcr", 0.0) or 0.0)
         self.state.pcr_volume = float(chain_metrics.get("pcr_volume", 0.0) or 0.0)
         self.state.max_pain_strike = float(chain_metrics.get("max_pain_strike", 0.0) or 0.0)
@@ -2063,7 +2329,10 @@ class PerStrategyExecutor:
                 if leg.strike is None or leg.option_type is None:
                     logger.warning(f"Leg {leg.tag} is active but missing strike or option_type")
                     continue
-                opt_data = self.market.get_option_at_strike(leg.strike, leg.option_type, leg.expiry)
+                if snap is not None and leg.expiry == snap.expiry:
+                    opt_data = snap.get_option(leg.strike, leg.option_type)
+                else:
+                    opt_data = self.market.get_option_at_strike(leg.strike, leg.option_type, leg.expiry)
                 if opt_data:
                     # Update fields only if present in opt_data
                     if "ltp" in opt_data:
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+sweep.py — Parallel parameter sweep over replayed market data
+==============================================================
+
+Expands a base strategy config against parameter grids, validates every
+variant with config_schema.validate_config and replays the valid ones
+across a process pool (one worker per core by default).
+
+- Market data is loaded from the historical store once, saved as a
+  ReplayTape directory and memory-mapped read-only by every worker.
+- Each finished variant is appended to ``results.jsonl`` immediately; a
+  re-run skips variants already there, so an interrupted sweep resumes.
+- Results are ranked (default: net PnL) into ``ranking.csv``.
+
+Grid keys are dotted config paths; list items by index or ``*`` (all):
+
+    {
+        "entry.legs.*.strike_value": [0.2, 0.3],
+        "exit.stop_loss.amount": [2000, 3000],
+        "adjustment.rules.0.conditions.0.value": [40, 60],
+        "timing.entry_window_start": ["09:20", "09:45"]
+    }
+
+CLI:
+    python -m shoonya_platform.strategy_runner.sweep --db analytics.sqlite \\
+        --config base.json --grid grid.json --date 2026-02-10 --out sweeps/run1
+"""
+
+import argparse
+import copy
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .config_schema import validate_config
+from .replay import FillModel, ReplayExecutor, ReplayTape, config_index_symbols
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.jsonl"
+RANKING_FILE = "ranking.csv"
+TAPE_DIR = "tape"
+
+
+# ==============================================================================
+# GRID
+# ==============================================================================
+
+def set_path(config: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted path in place; ``*`` fans out over every list item."""
+    parts = path.split(".")
+
+    def _set(node: Any, i: int) -> None:
+        key = parts[i]
+        last = i == len(parts) - 1
+        if key == "*":
+            children = node if isinstance(node, list) else list(node.values())
+            if not children:
+                raise KeyError(f"{path}: nothing matches '*'")
+            for idx in range(len(children)):
+                if last:
+                    if isinstance(node, list):
+                        node[idx] = copy.deepcopy(value)
+                    else:
+                        node[list(node)[idx]] = copy.deepcopy(value)
+                else:
+                    _set(children[idx], i + 1)
+            return
+        if isinstance(node, list):
+            idx = int(key)
+            if idx >= len(node):
+                raise KeyError(f"{path}: index {idx} out of range")
+            if last:
+                node[idx] = value
+            else:
+                _set(node[idx], i + 1)
+            return
+        if not isinstance(node, dict):
+            raise KeyError(f"{path}: '{key}' is not inside an object")
+        if last:
+            node[key] = value
+        else:
+            _set(node.setdefault(key, {}), i + 1)
+
+    _set(config, 0)
+
+
+def variant_id(config: Dict[str, Any]) -> str:
+    """Stable id of a full variant config (changes with the base config too)."""
+    blob = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+@dataclass
+class Variant:
+    id: str
+    overrides: Dict[str, Any]
+    config: Dict[str, Any]
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+def expand_grid(base: Dict[str, Any], grid: Dict[str, Sequence[Any]]) -> List[Variant]:
+    """Cartesian product of the grid over ``base``; every variant validated."""
+    paths = list(grid)
+    variants: List[Variant] = []
+    seen = set()
+    for values in itertools.product(*(grid[p] for p in paths)):
+        overrides = dict(zip(paths, values))
+        config = copy.deepcopy(base)
+        errors: List[str] = []
+        try:
+            for path, value in overrides.items():
+                set_path(config, path, value)
+        except (KeyError, ValueError, TypeError) as e:
+            errors.append(f"[ERROR] grid: {e}")
+        if not errors:
+            ok, problems = validate_config(config)
+            if not ok:
+                errors = [repr(p) for p in problems if p.severity == "error"]
+        vid = variant_id({"config": config, "overrides": overrides})
+        if vid in seen:
+            continue
+        seen.add(vid)
+        variants.append(Variant(vid, overrides, config, errors))
+    return variants
+
+
+# ==============================================================================
+# WORKERS
+# ==============================================================================
+
+_worker_tape: Optional[ReplayTape] = None
+
+
+def _init_worker(tape_dir: str) -> None:
+    global _worker_tape
+    logging.getLogger("shoonya_platform.strategy_runner").setLevel(logging.WARNING)
+    _worker_tape = ReplayTape.open(tape_dir)
+
+
+def _run_variant(
+    vid: str,
+    overrides: Dict[str, Any],
+    config: Dict[str, Any],
+    fill_model: Optional[FillModel],
+    lot_size: Optional[int],
+) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"id": vid, "overrides": overrides, "pid": os.getpid()}
+    try:
+        assert _worker_tape is not None, "worker not initialised"
+        result = ReplayExecutor(config, _worker_tape, fill_model=fill_model, lot_size=lot_size).run()
+        row.update(result.summary())
+        row["status"] = "ok"
+    except Exception as e:
+        logger.exception("Sweep variant %s failed", vid)
+        row.update(status="failed", error=str(e))
+    return row
+
+
+# ==============================================================================
+# RUNNER
+# ==============================================================================
+
+class SweepRunner:
+    """
+    Args:
+        base_config: strategy config every variant starts from
+        grid: {dotted path: [values]}
+        out_dir: tape, results.jsonl and ranking.csv live here
+        store / start / end: historical store and IST dates to load
+            (not needed when ``tape`` is given or out_dir already has one)
+        workers: process count (default: all cores)
+        rank_by: summary field to rank on, highest first
+    """
+
+    def __init__(
+        self,
+        base_config: Dict[str, Any],
+        grid: Dict[str, Sequence[Any]],
+        out_dir: Union[str, Path],
+        *,
+        store=None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        tape: Optional[ReplayTape] = None,
+        workers: Optional[int] = None,
+        fill_model: Optional[FillModel] = None,
+        lot_size: Optional[int] = None,
+        rank_by: str = "net_pnl",
+        mp_context: str = "spawn",
+    ):
+        self.base_config = base_config
+        self.grid = grid
+        self.out_dir = Path(out_dir)
+        self.store = store
+        self.start = start
+        self.end = end
+        self.tape = tape
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.fill_model = fill_model
+        self.lot_size = lot_size
+        self.rank_by = rank_by
+        self.mp_context = mp_context
+        self.stats: Dict[str, int] = {}
+
+    @property
+    def tape_dir(self) -> Path:
+        return self.out_dir / TAPE_DIR
+
+    @property
+    def results_path(self) -> Path:
+        return self.out_dir / RESULTS_FILE
+
+    def _wanted_identity(self) -> Dict[str, Any]:
+        """Exchange / symbol / dates this run asks for (None = not given)."""
+        if self.tape is not None:
+            return {"exchange": self.tape.exchange, "symbol": self.tape.symbol,
+                    "start": self.tape.start, "end": self.tape.end}
+        identity = self.base_config.get("identity", {})
+        return {
+            "exchange": str(identity.get("exchange") or "").upper() or None,
+            "symbol": str(identity.get("underlying") or "").upper() or None,
+            "start": self.start,
+            "end": (self.end or self.start) if self.start else None,
+        }
+
+    def prepare_tape(self) -> Path:
+        """
+        Save the shared tape once; later runs (resume) reuse it. Results
+        are keyed by variant only, so an existing tape recorded for another
+        underlying or date range is refused instead of silently reused.
+        """
+        manifest_path = self.tape_dir / "tape.json"
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            wanted = self._wanted_identity()
+            for key, value in wanted.items():
+                have = manifest.get(key)
+                if value is None or have is None:
+                    continue
+                if str(value) != str(have):
+                    raise ValueError(
+                        f"{self.out_dir} holds a tape for "
+                        f"{manifest.get('exchange')}:{manifest.get('symbol')} "
+                        f"{manifest.get('start')}..{manifest.get('end')}, not "
+                        f"{wanted['exchange']}:{wanted['symbol']} "
+                        f"{wanted['start']}..{wanted['end']}; use a new out_dir"
+                    )
+            return self.tape_dir
+        tape = self.tape
+        if tape is None:
+            if self.store is None or self.start is None:
+                raise ValueError("SweepRunner needs tape=, an existing tape dir, or store= and start=")
+            identity = self.base_config["identity"]
+            tape = ReplayTape.load(
+                self.store, identity["exchange"], identity["underlying"], self.start, self.end,
+                index_symbols=config_index_symbols(self.base_config),
+            )
+        return tape.save(self.tape_dir)
+
+    def load_results(self) -> Dict[str, Dict[str, Any]]:
+        done: Dict[str, Dict[str, Any]] = {}
+        if not self.results_path.exists():
+            return done
+        with open(self.results_path, "r") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted run
+                done[row["id"]] = row
+        return done
+
+    def _terminate_torn_line(self) -> None:
+        """An interrupted write can leave a partial last line; end it."""
+        if not self.results_path.exists():
+            return
+        with open(self.results_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _append(self, fh, row: Dict[str, Any]) -> None:
+        fh.write(json.dumps(row, default=str) + "\n")
+        fh.flush()
+
+    def run(self) -> List[Dict[str, Any]]:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        variants = expand_grid(self.base_config, self.grid)
+        tape_dir = self.prepare_tape()
+        # failed variants (crash, killed worker) are retried on resume
+        done = {k: r for k, r in self.load_results().items() if r.get("status") != "failed"}
+
+        todo = [v for v in variants if v.is_valid and v.id not in done]
+        invalid = [v for v in variants if not v.is_valid and v.id not in done]
+        self.stats = {
+            "variants": len(variants),
+            "invalid": sum(1 for v in variants if not v.is_valid),
+            "resumed": sum(1 for v in variants if v.id in done),
+            "ran": len(todo),
+        }
+        logger.info("Sweep %s | %s | workers=%d", self.out_dir, self.stats, self.workers)
+
+        self._terminate_torn_line()
+        with open(self.results_path, "a") as fh:
+            for v in invalid:
+                self._append(fh, {"id": v.id, "overrides": v.overrides,
+                                  "status": "invalid", "error": "; ".join(v.errors)})
+            if todo:
+                pool = ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(todo)),
+                    mp_context=multiprocessing.get_context(self.mp_context),
+                    initializer=_init_worker,
+                    initargs=(str(tape_dir),),
+                )
+                try:
+                    futures = {
+                        pool.submit(_run_variant, v.id, v.overrides, v.config,
+                                    self.fill_model, self.lot_size): v
+                        for v in todo
+                    }
+                    for fut in as_completed(futures):
+                        try:
+                            row = fut.result()
+                        except BrokenExecutor as e:
+                            # a worker died (OOM kill, segfault): record the
+                            # variant as failed so resume retries it
+                            v = futures[fut]
+                            logger.error("Sweep variant %s lost: %s", v.id, e)
+                            row = {"id": v.id, "overrides": v.overrides,
+                                   "status": "failed", "error": f"worker died: {e}"}
+                        self._append(fh, row)
+                except BaseException:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+                pool.shutdown()
+
+        table = self.ranking(variants)
+        self.write_ranking(table)
+        return table
+
+    def ranking(self, variants: Optional[List[Variant]] = None) -> List[Dict[str, Any]]:
+        """Ranked rows for ``variants`` (default: the current grid)."""
+        if variants is None:
+            variants = expand_grid(self.base_config, self.grid)
+        done = self.load_results()
+        rows = [done[v.id] for v in variants if v.id in done]
+        ok = [r for r in rows if r.get("status") == "ok"]
+        ok.sort(key=lambda r: r.get(self.rank_by, 0.0), reverse=True)
+        rest = [r for r in rows if r.get("status") != "ok"]
+        for i, r in enumerate(ok, 1):
+            r["rank"] = i
+        return ok + rest
+
+    def write_ranking(self, table: List[Dict[str, Any]]) -> Path:
+        path = self.out_dir / RANKING_FILE
+        params = list(self.grid)
+        cols = ["rank", "id", *params, "net_pnl", "max_drawdown", "trades",
+                "errors", "elapsed_sec", "status", "error"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(cols)
+            for r in table:
+                overrides = r.get("overrides", {})
+                writer.writerow([
+                    overrides.get(c) if c in params else r.get(c, "")
+                    for c in cols
+                ])
+        return path
+
+
+def format_table(table: List[Dict[str, Any]], limit: int = 20) -> str:
+    lines = []
+    for r in table[:limit]:
+        params = ", ".join(f"{k}={v}" for k, v in r.get("overrides", {}).items())
+        if r.get("status") == "ok":
+            lines.append(f"{r['rank']:>4}  {r['net_pnl']:>12.2f}  dd {r['max_drawdown']:>10.2f}  "
+                         f"trades {r['trades']:>3}  {params}")
+        else:
+            lines.append(f"   -  {r.get('status', '?'):>12}  {params}  {r.get('error', '')}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from shoonya_platform.analytics.sqlite_historical_store import SQLiteHistoricalStore
+
+    parser = argparse.ArgumentParser(description="Parameter sweep over replayed days")
+    parser.add_argument("--db", required=True, help="historical analytics SQLite file")
+    parser.add_argument("--config", required=True, help="base strategy JSON config")
+    parser.add_argument("--grid", required=True, help="JSON {dotted.path: [values]}")
+    parser.add_argument("--date", required=True, help="first trading day (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last trading day (default: --date)")
+    parser.add_argument("--out", required=True, help="sweep directory (re-run to resume)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rank-by", default="net_pnl")
+    parser.add_argument("--slippage-pct", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    with open(args.config, "r") as f:
+        base = json.load(f)
+    with open(args.grid, "r") as f:
+        grid = json.load(f)
+    runner = SweepRunner(
+        base, grid, args.out,
+        store=SQLiteHistoricalStore(args.db),
+        start=date.fromisoformat(args.date),
+        end=date.fromisoformat(args.end) if args.end else None,
+        workers=args.workers,
+        fill_model=FillModel(slippage_pct=args.slippage_pct),
+        rank_by=args.rank_by,
+    )
+    table = runner.run()
+    print(format_table(table))
+    print(json.dumps(runner.stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,7 @@ Includes all original functions + fixes for IV calculation.
 
 import math
 import numpy as np
+from scipy.special import ndtr
 from scipy.stats import norm
 from datetime import datetime
 
@@ -408,3 +409,219 @@ def implied_volatility(
         pass
 
     return None
+
+
+# =============================================================================
+# VECTORIZED ENGINE (WHOLE-CHAIN)
+# =============================================================================
+# Same model and conventions as the scalar functions above, evaluated on
+# NumPy arrays: one call prices / solves every strike of a chain side.
+#   - S, T, r, q are shared scalars; K, prices, sigma are arrays
+#   - is_call is a bool (whole side) or a bool array (mixed CE/PE)
+#   - missing / unsolvable entries are NaN (scalar path returns None)
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def _npdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def _d1_d2(S, K, T, r, sigma, q):
+    sqrt_T = math.sqrt(T)
+    vol_sqrt_T = sigma * sqrt_T
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / vol_sqrt_T
+    return d1, d1 - vol_sqrt_T, sqrt_T
+
+
+def bs_price_vec(S, K, T, r, sigma, is_call=True, q=0.0):
+    """
+    Vectorized bs_price().
+
+    Returns an array of option prices; 0.0 where inputs are invalid
+    (same convention as the scalar function).
+    """
+    K = np.asarray(K, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+    if T <= 0 or S <= 0:
+        return np.zeros(np.broadcast(K, sigma).shape)
+
+    with np.errstate(all="ignore"):
+        d1, d2, _ = _d1_d2(S, K, T, r, sigma, q)
+        s_fwd = S * math.exp(-q * T)
+        k_disc = K * math.exp(-r * T)
+        call = s_fwd * ndtr(d1) - k_disc * ndtr(d2)
+        put = k_disc * ndtr(-d2) - s_fwd * ndtr(-d1)
+        price = np.where(is_call, call, put)
+
+    invalid = (sigma <= 0) | (K <= 0) | ~np.isfinite(price)
+    return np.where(invalid, 0.0, price)
+
+
+def bs_greeks_vec(S, K, T, r, sigma, is_call=True, q=0.0):
+    """
+    Vectorized bs_greeks().
+
+    Returns a dict of arrays: delta, gamma, theta, vega, rho (same units
+    as the scalar function: theta per day, vega/rho per 1%).
+    """
+    K = np.asarray(K, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+    shape = np.broadcast(K, sigma).shape
+    if T <= 0 or S <= 0:
+        zeros = np.zeros(shape)
+        return dict(delta=zeros, gamma=zeros, theta=zeros, vega=zeros, rho=zeros)
+
+    with np.errstate(all="ignore"):
+        d1, d2, sqrt_T = _d1_d2(S, K, T, r, sigma, q)
+        pdf = _npdf(d1)
+        eq_T = math.exp(-q * T)
+        er_T = math.exp(-r * T)
+
+        nd1 = ndtr(d1)
+        nd2 = ndtr(d2)
+        n_d1 = 1.0 - nd1
+        n_d2 = 1.0 - nd2
+
+        decay = -S * eq_T * pdf * sigma / (2 * sqrt_T)
+        delta = np.where(is_call, eq_T * nd1, -eq_T * n_d1)
+        gamma = eq_T * pdf / (S * sigma * sqrt_T)
+        vega = S * eq_T * pdf * sqrt_T / 100
+        theta = np.where(
+            is_call,
+            decay + q * S * eq_T * nd1 - r * K * er_T * nd2,
+            decay - q * S * eq_T * n_d1 + r * K * er_T * n_d2,
+        ) / 365
+        rho = np.where(
+            is_call,
+            K * T * er_T * nd2,
+            -K * T * er_T * n_d2,
+        ) / 100
+
+    invalid = (sigma <= 0) | (K <= 0) | ~np.isfinite(gamma)
+    out = {}
+    for name, arr in (("delta", delta), ("gamma", gamma), ("theta", theta),
+                      ("vega", vega), ("rho", rho)):
+        out[name] = np.where(invalid, 0.0, np.broadcast_to(arr, shape))
+    return out
+
+
+def implied_volatility_vec(
+    market_prices,
+    S,
+    K,
+    T,
+    r,
+    is_call=True,
+    max_iterations=100,
+    tolerance=1e-5,
+    q=0.0,
+    sigma_low=1e-4,
+    sigma_high=5.0,
+):
+    """
+    Vectorized implied_volatility().
+
+    Safeguarded Newton on every option at once: each element keeps a
+    [low, high] volatility bracket and falls back to the bracket midpoint
+    whenever its Newton step is non-finite or leaves the bracket, so every
+    element that has a solution converges (Newton speed near the root,
+    bisection robustness elsewhere).
+
+    Eligibility, acceptance and output format match the scalar solver:
+    IV in percent rounded to 2 decimals, limited to 0.1%..500%.
+
+    Returns:
+        Array of IVs (percent); NaN where no IV exists.
+    """
+    prices = np.asarray(market_prices, dtype=np.float64)
+    K = np.broadcast_to(np.asarray(K, dtype=np.float64), prices.shape)
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), prices.shape)
+    out = np.full(prices.shape, np.nan)
+
+    if S <= 0 or T < 1e-9:
+        return out
+
+    with np.errstate(invalid="ignore"):
+        intrinsic = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+        candidate = (
+            np.isfinite(prices) & (prices > 0)
+            & np.isfinite(K) & (K > 0)
+            & (prices > intrinsic * 1.01)  # Must have time value
+        )
+    idx = np.flatnonzero(candidate)
+    if idx.size == 0:
+        return out
+
+    price = prices[idx]
+    k = K[idx]
+    call = is_call[idx]
+    n = idx.size
+
+    lo = np.full(n, sigma_low)
+    hi = np.full(n, sigma_high)
+
+    # Price is increasing in sigma: a solution exists iff it is bracketed
+    active = (
+        (bs_price_vec(S, k, T, r, lo, call, q) <= price)
+        & (bs_price_vec(S, k, T, r, hi, call, q) >= price)
+    )
+    converged = np.zeros(n, dtype=bool)
+
+    # Loop invariants (whole arrays per iteration; no per-element gathers)
+    sqrt_T = math.sqrt(T)
+    s_fwd = S * math.exp(-q * T)
+    k_disc = k * math.exp(-r * T)
+    log_sk = np.log(S / k)
+    drift = (r - q) * T
+
+    # Solve on the out-of-the-money side via put-call parity (same sigma,
+    # same price error): its price is pure time value, so Newton on
+    # ln(price) converges in a handful of steps even for deep wings.
+    otm_call = k_disc >= s_fwd
+    target = price + np.where(
+        otm_call == call, 0.0, np.where(call, k_disc - s_fwd, s_fwd - k_disc)
+    )
+    log_target = np.log(np.where(target > 0, target, np.nan))
+    parity = np.where(otm_call, 0.0, k_disc - s_fwd)
+
+    # Initial guess: Brenner-Subrahmanyam on the OTM price. The 10% floor
+    # keeps wing strikes from starting where their price underflows.
+    sigma = np.clip(math.sqrt(2 * math.pi / T) * (target / S), 0.10, 2.0)
+
+    with np.errstate(all="ignore"):
+        for _ in range(max_iterations):
+            if not active.any():
+                break
+
+            vol_sqrt_T = sigma * sqrt_T
+            d1 = (log_sk + drift + 0.5 * vol_sqrt_T * vol_sqrt_T) / vol_sqrt_T
+            model = s_fwd * ndtr(d1) - k_disc * ndtr(d1 - vol_sqrt_T) + parity
+            vega = s_fwd * _npdf(d1) * sqrt_T
+            diff = model - target
+
+            # Shrink bracket around the root
+            above = diff > 0
+            hi = np.where(above, sigma, hi)
+            lo = np.where(above, lo, sigma)
+
+            # Newton step on ln(price); geometric bisection when it is
+            # non-finite or leaves the bracket
+            step = sigma - (np.log(model) - log_target) * model / vega
+            step = np.where((step > lo) & (step < hi), step, np.sqrt(lo * hi))
+
+            finished = (np.abs(diff) < tolerance) | ((hi - lo) < 1e-12)
+            converged |= active & finished
+            active &= ~finished
+            sigma = np.where(active, step, sigma)
+
+    # Max iterations reached: accept if within 2% of market price (scalar rule)
+    leftover = np.flatnonzero(active)
+    if leftover.size:
+        model = bs_price_vec(S, k[leftover], T, r, sigma[leftover], call[leftover], q)
+        converged[leftover] = np.abs(model - price[leftover]) < price[leftover] * 0.02
+
+    result = sigma * 100
+    ok = converged & (result >= 0.1) & (result <= 500)
+    out[idx[ok]] = np.round(result[ok], 2)
+    return out
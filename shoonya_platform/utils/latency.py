@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Latency histogram
+=================
+
+Fixed log-spaced buckets (milliseconds) with count / sum / max, cheap to
+record from hot paths and safe to read from API threads. Percentiles are
+estimated from bucket upper bounds (clamped to the observed max).
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# Upper bounds in ms; the last bucket is open-ended
+DEFAULT_BUCKETS_MS: Sequence[float] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1_000, 2_500, 5_000, 10_000, 30_000,
+)
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram (observe in seconds, report in ms)."""
+
+    def __init__(self, buckets_ms: Optional[Sequence[float]] = None):
+        self._bounds: List[float] = list(buckets_ms or DEFAULT_BUCKETS_MS)
+        self._counts: List[int] = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        ms = max(0.0, seconds * 1000.0)
+        i = bisect.bisect_left(self._bounds, ms)
+        with self._lock:
+            self._counts[i] += 1
+            self._count += 1
+            self._sum_ms += ms
+            if ms > self._max_ms:
+                self._max_ms = ms
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def _percentile(self, counts: List[int], total: int, max_ms: float, q: float) -> float:
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            seen += n
+            if n and seen >= rank:
+                bound = self._bounds[i] if i < len(self._bounds) else max_ms
+                return min(bound, max_ms)
+        return max_ms
+
+    def snapshot(self) -> Dict[str, object]:
+        """count, avg/max/p50/p95/p99 (ms) and non-empty bucket counts."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            sum_ms = self._sum_ms
+            max_ms = self._max_ms
+        if not total:
+            return {"count": 0, "avg_ms": None, "max_ms": None,
+                    "p50_ms": None, "p95_ms": None, "p99_ms": None, "buckets": {}}
+        buckets = {}
+        for i, n in enumerate(counts):
+            if n:
+                label = f"le_{self._bounds[i]:g}ms" if i < len(self._bounds) else "inf"
+                buckets[label] = n
+        return {
+            "count": total,
+            "avg_ms": round(sum_ms / total, 3),
+            "max_ms": round(max_ms, 3),
+            "p50_ms": round(self._percentile(counts, total, max_ms, 0.50), 3),
+            "p95_ms": round(self._percentile(counts, total, max_ms, 0.95), 3),
+            "p99_ms": round(self._percentile(counts, total, max_ms, 0.99), 3),
+            "buckets": buckets,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self._bounds) + 1)
+            self._count = 0
+            self._sum_ms = 0.0
+            self._max_ms = 0.0
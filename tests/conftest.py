@@ -1,9 +1,15 @@
 import pytest
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock
 
+# Tests never write into the package tree: one throwaway orders DB per run,
+# set before shoonya_platform.persistence.database resolves its path.
+_ORDERS_DB_DIR = tempfile.mkdtemp(prefix="orders-db-")
+os.environ["ORDERS_DB_PATH"] = os.path.join(_ORDERS_DB_DIR, "orders.db")
+
 from shoonya_platform.execution.order_watcher import OrderWatcherEngine
 from shoonya_platform.risk.supreme_risk import SupremeRiskManager
 from shoonya_platform.execution.intent import UniversalOrderCommand
@@ -20,6 +26,28 @@ collect_ignore = [
     "test_webhook.py",        # Standalone webhook test script
 ]
 
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", default=False,
+        help="Run @pytest.mark.benchmark latency / throughput measurements",
+    )
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_ORDERS_DB_DIR, ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    # Wall-clock comparisons depend on the machine: opt-in only
+    if config.getoption("--benchmark") or os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with --benchmark or RUN_BENCHMARKS=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 # Global temp directory for test state files
 _TEST_TEMP_DIR = tempfile.mkdtemp(prefix="shoonya_test_")
 
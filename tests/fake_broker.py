@@ -1,19 +1,39 @@
+import threading
+import time
+
+
 class FakeBroker:
-    def __init__(self):
+    def __init__(self, latency=None):
         self.positions = []
         self.orders = []
         self.ltp = {}
+        # Injected per-method latency in seconds, e.g. {"get_order_book": 0.3}
+        self.latency = dict(latency or {})
+        self.call_log = []  # (method, start, end)
+        self._calls_lock = threading.Lock()
+
+    def _simulate(self, method):
+        start = time.monotonic()
+        delay = self.latency.get(method, 0.0)
+        if delay:
+            time.sleep(delay)
+        with self._calls_lock:
+            self.call_log.append((method, start, time.monotonic()))
 
     def get_positions(self):
+        self._simulate("get_positions")
         return self.positions
 
     def get_order_book(self):
+        self._simulate("get_order_book")
         return self.orders
 
     def get_ltp(self, exch, symbol):
+        self._simulate("get_ltp")
         return self.ltp.get(symbol)
 
     def place_order(self, params):
+        self._simulate("place_order")
         self.orders.append({
             "norenordno": f"OID{len(self.orders)}",
             "status": "COMPLETE"
@@ -25,4 +45,4 @@ class FakeBroker:
                 self.order_id = order_id
                 self.error_message = None
 
-        return Result(self.orders[-1]["norenordno"]) 
+        return Result(self.orders[-1]["norenordno"])
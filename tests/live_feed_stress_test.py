@@ -1,5 +1,12 @@
 """
-Simple stress test for live_feed per-token locking and janitor.
+Stress test + benchmark for the live_feed tick store.
+
+Writers hammer event_handler_feed_update() from several threads while a
+reader polls the store like OptionChainData does. Reports ingest
+throughput, per-tick latency percentiles and reader pull cost, for the
+v3.2 TickStore and for the v3.1 path (TTLCache + three locks per tick +
+full-store copy on every read) reproduced inline as the baseline.
+
 Run as: python -m tests.live_feed_stress_test
 """
 import sys
@@ -13,43 +20,148 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from cachetools import TTLCache
+
 from shoonya_platform.market_data.feeds import live_feed
 
 NUM_THREADS = 8
-TICKS_PER_THREAD = 2000
-TOKENS = [str(10000 + i) for i in range(200)]
-
-latencies = []
-
-
-def worker(tid):
-    start = time.time()
-    for i in range(TICKS_PER_THREAD):
-        tk = random.choice(TOKENS)
-        tick = {
-            "tk": f"NFO|{tk}",
-            "lp": round(1000 + random.random() * 50, 2),
-            "v": random.randint(1, 1000),
-            "oi": random.randint(0, 10000),
-            "ft": int(time.time() * 1000),
-        }
-        s = time.time()
-        live_feed.event_handler_feed_update(tick)
-        latencies.append(time.time() - s)
-    dur = time.time() - start
-    print(f"Thread {tid} done in {dur:.2f}s")
-
-
-threads = []
-for t in range(NUM_THREADS):
-    th = threading.Thread(target=worker, args=(t,))
-    th.start()
-    threads.append(th)
-
-for th in threads:
-    th.join()
-
-print("All threads completed")
-print("Total tokens stored:", len(live_feed.get_all_tick_data()))
-print("Feed stats:", live_feed.get_feed_stats())
-print(f"Avg process latency per tick: {sum(latencies)/len(latencies):.6f}s")
+TICKS_PER_THREAD = 5000
+TOKENS = [str(10000 + i) for i in range(2000)]
+CHAIN_TOKENS = TOKENS[:300]          # what one option chain pulls
+READER_INTERVAL = 0.005              # 200 pulls / second
+
+
+class LegacyFeed:
+    """v3.1 tick path: merge under store lock, heartbeat + counter locks, copying reads."""
+
+    def __init__(self):
+        self.store = TTLCache(maxsize=10_000, ttl=300)
+        self.store_lock = threading.RLock()
+        self.state_lock = threading.Lock()
+        self.counter_lock = threading.Lock()
+        self.counter = 0
+        self.last_tick = None
+
+    def on_tick(self, tick_data):
+        token = live_feed._normalize_token_key(tick_data["tk"])
+        normalized = live_feed.normalize_tick(tick_data)
+        with self.store_lock:
+            existing = self.store.get(token, {})
+            existing.update(normalized)
+            self.store[token] = existing
+        with self.state_lock:
+            self.last_tick = time.time()
+        with self.counter_lock:
+            self.counter += 1
+
+    def pull(self, cursor):
+        # OptionChainData pulled every chain token, every time
+        with self.store_lock:
+            out = {}
+            for t in CHAIN_TOKENS:
+                if t in self.store:
+                    out[t] = self.store[t].copy()
+        return cursor, out
+
+    def total(self):
+        return self.counter
+
+
+class CurrentFeed:
+    """v3.2 live_feed module: single store lock, seq cursor pulls."""
+
+    def __init__(self):
+        live_feed.reset_all_state()
+        self.on_tick = live_feed.event_handler_feed_update
+
+    def pull(self, cursor):
+        return live_feed.get_ticks_since(cursor, CHAIN_TOKENS)
+
+    def total(self):
+        return live_feed.get_feed_stats()["total_ticks_received"]
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(feed, seed=7):
+    random.seed(seed)
+    latencies = [[] for _ in range(NUM_THREADS)]
+    pulls = []
+    pulled_ticks = [0]
+    done = threading.Event()
+
+    def writer(tid):
+        lat = latencies[tid]
+        rnd = random.Random(seed + tid)
+        for _ in range(TICKS_PER_THREAD):
+            tick = {
+                "tk": f"NFO|{rnd.choice(TOKENS)}",
+                "lp": round(1000 + rnd.random() * 50, 2),
+                "v": rnd.randint(1, 1000),
+                "oi": rnd.randint(0, 10000),
+                "ft": int(time.time()),
+            }
+            s = time.perf_counter()
+            feed.on_tick(tick)
+            lat.append(time.perf_counter() - s)
+
+    def reader():
+        cursor = 0
+        while not done.is_set():
+            s = time.perf_counter()
+            cursor, ticks = feed.pull(cursor)
+            pulls.append(time.perf_counter() - s)
+            pulled_ticks[0] += len(ticks)
+            time.sleep(READER_INTERVAL)
+
+    rd = threading.Thread(target=reader)
+    rd.start()
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(NUM_THREADS)]
+    start = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    rd.join()
+
+    flat = [x for lat in latencies for x in lat]
+    total = NUM_THREADS * TICKS_PER_THREAD
+    assert feed.total() == total, "ticks lost"
+    return {
+        "ticks": total,
+        "elapsed_s": elapsed,
+        "ticks_per_s": total / elapsed,
+        "p50_us": _pct(flat, 0.50) * 1e6,
+        "p99_us": _pct(flat, 0.99) * 1e6,
+        "max_us": max(flat) * 1e6,
+        "pulls": len(pulls),
+        "pull_avg_us": sum(pulls) / max(len(pulls), 1) * 1e6,
+        "pull_p99_us": _pct(pulls, 0.99) * 1e6 if pulls else 0.0,
+        "ticks_per_pull": pulled_ticks[0] / max(len(pulls), 1),
+    }
+
+
+def _report(name, r):
+    print(
+        f"{name:<18} {r['ticks_per_s']:>10,.0f} ticks/s | "
+        f"tick p50={r['p50_us']:6.1f}us p99={r['p99_us']:7.1f}us max={r['max_us']:8.1f}us | "
+        f"pull avg={r['pull_avg_us']:7.1f}us p99={r['pull_p99_us']:7.1f}us "
+        f"({r['ticks_per_pull']:.0f} ticks/pull, {r['pulls']} pulls)"
+    )
+
+
+if __name__ == "__main__":
+    print(f"{NUM_THREADS} writer threads x {TICKS_PER_THREAD} ticks, "
+          f"{len(TOKENS)} tokens, reader pulling {len(CHAIN_TOKENS)} chain tokens")
+    legacy = run(LegacyFeed())
+    current = run(CurrentFeed())
+    _report("v3.1 TTLCache", legacy)
+    _report("v3.2 TickStore", current)
+    print(f"Throughput: {current['ticks_per_s'] / legacy['ticks_per_s']:.2f}x | "
+          f"pull cost: {legacy['pull_avg_us'] / max(current['pull_avg_us'], 1e-9):.2f}x cheaper")
+    print("Feed stats:", live_feed.get_feed_stats())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Broker access lanes: a slow order-book read no longer blocks order
+placement, each lane is bounded, the shared sliding-window limiter gives
+orders priority, and login drains every lane.
+"""
+
+import threading
+import time
+
+import pytest
+
+from shoonya_platform.brokers.lanes import BrokerLanes, SlidingWindowRateLimiter
+from shoonya_platform.execution.trading_bot import ShoonyaApiProxy
+from shoonya_platform.utils.latency import LatencyHistogram
+
+from .fake_broker import FakeBroker
+
+
+class LaggyBroker(FakeBroker):
+    def ensure_session(self):
+        return True
+
+    def login(self):
+        self._simulate("login")
+        return True
+
+
+class SerializedProxy(ShoonyaApiProxy):
+    """The previous behaviour: every call behind one RLock."""
+
+    def __init__(self, client):
+        super().__init__(client)
+        self._lock = threading.RLock()
+
+    def _call(self, name, *args, **kwargs):
+        with self._lock:
+            return self._invoke(name, *args, **kwargs)
+
+
+class GatedBroker(LaggyBroker):
+    """Gated methods block inside the broker until the test releases them."""
+
+    def __init__(self, gated=()):
+        super().__init__()
+        self.gates = {m: threading.Event() for m in gated}
+        self.entered = {m: 0 for m in gated}
+
+    def _simulate(self, method):
+        if method in self.gates:
+            with self._calls_lock:
+                self.entered[method] += 1
+            assert self.gates[method].wait(5), f"{method} never released"
+        super()._simulate(method)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.002)
+    return False
+
+
+def _place_during_read(proxy, broker):
+    """Place an order while get_order_book is held inside the broker."""
+    reader = threading.Thread(target=proxy.get_order_book)
+    reader.start()
+    assert _wait_until(lambda: broker.entered["get_order_book"] == 1)
+    placer = threading.Thread(target=proxy.place_order, args=({"tsym": "NIFTY"},))
+    placer.start()
+    placer.join(timeout=0.2)
+    placed_during_read = not placer.is_alive()
+    broker.gates["get_order_book"].set()
+    reader.join()
+    placer.join()
+    return placed_during_read
+
+
+def test_slow_order_book_does_not_block_place_order():
+    # before: one lock for every call, the order waits for the read
+    old = GatedBroker(gated={"get_order_book"})
+    assert not _place_during_read(SerializedProxy(old), old)
+    assert [name for name, _, _ in old.call_log] == ["get_order_book", "place_order"]
+
+    broker = GatedBroker(gated={"get_order_book"})
+    proxy = ShoonyaApiProxy(broker)
+    assert _place_during_read(proxy, broker)
+    assert [name for name, _, _ in broker.call_log] == ["place_order", "get_order_book"]
+    lanes = proxy.get_lane_stats()["lanes"]
+    assert lanes["orders"]["calls"] == 1 and lanes["reads"]["calls"] == 1
+
+
+def _order_latency_during_slow_reads(proxy, n=5):
+    hist = LatencyHistogram()
+    for _ in range(n):
+        reader = threading.Thread(target=proxy.get_order_book)
+        reader.start()
+        time.sleep(0.02)  # order book read now in flight
+        started = time.perf_counter()
+        proxy.place_order({"tsym": "NIFTY"})
+        hist.observe(time.perf_counter() - started)
+        reader.join()
+    return hist.snapshot()
+
+
+@pytest.mark.benchmark
+def test_place_order_latency_during_slow_reads():
+    latency = {"get_order_book": 0.2, "place_order": 0.01}
+    before = _order_latency_during_slow_reads(SerializedProxy(LaggyBroker(latency)))
+    after = _order_latency_during_slow_reads(ShoonyaApiProxy(LaggyBroker(latency)))
+
+    print(f"\nplace_order during slow get_order_book  before: p50={before['p50_ms']}ms "
+          f"max={before['max_ms']}ms  after: p50={after['p50_ms']}ms max={after['max_ms']}ms")
+    assert before["p50_ms"] >= 150
+    assert after["max_ms"] < 100
+
+
+def test_lane_concurrency_is_bounded():
+    broker = GatedBroker(gated={"get_order_book", "get_ltp"})
+    proxy = ShoonyaApiProxy(broker, lane_limits={"reads": 2, "quotes": 3})
+    threads = [threading.Thread(target=proxy.get_order_book) for _ in range(6)]
+    threads += [threading.Thread(target=proxy.get_ltp, args=("NSE", "X")) for _ in range(6)]
+    for t in threads:
+        t.start()
+    # the first pair / triple is inside the broker, the rest queue in the lane
+    assert _wait_until(lambda: broker.entered == {"get_order_book": 2, "get_ltp": 3})
+    lanes = proxy.get_lane_stats()["lanes"]
+    assert lanes["reads"]["in_flight"] == 2 and lanes["quotes"]["in_flight"] == 3
+    for gate in broker.gates.values():
+        gate.set()
+    for t in threads:
+        t.join()
+    lanes = proxy.get_lane_stats()["lanes"]
+    assert lanes["reads"]["max_in_flight"] == 2 and lanes["reads"]["calls"] == 6
+    assert lanes["quotes"]["max_in_flight"] == 3 and lanes["quotes"]["calls"] == 6
+
+
+class _ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter_reserves_slots_for_orders():
+    clock = _ManualClock()
+    limiter = SlidingWindowRateLimiter(5, window_sec=0.25, priority_reserve=1, clock=clock)
+    limiter.acquire()
+    clock.now = 0.125
+    for _ in range(3):
+        limiter.acquire()
+    # Reads are now throttled but an order still gets the reserved slot
+    limiter.acquire(priority=True)
+    assert limiter.get_stats()["throttled"] == 0
+
+    read = threading.Thread(target=limiter.acquire)
+    read.start()
+    assert _wait_until(lambda: limiter.waiting() == 1)
+    order = threading.Thread(target=limiter.acquire, kwargs={"priority": True})
+    order.start()                    # arrives later ...
+    assert _wait_until(lambda: limiter.waiting() == 2)
+
+    clock.now = 0.25                 # one slot leaves the window
+    order.join(timeout=5)
+    assert not order.is_alive()      # ... and is served first
+    assert read.is_alive() and limiter.waiting() == 1
+
+    clock.now = 0.375
+    read.join(timeout=5)
+    assert not read.is_alive()
+    stats = limiter.get_stats()
+    assert stats["acquired"] == 7 and stats["priority_acquired"] == 2
+    assert stats["throttled"] == 2 and stats["waiting"] == 0
+
+
+def test_shared_limiter_spans_lanes():
+    limiter = SlidingWindowRateLimiter(4, window_sec=0.5)
+    proxy = ShoonyaApiProxy(LaggyBroker(), rate_limiter=limiter)
+    for _ in range(2):
+        proxy.get_order_book()
+        proxy.get_ltp("NSE", "X")
+    assert limiter.calls_in_window() == 4   # both lanes draw on one budget
+    assert limiter.get_stats()["throttled"] == 0
+    proxy.get_order_book()                  # 5th call in the window waits
+    proxy.get_ltp("NSE", "X")
+    stats = proxy.get_lane_stats()["rate_limiter"]
+    assert stats["acquired"] == 6 and stats["throttled"] >= 1
+
+
+def test_login_drains_lanes():
+    broker = GatedBroker(gated={"get_order_book"})
+    proxy = ShoonyaApiProxy(broker)
+    reader = threading.Thread(target=proxy.get_order_book)
+    reader.start()
+    assert _wait_until(lambda: broker.entered["get_order_book"] == 1)
+    login = threading.Thread(target=proxy.login)
+    login.start()
+    login.join(timeout=0.2)
+    assert login.is_alive()          # waits for the read in flight
+    broker.gates["get_order_book"].set()
+    reader.join()
+    login.join()
+    assert [name for name, _, _ in broker.call_log] == ["get_order_book", "login"]
+
+
+def test_nested_call_in_same_lane_does_not_deadlock():
+    class Nested(LaggyBroker):
+        def get_account_info(self):
+            return {"positions": proxy.get_positions()}
+
+    broker = Nested()
+    broker.positions = [{"tsym": "X"}]
+    proxy = ShoonyaApiProxy(broker, lane_limits={"reads": 1})
+    done = []
+    t = threading.Thread(target=lambda: done.append(proxy.get_account_info()))
+    t.start()
+    t.join(timeout=2)
+    assert done == [{"positions": [{"tsym": "X"}]}]
+
+
+def test_lanes_count_errors():
+    lanes = BrokerLanes()
+
+    def boom():
+        raise ValueError("x")
+
+    try:
+        lanes.run("cancel_order", boom)
+    except ValueError:
+        pass
+    assert lanes.get_stats()["lanes"]["orders"]["errors"] == 1
+    assert lanes.get_stats()["lanes"]["orders"]["in_flight"] == 0
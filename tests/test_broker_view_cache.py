@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+BrokerView single-flight cache: freshness contract (max_age), one shared
+REST call for concurrent misses with the lock released during I/O,
+invalidation on order events, and per-consumer counters.
+"""
+
+import threading
+import time
+
+import pytest
+
+from shoonya_platform.api.dashboard.services.broker_service import BrokerView, read_broker
+
+from .fake_broker import FakeBroker
+
+
+class CountingBroker(FakeBroker):
+    def __init__(self, latency=None):
+        super().__init__(latency)
+        self.fail = False
+
+    def get_positions(self):
+        self._simulate("get_positions")
+        if self.fail:
+            raise RuntimeError("BROKER_DOWN")
+        return list(self.positions)
+
+    def rest_calls(self, method="get_positions"):
+        return sum(1 for name, _, _ in self.call_log if name == method)
+
+
+@pytest.fixture
+def broker():
+    b = CountingBroker({"get_positions": 0.1, "get_order_book": 0.1})
+    b.positions = [{"tsym": "NIFTY", "netqty": 25}]
+    return b
+
+
+def _run_concurrently(fn, n):
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(fn())) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return out
+
+
+def test_concurrent_misses_share_one_request(broker):
+    view = BrokerView(broker)
+    results = _run_concurrently(lambda: view.get_positions(consumer="strategy"), 10)
+    assert broker.rest_calls() == 1
+    assert all(r == broker.positions for r in results)
+    stats = view.get_cache_stats()["consumers"]["strategy"]
+    assert stats["misses"] == 1 and stats["coalesced"] == 9
+
+
+class GatedBroker(CountingBroker):
+    """get_positions blocks until the test opens the gate."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def get_positions(self):
+        self.entered.set()
+        assert self.gate.wait(timeout=10)
+        return super().get_positions()
+
+
+def test_lock_not_held_during_io():
+    broker = GatedBroker()
+    view = BrokerView(broker)
+    reader = threading.Thread(target=view.get_positions)
+    reader.start()
+    try:
+        assert broker.entered.wait(timeout=10)  # positions fetch in flight
+        # both need the view lock: they would block behind the gated fetch
+        view.get_cache_stats()
+        view.invalidate_cache("limits")
+        assert reader.is_alive() and broker.rest_calls() == 0
+    finally:
+        broker.gate.set()
+        reader.join()
+    assert broker.rest_calls() == 1
+
+
+def test_max_age_contract(broker):
+    view = BrokerView(broker, cache_ttl=5.0)
+    view.get_positions()
+    view.get_positions(max_age=5.0)
+    assert broker.rest_calls() == 1
+    time.sleep(0.05)
+    view.get_positions(max_age=0.01)  # older than 10 ms → refetch
+    assert broker.rest_calls() == 2
+    view.get_positions(force_refresh=True)  # legacy spelling of max_age=0
+    assert broker.rest_calls() == 3
+
+
+def test_fresh_request_does_not_join_older_flight(broker):
+    view = BrokerView(broker)
+    first = threading.Thread(target=view.get_positions)
+    first.start()
+    time.sleep(0.03)
+    view.get_positions(max_age=0.0)  # flight started before → needs its own
+    first.join()
+    assert broker.rest_calls() == 2
+
+
+def test_order_events_invalidate_including_inflight(broker):
+    view = BrokerView(broker, cache_ttl=60.0)
+    view.get_positions()
+    view.on_order_event("filled")
+    view.get_positions()
+    assert broker.rest_calls() == 2
+
+    # A fetch that started before the fill must not be served afterwards
+    slow = threading.Thread(target=view.get_positions, kwargs={"max_age": 0.0})
+    slow.start()
+    time.sleep(0.03)
+    view.on_order_event("placed")
+    slow.join()
+    view.get_positions()
+    assert broker.rest_calls() == 4
+
+
+def test_stale_fallback_is_opt_out(broker):
+    view = BrokerView(broker)
+    view.get_positions()
+    broker.fail = True
+    assert view.get_positions(max_age=0.0) == broker.positions
+    with pytest.raises(RuntimeError):
+        view.get_positions(max_age=0.0, consumer="risk_manager", allow_stale=False)
+    assert view.get_cache_stats()["consumers"]["risk_manager"]["errors"] == 1
+
+
+def test_consumers_share_reads(broker):
+    """Strategy reconcile + watcher + RMS polling the same second → 1 REST call."""
+    view = BrokerView(broker)
+    bot = type("Bot", (), {"broker_view": view, "api": broker})()
+    for _ in range(5):
+        view.get_positions(max_age=1.0, consumer="strategy_reconcile")
+        read_broker(bot, "positions", max_age=0.5, consumer="order_watcher")
+        read_broker(bot, "positions", max_age=1.0, consumer="risk_manager", allow_stale=False)
+    stats = view.get_cache_stats()
+    assert broker.rest_calls() == 1
+    assert stats["rest_calls"]["positions"] == 1
+    assert set(stats["consumers"]) == {"strategy_reconcile", "order_watcher", "risk_manager"}
+    assert stats["consumers"]["order_watcher"]["hits"] == 5
+
+
+def test_read_broker_without_view_calls_api(broker):
+    bot = type("Bot", (), {"api": broker})()
+    assert read_broker(bot, "positions") == broker.positions
+    assert read_broker(bot, "orders") == []
+
+
+def test_read_returns_copies_and_rejects_unknown_targets(broker):
+    view = BrokerView(broker)
+    first = view.read("positions", consumer="order_watcher")
+    first.append({"tsym": "MUTATED"})
+    assert view.read("positions", consumer="order_watcher") == broker.positions
+    assert broker.rest_calls() == 1
+    with pytest.raises(ValueError):
+        view.read("margins")
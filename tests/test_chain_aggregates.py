@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+MarketReader chain aggregates: the prefix-sum max pain / PCR inflection
+must match the old strike x strike loops, and readers on the same chain
+share one computation per snapshot.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from shoonya_platform.market_data.option_chain.snapshot_bus import get_snapshot_bus
+from shoonya_platform.market_data.option_chain.store import OptionChainStore
+from shoonya_platform.strategy_runner import market_reader as mr
+from shoonya_platform.strategy_runner.market_reader import (
+    MarketReader,
+    compute_chain_aggregates,
+)
+
+from tests.test_snapshot_bus import EXPIRY, KEY, FakeChain
+
+
+def _reference_max_pain(strikes, types, oi):
+    """The previous O(n^2) loop."""
+    ce, pe = {}, {}
+    for k, t, o in zip(strikes, types, oi):
+        if np.isnan(k) or t not in ("CE", "PE"):
+            continue
+        book = ce if t == "CE" else pe
+        book[k] = book.get(k, 0.0) + (0.0 if np.isnan(o) else o)
+    best, best_pain = 0.0, float("inf")
+    for s in sorted(set(ce) | set(pe)):
+        pain = sum(max(0.0, s - k) * o for k, o in ce.items())
+        pain += sum(max(0.0, k - s) * o for k, o in pe.items())
+        if pain < best_pain:
+            best, best_pain = s, pain
+    return best
+
+
+def _reference_inflection(strikes, types, oi, atm):
+    per = {}
+    for k, t, o in zip(strikes, types, oi):
+        if np.isnan(k):
+            continue
+        agg = per.setdefault(k, [0.0, 0.0])
+        o = 0.0 if np.isnan(o) else o
+        if t == "CE":
+            agg[0] += o
+        elif t == "PE":
+            agg[1] += o
+    best, best_score = 0.0, float("inf")
+    for k, (ce, pe) in per.items():
+        if ce <= 0:
+            continue
+        score = abs(pe / ce - 1.0) + abs(k - atm) / max(1.0, atm)
+        if score < best_score:
+            best, best_score = k, score
+    return best if best > 0 else atm
+
+
+def _random_chain(seed, n=120):
+    rng = np.random.default_rng(seed)
+    base = 20000 + 50 * np.arange(n, dtype=np.float64)
+    strikes = np.repeat(base, 2)
+    types = np.array(["CE", "PE"] * n, dtype=object)
+    oi = rng.integers(0, 200_000, size=2 * n).astype(np.float64)
+    oi[rng.random(2 * n) < 0.05] = np.nan
+    vol = rng.integers(0, 50_000, size=2 * n).astype(np.float64)
+    return strikes, types, oi, vol, float(base[n // 2])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_quadratic_reference(seed):
+    strikes, types, oi, vol, atm = _random_chain(seed)
+    agg = compute_chain_aggregates(strikes, types, oi, vol, atm)
+    assert agg["max_pain_strike"] == _reference_max_pain(strikes, types, oi)
+    assert agg["pcr_inflection_strike"] == _reference_inflection(strikes, types, oi, atm)
+    assert agg["total_oi_ce"] == np.nansum(oi[types == "CE"])
+    assert agg["pcr"] == pytest.approx(np.nansum(oi[types == "PE"]) / np.nansum(oi[types == "CE"]))
+
+
+def test_edge_cases():
+    empty = compute_chain_aggregates([], [], [], [], atm=22500)
+    assert empty["max_pain_strike"] == 0.0 and empty["pcr"] == 0.0
+
+    # No CE OI anywhere → inflection falls back to ATM
+    agg = compute_chain_aggregates(
+        [22400, 22500], ["PE", "PE"], [10, 20], [1, 1], atm=22450
+    )
+    assert agg["pcr_inflection_strike"] == 22450
+    assert agg["pcr"] == 0.0
+
+    # Flat pain curve → lowest strike (first minimum, like the old scan)
+    agg = compute_chain_aggregates([100, 200], ["CE", "PE"], [0, 0], [0, 0])
+    assert agg["max_pain_strike"] == 100
+
+
+@pytest.fixture
+def chain(tmp_path, monkeypatch):
+    monkeypatch.setattr(mr, "DB_FOLDER", tmp_path)
+    mr._agg_cache.clear()
+    oc = FakeChain()
+    store = OptionChainStore(tmp_path / f"NFO_NIFTY_{EXPIRY}.sqlite")
+    store.write_snapshot(oc)
+    bus = get_snapshot_bus()
+    bus.publish(KEY, oc)
+    yield oc, store, bus
+    store.close()
+    bus.remove(KEY)
+
+
+def test_readers_share_one_computation_per_snapshot(chain, monkeypatch):
+    oc, _, bus = chain
+    calls = []
+    original = mr.compute_chain_aggregates
+    monkeypatch.setattr(
+        mr, "compute_chain_aggregates", lambda *a, **k: (calls.append(1), original(*a, **k))[1]
+    )
+
+    readers = [MarketReader("NFO", "NIFTY", source="bus") for _ in range(5)]
+    for r in readers:
+        r.get_chain_metrics(EXPIRY)
+        r.get_max_pain_strike(EXPIRY)
+        r.get_pcr_inflection_strike(EXPIRY)
+    assert len(calls) == 1
+
+    # New snapshot → one more computation, shared again
+    oc.df.loc[4, "oi"] = 999_999  # a CE row
+    bus.publish(KEY, oc)
+    metrics = [r.get_chain_metrics(EXPIRY) for r in readers]
+    assert len(calls) == 2
+    # OI buildup stays per reader (relative to its own previous call)
+    assert all(m["oi_buildup_ce"] == metrics[0]["oi_buildup_ce"] != 0 for m in metrics)
+
+
+def test_sqlite_cache_follows_snapshot_ts(chain, monkeypatch):
+    oc, store, _ = chain
+    calls = []
+    original = mr.compute_chain_aggregates
+    monkeypatch.setattr(
+        mr, "compute_chain_aggregates", lambda *a, **k: (calls.append(1), original(*a, **k))[1]
+    )
+    a = MarketReader("NFO", "NIFTY", source="sqlite")
+    b = MarketReader("NFO", "NIFTY", source="sqlite")
+    try:
+        first = a.get_max_pain_strike(EXPIRY)
+        assert b.get_max_pain_strike(EXPIRY) == first
+        assert len(calls) == 1
+
+        time.sleep(0.01)  # snapshot_ts must move
+        oc.df.loc[oc.df["strike"] == 22000, "oi"] = 10_000_000
+        store.write_snapshot(oc)
+        assert a.get_max_pain_strike(EXPIRY) != first
+        assert len(calls) == 2
+    finally:
+        a.close_all()
+        b.close_all()
+
+
+def test_sqlite_cache_key_and_rows_come_from_one_write(chain, monkeypatch):
+    oc, store, _ = chain
+    reader = MarketReader("NFO", "NIFTY", source="sqlite")
+    try:
+        expected = reader.get_max_pain_strike(EXPIRY)
+        mr._agg_cache.clear()
+
+        # the supervisor rewrites the chain between the meta and row reads
+        key_for = reader._sqlite_aggregates_key
+
+        def rewrite_after_meta(expiry, meta):
+            time.sleep(0.01)   # snapshot_ts must move
+            oc.df.loc[oc.df["strike"] == 22000, "oi"] = 10_000_000
+            store.write_snapshot(oc)
+            monkeypatch.setattr(reader, "_sqlite_aggregates_key", key_for)
+            return key_for(expiry, meta)
+
+        monkeypatch.setattr(reader, "_sqlite_aggregates_key", rewrite_after_meta)
+        # rows are read in the meta's transaction: the old chain, cached
+        # under the old snapshot_ts
+        assert reader.get_max_pain_strike(EXPIRY) == expected
+        assert reader.get_max_pain_strike(EXPIRY) != expected
+    finally:
+        reader.close_all()
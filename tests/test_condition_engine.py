@@ -1,8 +1,14 @@
+import random
+import time
 import unittest
 from datetime import datetime
+
+import pytest
+
 from shoonya_platform.strategy_runner.state import StrategyState, LegState
 from shoonya_platform.strategy_runner.condition_engine import ConditionEngine
 from shoonya_platform.strategy_runner.models import Condition, Comparator, JoinOperator, InstrumentType, Side, OptionType
+from shoonya_platform.strategy_runner.exit_engine import ExitEngine
 
 class TestConditionEngine(unittest.TestCase):
     def setUp(self):
@@ -55,5 +61,144 @@ class TestConditionEngine(unittest.TestCase):
         self.assertTrue(self.engine.evaluate([c_false]))
         self.assertTrue(self.engine.evaluate([c_true]))
 
+
+def _state_with_legs():
+    state = StrategyState()
+    state.spot_price = 25000
+    state.current_time = datetime(2026, 1, 5, 10, 30)
+    state.index_data = {"NIFTY": {"ltp": 25000.0, "change_pct": 0.4}, "INDIAVIX": {"ltp": 13.5}}
+    for tag, opt, strike, delta in (("CE1", OptionType.CE, 25200, 0.35), ("PE1", OptionType.PE, 24800, -0.3)):
+        state.legs[tag] = LegState(
+            tag=tag, symbol="NIFTY", instrument=InstrumentType.OPT, option_type=opt,
+            strike=strike, expiry="2026-01-29", side=Side.SELL, qty=1,
+            entry_price=100, ltp=90, delta=delta,
+        )
+    return state
+
+
+_PARAMS = [
+    ("spot_price", 24000, 26000), ("combined_pnl", -2000, 2000), ("abs(net_delta)", 0, 1),
+    ("tag.CE1.delta", 0, 1), ("tag.PE1.pnl", -500, 500), ("ce_ltp", 0, 200),
+    ("pe_moneyness", -0.05, 0.05), ("index_NIFTY_change_pct", -2, 2), ("india_vix", 10, 20),
+    ("max_leg_delta", 0, 1), ("active_legs_count", 0, 3),
+]
+_COMPS = [">", ">=", "<", "<=", "~=", "between", "not_between", "crosses_above", "crosses_below"]
+
+
+def _random_rules(n, rng):
+    rules = []
+    for _ in range(n):
+        conds = []
+        for k in range(rng.randint(1, 4)):
+            param, lo, hi = rng.choice(_PARAMS)
+            comp = rng.choice(_COMPS)
+            a, b = sorted((rng.uniform(lo, hi), rng.uniform(lo, hi)))
+            cond = {"parameter": param, "comparator": comp, "value": round(a, 4)}
+            if comp in ("between", "not_between"):
+                cond["value2"] = round(b, 4)
+            if k:
+                cond["join"] = rng.choice(["AND", "OR"])
+            conds.append(cond)
+        if rng.random() < 0.1:
+            conds.append({"parameter": "time_current", "comparator": ">=", "value": "09:30", "join": "AND"})
+        rules.append(conds)
+    return rules
+
+
+def _tick(state, i):
+    state.spot_price = 25000 + 300 * ((i * 37) % 100 - 50) / 50
+    state.legs["CE1"].ltp = 90 + (i % 17)
+    state.legs["CE1"].delta = 0.2 + (i % 13) / 40
+    state.legs["PE1"].ltp = 95 - (i % 11)
+    state.index_data["NIFTY"]["change_pct"] = ((i * 7) % 40 - 20) / 10
+
+
+class TestCompiledConditions(unittest.TestCase):
+    def test_compiled_matches_interpreted_including_crossings(self):
+        rules = _random_rules(100, random.Random(7))
+        interp_state, comp_state = _state_with_legs(), _state_with_legs()
+        interp, comp = ConditionEngine(interp_state), ConditionEngine(comp_state)
+        for i in range(300):
+            _tick(interp_state, i)
+            _tick(comp_state, i)
+            for conds in rules:
+                expected = interp.evaluate([_to_cond(c) for c in conds])
+                self.assertEqual(comp.compiled(conds)(), expected, conds)
+        self.assertEqual(interp_state.prev_values, comp_state.prev_values)
+
+    def test_short_circuit_skips_value_checks(self):
+        state = _state_with_legs()
+        engine = ConditionEngine(state)
+        conds = [
+            {"parameter": "spot_price", "comparator": "<", "value": 0},
+            {"parameter": "tag.MISSING.delta", "comparator": ">", "value": 0, "join": "AND"},
+        ]
+        calls = []
+        compiled = engine.compile(conds)
+        inner = compiled.steps[1][2]
+        compiled.steps[1] = (True, False, lambda st: calls.append(1) or inner(st))
+        self.assertFalse(compiled())
+        self.assertEqual(calls, [])  # false AND … never evaluated
+
+    def test_cache_reused_until_config_reload(self):
+        state = _state_with_legs()
+        exit_engine = ExitEngine(state)
+        rule = {"exit_leg_ref": "all", "action": "exit_all",
+                "conditions": [{"parameter": "spot_price", "comparator": ">", "value": 26000}]}
+        exit_engine.load_config({"leg_rules": [rule]})
+        engine = exit_engine.condition_engine
+        first = engine.compiled(rule["conditions"])
+        self.assertIs(engine.compiled(rule["conditions"]), first)
+        self.assertIsNone(exit_engine.check_exits(datetime(2026, 1, 5, 10, 30)))
+
+        rule["conditions"] = [{"parameter": "spot_price", "comparator": ">", "value": 24000}]
+        exit_engine.load_config({"leg_rules": [rule]})
+        self.assertIsNot(engine.compiled(rule["conditions"]), first)
+        self.assertEqual(exit_engine.check_exits(datetime(2026, 1, 5, 10, 30)), "leg_rule_exit_all")
+
+    @pytest.mark.benchmark
+    def test_benchmark_100_rules_x_10k_ticks(self):
+        rules = _random_rules(100, random.Random(11))
+        state = _state_with_legs()
+        engine = ConditionEngine(state)
+        for conds in rules:
+            engine.compiled(conds)
+
+        ticks = 10_000
+        t0 = time.perf_counter()
+        fired = 0
+        for i in range(ticks):
+            _tick(state, i)
+            for conds in rules:
+                fired += engine.compiled(conds)()
+        compiled_s = time.perf_counter() - t0
+
+        # Per-tick rebuild path (dict → Condition → evaluate), sampled
+        sample = 100
+        t0 = time.perf_counter()
+        for i in range(sample):
+            _tick(state, i)
+            for conds in rules:
+                engine.evaluate([_to_cond(c) for c in conds])
+        interp_s = (time.perf_counter() - t0) * ticks / sample
+
+        print(
+            f"\nConditionEngine, 100 rules x {ticks} ticks ({fired} fired):"
+            f"\n  rebuild + interpret: {interp_s:6.2f} s ({interp_s / ticks * 1e6:7.1f} us/tick, extrapolated)"
+            f"\n  compiled:            {compiled_s:6.2f} s ({compiled_s / ticks * 1e6:7.1f} us/tick)"
+        )
+        self.assertLess(compiled_s, interp_s / 2)
+
+
+def _to_cond(d):
+    return Condition(
+        parameter=d["parameter"],
+        comparator=Comparator(d["comparator"]),
+        value=d.get("value"),
+        value2=d.get("value2"),
+        join=JoinOperator(d["join"]) if d.get("join") else None,
+    )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Control-intent queue: consumers wake on the writer's notification instead of
+a 1 s poll, claim a batch in one transaction, never steal each other's intent
+types, and the claim query is served by the (status, created_at) index.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from shoonya_platform.api.dashboard.services import intent_utility
+from shoonya_platform.api.dashboard.services.intent_utility import DashboardIntentService
+from shoonya_platform.execution import generic_control_consumer
+from shoonya_platform.execution.generic_control_consumer import GenericControlIntentConsumer
+from shoonya_platform.persistence import database as db
+from shoonya_platform.persistence.intent_queue import (
+    IntentWakeup,
+    claim_pending_intents,
+    release_intents,
+)
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    path = tmp_path / "orders.db"
+    monkeypatch.setattr(db, "_DB_PATH", path)
+    monkeypatch.setattr(intent_utility, "DB_PATH", str(path))
+    db.close_thread_connection()
+    db.get_connection().close()  # schema + indexes
+    yield path
+    db.close_thread_connection()
+
+
+def _insert(intent_id, intent_type, status="PENDING", created_at=None):
+    conn = db.get_connection()
+    try:
+        conn.execute(
+            "INSERT INTO control_intents (id, client_id, parent_client_id, type, payload, "
+            "source, status, created_at) VALUES (?, 'C1', NULL, ?, ?, 'TEST', ?, ?)",
+            (intent_id, intent_type, json.dumps({}), status,
+             created_at or datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _statuses():
+    conn = db.get_connection()
+    try:
+        return dict(conn.execute("SELECT id, status FROM control_intents").fetchall())
+    finally:
+        conn.close()
+
+
+def test_wakeup_wait_returns_on_notify():
+    wakeup = IntentWakeup()
+    seen = wakeup.version
+    threading.Timer(0.01, wakeup.notify).start()
+    # a timeout would return the old version: only the notify bumps it
+    assert wakeup.wait(seen, timeout=30.0) == seen + 1
+    # Already-bumped version returns immediately (no lost wakeup)
+    assert wakeup.wait(seen, timeout=2.0) == seen + 1
+
+
+def test_batch_claim_is_one_transaction_and_respects_types(queue_db):
+    for i in range(20):
+        _insert(f"G{i:02d}", "GENERIC", created_at=f"2026-01-01T00:00:{i:02d}")
+    _insert("S00", "STRATEGY", created_at="2026-01-01T00:00:00")
+
+    before = db.get_db_stats()["queries"]
+    rows = claim_pending_intents("id, type", "type != 'STRATEGY'", limit=16)
+    queries = db.get_db_stats()["queries"] - before
+
+    assert [r[0] for r in rows] == [f"G{i:02d}" for i in range(16)]
+    assert queries <= 5  # probe + BEGIN + SELECT + UPDATE (was 3 per intent)
+    statuses = _statuses()
+    assert sum(1 for s in statuses.values() if s == "PROCESSING") == 16
+    assert statuses["S00"] == "PENDING"
+
+    release_intents(["G14", "G15"])
+    assert _statuses()["G15"] == "PENDING"
+    assert [r[0] for r in claim_pending_intents("id", "type = 'STRATEGY'")] == ["S00"]
+
+
+def test_empty_queue_probe_takes_no_write_lock(queue_db):
+    _insert("DONE", "GENERIC", status="ACCEPTED")
+    before = db.get_db_stats()["queries"]
+    assert claim_pending_intents("id", "type != 'STRATEGY'") == []
+    assert db.get_db_stats()["queries"] - before == 1
+
+
+def test_claim_uses_status_created_index(queue_db):
+    conn = db.get_connection()
+    try:
+        plan = " ".join(
+            str(r[-1]) for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM control_intents "
+                "WHERE status = 'PENDING' AND type = 'STRATEGY' ORDER BY created_at LIMIT 16"
+            ).fetchall()
+        )
+    finally:
+        conn.close()
+    assert "idx_control_intents_status_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_consumer_wakes_on_dashboard_insert(queue_db, monkeypatch):
+    # no fallback poll within the test: only the wakeup can deliver the intent
+    monkeypatch.setattr(generic_control_consumer, "POLL_INTERVAL_SEC", 600.0)
+    stop = threading.Event()
+    consumer = GenericControlIntentConsumer(bot=None, stop_event=stop)
+    handled = threading.Event()
+    passes = []
+    claim = consumer._process_pending_intents
+
+    def _counted_claim():
+        passes.append(1)
+        return claim()
+
+    def _process(row):
+        consumer._update_status(row[0], "ACCEPTED")
+        handled.set()
+        return True
+
+    consumer._process_pending_intents = _counted_claim
+    consumer._process_intent = _process
+    thread = threading.Thread(target=consumer.run_forever, daemon=True)
+    thread.start()
+    try:
+        # consumer is idle, blocked on the wakeup after one empty claim
+        deadline = time.monotonic() + 5.0
+        while not passes and time.monotonic() < deadline:
+            time.sleep(0.002)
+        assert len(passes) == 1
+        service = DashboardIntentService(client_id="C1")
+        service._insert_intent(intent_id="DASH-1", intent_type="GENERIC", payload={"x": 1})
+        assert handled.wait(10.0)
+    finally:
+        stop.set()
+        intent_utility.intent_wakeup.notify()
+        thread.join(timeout=2)
+
+    assert _statuses()["DASH-1"] == "ACCEPTED"
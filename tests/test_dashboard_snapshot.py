@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Dashboard snapshot aggregator: sections refreshed in the background on
+their own cadences, shared across polling tabs, `fields=` selection,
+per-section ages, stale-on-error, and ETag / If-None-Match on the
+/home/status route. Reports cached poll cost against the old serial
+fan-out.
+"""
+
+import os
+import threading
+import time
+
+os.environ.setdefault("DASHBOARD_PASSWORD", "test-pass")
+os.environ.setdefault("DASHBOARD_USERNAME", "test-user")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shoonya_platform.api.dashboard.api._shared import get_snapshot
+from shoonya_platform.api.dashboard.api.routes_intents_optionchain import sub_router
+from shoonya_platform.api.dashboard.services.snapshot_service import (
+    DashboardSnapshotAggregator,
+    dashboard_sections,
+    etag_matches,
+)
+
+IO_DELAY = 0.005   # every broker / DB / file read costs 5 ms
+
+
+class _Counted:
+    """Records calls per method and sleeps like real I/O."""
+
+    def __init__(self, **values):
+        self.values = values
+        self.calls = {}
+        self.fail = set()
+
+    def _read(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        time.sleep(IO_DELAY)
+        if name in self.fail:
+            raise RuntimeError(f"{name} down")
+        return self.values[name]
+
+
+class FakeBroker(_Counted):
+    def get_positions(self): return self._read("positions")
+    def get_positions_summary(self): return self._read("positions_summary")
+    def get_holdings(self): return self._read("holdings")
+    def get_limits(self): return self._read("limits")
+    def get_order_book(self): return self._read("orders")
+
+
+class FakeSystem(_Counted):
+    def get_orders(self, limit): return self._read("orders")
+    def get_open_orders(self): return self._read("open_orders")
+    def get_control_intents(self, limit): return self._read("control_intents")
+    def get_risk_state(self): return self._read("risk")
+    def get_option_data_heartbeat(self): return self._read("heartbeat")
+    def get_signal_activity(self): return self._read("signal")
+    def get_telegram_messages(self, limit): return self._read("telegram_messages")
+    def get_telegram_alert_stats(self, limit): return self._read("telegram_stats")
+
+
+class FakeWatcher:
+    def get_managed_exits_snapshot(self):
+        return [{"symbol": "NIFTY24000CE", "stop": 120.0}]
+
+
+class FakeBot:
+    order_watcher = FakeWatcher()
+
+
+def _fakes():
+    broker = FakeBroker(
+        positions=[{"tsym": "NIFTY24000CE", "netqty": "-50"}],
+        positions_summary={"net": -50},
+        holdings=[],
+        limits={"cash": "100000"},
+        orders=[],
+    )
+    system = FakeSystem(
+        orders=[], open_orders=[], control_intents=[],
+        risk={"daily_pnl": 0.0}, heartbeat=None, signal={"has_activity": False},
+        telegram_messages=[], telegram_stats={"total": 0},
+    )
+    return broker, system
+
+
+@pytest.fixture
+def aggregator():
+    broker, system = _fakes()
+    agg = DashboardSnapshotAggregator(dashboard_sections(broker, system, FakeBot()))
+    agg.broker, agg.system = broker, system
+    yield agg
+    agg.stop()
+
+
+def test_fields_shape_and_shared_fetches(aggregator):
+    agg = aggregator
+    assert agg.resolve_fields(None) == agg.names
+    assert agg.resolve_fields("broker") == [n for n in agg.names if n.startswith("broker.")]
+    assert agg.resolve_fields(" system.risk , managed_exits") == ["system.risk", "managed_exits"]
+    with pytest.raises(ValueError):
+        agg.resolve_fields("broker.nope")
+
+    body, etag = agg.collect()
+    assert set(body) == {"broker", "system", "managed_exits", "_meta"}
+    assert body["broker"]["positions"][0]["tsym"] == "NIFTY24000CE"
+    assert body["system"]["heartbeat"] == {}           # None → fallback, as before
+    assert body["managed_exits"][0]["stop"] == 120.0
+    assert set(body["_meta"]["age_sec"]) == set(agg.names)
+
+    # ten tabs polling repeatedly share one fetch per section
+    for _ in range(50):
+        for _ in range(10):
+            assert agg.collect()[1] == etag
+    assert agg.broker.calls["positions"] == 1 and agg.system.calls["risk"] == 1
+    assert agg.get_stats()["running"]
+
+
+def test_etag_versions_and_stale_on_error():
+    broker, system = _fakes()
+    agg = DashboardSnapshotAggregator({
+        "broker.positions": (broker.get_positions, [], 60.0),
+        "system.risk": (system.get_risk_state, {}, 60.0),
+    })
+    try:
+        _, all_tag = agg.collect()
+        _, risk_tag = agg.collect(["system.risk"])
+
+        agg.refresh("broker.positions")               # same content: same tag
+        assert agg.collect()[1] == all_tag
+        broker.values["positions"] = []
+        agg.refresh("broker.positions")
+        assert agg.collect()[1] != all_tag
+        assert agg.collect(["system.risk"])[1] == risk_tag
+
+        system.fail.add("risk")
+        time.sleep(0.05)
+        agg.refresh("system.risk")
+        body, tag = agg.collect(["system.risk"])
+        assert tag == risk_tag and body["system"]["risk"] == {"daily_pnl": 0.0}
+        assert body["_meta"]["errors"] == {"system.risk": "risk down"}
+        assert body["_meta"]["age_sec"]["system.risk"] >= 0.05
+    finally:
+        agg.stop()
+
+    assert etag_matches('W/"abc", "def"', 'W/"def"')
+    assert etag_matches("*", 'W/"x"') and not etag_matches(None, 'W/"x"')
+
+
+def test_etag_always_matches_the_body_it_ships_with():
+    counter = {"n": 0}
+
+    def fetch():
+        counter["n"] += 1
+        return {"n": counter["n"]}     # version == n: every fetch is a change
+
+    agg = DashboardSnapshotAggregator({"x.ticks": (fetch, {}, 3600.0)})
+    stop = False
+
+    def hammer():
+        while not stop:
+            agg.refresh("x.ticks")
+
+    writer = threading.Thread(target=hammer, daemon=True)
+    try:
+        agg.collect()
+        writer.start()
+        for _ in range(3000):
+            body, etag = agg.collect(["x.ticks"])
+            assert etag == agg.etag(["x.ticks"], [body["x"]["ticks"]["n"]])
+    finally:
+        stop = True
+        writer.join()
+        agg.stop()
+    assert counter["n"] > 1
+
+
+def _wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_refresher_follows_cadence_and_pauses_when_idle():
+    broker, _ = _fakes()
+    fetched_at = []
+
+    def positions():
+        fetched_at.append(time.monotonic())
+        return broker.get_positions()
+
+    agg = DashboardSnapshotAggregator(
+        {"broker.positions": (positions, [], 0.1)}, idle_timeout=0.4,
+    )
+    try:
+        agg.collect()
+        # refreshed in the background while polled, never faster than the cadence
+        assert _wait_until(lambda: len(fetched_at) >= 3)
+        gaps = [b - a for a, b in zip(fetched_at, fetched_at[1:])]
+        assert min(gaps) >= 0.09
+
+        # nobody polling → the refresher stops and reads stop with it
+        assert _wait_until(lambda: not agg.get_stats()["running"])
+        idle_count = len(fetched_at)
+        time.sleep(0.2)
+        assert len(fetched_at) == idle_count
+        agg.collect()
+        assert agg.get_stats()["running"]
+    finally:
+        agg.stop()
+
+
+def _client(aggregator):
+    app = FastAPI()
+    app.include_router(sub_router, prefix="/dashboard")
+    app.dependency_overrides[get_snapshot] = lambda: aggregator
+    return TestClient(app)
+
+
+def test_home_status_route_fields_and_not_modified(aggregator):
+    client = _client(aggregator)
+    first = client.get("/dashboard/home/status")
+    assert first.status_code == 200 and first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+    assert first.json()["_meta"]["etag"] == etag
+
+    for _ in range(30):
+        warm = client.get("/dashboard/home/status", headers={"If-None-Match": etag})
+        assert warm.status_code == 304 and warm.content == b""
+    # 304s are served from cache: still one broker read per section
+    assert aggregator.broker.calls["positions"] == 1
+    assert aggregator.get_stats()["not_modified"] == 30
+
+    part = client.get("/dashboard/home/status", params={"fields": "broker.positions,system"})
+    assert part.status_code == 200
+    assert set(part.json()) == {"broker", "system", "_meta"}
+    assert set(part.json()["broker"]) == {"positions"}
+    assert part.headers["etag"] != etag
+    assert client.get("/dashboard/home/status", params={"fields": "bogus"}).status_code == 400
+
+
+@pytest.mark.benchmark
+def test_home_status_cached_poll_cost(aggregator):
+    client = _client(aggregator)
+    t0 = time.perf_counter()
+    first = client.get("/dashboard/home/status")
+    cold = time.perf_counter() - t0
+    etag = first.headers["etag"]
+
+    polls = 30
+    t0 = time.perf_counter()
+    for _ in range(polls):
+        client.get("/dashboard/home/status", headers={"If-None-Match": etag})
+    cached = (time.perf_counter() - t0) / polls
+
+    serial = len(aggregator.names) * IO_DELAY
+    print(f"\n/home/status: serial fan-out ≥ {serial * 1e3:.0f} ms | first poll "
+          f"{cold * 1e3:.1f} ms | cached 304 poll {cached * 1e3:.2f} ms "
+          f"| {aggregator.get_stats()}")
+    assert cached < serial / 2
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Connection pool tests for shoonya_platform.persistence.database:
+per-thread reuse, schema-once, close() tolerance and counters.
+"""
+
+import threading
+
+import pytest
+
+from shoonya_platform.persistence import database as db
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "_DB_PATH", tmp_path / "orders.db")
+    db.close_thread_connection()
+    yield db
+    db.close_thread_connection()
+
+
+def test_same_thread_reuses_one_connection(pool):
+    before = pool.get_db_stats()
+    a = pool.get_connection()
+    b = pool.get_connection()
+    assert a._conn is b._conn
+    after = pool.get_db_stats()
+    assert after["connections_opened"] - before["connections_opened"] == 1
+    assert after["connections_reused"] - before["connections_reused"] == 1
+
+
+def test_schema_runs_once_per_path(pool):
+    before = pool.get_db_stats()["schema_inits"]
+    conn = pool.get_connection()
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert {"orders", "control_intents", "audit_log"} <= tables
+
+    # A fresh thread opens its own connection but skips the schema block
+    t = threading.Thread(target=lambda: pool.get_connection().close())
+    t.start()
+    t.join()
+    assert pool.get_db_stats()["schema_inits"] - before == 1
+
+
+def test_threads_get_isolated_connections(pool):
+    main_conn = pool.get_connection()._conn
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(pool.get_connection()._conn))
+    t.start()
+    t.join()
+    assert seen and seen[0] is not main_conn
+
+
+def test_close_keeps_connection_and_rolls_back(pool):
+    conn = pool.get_connection()
+    conn.execute(
+        "INSERT INTO control_intents (id, client_id, type, payload, source, status, created_at) "
+        "VALUES ('x', 'c', 'T', '{}', 'TEST', 'PENDING', '2026-01-01')"
+    )
+    conn.close()
+
+    again = pool.get_connection()
+    assert again.execute("SELECT COUNT(*) FROM control_intents").fetchone()[0] == 0
+    # Underlying connection survived close()
+    assert again.execute("SELECT 1").fetchone()[0] == 1
+
+
+def test_nested_lease_close_does_not_abort_outer_transaction(pool):
+    outer = pool.get_connection()
+    cur = outer.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    cur.execute(
+        "INSERT INTO control_intents (id, client_id, type, payload, source, status, created_at) "
+        "VALUES ('y', 'c', 'T', '{}', 'TEST', 'PENDING', '2026-01-01')"
+    )
+    pool.get_connection().close()
+    outer.commit()
+    outer.close()
+    assert pool.get_connection().execute(
+        "SELECT COUNT(*) FROM control_intents WHERE id='y'"
+    ).fetchone()[0] == 1
+
+
+def test_nested_lease_in_transaction_gets_its_own_connection(pool):
+    outer = pool.get_connection()
+    outer.execute(
+        "INSERT INTO control_intents (id, client_id, type, payload, source, status, created_at) "
+        "VALUES ('z', 'c', 'T', '{}', 'TEST', 'PENDING', '2026-01-01')"
+    )
+    before = pool.get_db_stats()["nested_txn_connections"]
+    inner = pool.get_connection()
+    assert inner._conn is not outer._conn
+    # the inner caller neither sees nor ends the outer transaction
+    assert inner.execute("SELECT COUNT(*) FROM control_intents WHERE id='z'").fetchone()[0] == 0
+    inner.rollback()
+    inner.commit()
+    inner.close()
+    assert outer.in_transaction
+    outer.commit()
+    assert pool.get_db_stats()["nested_txn_connections"] - before == 1
+
+    # outside a transaction, nested leases share the pooled connection again
+    again = pool.get_connection()
+    assert again._conn is outer._conn
+    assert again.execute("SELECT COUNT(*) FROM control_intents WHERE id='z'").fetchone()[0] == 1
+
+
+def test_query_and_lock_counters(pool):
+    conn = pool.get_connection()
+    before = pool.get_db_stats()
+    conn.execute("SELECT 1").fetchone()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.commit()
+    after = pool.get_db_stats()
+    assert after["queries"] - before["queries"] == 2
+    assert after["lock_wait_s"] >= before["lock_wait_s"]
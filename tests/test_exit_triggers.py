@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Tick-driven managed exits: sorted trigger levels per token, evaluation on
+TickStore writes (not the 1 s positions poll), trailing SL moved on ticks,
+REST positions used only to confirm quantity, tick-to-trigger latency.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from shoonya_platform.execution.exit_triggers import ExitTriggerEngine, PriceLevelBook
+from shoonya_platform.market_data.feeds.live_feed import TickStore
+from shoonya_platform.persistence import database as db
+from shoonya_platform.persistence.order_record import OrderRecord
+
+
+def test_level_book_hits():
+    book = PriceLevelBook()
+    book.set("LONG", "111", below=[95.0], above=[110.0])
+    book.set("SHORT", "111", below=[90.0], above=[105.0])
+    assert book.hits("111", 100.0) == []
+    assert book.hits("111", 95.0) == ["LONG"]
+    assert sorted(book.hits("111", 89.0)) == ["LONG", "SHORT"]
+    assert sorted(book.hits("111", 112.0)) == ["LONG", "SHORT"]
+    assert book.hits("222", 1.0) == []
+
+    book.set("LONG", "111", below=[99.0])  # replaces both old levels
+    assert book.hits("111", 111.0) == ["SHORT"]
+    book.remove("LONG")
+    book.remove("SHORT")
+    assert len(book) == 0 and book.tokens() == set()
+
+
+def _fire_on_crossing():
+    store = TickStore()
+    book = PriceLevelBook()
+    fired = []
+    done = threading.Event()
+    engine = ExitTriggerEngine(
+        book, lambda cmd, ltp, at: (fired.append((cmd, ltp, time.monotonic() - at)), done.set()),
+        store=store,
+    )
+    book.set("C1", "111", below=[95.0])
+    engine.start()
+    try:
+        store.update("222", {"ltp": 1.0})      # unwatched token
+        store.update("111", {"ltp": 100.0})    # watched, no level crossed
+        time.sleep(0.02)
+        assert not fired
+        store.update("111", {"ltp": 94.5})
+        assert done.wait(5.0)
+    finally:
+        engine.stop()
+        engine.join(timeout=2)
+    return engine, fired
+
+
+def test_engine_fires_once_on_crossing_tick():
+    engine, fired = _fire_on_crossing()
+    assert [(cmd, ltp) for cmd, ltp, _ in fired] == [("C1", 94.5)]
+    assert engine.get_stats()["hits"] == 1
+
+
+@pytest.mark.benchmark
+def test_engine_tick_to_trigger_latency():
+    _, fired = _fire_on_crossing()
+    latency = fired[0][2]
+    # Previous path: positions poll every 1 s → on average 0.5 s + REST latency
+    print(f"\ntick→trigger: {latency * 1000:.2f} ms (poll path: ~500 ms avg + REST)")
+    assert latency < 0.05
+
+
+# ---------------------------------------------------------------------------
+# OrderWatcher integration
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch, bot):
+    monkeypatch.setattr(db, "_DB_PATH", tmp_path / "orders.db")
+    db.close_thread_connection()
+    w = bot.order_watcher
+    w._is_exchange_open = lambda exchange, symbol: True
+    w.dispatched = []
+    w._execute_managed_exit = lambda record, qty: (w.dispatched.append((record.symbol, qty)), True)[1]
+    yield w
+    w._trigger_engine.stop()
+    db.close_thread_connection()
+
+
+def _managed_exit(bot, symbol, **risk):
+    now = datetime.utcnow().isoformat()
+    record = OrderRecord(
+        command_id=f"MX_{symbol}", source="STRATEGY", user="TEST", strategy_name="S1",
+        exchange="NFO", symbol=symbol, side="SELL", quantity=25, product="M",
+        order_type="MARKET", price=0.0,
+        stop_loss=risk.get("stop_loss"), target=risk.get("target"),
+        trailing_type=risk.get("trailing_type"), trailing_value=risk.get("trailing_value"),
+        broker_order_id=None, execution_type="EXIT", status="CREATED",
+        created_at=now, updated_at=now, tag=None, trail_when=risk.get("trail_when"),
+    )
+    bot.order_repo.create(record)
+    return record
+
+
+def _start_engine(watcher):
+    store = TickStore()
+    watcher._trigger_engine = ExitTriggerEngine(
+        watcher._trigger_book, watcher._on_exit_trigger, store=store,
+    )
+    watcher._trigger_engine.start()
+    return store
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.002)
+    return False
+
+
+def test_sl_fires_on_tick_and_confirms_qty(bot, watcher):
+    record = _managed_exit(bot, "NIFTY_CE", stop_loss=95.0, target=120.0)
+    bot.api.positions = [{"tsym": "NIFTY_CE", "netqty": 50, "token": "111", "ltp": 100.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    watcher._monitor_managed_exits()  # REST pass: learns token + qty, indexes levels
+    assert watcher._trigger_book.levels_for(record.command_id) == ("111", (95.0,), (120.0,))
+
+    store = _start_engine(watcher)
+    rest_before = sum(1 for name, _, _ in bot.api.call_log if name == "get_positions")
+    store.update("111", {"ltp": 96.0})
+    time.sleep(0.02)
+    assert watcher.dispatched == []
+    store.update("111", {"ltp": 94.0})
+    assert _wait(lambda: watcher.dispatched)
+
+    assert watcher.dispatched == [("NIFTY_CE", 50)]
+    # Exactly one REST read on the tick path: the quantity confirmation
+    rest_after = sum(1 for name, _, _ in bot.api.call_log if name == "get_positions")
+    assert rest_after - rest_before == 1
+    assert record.command_id not in watcher._managed_exits
+    assert len(watcher._trigger_book) == 0
+    stats = watcher.get_exit_trigger_stats()
+    assert stats["tick_to_trigger"]["count"] == 1
+    assert stats["tick_to_dispatch"]["count"] == 1
+
+
+def test_trailing_sl_moves_on_ticks(bot, watcher):
+    record = _managed_exit(
+        bot, "BANK_PE", stop_loss=90.0, trailing_type="POINTS", trailing_value=5.0,
+    )
+    bot.api.positions = [{"tsym": "BANK_PE", "netqty": 25, "token": "222", "ltp": 100.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    watcher._monitor_managed_exits()
+
+    store = _start_engine(watcher)
+    store.update("222", {"ltp": 111.0})  # new high: 2 steps of 5 → SL 90 → 100
+    assert _wait(lambda: watcher._managed_exits[record.command_id]["stop_loss"] == 100.0)
+    token, below, _ = watcher._trigger_book.levels_for(record.command_id)
+    assert below == (100.0,)
+
+    store.update("222", {"ltp": 99.5})
+    assert _wait(lambda: watcher.dispatched)
+    assert watcher.dispatched == [("BANK_PE", 25)]
+
+
+def test_tick_trigger_on_flat_position_does_not_dispatch(bot, watcher):
+    record = _managed_exit(bot, "FIN_CE", stop_loss=50.0)
+    bot.api.positions = [{"tsym": "FIN_CE", "netqty": -25, "token": "333", "ltp": 40.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    watcher._monitor_managed_exits()
+    assert watcher._trigger_book.levels_for(record.command_id) == ("333", (), (50.0,))
+
+    bot.api.positions = []  # squared off elsewhere
+    watcher._on_exit_trigger(record.command_id, 51.0, time.monotonic())
+    assert watcher.dispatched == []
+    assert bot.order_repo.get_by_id(record.command_id).tag == "POSITION_ALREADY_FLAT"
+    assert record.command_id not in watcher._managed_exits
+
+
+def test_new_exit_token_is_subscribed_outside_the_locks(bot, watcher, monkeypatch):
+    from shoonya_platform.market_data.feeds import live_feed
+
+    calls = []
+    monkeypatch.setattr(live_feed, "subscribe_livedata", lambda api, tokens, exchange: calls.append(
+        (tokens, exchange, watcher._managed_exits_lock.locked(), watcher._eval_lock.locked())
+    ))
+    record = _managed_exit(bot, "SENSEX_CE", stop_loss=95.0)
+    bot.api.positions = [{"tsym": "SENSEX_CE", "netqty": 25, "token": "444", "ltp": 100.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    _start_engine(watcher)
+
+    watcher._monitor_managed_exits()   # learns the token: first sight subscribes
+    watcher._monitor_managed_exits()   # already in the book: no resubscribe
+    assert watcher.update_managed_exit("SENSEX_CE", {"stop_loss": 90.0})
+    assert calls == [(["444"], "NFO", False, False)]
+
+
+def test_tick_trigger_skips_exit_cancelled_since_last_poll(bot, watcher):
+    record = _managed_exit(bot, "MID_CE", stop_loss=95.0)
+    bot.api.positions = [{"tsym": "MID_CE", "netqty": 25, "token": "555", "ltp": 100.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    watcher._monitor_managed_exits()
+
+    bot.order_repo.update_status(record.command_id, "CANCELLED")  # from the dashboard
+    watcher._on_exit_trigger(record.command_id, 94.0, time.monotonic())
+    assert watcher.dispatched == []
+    assert record.command_id not in watcher._managed_exits
+    assert len(watcher._trigger_book) == 0
+
+
+@pytest.mark.parametrize("via", ["tick", "poll"])
+def test_dispatch_runs_without_the_eval_lock(bot, watcher, via):
+    record = _managed_exit(bot, "MID_PE", stop_loss=95.0)
+    bot.api.positions = [{"tsym": "MID_PE", "netqty": 25, "token": "666", "ltp": 100.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    watcher._monitor_managed_exits()
+
+    seen = []
+
+    def execute(rec, qty):
+        seen.append(watcher._eval_lock.locked())
+        # claimed: the poll pass leaves it alone and the book no longer fires it
+        assert watcher._managed_exits[rec.command_id]["_dispatching"]
+        assert watcher._trigger_book.levels_for(rec.command_id) is None
+        watcher._monitor_managed_exits()
+        watcher._on_exit_trigger(rec.command_id, 90.0, time.monotonic())
+        return False
+
+    watcher._execute_managed_exit = execute
+    if via == "tick":
+        watcher._on_exit_trigger(record.command_id, 94.0, time.monotonic())
+    else:
+        bot.api.positions[0]["ltp"] = 94.0
+        watcher._monitor_managed_exits()
+    assert seen == [False]
+    # failed dispatch: back in the book once the backoff ends, not dispatching
+    state = watcher._managed_exits[record.command_id]
+    assert not state["_dispatching"] and state["_dispatch_failures"] == 1
+
+
+def _closed(watcher):
+    watcher._is_exchange_open = lambda exchange, symbol: False
+
+
+def _backing_off(watcher):
+    with watcher._managed_exits_lock:
+        for state in watcher._managed_exits.values():
+            state["_exit_next_retry"] = time.time() + 60
+
+
+@pytest.mark.parametrize("guard", [_closed, _backing_off])
+@pytest.mark.parametrize("ltp", [100.0, 40.0])  # between the levels / through SL
+def test_guards_block_dispatch_on_poll_and_tick(bot, watcher, guard, ltp):
+    record = _managed_exit(bot, "MCX_FUT", stop_loss=50.0, target=200.0)
+    bot.api.positions = [{"tsym": "MCX_FUT", "netqty": 25, "token": "777", "ltp": 100.0}]
+    with watcher._managed_exits_lock:
+        watcher._register_managed_exit(record)
+    watcher._monitor_managed_exits()
+    assert watcher.dispatched == []
+
+    guard(watcher)
+    bot.api.positions[0]["ltp"] = ltp
+    watcher._monitor_managed_exits()
+    watcher._on_exit_trigger(record.command_id, ltp, time.monotonic())
+    assert watcher.dispatched == []
+    assert record.command_id in watcher._managed_exits
+    assert watcher._managed_exits[record.command_id].get("_dispatch_failures", 0) == 0
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Intent tracking log: events are queued for a background writer instead of
+open/append/close per call, files rotate by size, both formats round-trip,
+and a command_id's lifecycle comes back from the index (recent events in
+memory, older ones via file offsets). Includes a per-event cost benchmark.
+"""
+
+import json
+import time
+
+import pytest
+
+from shoonya_platform.execution.intent_log import IntentLogWriter
+from shoonya_platform.execution.intent_tracker import IntentTracker
+
+
+def _lifecycle(tracker, cmd):
+    tracker.log_intent_created(cmd, {"symbol": "NIFTY", "side": "BUY", "quantity": 75, "order_type": "LMT"})
+    tracker.log_db_write(cmd, "CREATED")
+    tracker.log_sent_to_broker(cmd, f"B-{cmd}")
+    tracker.log_order_executed(cmd, f"B-{cmd}", 75, 101.5)
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "bin"])
+def test_lifecycle_roundtrip_memory_and_file(tmp_path, fmt):
+    writer = IntentLogWriter(tmp_path / "intent.log", fmt=fmt, index_size=4).start()
+    tracker = IntentTracker("C1", writer=writer)
+    for i in range(10):
+        _lifecycle(tracker, f"CMD-{i}")
+
+    recent = tracker.get_lifecycle("CMD-9")
+    assert [e["stage"] for e in recent] == ["INTENT_CREATED", "DB_WRITE", "SENT_TO_BROKER", "EXECUTED"]
+
+    # CMD-0 fell out of the in-memory index: served from the file offsets
+    old = tracker.get_lifecycle("CMD-0")
+    assert [e["stage"] for e in old] == ["INTENT_CREATED", "DB_WRITE", "SENT_TO_BROKER", "EXECUTED"]
+    assert old[0]["symbol"] == "NIFTY" and old[3]["avg_price"] == 101.5
+    assert old[2]["broker_order_id"] == "B-CMD-0"
+    assert old[0]["timestamp"][:10] == recent[0]["timestamp"][:10]
+    assert tracker.get_lifecycle("missing") == []
+    writer.close()
+
+    if fmt == "jsonl":  # stays line-per-event JSON for grep/jq
+        lines = (tmp_path / "intent.log").read_text().splitlines()
+        assert len(lines) == 40 and json.loads(lines[0])["command_id"] == "CMD-0"
+
+
+def test_late_event_after_eviction_keeps_full_lifecycle(tmp_path):
+    writer = IntentLogWriter(tmp_path / "intent.log", index_size=2).start()
+    tracker = IntentTracker("C1", writer=writer)
+    tracker.log_intent_created("CMD-OLD", {"symbol": "NIFTY", "side": "BUY", "quantity": 75})
+    tracker.log_sent_to_broker("CMD-OLD", "B-OLD")
+    for i in range(3):
+        _lifecycle(tracker, f"CMD-{i}")            # CMD-OLD falls out of memory
+    tracker.log_order_executed("CMD-OLD", "B-OLD", 75, 99.0)   # late fill
+
+    stages = [e["stage"] for e in tracker.get_lifecycle("CMD-OLD")]
+    assert stages == ["INTENT_CREATED", "SENT_TO_BROKER", "EXECUTED"]
+    writer.close()
+
+
+def test_size_rotation_keeps_backups_and_lookup(tmp_path):
+    path = tmp_path / "intent.log"
+    writer = IntentLogWriter(path, max_bytes=2000, backup_count=2, index_size=1, flush_interval=0.01).start()
+    tracker = IntentTracker("C1", writer=writer)
+    for i in range(40):
+        _lifecycle(tracker, f"CMD-{i}")
+        writer.flush()
+
+    stats = writer.get_stats()
+    assert stats["rotations"] > 2
+    assert path.exists() and (tmp_path / "intent.log.1").exists()
+    assert (tmp_path / "intent.log.2").exists() and not (tmp_path / "intent.log.3").exists()
+    assert path.stat().st_size <= 2000
+    assert [e["stage"] for e in tracker.get_lifecycle("CMD-38")][-1] == "EXECUTED"
+    assert tracker.get_lifecycle("CMD-0") == []  # rotated out of the last backup
+    writer.close()
+
+
+def test_close_drains_queue_and_fsync_policy(tmp_path):
+    writer = IntentLogWriter(tmp_path / "i.log", fsync="always", flush_interval=10).start()
+    tracker = IntentTracker("C1", writer=writer)
+    _lifecycle(tracker, "CMD-A")
+    writer.close()
+    stats = writer.get_stats()
+    assert stats["pending"] == 0 and stats["fsyncs"] >= 1
+    assert len((tmp_path / "i.log").read_text().splitlines()) == 4
+
+    with pytest.raises(ValueError):
+        IntentLogWriter(tmp_path / "x.log", fsync="sometimes")
+
+
+def _best_us(fn, n, rounds=3):
+    best = float("inf")
+    for r in range(rounds):
+        t0 = time.perf_counter()
+        fn(r)
+        best = min(best, time.perf_counter() - t0)
+    return best / n * 1e6
+
+
+@pytest.mark.benchmark
+def test_per_event_cost_vs_open_append_close(tmp_path):
+    n = 2000
+    legacy_path = tmp_path / "legacy.log"
+    msg = {"stage": "DB_WRITE", "command_id": "CMD", "status": "CREATED", "timestamp": "2026-01-01T00:00:00"}
+
+    def legacy(r):
+        for i in range(n):
+            with open(legacy_path, "a") as f:  # previous _write_log
+                f.write(json.dumps({**msg, "command_id": f"CMD-{r}-{i}"}) + "\n")
+
+    # long interval: batches are encoded/written at close(), off the timed loop
+    writer = IntentLogWriter(tmp_path / "new.log", flush_interval=30).start()
+    tracker = IntentTracker("C1", writer=writer)
+
+    def queued(r):
+        for i in range(n):
+            tracker._write_log({**msg, "command_id": f"CMD-{r}-{i}"})
+
+    legacy_us = _best_us(legacy, n)
+    new_us = _best_us(queued, n)
+    writer.close()
+
+    t0 = time.perf_counter()
+    for i in range(0, n, 7):
+        tracker.get_lifecycle(f"CMD-2-{i}")
+    lookup_us = (time.perf_counter() - t0) / len(range(0, n, 7)) * 1e6
+
+    stats = writer.get_stats()
+    print(
+        f"\nintent log, per event on the caller thread ({n} events):"
+        f"\n  open/append/close: {legacy_us:7.1f} us | queued: {new_us:6.1f} us"
+        f"\n  writer batches: {stats['batches']} | lifecycle lookup: {lookup_us:.1f} us"
+    )
+    assert len((tmp_path / "new.log").read_text().splitlines()) == 3 * n
+    assert new_us < legacy_us / 2
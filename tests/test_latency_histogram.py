@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""LatencyHistogram: bucket counts, percentile estimates, reset."""
+
+from shoonya_platform.utils.latency import LatencyHistogram
+
+
+def test_percentiles_and_buckets():
+    h = LatencyHistogram()
+    assert h.snapshot()["count"] == 0
+    for _ in range(90):
+        h.observe(0.0008)   # 0.8 ms
+    for _ in range(10):
+        h.observe(0.040)    # 40 ms
+    snap = h.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50_ms"] == 1
+    assert snap["p95_ms"] == 40.0  # bucket bound 50, clamped to max
+    assert snap["max_ms"] == 40.0
+    assert snap["buckets"] == {"le_1ms": 90, "le_50ms": 10}
+    assert abs(snap["avg_ms"] - (0.8 * 90 + 40 * 10) / 100) < 1e-6
+
+    h.observe(120.0)        # beyond the last bound
+    assert h.snapshot()["buckets"]["inf"] == 1
+    h.reset()
+    assert h.count == 0
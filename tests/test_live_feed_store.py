@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+LiveFeed TickStore: per-token slots, global/per-token sequence numbers,
+"changed since seq N" pulls, TTL/size eviction and the legacy dict API.
+"""
+
+import threading
+
+import pytest
+
+from shoonya_platform.market_data.feeds import live_feed
+from shoonya_platform.market_data.feeds.live_feed import TickStore
+
+
+@pytest.fixture
+def feed():
+    live_feed.reset_all_state()
+    yield live_feed
+    live_feed.reset_all_state()
+
+
+def _raw(token, ltp, **extra):
+    tick = {"tk": f"NFO|{token}", "lp": ltp, "ft": 1_700_000_000}
+    tick.update(extra)
+    return tick
+
+
+def test_seq_is_monotonic_per_store_and_token():
+    store = TickStore()
+    s1 = store.update("1", {"ltp": 10.0})
+    s2 = store.update("2", {"ltp": 20.0})
+    s3 = store.update("1", {"oi": 5})
+    assert s1 < s2 < s3 == store.seq
+    assert store.token_seq("1") == s3
+    assert store.token_seq("2") == s2
+    assert store.token_seq("missing") == 0
+    # Partial ticks merge into the slot
+    assert store.get("1") == {"ltp": 10.0, "oi": 5}
+
+
+def test_changed_since_returns_only_newer_ticks():
+    store = TickStore()
+    for tok in ("1", "2", "3"):
+        store.update(tok, {"ltp": float(tok)})
+    cursor = store.seq
+    store.update("2", {"ltp": 22.0})
+    store.update("4", {"ltp": 4.0})
+
+    seq, ticks = store.changed_since(cursor)
+    assert seq == store.seq
+    assert ticks == {"2": {"ltp": 22.0}, "4": {"ltp": 4.0}}
+
+    _, filtered = store.changed_since(cursor, tokens=["4", "1"])
+    assert filtered == {"4": {"ltp": 4.0}}
+
+    # Up to date → nothing
+    assert store.changed_since(seq) == (seq, {})
+    # seq 0 → every live token
+    assert set(store.changed_since(0)[1]) == {"1", "2", "3", "4"}
+
+
+def test_ttl_and_maxsize_eviction(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(live_feed.time, "monotonic", lambda: clock[0])
+
+    store = TickStore(maxsize=3, ttl=10)
+    store.update("old", {"ltp": 1.0})
+    clock[0] += 11
+    assert "old" not in store and store.get("old") is None
+    assert store.changed_since(0)[1] == {}
+
+    for tok in ("a", "b", "c", "d"):
+        store.update(tok, {"ltp": 1.0})
+    assert len(store) == 3
+    assert "a" not in store and "d" in store
+
+
+def test_setitem_replaces_and_keeps_extra_keys():
+    """fyers_feed writes whole ticks with ``store[key] = tick`` under the lock."""
+    store = TickStore()
+    store.update("NSE|1", {"ltp": 1.0, "oi": 7})
+    with store.lock:
+        store["NSE|1"] = {"ltp": 2.0, "_fyers_source": True}
+    assert store["NSE|1"] == {"ltp": 2.0, "_fyers_source": True}
+    with pytest.raises(KeyError):
+        store["nope"]
+
+
+def test_handler_and_pull_api(feed):
+    feed.event_handler_feed_update(_raw("101", 50.5, oi=900))
+    feed.event_handler_feed_update(_raw("102", 60.0))
+    cursor = feed.get_tick_seq()
+    feed.event_handler_feed_update(_raw("101", 51.0))
+
+    assert feed.get_tick_data("NFO|101")["ltp"] == 51.0
+    assert feed.get_tick_data("101")["oi"] == 900
+    assert feed.get_tick_data("999") is None
+    assert set(feed.get_tick_data_batch(["NFO|101", "102", "999"])) == {"101", "102"}
+    assert feed.get_ltp_map() == {"101": 51.0, "102": 60.0}
+
+    seq, changed = feed.get_ticks_since(cursor, ["NFO|101", "NFO|102"])
+    assert seq == feed.get_tick_seq()
+    assert list(changed) == ["101"]
+
+    stats = feed.get_feed_stats()
+    assert stats["total_ticks_received"] == 3
+    assert stats["tokens_with_data"] == 2
+    assert stats["tick_seq"] == seq
+
+
+def test_reset_keeps_seq_monotonic(feed):
+    feed.event_handler_feed_update(_raw("101", 1.0))
+    before = feed.get_tick_seq()
+    feed.reset_all_state()
+    assert feed.get_feed_stats()["total_ticks_received"] == 0
+    feed.event_handler_feed_update(_raw("101", 2.0))
+    assert feed.get_tick_seq() > before
+    assert feed.get_ticks_since(before)[1] == {"101": feed.get_tick_data("101")}
+
+
+def test_concurrent_writers_lose_no_ticks(feed):
+    n_threads, per_thread = 8, 500
+
+    def worker(tid):
+        for i in range(per_thread):
+            feed.event_handler_feed_update(_raw(str(tid * 10 + i % 10), float(i)))
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = feed.get_feed_stats()
+    assert stats["total_ticks_received"] == n_threads * per_thread
+    assert stats["tokens_with_data"] == n_threads * 10
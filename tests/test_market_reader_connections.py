@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+MarketReader SQLite connections: one persistent read-only connection per
+chain that survives in-place snapshot rewrites, sees every new snapshot,
+validates once, and reopens only when the file is recreated.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shoonya_platform.market_data.option_chain.store import OptionChainStore
+from shoonya_platform.strategy_runner import market_reader as mr
+from shoonya_platform.strategy_runner.market_reader import MarketReader
+
+from tests.test_snapshot_bus import EXPIRY, FakeChain
+
+
+@pytest.fixture
+def chain(tmp_path, monkeypatch):
+    monkeypatch.setattr(mr, "DB_FOLDER", tmp_path)
+    oc = FakeChain()
+    path = tmp_path / f"NFO_NIFTY_{EXPIRY}.sqlite"
+    store = OptionChainStore(path)
+    store.write_snapshot(oc)
+    reader = MarketReader("NFO", "NIFTY", source="sqlite")
+    yield oc, store, reader, path
+    reader.close_all()
+    store.close()
+
+
+def test_connection_survives_snapshot_rewrites(chain):
+    oc, store, reader, _ = chain
+    conn = reader._get_connection(EXPIRY)
+    assert reader.get_option_at_strike(22500, "CE", EXPIRY)["ltp"] == oc.df.loc[
+        (oc.df.strike == 22500) & (oc.df.option_type == "CE"), "ltp"
+    ].iloc[0]
+
+    for i in range(5):
+        time.sleep(0.002)
+        oc.df.loc[(oc.df.strike == 22500) & (oc.df.option_type == "CE"), "ltp"] = 900.0 + i
+        store.write_snapshot(oc)
+        # New snapshot visible through the same connection
+        assert reader.get_option_at_strike(22500, "CE", EXPIRY)["ltp"] == 900.0 + i
+        assert reader._get_connection(EXPIRY) is conn
+
+    stats = reader.get_connection_stats()
+    assert stats["opens"] == 1
+    assert stats["reuses"] >= 10
+    assert stats["snapshot_changes"] >= 5
+    assert stats["open_connections"] == 1
+
+
+def test_validation_runs_only_on_open(chain):
+    _, _, reader, _ = chain
+    reader._get_connection(EXPIRY)
+
+    statements = []
+    conn = reader._conn_info[EXPIRY]["conn"]
+    reader._conn_info[EXPIRY]["conn"] = _Tracing(conn, statements)
+    for _ in range(10):
+        reader._get_connection(EXPIRY)
+    assert statements and all("data_version" in s for s in statements)
+
+
+def test_path_resolved_only_when_opening(chain, monkeypatch):
+    oc, store, reader, _ = chain
+    resolved = []
+    resolve = reader._resolve_db_path
+
+    def counting_resolve(expiry=None):
+        resolved.append(expiry)
+        return resolve(expiry)
+
+    monkeypatch.setattr(reader, "_resolve_db_path", counting_resolve)
+
+    conn = reader._get_connection()          # default expiry: directory glob
+    for i in range(5):
+        store.write_snapshot(oc)
+        assert reader._get_connection() is conn
+        assert reader._get_connection(EXPIRY) is not None
+    assert resolved == [None, EXPIRY]
+
+
+def test_recreated_file_is_reopened(chain):
+    oc, store, reader, path = chain
+    reader._get_connection(EXPIRY)
+    store.close()
+
+    # Chain removed + restarted: file deleted and written again from scratch
+    for suffix in ("", "-wal", "-shm"):
+        p = path.with_name(path.name + suffix)
+        if p.exists():
+            p.unlink()
+    oc.df.loc[:, "ltp"] = 7.0
+    fresh = OptionChainStore(path)
+    try:
+        fresh.write_snapshot(oc)
+        assert reader.get_option_at_strike(22500, "CE", EXPIRY)["ltp"] == 7.0
+        stats = reader.get_connection_stats()
+        assert stats["opens"] == 2
+        assert stats["reopens"] == 1
+    finally:
+        fresh.close()
+
+
+def test_idle_connection_is_recycled(chain):
+    _, _, reader, _ = chain
+    reader.max_stale_seconds = 0.05
+    conn = reader._get_connection(EXPIRY)
+    assert reader._get_connection(EXPIRY) is conn
+    time.sleep(0.1)  # no writes → can't rule out a recycled inode
+    assert reader._get_connection(EXPIRY) is not conn
+    assert reader.get_connection_stats()["reopens"] == 1
+
+
+def test_connection_is_reused_across_threads(chain):
+    oc, store, reader, _ = chain
+    expected = oc.df.loc[(oc.df.strike == 22500) & (oc.df.option_type == "CE"), "ltp"].iloc[0]
+
+    def read(_):
+        return reader.get_option_at_strike(22500, "CE", EXPIRY)["ltp"]
+
+    # Pool threads take turns running the reader, as executor ticks do
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(read, range(40))) == [expected] * 40
+
+    stats = reader.get_connection_stats()
+    assert stats["opens"] == 1
+    assert stats["reopens"] == 0
+    assert stats["open_connections"] == 1
+
+
+def test_failed_probe_counts_as_reopen(chain):
+    _, _, reader, _ = chain
+    conn = reader._get_connection(EXPIRY)
+    conn.close()  # probe now raises ProgrammingError
+    assert reader._get_connection(EXPIRY) is not conn
+    stats = reader.get_connection_stats()
+    assert stats["opens"] == 2 and stats["reopens"] == 1
+
+
+class _Tracing:
+    """Connection proxy recording executed SQL."""
+
+    def __init__(self, conn, log):
+        self._conn = conn
+        self._log = log
+
+    def execute(self, sql, *args):
+        self._log.append(sql)
+        return self._conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
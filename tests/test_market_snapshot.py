@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Per-cycle MarketSnapshot: built once per (exchange, symbol, expiry) by
+StrategyExecutorService and consumed by executors without any reader
+queries; values must equal what the MarketReader getters return.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from shoonya_platform.market_data.option_chain.snapshot_bus import get_snapshot_bus
+from shoonya_platform.market_data.option_chain.store import OptionChainStore
+from shoonya_platform.strategy_runner import market_reader as mr
+from shoonya_platform.strategy_runner import strategy_executor_service as ses
+from shoonya_platform.strategy_runner.market_reader import MarketReader
+from shoonya_platform.strategy_runner.models import InstrumentType, OptionType, Side
+from shoonya_platform.strategy_runner.state import LegState, StrategyState
+
+from tests.test_snapshot_bus import EXPIRY, KEY, FakeChain
+
+
+@pytest.fixture
+def chain_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(mr, "DB_FOLDER", tmp_path)
+    oc = FakeChain()
+    store = OptionChainStore(tmp_path / f"NFO_NIFTY_{EXPIRY}.sqlite")
+    store.write_snapshot(oc)
+    yield oc
+    store.close()
+
+
+@pytest.mark.parametrize("source", ["sqlite", "bus"])
+def test_snapshot_matches_reader_getters(chain_db, source):
+    if source == "bus":
+        get_snapshot_bus().publish(KEY, chain_db)
+    reader = MarketReader("NFO", "NIFTY", source=source)
+    try:
+        snap = reader.build_market_snapshot(EXPIRY)
+        assert snap.key == ("NFO", "NIFTY", EXPIRY)
+        assert snap.spot_price == reader.get_spot_price(EXPIRY)
+        assert snap.atm_strike == reader.get_atm_strike(EXPIRY)
+        assert snap.fut_ltp == reader.get_fut_ltp(EXPIRY)
+        assert snap.chain_metrics["max_pain_strike"] == reader.get_max_pain_strike(EXPIRY)
+        for strike in (22000, 22500, 23000, 99999):
+            for opt in ("CE", OptionType.PE):
+                assert snap.get_option(strike, opt) == reader.get_option_at_strike(strike, opt, EXPIRY)
+    finally:
+        reader.close_all()
+        get_snapshot_bus().remove(KEY)
+
+
+@pytest.mark.parametrize("source", ["sqlite", "bus"])
+def test_chain_metrics_come_from_the_snapshot_rows(chain_db, source, monkeypatch):
+    if source == "bus":
+        get_snapshot_bus().publish(KEY, chain_db)
+    reader = MarketReader("NFO", "NIFTY", source=source)
+    expected = reader.get_chain_metrics(EXPIRY)["max_pain_strike"]
+
+    def reread(*args, **kwargs):
+        raise AssertionError("chain metrics re-read outside the snapshot")
+
+    monkeypatch.setattr(reader, "_chain_aggregates", reread)
+    try:
+        snap = reader.build_market_snapshot(EXPIRY)
+        assert snap.chain_metrics["max_pain_strike"] == expected != 0
+        if source == "sqlite":
+            ce_oi = sum(r["oi"] for (_, opt), r in snap.rows.items() if opt == "CE")
+            assert snap.chain_metrics["total_oi_ce"] == ce_oi
+    finally:
+        reader.close_all()
+        get_snapshot_bus().remove(KEY)
+
+
+def test_snapshot_is_immutable(chain_db):
+    reader = MarketReader("NFO", "NIFTY", source="sqlite")
+    try:
+        snap = reader.build_market_snapshot(EXPIRY)
+        with pytest.raises(AttributeError):
+            snap.spot_price = 1.0
+        with pytest.raises(TypeError):
+            snap.chain_metrics["pcr"] = 1.0
+        row = snap.get_option(22500, "CE")
+        row["ltp"] = -1.0  # caller's copy only
+        assert snap.get_option(22500, "CE")["ltp"] != -1.0
+    finally:
+        reader.close_all()
+
+
+def _service(executors):
+    svc = ses.StrategyExecutorService.__new__(ses.StrategyExecutorService)
+    svc._lock = threading.RLock()
+    svc._executors = executors
+    svc._snapshot_readers = {}
+    svc._snapshot_stats = {"cycles": 0, "snapshots_built": 0, "executors_served": 0}
+    return svc
+
+
+def test_service_builds_one_snapshot_per_chain(chain_db, monkeypatch):
+    built = []
+    original = MarketReader.build_market_snapshot
+    monkeypatch.setattr(
+        MarketReader, "build_market_snapshot",
+        lambda self, expiry=None: (built.append(expiry), original(self, expiry))[1],
+    )
+    same = ("NFO", "NIFTY", EXPIRY)
+    executors = {
+        f"s{i}": SimpleNamespace(market_snapshot_key=lambda: same) for i in range(6)
+    }
+    executors["other"] = SimpleNamespace(market_snapshot_key=lambda: ("NFO", "NIFTY", "01-JAN-2099"))
+    svc = _service(executors)
+
+    snaps = svc._build_market_snapshots(list(executors))
+    assert sorted(built, key=str) == sorted([EXPIRY, "01-JAN-2099"], key=str)
+    assert list(snaps) == [same]  # missing chain → executors fall back
+    assert svc._snapshot_stats == {"cycles": 1, "snapshots_built": 1, "executors_served": 6}
+    for reader in svc._snapshot_readers.values():
+        reader.close_all()
+
+
+class _NoQueries:
+    exchange = "NFO"
+    symbol = "NIFTY"
+
+    def __getattr__(self, name):
+        raise AssertionError(f"reader queried: {name}")
+
+
+def test_executor_uses_snapshot_without_queries(chain_db):
+    reader = MarketReader("NFO", "NIFTY", source="sqlite")
+    try:
+        snap = reader.build_market_snapshot(EXPIRY)
+    finally:
+        reader.close_all()
+
+    ex = ses.PerStrategyExecutor.__new__(ses.PerStrategyExecutor)
+    ex.name = "snap_test"
+    ex.state = StrategyState()
+    ex.market = _NoQueries()
+    ex._cycle_expiry_date = EXPIRY
+    ex._market_snapshot = snap
+    ex.state.legs["L1"] = LegState(
+        tag="L1", symbol="NIFTY", instrument=InstrumentType.OPT,
+        option_type=OptionType.CE, strike=22500.0, expiry=EXPIRY,
+        side=Side.SELL, qty=1, entry_price=50.0, order_status="FILLED",
+    )
+
+    ex._update_market_data()
+
+    expected = snap.get_option(22500, "CE")
+    assert ex.state.spot_price == snap.spot_price
+    assert ex.state.max_pain_strike == snap.chain_metrics["max_pain_strike"]
+    assert ex.state.legs["L1"].ltp == expected["ltp"]
+    assert ex.state.legs["L1"].delta == expected["delta"]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+OptionChainData tick pulls: persistent token index + batched column
+updates must produce the same chain as the per-cell loop, and pull
+latency is reported in get_pull_stats().
+"""
+
+import pandas as pd
+import pytest
+
+from shoonya_platform.market_data.option_chain import option_chain as oc_mod
+from shoonya_platform.market_data.option_chain.option_chain import (
+    TICK_FIELD_MAP,
+    OptionChainData,
+)
+
+N_STRIKES = 150  # → 300 contracts
+
+
+def _chain_df(n_strikes=N_STRIKES):
+    rows = []
+    for i in range(n_strikes):
+        for opt in ("CE", "PE"):
+            row = {
+                "token": str(60000 + 2 * i + (opt == "PE")),
+                "trading_symbol": f"NIFTY{20000 + 50 * i}{opt}",
+                "strike": 20000 + 50 * i,
+                "option_type": opt,
+                "exchange": "NFO",
+                "lot_size": None,
+                "last_update": None,
+            }
+            row.update({col: None for col in TICK_FIELD_MAP.values()})
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _loaded_chain(df):
+    oc = OptionChainData()
+    with oc._lock:
+        oc._df = df
+        oc._token_set = set(df["token"])
+        oc._spot_token = "26000"
+        oc._rebuild_token_index()
+    return oc
+
+
+def _ticks(df, step=0):
+    ticks = {"26000": {"ltp": 22500.0 + step}}
+    for i, tok in enumerate(df["token"].tolist()):
+        if i % 3 == 0:
+            continue  # not every contract ticks every pull
+        ticks[f"NFO|{tok}"] = {
+            "ltp": 100.0 + i + step, "pc": 1.0, "v": 1000 + i, "oi": 5000 + i,
+            "o": 90.0, "h": 110.0, "l": 85.0, "c": 95.0,
+            "bp1": 99.5, "sp1": 100.5, "bq1": 50, "sq1": 75,
+            "tt": 1_700_000_000 + step,
+        }
+    ticks[f"NFO|{df['token'].iloc[1]}"].pop("oi")  # partial tick
+    return ticks
+
+
+def _reference_apply(df, ticks):
+    """The previous per-cell update loop."""
+    df = df.copy()
+    idx_by_token = {}
+    for idx, tok in df["token"].items():
+        idx_by_token.setdefault(tok, []).append(idx)
+    for returned_token, tick in ticks.items():
+        tok = returned_token.split("|")[-1]
+        for idx in idx_by_token.get(tok, []):
+            for src, col in TICK_FIELD_MAP.items():
+                if tick.get(src) is not None:
+                    df.at[idx, col] = tick[src]
+            df.at[idx, "last_update"] = tick.get("tt")
+    return df
+
+
+class FakeFeed(dict):
+    """Tick store stand-in: every assignment of feed["ticks"] bumps the seq."""
+
+    def __init__(self):
+        super().__init__(ticks={}, seq=0)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if key == "ticks":
+            super().__setitem__("seq", self["seq"] + 1)
+
+    def since(self, since_seq, tokens=None):
+        if since_seq >= self["seq"]:
+            return self["seq"], {}
+        wanted = set(tokens)
+        return self["seq"], {
+            k: v for k, v in self["ticks"].items() if k.split("|")[-1] in wanted
+        }
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    state = FakeFeed()
+    monkeypatch.setattr(oc_mod, "get_ticks_since", state.since)
+    monkeypatch.setattr(oc_mod, "get_all_tick_data", lambda: dict(state["ticks"]))
+    return state
+
+
+def test_pull_efficient_matches_reference(feed):
+    base = _chain_df()
+    oc = _loaded_chain(base.copy())
+    ticks = _ticks(base)
+    feed["ticks"] = {k.split("|")[-1]: v for k, v in ticks.items()}
+
+    updated = oc.pull_ticks_efficient()
+    expected = _reference_apply(base, ticks)
+
+    assert updated == 1 + sum(1 for k in ticks if k != "26000")
+    assert oc._spot_ltp == 22500.0
+    got = oc.get_dataframe()
+    for col in list(TICK_FIELD_MAP.values()) + ["last_update"]:
+        assert got[col].tolist() == expected[col].tolist(), col
+
+
+def test_pull_latest_matches_reference(feed):
+    base = _chain_df(20)
+    oc = _loaded_chain(base.copy())
+    ticks = _ticks(base, step=3)
+    feed["ticks"] = ticks
+
+    assert oc.pull_latest_ticks() == len(ticks)
+    expected = _reference_apply(base, ticks)
+    got = oc.get_dataframe()
+    assert got["ltp"].tolist() == expected["ltp"].tolist()
+    assert got["oi"].tolist() == expected["oi"].tolist()
+
+
+def test_token_index_is_persistent(feed, monkeypatch):
+    base = _chain_df(10)
+    oc = _loaded_chain(base)
+    feed["ticks"] = {k.split("|")[-1]: v for k, v in _ticks(base).items()}
+
+    rebuilds = []
+    original = oc._rebuild_token_index
+    monkeypatch.setattr(oc, "_rebuild_token_index", lambda: (rebuilds.append(1), original()))
+
+    for _ in range(5):
+        oc.pull_ticks_efficient()
+    assert rebuilds == []
+
+    # Chain replaced (reload / recenter) → index rebuilt once
+    with oc._lock:
+        oc._df = _chain_df(10)
+    oc.pull_ticks_efficient()
+    oc.pull_ticks_efficient()
+    assert len(rebuilds) == 1
+
+
+def test_pull_fetches_only_new_ticks(feed):
+    base = _chain_df(10)
+    oc = _loaded_chain(base.copy())
+    feed["ticks"] = {k.split("|")[-1]: v for k, v in _ticks(base).items()}
+
+    assert oc.pull_ticks_efficient() > 0
+    assert oc._tick_seq == feed["seq"]
+    # Nothing new in the feed → nothing applied
+    assert oc.pull_ticks_efficient() == 0
+
+    # Chain replaced → cursor reset, the new rows get every tick again
+    with oc._lock:
+        oc._df = base.copy()
+    assert oc.pull_ticks_efficient() > 0
+    assert oc.get_dataframe()["ltp"].notna().any()
+
+
+def test_pull_latency_in_stats(feed):
+    base = _chain_df()
+    oc = _loaded_chain(base)
+
+    for step in range(50):
+        feed["ticks"] = {k.split("|")[-1]: v for k, v in _ticks(base, step).items()}
+        oc.pull_ticks_efficient()
+
+    stats = oc.get_pull_stats()
+    lat = stats["pull_latency_ms"]
+    assert stats["contracts"] == 2 * N_STRIKES
+    assert stats["total_pulls"] == 50
+    assert lat["samples"] == 50
+    assert 0 < lat["avg"] <= lat["max"]
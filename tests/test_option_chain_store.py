@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+OptionChainStore incremental writer: only changed rows are UPSERTed, the
+table always equals the latest snapshot, meta.snapshot_ts moves every write.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from shoonya_platform.market_data.option_chain.store import OptionChainStore
+
+
+class MutableChain:
+    """OptionChainData stand-in whose rows the test can edit."""
+
+    def __init__(self):
+        rows = []
+        for i, strike in enumerate(range(22000, 23050, 50)):
+            for opt in ("CE", "PE"):
+                rows.append({
+                    "strike": float(strike), "option_type": opt,
+                    "token": str(50000 + 2 * i + (opt == "PE")),
+                    "trading_symbol": f"NIFTY{strike}{opt}", "exchange": "NFO",
+                    "lot_size": 50, "ltp": 100.0 + i, "change_pct": 0.5,
+                    "volume": 1000, "oi": 5000 + i,
+                    "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5,
+                    "bid": 99.0, "ask": 101.0, "bid_qty": 10, "ask_qty": 20,
+                    "last_update": None,
+                    "iv": 14.0, "delta": 0.5, "gamma": 0.001, "theta": -5.0, "vega": 8.0,
+                })
+        rows[0]["iv"] = float("nan")
+        self.df = pd.DataFrame(rows)
+        self.atm = 22500
+
+    def get_dataframe(self, copy=True):
+        return self.df.copy() if copy else self.df
+
+    def get_stats(self):
+        return {
+            "exchange": "NFO", "symbol": "NIFTY", "expiry": "10-JAN-2099",
+            "atm": self.atm, "spot_ltp": 22510.0, "fut_ltp": 22550.0,
+        }
+
+
+def _table(path):
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT * FROM option_chain ORDER BY strike, option_type"
+        ).fetchall()
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    finally:
+        conn.close()
+    return rows, meta
+
+
+def _reference(tmp_path, oc):
+    """Table contents a from-scratch full write produces."""
+    ref = tmp_path / "ref.sqlite"
+    ref.unlink(missing_ok=True)
+    store = OptionChainStore(ref)
+    store.write_snapshot(oc)
+    store.close()
+    return _table(ref)[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = OptionChainStore(tmp_path / "chain.sqlite")
+    yield s
+    s.close()
+
+
+def test_first_write_is_full_then_only_changes(tmp_path, store):
+    oc = MutableChain()
+    n = len(oc.df)
+
+    assert store.write_snapshot(oc) == n
+    rows, meta = _table(store.db_path)
+    assert len(rows) == n
+    ts1 = float(meta["snapshot_ts"])
+
+    # Nothing changed → no option rows written, snapshot_ts still advances
+    assert store.write_snapshot(oc) == 0
+    _, meta = _table(store.db_path)
+    assert float(meta["snapshot_ts"]) >= ts1
+
+    # One tick + one Greek change → two rows
+    oc.df.loc[3, "ltp"] = 555.5
+    oc.df.loc[7, "delta"] = 0.42
+    oc.atm = 22550
+    assert store.write_snapshot(oc) == 2
+    rows, meta = _table(store.db_path)
+    assert rows == _reference(tmp_path, oc)
+    assert meta["atm"] == "22550"
+
+
+def test_removed_rows_are_deleted(tmp_path, store):
+    oc = MutableChain()
+    store.write_snapshot(oc)
+    oc.df = oc.df.iloc[4:].reset_index(drop=True)
+    assert store.write_snapshot(oc) == 4
+    assert _table(store.db_path)[0] == _reference(tmp_path, oc)
+
+
+def test_new_store_on_existing_file_rewrites(tmp_path):
+    path = tmp_path / "chain.sqlite"
+    oc = MutableChain()
+    first = OptionChainStore(path)
+    first.write_snapshot(oc)
+    first.close()
+
+    oc.df = oc.df.iloc[:10].reset_index(drop=True)
+    second = OptionChainStore(path)
+    try:
+        assert second.write_snapshot(oc) == 10
+        assert _table(path)[0] == _reference(tmp_path, oc)
+    finally:
+        second.close()
+
+
+def test_write_stats(store):
+    oc = MutableChain()
+    store.write_snapshot(oc)
+    store.write_snapshot(oc)
+    oc.df.loc[0, "oi"] = 1
+    store.write_snapshot(oc)
+
+    stats = store.get_write_stats()
+    assert stats["snapshots"] == 3
+    assert stats["full_rewrites"] == 1
+    assert stats["last_rows_written"] == 1
+    assert stats["rows_written_total"] == len(oc.df) + 1
+    assert stats["rows_skipped_total"] == 2 * len(oc.df) - 1
+    assert stats["max_write_ms"] >= stats["last_write_ms"] > 0
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+OrderWatcher STEP 6 reconciliation: one open-orders query per cycle,
+settled broker orders skipped without DB work, status updates in one
+transaction, orphan grace period and the (client_id, broker_order_id) index.
+"""
+
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from shoonya_platform.persistence import database as db
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch, bot):
+    monkeypatch.setattr(db, "_DB_PATH", tmp_path / "orders.db")
+    db.close_thread_connection()
+    yield bot
+    db.close_thread_connection()
+
+
+def _sent_order(bot, symbol, broker_id):
+    cmd = bot.create_test_command(symbol=symbol, side="BUY")
+    bot.order_repo.create(cmd.to_record())
+    bot.order_repo.update_broker_id(cmd.command_id, broker_id)
+    return cmd.command_id
+
+
+def _queries():
+    return db.get_db_stats()["queries"]
+
+
+def test_terminal_statuses_applied_in_one_batch(bot):
+    ids = {
+        "B1": _sent_order(bot, "NIFTY_A", "B1"),
+        "B2": _sent_order(bot, "NIFTY_B", "B2"),
+        "B3": _sent_order(bot, "NIFTY_C", "B3"),
+    }
+    bot.api.orders = [
+        {"norenordno": "B1", "status": "COMPLETE"},
+        {"norenordno": "B2", "status": "REJECTED"},
+        {"norenordno": "B3", "status": "OPEN"},
+    ]
+    commits = []
+    conn = db.get_connection()
+    original = type(conn).commit
+    type(conn).commit = lambda self: (commits.append(1), original(self))[1]
+    try:
+        bot.order_watcher._reconcile_broker_orders()
+    finally:
+        type(conn).commit = original
+
+    repo = bot.order_repo
+    assert repo.get_by_id(ids["B1"]).status == "EXECUTED"
+    failed = repo.get_by_id(ids["B2"])
+    assert failed.status == "FAILED" and failed.tag == "BROKER_REJECTED"
+    assert repo.get_by_id(ids["B3"]).status == "SENT_TO_BROKER"
+    assert len(commits) == 1
+    bot.execution_guard.force_clear_symbol.assert_called_once_with(
+        strategy_id=failed.strategy_name, symbol="NIFTY_B",
+    )
+
+
+def test_settled_orders_cost_no_queries(bot):
+    bot.order_watcher.ORPHAN_GRACE_SEC = 0.0
+    for i in range(50):
+        _sent_order(bot, f"SYM{i}", f"OMS{i}")
+    book = [{"norenordno": f"OMS{i}", "status": "COMPLETE"} for i in range(50)]
+    book += [{"norenordno": f"MANUAL{i}", "status": "CANCELLED"} for i in range(250)]
+    bot.api.orders = book
+
+    first = _queries()
+    bot.order_watcher._reconcile_broker_orders()
+    first = _queries() - first
+
+    again = _queries()
+    bot.order_watcher._reconcile_broker_orders()
+    again = _queries() - again
+
+    # Previous implementation: one get_by_broker_id per broker order, every cycle
+    legacy = _queries()
+    for bo in book:
+        bot.order_repo.get_by_broker_id(bo["norenordno"])
+    legacy = _queries() - legacy
+
+    assert again == 0
+    assert first <= 4 < legacy
+    stats = bot.order_watcher.get_reconcile_stats()
+    assert stats["settled_today"] == 300 and stats["skipped_settled"] == 300
+
+
+def test_orphan_grace_lets_late_broker_id_reconcile(bot):
+    watcher = bot.order_watcher
+    bot.api.orders = [{"norenordno": "LATE1", "status": "COMPLETE"}]
+    watcher._reconcile_broker_orders()
+    assert watcher.get_reconcile_stats()["orphans_pending"] == 1
+
+    # Broker id persisted after the fill was already on the book
+    cmd_id = _sent_order(bot, "NIFTY_LATE", "LATE1")
+    watcher._reconcile_broker_orders()
+    assert bot.order_repo.get_by_id(cmd_id).status == "EXECUTED"
+    assert watcher.get_reconcile_stats()["orphans_pending"] == 0
+
+
+def test_orphan_settled_after_grace(bot):
+    watcher = bot.order_watcher
+    watcher.ORPHAN_GRACE_SEC = 0.05
+    bot.api.orders = [{"norenordno": "MANUAL1", "status": "COMPLETE"}]
+    watcher._reconcile_broker_orders()
+    assert watcher.get_reconcile_stats()["settled_today"] == 0
+    time.sleep(0.06)
+    watcher._reconcile_broker_orders()
+    assert watcher._settled_broker_ids == {"MANUAL1": "ORPHAN"}
+
+
+def test_watermark_resets_each_day(bot):
+    watcher = bot.order_watcher
+    watcher.ORPHAN_GRACE_SEC = 0.0
+    bot.api.orders = [{"norenordno": "X1", "status": "COMPLETE"}]
+    watcher._reconcile_broker_orders()
+    assert "X1" in watcher._settled_broker_ids
+
+    watcher._settled_day = date.today() - timedelta(days=1)
+    bot.api.orders = []
+    watcher._reconcile_broker_orders()
+    assert watcher._settled_broker_ids == {}
+
+
+def test_broker_id_lookup_uses_index(bot):
+    conn = db.get_connection()
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM orders WHERE broker_order_id = ? AND client_id = ?",
+        ("B1", "TEST_CLIENT"),
+    ).fetchall()
+    assert any("idx_orders_client_broker" in row[-1] for row in plan)
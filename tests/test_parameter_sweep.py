@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep: grid expansion over dotted config paths, schema
+validation of every variant, replay across a process pool over one
+memory-mapped tape, ranked results, and resume after interruption.
+"""
+
+import copy
+import json
+import os
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from shoonya_platform.analytics.sqlite_historical_store import SQLiteHistoricalStore
+from shoonya_platform.strategy_runner.replay import ReplayTape, replay_day
+from shoonya_platform.strategy_runner import sweep
+from shoonya_platform.strategy_runner.sweep import SweepRunner, expand_grid, set_path
+from tests.test_replay_engine import DAY, STRADDLE, _record_day
+
+BASE = copy.deepcopy(STRADDLE)
+BASE["schema_version"] = "4.0"
+BASE["timing"]["eod_exit_time"] = "15:20"
+
+GRID = {
+    "exit.stop_loss.amount": [50, 100000],
+    "exit.time.strategy_exit_time": ["12:00", "15:15"],
+    "timing.entry_window_start": ["09:20", "9:99"],   # 9:99 fails validation
+}
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    store = SQLiteHistoricalStore(tmp_path_factory.mktemp("hist") / "analytics.sqlite")
+    _record_day(store)
+    return store
+
+
+def test_set_path_and_grid_validation():
+    cfg = copy.deepcopy(BASE)
+    set_path(cfg, "entry.legs.*.lots", 2)
+    set_path(cfg, "entry.legs.1.strike_selection", "atm+1")
+    set_path(cfg, "exit.profit_target.amount", 900)   # missing section is created
+    assert [leg["lots"] for leg in cfg["entry"]["legs"]] == [2, 2]
+    assert cfg["entry"]["legs"][1]["strike_selection"] == "atm+1"
+    assert cfg["exit"]["profit_target"] == {"amount": 900}
+    with pytest.raises(KeyError):
+        set_path(cfg, "entry.legs.5.lots", 1)
+
+    variants = expand_grid(BASE, GRID)
+    assert len(variants) == 8 and len({v.id for v in variants}) == 8
+    invalid = [v for v in variants if not v.is_valid]
+    assert len(invalid) == 4
+    assert all(v.overrides["timing.entry_window_start"] == "9:99" for v in invalid)
+    assert "entry_window_start" in invalid[0].errors[0]
+    assert BASE["exit"]["stop_loss"]["amount"] == 100000   # base untouched
+
+
+def test_sweep_ranks_resumes_and_matches_single_replay(store, tmp_path):
+    out = tmp_path / "sweep"
+    runner = SweepRunner(BASE, GRID, out, store=store, start=DAY, workers=2)
+    table = runner.run()
+    assert runner.stats == {"variants": 8, "invalid": 4, "resumed": 0, "ran": 4}
+
+    ok = [r for r in table if r["status"] == "ok"]
+    assert [r["rank"] for r in ok] == [1, 2, 3, 4]
+    assert [r["net_pnl"] for r in ok] == sorted((r["net_pnl"] for r in ok), reverse=True)
+    assert all(r["frames"] == 2250 and r["errors"] == 0 for r in ok)
+    assert [r["status"] for r in table[4:]] == ["invalid"] * 4
+    assert (out / "ranking.csv").read_text().splitlines()[0].startswith(
+        "rank,id,exit.stop_loss.amount,exit.time.strategy_exit_time,timing.entry_window_start,net_pnl")
+
+    # workers replay the shared mapped tape exactly like an in-process replay
+    tape = ReplayTape.open(out / "tape")
+    assert isinstance(tape.columns["ltp"], np.memmap) and len(tape) == 2250
+    best = ok[0]
+    cfg = copy.deepcopy(BASE)
+    for path, value in best["overrides"].items():
+        set_path(cfg, path, value)
+    assert replay_day(store, cfg, DAY).net_pnl == pytest.approx(best["net_pnl"])
+
+    # interrupted: the last two finished variants never made it to disk
+    lines = (out / "results.jsonl").read_text().splitlines()
+    (out / "results.jsonl").write_text("\n".join(lines[:-2]) + "\n" + lines[-2][:20])
+    resumed = SweepRunner(BASE, GRID, out, workers=2)   # tape reused, no store needed
+    table2 = resumed.run()
+    assert resumed.stats["resumed"] == 6 and resumed.stats["ran"] == 2
+    assert [(r["id"], r["net_pnl"]) for r in table2 if r["status"] == "ok"] == \
+        [(r["id"], r["net_pnl"]) for r in ok]
+    assert SweepRunner(BASE, GRID, out).run() and json.loads(
+        (out / "results.jsonl").read_text().splitlines()[-1])["status"] == "ok"
+
+
+def test_existing_tape_for_another_range_or_symbol_is_refused(store, tmp_path):
+    out = tmp_path / "sweep"
+    assert SweepRunner(BASE, GRID, out, store=store, start=DAY).prepare_tape() == out / "tape"
+    manifest = json.loads((out / "tape" / "tape.json").read_text())
+    assert (manifest["start"], manifest["end"]) == (DAY.isoformat(), DAY.isoformat())
+
+    with pytest.raises(ValueError, match="holds a tape"):
+        SweepRunner(BASE, GRID, out, store=store, start=DAY + timedelta(days=1)).prepare_tape()
+    other = copy.deepcopy(BASE)
+    other["identity"]["underlying"] = "BANKNIFTY"
+    with pytest.raises(ValueError, match="holds a tape"):
+        SweepRunner(other, GRID, out).prepare_tape()
+    # resume without a store: identity comes from the config and matches
+    assert SweepRunner(BASE, GRID, out).prepare_tape() == out / "tape"
+
+
+def _worker_dies(*args):
+    os._exit(1)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork to patch the worker")
+def test_dead_worker_marks_variants_failed_and_resume_retries(store, tmp_path, monkeypatch):
+    out = tmp_path / "sweep"
+    grid = {"exit.stop_loss.amount": [50, 100000]}
+    monkeypatch.setattr(sweep, "_run_variant", _worker_dies)
+    runner = SweepRunner(BASE, grid, out, store=store, start=DAY, workers=1, mp_context="fork")
+    table = runner.run()   # BrokenProcessPool does not abort the sweep
+    assert [r["status"] for r in table] == ["failed", "failed"]
+    assert all("worker died" in r["error"] for r in table)
+
+    monkeypatch.undo()
+    resumed = SweepRunner(BASE, grid, out, workers=1)
+    assert [r["status"] for r in resumed.run()] == ["ok", "ok"]
+    assert resumed.stats["resumed"] == 0 and resumed.stats["ran"] == 2
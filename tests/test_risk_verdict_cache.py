@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+SupremeRiskManager verdict cache: can_execute() answers from the PnL the
+heartbeat refreshed (no broker round-trip, no wait on the heartbeat lock)
+and only refreshes synchronously once that PnL is older than the
+configured staleness; process_alert() no longer runs the heartbeat.
+"""
+
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from shoonya_platform.execution.bot_execution import ExecutionMixin
+from shoonya_platform.risk.supreme_risk import SupremeRiskManager
+from shoonya_platform.utils.latency import LatencyHistogram
+
+from .conftest import FakeBot
+from .fake_broker import FakeBroker
+
+LIVE = [{"netqty": 25, "rpnl": 0, "urmtom": 150, "tsym": "NIFTY", "exch": "NFO", "prd": "M"}]
+
+
+class SlowBroker(FakeBroker):
+    """get_positions() with a fixed REST round-trip and a call counter."""
+
+    def __init__(self, delay=0.02):
+        super().__init__()
+        self.delay = delay
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = None  # an Event here holds get_positions() open
+
+    def get_positions(self):
+        self.calls += 1
+        if self.release is not None:
+            self.entered.set()
+            self.release.wait(5)
+        time.sleep(self.delay)
+        return self.positions
+
+
+@pytest.fixture
+def rms(monkeypatch):
+    monkeypatch.setattr(SupremeRiskManager, "_is_any_market_active", classmethod(lambda cls: True))
+    broker = SlowBroker()
+    broker.positions = list(LIVE)
+    bot = FakeBot(f"VERDICT_{uuid.uuid4().hex[:8]}", broker)
+    bot.risk_manager.VERDICT_MAX_STALENESS_SEC = 5.0
+    return bot.risk_manager, broker
+
+
+def test_fresh_verdict_skips_broker(rms):
+    rm, broker = rms
+    rm.heartbeat()
+    assert broker.calls == 1
+    assert rm.get_risk_verdict()["allowed"] is True
+
+    for _ in range(50):
+        assert rm.can_execute() is True
+    assert broker.calls == 1
+    stats = rm.get_verdict_stats()
+    assert stats["cached"] == 50 and stats["sync_refreshes"] == 0
+
+
+def test_verdict_counts_are_exact_across_threads(rms):
+    rm, _ = rms
+    rm.heartbeat()
+    threads = [
+        threading.Thread(target=lambda: [rm.can_execute() for _ in range(200)])
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert rm.get_verdict_stats()["cached"] == 1600
+
+
+def test_stale_verdict_or_new_day_refreshes_synchronously(rms):
+    rm, broker = rms
+    assert rm.can_execute() is True  # nothing refreshed yet
+    assert broker.calls == 1
+
+    rm._pnl_refreshed_at -= rm.VERDICT_MAX_STALENESS_SEC + 1
+    assert rm.can_execute() is True
+    assert broker.calls == 2
+
+    rm.current_day = date.today() - timedelta(days=1)
+    assert rm.can_execute() is True
+    assert broker.calls == 3
+    assert rm.current_day == date.today()
+    assert rm.get_verdict_stats()["sync_refreshes"] == 3
+
+
+def test_cached_breach_still_triggers_exit(rms):
+    rm, broker = rms
+    # Flat book with a realised loss: heartbeat does not act on it (no live
+    # positions) but the entry gate must still refuse and route the exit.
+    broker.positions = [{"netqty": 0, "rpnl": -3000, "urmtom": 0, "tsym": "NIFTY", "exch": "NFO", "prd": "M"}]
+    rm.heartbeat()
+    assert rm.get_risk_verdict()["reason"] == "MAX_LOSS_BREACH"
+    assert rm.daily_loss_hit is False
+
+    calls = broker.calls
+    assert rm.can_execute() is False
+    assert broker.calls == calls
+    assert rm.daily_loss_hit is True
+    assert rm.get_risk_verdict()["reason"] == "FORCE_EXIT_IN_PROGRESS"
+
+
+def test_gate_does_not_wait_for_running_heartbeat(rms):
+    rm, broker = rms
+    rm.heartbeat()
+    broker.release = threading.Event()
+    hb = threading.Thread(target=rm.heartbeat)
+    hb.start()
+    assert broker.entered.wait(5)  # heartbeat now holds the lock inside get_positions()
+    calls = broker.calls
+    assert rm.can_execute() is True
+    # answered while the heartbeat is still blocked, without a broker call
+    assert hb.is_alive() and broker.calls == calls
+    broker.release.set()
+    hb.join()
+
+
+@pytest.mark.benchmark
+def test_alert_gate_latency_before_and_after(rms):
+    rm, broker = rms
+    n = 40
+    before, after = LatencyHistogram(), LatencyHistogram()
+
+    # Old hot path: heartbeat() + can_execute() each hitting the broker
+    for _ in range(n):
+        started = time.perf_counter()
+        rm.heartbeat()
+        rm._pnl_refreshed_at = None
+        rm.can_execute()
+        before.observe(time.perf_counter() - started)
+
+    # New hot path: verdict kept fresh by the scheduler heartbeat
+    rm.heartbeat()
+    for _ in range(n):
+        started = time.perf_counter()
+        rm.can_execute()
+        after.observe(time.perf_counter() - started)
+
+    b, a = before.snapshot(), after.snapshot()
+    print(f"\nRMS gate per alert  before: p50={b['p50_ms']}ms p95={b['p95_ms']}ms p99={b['p99_ms']}ms")
+    print(f"RMS gate per alert  after:  p50={a['p50_ms']}ms p95={a['p95_ms']}ms p99={a['p99_ms']}ms")
+    assert b["p50_ms"] >= 2 * broker.delay * 1000 * 0.9
+    assert a["p99_ms"] < b["p50_ms"] / 10
+
+
+class _AlertBot(ExecutionMixin):
+    def __init__(self):
+        self.risk_manager = Mock()
+        self.telegram_enabled = False
+        self._process_alert_duration = LatencyHistogram()
+
+    def _ensure_login(self):
+        return True
+
+    def parse_alert_data(self, alert_data):
+        raise ValueError("bad alert")
+
+
+def test_process_alert_skips_heartbeat_and_records_duration():
+    bot = _AlertBot()
+    result = bot.process_alert({"strategy_name": "x"})
+    assert result["status"] == "error"
+    bot.risk_manager.heartbeat.assert_not_called()
+    stats = bot.get_alert_handling_stats()
+    assert stats["process_alert_duration"]["count"] == 1
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Binary instrument cache: the first load parses parquet and publishes one
+mappable file per exchange; later loads (any process) map it read-only.
+Includes a cold vs warm process-startup benchmark.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from scripts import scriptmaster as sm
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _raw(exchange: str, underlyings, n_strikes: int) -> pd.DataFrame:
+    rows, token = [], 40000 if exchange == "NFO" else 80000
+    for und, inst, lot, base, step in underlyings:
+        for m, mon in enumerate(("JAN", "FEB", "MAR", "APR", "MAY", "JUN")):
+            expiry = f"{27 - m:02d}-{mon}-2026"
+            token += 1
+            rows.append((token, lot, und, f"{und}{27 - m}{mon}26F", expiry, "FUTIDX", "XX", 0, 0.05))
+            for k in range(-n_strikes, n_strikes):
+                for opt in ("CE", "PE"):
+                    token += 1
+                    strike = base + k * step
+                    rows.append((token, lot, und, f"{und}{27 - m}{mon}26{opt[0]}{strike}",
+                                 expiry, inst, opt, strike, 0.05))
+    return pd.DataFrame(rows, columns=[
+        "Token", "LotSize", "Symbol", "TradingSymbol", "Expiry",
+        "Instrument", "OptionType", "StrikePrice", "TickSize",
+    ])
+
+
+@pytest.fixture
+def store_dirs(tmp_path):
+    proc, cache = tmp_path / "processed", tmp_path / "cache"
+    proc.mkdir()
+    sm._normalize(_raw("NFO", [("NIFTY", "OPTIDX", 75, 24000, 50),
+                               ("BANKNIFTY", "OPTIDX", 30, 52000, 100)], 1000), "NFO") \
+        .to_parquet(proc / "NFO.parquet")
+    sm._normalize(_raw("BFO", [("SENSEX", "OPTIDX", 20, 80000, 100)], 1000), "BFO") \
+        .to_parquet(proc / "BFO.parquet")
+
+    saved = (sm.PROC_DIR, sm.CACHE_DIR, dict(sm.SCRIPTMASTER), dict(sm.EXPIRY_CALENDAR))
+    sm.PROC_DIR, sm.CACHE_DIR = proc, cache
+    yield proc, cache
+    sm.PROC_DIR, sm.CACHE_DIR = saved[0], saved[1]
+    with sm._SCRIPTMASTER_LOCK:
+        sm.SCRIPTMASTER.clear()
+        sm.SCRIPTMASTER.update(saved[2])
+        sm.EXPIRY_CALENDAR.clear()
+        sm.EXPIRY_CALENDAR.update(saved[3])
+
+
+def test_cold_load_publishes_and_warm_load_maps(store_dirs):
+    proc, cache = store_dirs
+    assert sm._open_instrument_cache() is None
+
+    sm._load_from_disk()  # cold: parse + publish, then swap onto the mapping
+    assert (cache / "CURRENT").exists()
+    assert all(t.is_mapped for t in sm.SCRIPTMASTER.values())
+    cold_calendar = json.loads(json.dumps(sm.EXPIRY_CALENDAR))
+    cold_tokens = sm.get_tokens(underlying="NIFTY", expiry="25-MAR-2026", option_type="PE", strike_price=24500)
+
+    sm.SCRIPTMASTER.clear()
+    sm.EXPIRY_CALENDAR.clear()
+    sm._load_from_disk()  # warm
+    assert set(sm.SCRIPTMASTER) == {"NFO", "BFO"}
+    assert all(t.is_mapped for t in sm.SCRIPTMASTER.values())
+    assert sm.EXPIRY_CALENDAR == cold_calendar
+    assert sm.get_tokens(underlying="NIFTY", expiry="25-MAR-2026", option_type="PE",
+                         strike_price=24500) == cold_tokens
+    rec = sm.SCRIPTMASTER["BFO"].by_contract("SENSEX", "27-JAN-2026", "CE", 80000)[0]
+    assert rec["TradingSymbol"] == "SENSEX27JAN26C80000" and rec["LotSize"] == 20
+    # Read-only mapping: no process can scribble on the shared pages
+    with pytest.raises((ValueError, TypeError)):
+        sm.SCRIPTMASTER["NFO"]._arrays["StrikePrice"][0] = 1.0
+
+
+def test_rewritten_parquet_invalidates_cache(store_dirs):
+    proc, cache = store_dirs
+    sm._load_from_disk()
+    first = (cache / "CURRENT").read_text()
+
+    df = pd.read_parquet(proc / "BFO.parquet").iloc[:100]
+    time.sleep(0.01)
+    df.to_parquet(proc / "BFO.parquet")
+    assert sm._open_instrument_cache() is None
+
+    sm._load_from_disk()
+    assert (cache / "CURRENT").read_text() != first
+    assert len(sm.SCRIPTMASTER["BFO"]) == 100
+    # superseded generation pruned
+    assert [p.name for p in cache.iterdir() if p.is_dir()] == [(cache / "CURRENT").read_text()]
+
+
+_STARTUP = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from scripts import scriptmaster as sm
+sm.PROC_DIR, sm.CACHE_DIR = sm.Path(sys.argv[1]), sm.Path(sys.argv[2])
+t1 = time.perf_counter()
+sm._load_from_disk()
+sm.get_tokens(underlying="NIFTY", expiry="27-JAN-2026", option_type="CE", strike_price=24000)
+t2 = time.perf_counter()
+status = {}
+try:
+    for line in open("/proc/self/status"):
+        k, _, v = line.partition(":")
+        if k in ("RssAnon", "RssFile"):
+            status[k] = int(v.split()[0])
+except OSError:
+    pass
+print(json.dumps({"import_s": t1 - t0, "load_s": t2 - t1, **status}))
+"""
+
+
+def _start(proc, cache):
+    out = subprocess.run(
+        [sys.executable, "-c", _STARTUP, str(proc), str(cache)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_newer_generation_is_never_pruned(store_dirs):
+    proc, cache = store_dirs
+    sm._load_from_disk()
+    newer = cache / "99991231-235959-1-abcdef"      # published after us by another process
+    newer.mkdir()
+    df = pd.read_parquet(proc / "BFO.parquet").iloc[:100]
+    time.sleep(0.01)
+    df.to_parquet(proc / "BFO.parquet")
+    sm._load_from_disk()
+    assert newer.exists()
+
+
+def test_concurrent_cold_starts_share_one_generation(store_dirs):
+    proc, cache = store_dirs
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", _STARTUP, str(proc), str(cache)],
+            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            env={**os.environ, "PYTHONPATH": str(ROOT)},
+        )
+        for _ in range(3)
+    ]
+    for p in procs:
+        assert p.wait(timeout=300) == 0, p.stderr.read().decode()[-2000:]
+    current = (cache / "CURRENT").read_text()
+    assert [d.name for d in cache.iterdir() if d.is_dir()] == [current]
+    assert sm._open_instrument_cache() is not None   # later starts stay warm
+
+
+@pytest.mark.benchmark
+def test_startup_benchmark_cold_vs_warm(store_dirs):
+    proc, cache = store_dirs
+    cold = _start(proc, cache)
+    warm = [_start(proc, cache) for _ in range(2)]
+    best = min(warm, key=lambda r: r["load_s"])
+
+    rows = sum(len(pd.read_parquet(p)) for p in proc.glob("*.parquet"))
+    print(
+        f"\nScriptMaster startup ({rows} rows, NFO+BFO), per process:"
+        f"\n  cold (parse parquet + build + publish): load {cold['load_s'] * 1000:7.1f} ms"
+        f"\n  warm (map binary cache):                load {best['load_s'] * 1000:7.1f} ms"
+    )
+    if "RssAnon" in best:
+        print(f"  warm RSS: anon {best['RssAnon'] / 1024:.1f} MB, file-backed (shared) "
+              f"{best['RssFile'] / 1024:.1f} MB | cold anon {cold['RssAnon'] / 1024:.1f} MB")
+    assert best["load_s"] < cold["load_s"] / 3
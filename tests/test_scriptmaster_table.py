@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Columnar ScriptMaster: per-exchange tables with hash indexes instead of
+per-row dicts. Checks the dict-compatible read view, the indexed query
+helpers against the old linear scans, and reports load time / memory /
+lookup latency against the old iterrows() loader.
+"""
+
+import time
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from scripts import scriptmaster as sm
+from scripts.scriptmaster_table import ExchangeTable
+
+MONTHS = ["JAN", "FEB", "MAR", "APR"]
+
+
+def _raw_nfo() -> pd.DataFrame:
+    rows = []
+    token = 35000
+    for und, inst, lot, base, step in (
+        ("NIFTY", "OPTIDX", 75, 24000, 50),
+        ("BANKNIFTY", "OPTIDX", 30, 52000, 100),
+        ("RELIANCE", "OPTSTK", 500, 1300, 1),
+    ):
+        for m, mon in enumerate(MONTHS):
+            expiry = f"{27 - m:02d}-{mon}-2026"
+            token += 1
+            rows.append((token, lot, und, f"{und}{27 - m}{mon}26F", expiry,
+                         "FUTIDX" if inst == "OPTIDX" else "FUTSTK", "XX", 0, 0.05))
+            for k in range(-400, 400):
+                strike = base + k * step
+                for opt in ("CE", "PE"):
+                    token += 1
+                    rows.append((token, lot, und, f"{und}{27 - m}{mon}26{opt[0]}{strike}",
+                                 expiry, inst, opt, strike, 0.05))
+    return pd.DataFrame(rows, columns=[
+        "Token", "LotSize", "Symbol", "TradingSymbol", "Expiry",
+        "Instrument", "OptionType", "StrikePrice", "TickSize",
+    ])
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    proc = tmp_path_factory.mktemp("processed")
+    norm = sm._normalize(_raw_nfo(), "NFO")
+    norm.to_parquet(proc / "NFO.parquet")
+
+    saved = (sm.PROC_DIR, sm.CACHE_DIR, dict(sm.SCRIPTMASTER), dict(sm.EXPIRY_CALENDAR))
+    sm.PROC_DIR = proc
+    sm.CACHE_DIR = proc / "no-cache"
+    sm.CACHE_DIR.write_text("")  # a file: cache unusable, every load parses parquet
+    t0 = time.perf_counter()
+    sm._load_from_disk()
+    load_s = time.perf_counter() - t0
+    # second load under tracemalloc: retained size of the new store
+    tracemalloc.start()
+    sm._load_from_disk()
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    yield {"proc": proc, "load_s": load_s, "mem": mem, "norm": norm}
+
+    sm.PROC_DIR, sm.CACHE_DIR = saved[0], saved[1]
+    with sm._SCRIPTMASTER_LOCK:
+        sm.SCRIPTMASTER.clear()
+        sm.SCRIPTMASTER.update(saved[2])
+        sm.EXPIRY_CALENDAR.clear()
+        sm.EXPIRY_CALENDAR.update(saved[3])
+
+
+def _legacy_load(proc):
+    """The previous loader: iterrows() into nested dicts + a universal copy."""
+    df = pd.read_parquet(proc / "NFO.parquet")
+    df.index = df.index.astype(str)
+    data = {str(idx): {str(c): v for c, v in row.items()} for idx, row in df.iterrows()}
+    universal = {f"NFO|{tok}": rec.copy() for tok, rec in data.items()}
+    return {"NFO": data}, universal
+
+
+def _legacy_get_tokens(universal, **f):
+    out = []
+    for key, rec in universal.items():
+        if rec.get("Underlying") != f["underlying"] or rec.get("Expiry") != f["expiry"]:
+            continue
+        if rec.get("OptionType") != f["option_type"]:
+            continue
+        if float(rec.get("StrikePrice") or 0) != float(f["strike_price"]):
+            continue
+        out.append(key.split("|", 1)[1])
+    return out
+
+
+def _per_call_us(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def test_dict_compatible_view(store):
+    table = sm.SCRIPTMASTER["NFO"]
+    assert isinstance(table, ExchangeTable)
+    assert len(table) == len(store["norm"])
+
+    tok = next(iter(table))
+    rec = table[tok]
+    assert rec["Token"] == tok and rec["Exchange"] == "NFO"
+    assert table.get("nope") is None and "nope" not in table
+    assert sm.SCRIPTMASTER_UNIVERSAL[f"NFO|{tok}"] == rec
+    assert len(sm.SCRIPTMASTER_UNIVERSAL) == len(table)
+
+    ce = table.by_contract("NIFTY", "27-JAN-2026", "CE", 24000)
+    assert len(ce) == 1
+    assert ce[0]["TradingSymbol"] == "NIFTY27JAN26C24000"
+    assert ce[0]["LotSize"] == 75 and ce[0]["StrikePrice"] == 24000.0
+    assert table.get_by_tradingsymbol("NIFTY27JAN26C24000") == ce[0]
+
+
+def test_query_helpers_match_legacy_scans(store):
+    data, universal = _legacy_load(store["proc"])
+    f = dict(underlying="BANKNIFTY", expiry="26-FEB-2026", option_type="PE", strike_price=52500)
+    assert sm.get_tokens(**f) == _legacy_get_tokens(universal, **f)
+
+    legacy_rows = [r for r in data["NFO"].values() if r["Symbol"] == "RELIANCE"]
+    assert [r["Token"] for r in sm.universal_symbol_search("reliance", "nfo")] == \
+        [r["Token"] for r in legacy_rows]
+
+    futs = sm.get_future("NIFTY", "NFO")
+    assert list(futs["Expiry"]) == ["27-JAN-2026", "26-FEB-2026", "25-MAR-2026", "24-APR-2026"]
+    assert sm.get_stock_detail("NIFTY", "NFO", "FUTIDX")["Instrument"] == "FUTIDX"
+    assert sm.requires_limit_order(exchange="NFO", tradingsymbol="RELIANCE27JAN26C1300")
+    assert not sm.requires_limit_order(exchange="NFO", tradingsymbol="NIFTY27JAN26C24000")
+    assert sm.options_expiry("NIFTY", "NFO") == [
+        "27-JAN-2026", "26-FEB-2026", "25-MAR-2026", "24-APR-2026"
+    ]
+
+
+def test_columnar_store_uses_less_memory(store):
+    tracemalloc.start()
+    data, universal = _legacy_load(store["proc"])
+    legacy_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del data, universal
+    assert store["mem"] < legacy_mem / 2
+
+
+@pytest.mark.benchmark
+def test_report_load_memory_lookup(store):
+    t0 = time.perf_counter()
+    data, universal = _legacy_load(store["proc"])
+    legacy_load_s = time.perf_counter() - t0
+    del data, universal
+    tracemalloc.start()
+    data, universal = _legacy_load(store["proc"])
+    legacy_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    f = dict(underlying="NIFTY", expiry="25-MAR-2026", option_type="CE", strike_price=24100)
+    legacy_us = _per_call_us(lambda: _legacy_get_tokens(universal, **f), 3)
+    new_us = _per_call_us(lambda: sm.get_tokens(**f), 200)
+    legacy_tsym_us = _per_call_us(lambda: next(
+        r for r in data["NFO"].values() if r["TradingSymbol"] == "RELIANCE24APR26P1400"), 3)
+    new_tsym_us = _per_call_us(
+        lambda: sm.requires_limit_order(exchange="NFO", tradingsymbol="RELIANCE24APR26P1400"), 200)
+
+    rows = len(store["norm"])
+    print(
+        f"\nScriptMaster ({rows} rows, one exchange)"
+        f"\n  load:      legacy {legacy_load_s * 1000:8.1f} ms | columnar {store['load_s'] * 1000:8.1f} ms"
+        f"\n  memory:    legacy {legacy_mem / 2**20:8.1f} MB | columnar {store['mem'] / 2**20:8.1f} MB"
+        f"\n  get_tokens contract: legacy {legacy_us:9.1f} us | indexed {new_us:7.1f} us"
+        f"\n  tradingsymbol:       legacy {legacy_tsym_us:9.1f} us | indexed {new_tsym_us:7.1f} us"
+    )
+    assert new_us < legacy_us / 10
+    assert new_tsym_us < legacy_tsym_us / 10
+    assert store["load_s"] < legacy_load_s
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Snapshot bus tests: MarketReader reading the in-process snapshot bus must
+return exactly what it returns from the SQLite mirror of the same chain.
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from shoonya_platform.market_data.option_chain.snapshot_bus import (
+    OptionChainSnapshotBus,
+    get_snapshot_bus,
+)
+from shoonya_platform.market_data.option_chain.store import OptionChainStore
+from shoonya_platform.strategy_runner import market_reader as mr
+from shoonya_platform.strategy_runner.market_reader import MarketReader
+
+EXPIRY = "10-JAN-2099"
+KEY = f"NFO:NIFTY:{EXPIRY}"
+
+
+class FakeChain:
+    """Minimal OptionChainData stand-in (get_dataframe / get_stats)."""
+
+    def __init__(self, spot=22510.0):
+        rows = []
+        for i, strike in enumerate(range(22000, 23050, 50)):
+            m = (strike - spot) / 400.0
+            ce_delta = 1.0 / (1.0 + math.exp(3 * m))
+            for opt in ("CE", "PE"):
+                delta = ce_delta if opt == "CE" else ce_delta - 1.0
+                intrinsic = max(spot - strike, 0) if opt == "CE" else max(strike - spot, 0)
+                rows.append({
+                    "token": str(40000 + i * 2 + (opt == "PE")),
+                    "trading_symbol": f"NIFTY10JAN99{opt[0]}{strike}",
+                    "strike": strike,
+                    "option_type": opt,
+                    "exchange": "NFO",
+                    "lot_size": 50,
+                    "ltp": round(intrinsic + 40 + 30 * abs(delta), 2),
+                    "change_pct": 1.5,
+                    "volume": 1000 + i * 10,
+                    "oi": 50000 + (i * 700 if opt == "CE" else (20 - i) * 650),
+                    "open": 10.0, "high": 12.0, "low": 9.0, "close": 11.0,
+                    "bid": 10.0, "ask": 10.5, "bid_qty": 100, "ask_qty": 150,
+                    "last_update": None,
+                    "iv": 14.0 + abs(m),
+                    "delta": delta,
+                    "gamma": 0.001,
+                    "theta": -5.0 - 10 * abs(delta),
+                    "vega": 8.0,
+                })
+        # One contract without a live price / Greeks (must never match)
+        rows[0].update(ltp=None, delta=None, iv=None)
+        self.df = pd.DataFrame(rows)
+        self.spot = spot
+
+    def get_dataframe(self, copy=True):
+        return self.df.copy() if copy else self.df
+
+    def get_stats(self):
+        return {
+            "exchange": "NFO", "symbol": "NIFTY", "expiry": EXPIRY,
+            "atm": 22500, "spot_ltp": self.spot, "fut_ltp": self.spot + 40,
+        }
+
+
+@pytest.fixture
+def readers(tmp_path, monkeypatch):
+    monkeypatch.setattr(mr, "DB_FOLDER", tmp_path)
+    oc = FakeChain()
+
+    store = OptionChainStore(tmp_path / f"NFO_NIFTY_{EXPIRY}.sqlite")
+    store.write_snapshot(oc)
+    store.close()
+
+    bus = get_snapshot_bus()
+    bus.publish(KEY, oc)
+
+    sqlite_reader = MarketReader("NFO", "NIFTY", source="sqlite")
+    bus_reader = MarketReader("NFO", "NIFTY", source="bus")
+    yield sqlite_reader, bus_reader
+    sqlite_reader.close_all()
+    bus.remove(KEY)
+
+
+def test_bus_reader_matches_sqlite_reader(readers):
+    sql, bus = readers
+    calls = [
+        ("get_option_at_strike", (22500, "CE", EXPIRY)),
+        ("get_option_at_strike", (22550.0, "PE", EXPIRY)),
+        ("get_option_at_strike", (99999, "PE", EXPIRY)),
+        ("find_option_by_delta", ("CE", 0.3, 0.05, EXPIRY)),
+        ("find_option_by_delta", ("PE", 0.5, 0.01, EXPIRY)),
+        ("find_option_by_delta", ("PE", 0.99, 0.01, EXPIRY)),
+        ("find_straddle_strike_by_delta", ("PE", 0.5, EXPIRY)),
+        ("find_option_by_premium", ("CE", 75.0, 10.0, EXPIRY)),
+        ("find_option_by_premium", ("PE", 5000.0, 1.0, EXPIRY)),
+        ("find_option_by_iv", ("CE", 14.5, 0.1, EXPIRY)),
+        ("find_option_by_criteria", ("CE", "abs_theta", 9.0, 0.5, EXPIRY)),
+        ("find_option_by_criteria", ("PE", "oi", 60000.0, 10.0, EXPIRY)),
+        ("get_full_chain", (EXPIRY,)),
+        ("get_max_pain_strike", (EXPIRY,)),
+        ("get_pcr_inflection_strike", (EXPIRY,)),
+        ("get_lot_size", (EXPIRY,)),
+        ("get_spot_price", (EXPIRY,)),
+        ("get_atm_strike", (EXPIRY,)),
+        ("get_fut_ltp", (EXPIRY,)),
+        ("_get_strike_step", (EXPIRY,)),
+    ]
+    for name, args in calls:
+        assert getattr(bus, name)(*args) == getattr(sql, name)(*args), name
+
+    m_sql = sql.get_chain_metrics(EXPIRY)
+    m_bus = bus.get_chain_metrics(EXPIRY)
+    assert m_bus == pytest.approx(m_sql)
+
+
+def test_bus_reader_auto_resolves_nearest_expiry(readers):
+    _, bus = readers
+    assert bus.get_option_at_strike(22500, "CE") == bus.get_option_at_strike(22500, "CE", EXPIRY)
+
+
+def test_bus_only_reader_never_opens_sqlite(readers):
+    _, bus = readers
+    get_snapshot_bus().remove(KEY)
+    assert bus.get_option_at_strike(22500, "CE", EXPIRY) is None
+    assert bus._conn_info == {}
+
+
+def test_expiry_modes_resolve_from_bus_without_sqlite_files(readers, tmp_path, monkeypatch):
+    _, bus = readers
+    monkeypatch.setattr(mr, "DB_FOLDER", tmp_path / "no_mirror")   # mirror switched off
+    later = "17-JAN-2099"
+    get_snapshot_bus().publish(f"NFO:NIFTY:{later}", FakeChain())
+    try:
+        assert bus.resolve_expiry_mode("weekly_current") == EXPIRY
+        assert bus.resolve_expiry_mode("weekly_next") == later
+        assert bus.get_next_expiry(EXPIRY) == later
+        # a sqlite-only reader still only sees DB files
+        with pytest.raises(ValueError):
+            MarketReader("NFO", "NIFTY", source="sqlite").resolve_expiry_mode("weekly_current")
+    finally:
+        get_snapshot_bus().remove(f"NFO:NIFTY:{later}")
+
+
+def test_auto_reader_falls_back_to_sqlite(readers):
+    sql, _ = readers
+    get_snapshot_bus().remove(KEY)
+    auto = MarketReader("NFO", "NIFTY", source="auto")
+    try:
+        assert auto.get_option_at_strike(22500, "CE", EXPIRY) == sql.get_option_at_strike(22500, "CE", EXPIRY)
+    finally:
+        auto.close_all()
+
+
+def test_snapshot_is_immutable_and_versioned():
+    bus = OptionChainSnapshotBus()
+    oc = FakeChain()
+    first = bus.publish(KEY, oc)
+    second = bus.publish(KEY, oc)
+    assert second.version == first.version + 1
+    assert bus.get("NFO", "NIFTY", EXPIRY) is second
+    with pytest.raises(ValueError):
+        second.column("ltp")[0] = 1.0
+
+    bus.remove(KEY)
+    third = bus.publish(KEY, oc)
+    assert third.version > second.version
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+StrategyExecutorService event-driven scheduler: strategies tick when their
+chain publishes or a fill arrives (rate-limited per strategy), with a
+heartbeat fallback; queue delay / process_tick histograms are exposed.
+"""
+
+import threading
+import time
+
+import pytest
+
+from shoonya_platform.market_data.option_chain.snapshot_bus import get_snapshot_bus
+from shoonya_platform.strategy_runner import market_reader as mr
+from shoonya_platform.strategy_runner.strategy_executor_service import StrategyExecutorService
+
+from tests.test_snapshot_bus import EXPIRY, KEY, FakeChain
+
+CHAIN = ("NFO", "NIFTY", EXPIRY)
+OTHER = ("NFO", "BANKNIFTY", EXPIRY)
+
+
+class FakeExecutor:
+    def __init__(self, chain):
+        self.chain = chain
+        self.ticks = []
+        self.snapshots = []
+        self._tick_lock = threading.RLock()
+        self.cycle_completed = False
+        self.state = type("S", (), {"any_leg_active": True})()
+
+    def market_snapshot_key(self):
+        return self.chain
+
+    def process_tick(self, market_snapshot=None):
+        self.ticks.append(time.monotonic())
+        self.snapshots.append(market_snapshot)
+
+    def notify_fill(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(mr, "DB_FOLDER", tmp_path)
+    svc = StrategyExecutorService.__new__(StrategyExecutorService)
+    svc._lock = threading.RLock()
+    svc._executors = {}
+    svc._strategies = {}
+    svc._snapshot_readers = {}
+    svc._snapshot_stats = {"cycles": 0, "snapshots_built": 0, "executors_served": 0}
+    svc._timed_out_strategies = {}
+    svc._stop_event = threading.Event()
+    svc._init_scheduler()
+    svc.HEARTBEAT_INTERVAL = 1.0
+    svc.MIN_TICK_INTERVAL = 0.05
+
+    def add(name, chain, **schedule):
+        svc._executors[name] = FakeExecutor(chain)
+        svc._strategies[name] = {"schedule": schedule}
+        return svc._executors[name]
+
+    svc.add = add
+    svc._running = True
+    bus = get_snapshot_bus()
+    bus.subscribe(svc._on_chain_published)
+    thread = threading.Thread(target=svc._run_loop, daemon=True)
+    thread.start()
+    yield svc
+    svc._running = False
+    svc._stop_event.set()
+    svc._wake.set()
+    thread.join(timeout=5)
+    bus.unsubscribe(svc._on_chain_published)
+    bus.remove(KEY)
+
+
+def _wait_for(pred, timeout=10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if pred():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_publish_wakes_only_strategies_on_that_chain(service):
+    service.HEARTBEAT_INTERVAL = 600.0  # any tick after the first is a wakeup
+    a = service.add("a", CHAIN)
+    b = service.add("b", OTHER)
+    service._wake.set()
+    assert _wait_for(lambda: a.ticks and b.ticks)  # first (heartbeat) tick
+    time.sleep(0.1)
+    a0, b0 = len(a.ticks), len(b.ticks)
+
+    get_snapshot_bus().publish(KEY, FakeChain())
+    assert _wait_for(lambda: len(a.ticks) > a0)
+    assert len(b.ticks) == b0
+    assert service.get_scheduler_stats()["wakeups"]["heartbeat"] == 2
+    # Woken tick receives the shared snapshot for its chain
+    assert a.snapshots[-1] is not None and a.snapshots[-1].key == CHAIN
+
+
+def test_min_interval_coalesces_bursts(service):
+    service.HEARTBEAT_INTERVAL = 600.0
+    a = service.add("a", CHAIN, min_tick_interval_sec=600.0)
+    service._wake.set()
+    assert _wait_for(lambda: a.ticks)  # first (heartbeat) tick
+    n0 = len(a.ticks)
+
+    bus = get_snapshot_bus()
+    chain = FakeChain()
+    for _ in range(20):
+        bus.publish(KEY, chain)
+    # Inside the min interval the whole burst collapses into one pending tick
+    assert _wait_for(lambda: not service._published_chains
+                     and service.get_scheduler_stats()["wakeups"]["chain"] >= 1)
+    assert len(a.ticks) == n0 and list(service._dirty) == ["a"]
+
+    # Once the interval allows it, the coalesced wake-up ticks exactly once
+    service._strategies["a"]["schedule"]["min_tick_interval_sec"] = 0.3
+    service._wake.set()
+    assert _wait_for(lambda: len(a.ticks) > n0)
+    assert len(a.ticks) == n0 + 1 and not service._dirty
+    assert a.ticks[-1] - a.ticks[-2] >= 0.29
+
+
+def test_fill_wakes_strategy(service):
+    service.HEARTBEAT_INTERVAL = 600.0
+    a = service.add("a", OTHER)
+    service._wake.set()
+    assert _wait_for(lambda: a.ticks)
+    time.sleep(0.1)
+    n0 = len(a.ticks)
+    service.notify_fill("a", symbol="X", side="BUY", qty=1, price=1.0)
+    assert _wait_for(lambda: len(a.ticks) > n0)
+    assert service.get_scheduler_stats()["wakeups"]["fill"] == 1
+
+
+def test_heartbeat_fallback_and_histograms(service):
+    a = service.add("a", OTHER)
+    service._wake.set()
+    assert _wait_for(lambda: len(a.ticks) >= 3)
+    gaps = [y - x for x, y in zip(a.ticks, a.ticks[1:])]
+    assert min(gaps) >= 0.9  # never ahead of the heartbeat
+
+    stats = service.get_scheduler_stats()
+    assert stats["wakeups"]["heartbeat"] >= 2
+    per = stats["strategies"]["a"]
+    assert per["process_tick"]["count"] == len(a.ticks)
+    assert per["queue_delay"]["count"] == len(a.ticks)
+    assert per["queue_delay"]["p95_ms"] is not None
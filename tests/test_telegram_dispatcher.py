@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Telegram dispatcher against a local stub Bot API server: producers only
+enqueue (even when the API is slow), order bursts are coalesced into one
+digest, failures are retried with backoff, and a full queue drops the
+oldest messages.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from notifications.dispatcher import DIGEST_SEPARATOR
+from notifications.telegram import TelegramNotifier
+from shoonya_platform.strategy_runner.strategy_executor_service import StrategyExecutorService
+
+
+class StubTelegram:
+    """Minimal Bot API: getMe + sendMessage with injectable delay / failures."""
+
+    def __init__(self):
+        self.messages = []
+        self.requests = 0
+        self.delay = 0.0
+        self.fail_next = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(200, {"ok": True, "result": {"first_name": "stub"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+                stub.requests += 1
+                time.sleep(stub.delay)
+                if stub.fail_next > 0:
+                    stub.fail_next -= 1
+                    self._reply(502, {"ok": False})
+                    return
+                stub.messages.append(data["text"])
+                self._reply(200, {"ok": True, "result": {}})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = StubTelegram()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def notifier(stub, tmp_path):
+    tg = TelegramNotifier("TOKEN", "42", api_base=stub.url)
+    tg._log_path = tmp_path / "telegram_messages.jsonl"
+    assert tg.is_connected
+    yield tg
+    tg.stop_dispatcher(timeout=2)
+
+
+def _log_entries(tg):
+    if not tg._log_path.exists():
+        return []
+    return [json.loads(line) for line in tg._log_path.read_text().splitlines()]
+
+
+def test_producers_do_not_wait_for_slow_api(stub, notifier):
+    stub.delay = 0.2
+    d = notifier.start_dispatcher(coalesce_window=0.05)
+    started = time.perf_counter()
+    for i in range(20):
+        notifier.send_login_success(f"user{i}")  # system: not coalesced
+    elapsed = time.perf_counter() - started
+    assert elapsed < 0.1  # 20 synchronous posts would take >= 4 s
+
+    stats = d.get_stats()
+    assert stats["enqueued"] == 20 and stats["queue_depth"] >= 18
+    stub.delay = 0.0
+    assert d.flush(timeout=5)
+    assert len(stub.messages) == 20
+    assert d.get_stats()["delivery_latency"]["count"] == 20
+
+
+def test_order_burst_is_coalesced_into_digest(stub, notifier):
+    d = notifier.start_dispatcher(coalesce_window=0.2)
+    notifier.send_alert_received("S1", "ENTRY", 2, "NFO")
+    for i in range(4):
+        notifier.send_order_success(f"OID{i}", "NIFTY", "BUY", 75)
+    notifier.send_login_success("user")  # different category, sent on its own
+    assert d.flush(timeout=5)
+
+    assert len(stub.messages) == 2
+    digest = next(m for m in stub.messages if "ALERT RECEIVED" in m)
+    assert digest.count(DIGEST_SEPARATOR.strip()) == 4
+    assert all(f"OID{i}" in digest for i in range(4))
+    stats = d.get_stats()
+    assert stats["delivered"] == 6 and stats["coalesced"] == 4
+
+    # Dashboard log still has one entry per original message
+    entries = _log_entries(notifier)
+    assert len(entries) == 6 and all(e["sent"] for e in entries)
+
+
+def test_failed_delivery_is_retried_with_backoff(stub, notifier):
+    stub.fail_next = 2
+    d = notifier.start_dispatcher(backoff_base=0.05, coalesce_window=0.0)
+    notifier.send_login_success("user")
+    assert d.flush(timeout=5)
+    assert stub.requests == 3
+    assert stub.messages and "LOGIN SUCCESSFUL" in stub.messages[0]
+    assert d.get_stats()["retries"] == 2
+
+    stub.fail_next = 10
+    notifier.send_login_success("again")
+    assert d.flush(timeout=5)
+    stats = d.get_stats()
+    assert stats["failed"] == 1
+    assert _log_entries(notifier)[-1]["sent"] is False
+
+
+def test_full_queue_drops_oldest(stub, notifier):
+    stub.delay = 0.3
+    d = notifier.start_dispatcher(max_queue=5, coalesce_window=0.0)
+    notifier.send_login_success("first")
+    time.sleep(0.1)  # worker busy with "first"
+    for i in range(10):
+        notifier.send_login_success(f"user{i}")
+    stats = d.get_stats()
+    assert stats["queue_depth"] == 5 and stats["dropped"] == 5
+    stub.delay = 0.0
+    assert d.flush(timeout=5)
+    delivered = " ".join(stub.messages)
+    assert "user9" in delivered and "user4" not in delivered
+
+
+def test_blocked_category_is_logged_not_sent(stub, notifier):
+    d = notifier.start_dispatcher()
+    notifier.set_preferences({"reports": False})
+    notifier._send_with_log("send_heartbeat", "hb")
+    assert d.flush(timeout=5)
+    assert stub.messages == []
+    last = _log_entries(notifier)[-1]
+    assert last["message"] == "hb" and last["sent"] is False
+
+
+def test_auto_resume_notice_is_queued_not_sent_inline(stub, notifier, monkeypatch):
+    d = notifier.start_dispatcher(coalesce_window=0.0)
+    delivered, sent_from = [], []
+    deliver, send = notifier.deliver, notifier.send_message
+
+    def recording_deliver(message, **kwargs):
+        delivered.append(kwargs)
+        return deliver(message, **kwargs)
+
+    def recording_send(*args, **kwargs):
+        sent_from.append(threading.current_thread())
+        return send(*args, **kwargs)
+
+    monkeypatch.setattr(notifier, "deliver", recording_deliver)
+    monkeypatch.setattr(notifier, "send_message", recording_send)
+    service = StrategyExecutorService.__new__(StrategyExecutorService)
+    service.bot = type("Bot", (), {"telegram": notifier})()
+
+    service._notify_auto_resume(["NIFTY_STRANGLE"])
+    assert delivered == [{"category": "strategy", "allowed": True}]
+    assert d.flush(timeout=5)
+    # Sent on the dispatcher thread only: the caller just enqueued
+    assert sent_from and threading.current_thread() not in sent_from
+    assert "STRATEGY AUTO-RESUME" in stub.messages[0]
+
+    # Category toggled off: still logged for the dashboard, never sent
+    notifier._prefs["strategy"] = False
+    service._notify_auto_resume(["BANK_IRON_FLY"])
+    assert d.flush(timeout=5)
+    assert len(stub.messages) == 1
+    assert _log_entries(notifier)[-1]["sent"] is False
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Telegram log tail reader: backward tail from EOF, incremental parsing of
+appended lines only, windowed alert/success/failure/risk counters, torn
+last lines, truncation and rotation. Compared against the old
+read-everything implementation, with timings on a large session log.
+"""
+
+import json
+import time
+
+import pytest
+
+from shoonya_platform.api.dashboard.services import system_service
+from shoonya_platform.api.dashboard.services.system_service import (
+    SystemTruthService,
+    TelegramLogReader,
+    telegram_log_reader,
+)
+
+KINDS = [
+    "📥 Alert received: NIFTY",
+    "✅ Order successful: NIFTY24000CE",
+    "❌ Order failed: margin",
+    "⚠️ Risk limit warning",
+    "🔐 Login successful",
+    "heartbeat",
+    "🛑 FORCE EXIT triggered",
+]
+
+
+def _line(i: int) -> str:
+    return json.dumps({"ts": 1_700_000_000.0 + i, "message": f"{KINDS[i % len(KINDS)]} #{i}", "sent": True})
+
+
+def _write(path, start: int, count: int, mode: str = "a") -> None:
+    with open(path, mode, encoding="utf-8") as f:
+        f.write("".join(_line(i) + "\n" for i in range(start, start + count)))
+
+
+def _naive_messages(path, limit):
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    items = []
+    for line in lines[-limit:]:
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return items
+
+
+def _naive_stats(path, limit):
+    messages = _naive_messages(path, limit)
+    out = {"total": len(messages), "success": 0, "failed": 0, "alerts": 0, "risk": 0, "last_ts": None}
+    for item in messages:
+        text = (item.get("message") or "").lower()
+        ts = item.get("ts")
+        if ts:
+            out["last_ts"] = max(out["last_ts"] or ts, ts)
+        out["alerts"] += "alert received" in text
+        out["success"] += "order successful" in text or "login successful" in text
+        out["failed"] += "order failed" in text or "login failed" in text
+        out["risk"] += "risk" in text or "force exit" in text
+    return out
+
+
+def test_tail_matches_full_read_and_parses_only_new_lines(tmp_path):
+    log = tmp_path / "telegram_messages.jsonl"
+    _write(log, 0, 5000, "w")
+    reader = TelegramLogReader(log, capacity=600)
+    reader.CHUNK = 4096   # force several backward chunks
+
+    assert reader.messages(200) == _naive_messages(log, 200)
+    assert reader.stats(500) == _naive_stats(log, 500)
+    assert reader.parsed_lines == 600   # only the tail was decoded
+
+    _write(log, 5000, 37)
+    assert reader.stats(500) == _naive_stats(log, 500)
+    assert reader.messages(200) == _naive_messages(log, 200)
+    assert reader.parsed_lines == 637   # appended lines only, once
+
+    # a torn last line waits until its newline lands
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(_line(5037)[:15])
+    assert reader.messages(1)[0]["ts"] == 1_700_000_000.0 + 5036
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(_line(5037)[15:] + "\nnot json\n\n")
+    assert reader.messages(1)[0]["ts"] == 1_700_000_000.0 + 5037
+    assert reader.stats(500) == _naive_stats(log, 502)   # garbage and blank lines are skipped
+
+    # asking for a larger window than cached re-tails the file
+    assert reader.messages(2000) == _naive_messages(log, 2002)
+
+
+def test_truncation_rotation_and_service_wiring(tmp_path, monkeypatch):
+    log = tmp_path / "telegram_messages.jsonl"
+    _write(log, 0, 50, "w")
+    monkeypatch.setattr(system_service, "TELEGRAM_LOG", log)
+    service = SystemTruthService.__new__(SystemTruthService)   # no OMS needed here
+
+    assert service.get_telegram_messages(10) == _naive_messages(log, 10)
+    assert service.get_telegram_alert_stats(500) == _naive_stats(log, 500)
+    assert telegram_log_reader(log) is telegram_log_reader(log)
+
+    # rewritten in place with more data: offset no longer sits after a newline
+    with open(log, "w", encoding="utf-8") as f:
+        f.write("x" * 7 + "\n")
+        f.write("".join(_line(i) + "\n" for i in range(900, 960)))
+    assert service.get_telegram_messages(200) == _naive_messages(log, 200)
+
+    # truncated
+    _write(log, 100, 3, "w")
+    assert service.get_telegram_alert_stats(500) == _naive_stats(log, 500)
+
+    # rotated: renamed away and recreated
+    log.rename(tmp_path / "telegram_messages.jsonl.1")
+    assert service.get_telegram_messages(10) == []
+    _write(log, 200, 4, "w")
+    assert service.get_telegram_messages(10) == _naive_messages(log, 10)
+    assert service.get_telegram_alert_stats(500)["total"] == 4
+
+
+@pytest.mark.benchmark
+def test_dashboard_refresh_cost_stays_flat_as_log_grows(tmp_path):
+    log = tmp_path / "telegram_messages.jsonl"
+    _write(log, 0, 200_000, "w")
+    reader = TelegramLogReader(log)
+
+    def refresh():
+        reader.messages(200)
+        reader.stats(500)
+
+    def naive():
+        _naive_messages(log, 200)
+        _naive_stats(log, 500)
+
+    def best(fn, n):
+        fn()
+        times = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    t_naive = best(naive, 3)
+    t_idle = best(refresh, 20)
+    _write(log, 200_000, 10)
+    t0 = time.perf_counter()
+    refresh()
+    t_append = time.perf_counter() - t0
+    assert reader.stats(500) == _naive_stats(log, 500)
+
+    print(f"\ntelegram log 200k lines: full read {t_naive * 1e3:.1f} ms | "
+          f"tail idle {t_idle * 1e3:.3f} ms | +10 lines {t_append * 1e3:.3f} ms")
+    assert t_idle * 20 < t_naive
+    assert t_append * 10 < t_naive